@@ -0,0 +1,187 @@
+"""add_message_counters
+
+Revision ID: 20260201090000
+Revises: 441a201965a6
+Create Date: 2026-02-01 09:00:00.000000
+
+Denormalized message counters kept consistent by triggers:
+
+- messages.message_count / admin_unread_count / member_unread_count on
+  thread root rows (counts of rows whose thread_id is the root)
+- message_unread_counts: unread tally per inbox, keyed "admin" (unread
+  messages sent by members) or "member:<recipient_id>"
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20260201090000'
+down_revision = '441a201965a6'
+branch_labels = None
+depends_on = None
+
+
+def lock_down(table: str) -> None:
+    """Server-only table: row level security without policies, no anon/authenticated privileges."""
+    op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;")
+    op.execute(f"""
+        DO $$
+        DECLARE
+            v_role text;
+        BEGIN
+            FOR v_role IN SELECT rolname FROM pg_roles WHERE rolname IN ('anon', 'authenticated') LOOP
+                EXECUTE format('REVOKE ALL ON {table} FROM %I', v_role);
+            END LOOP;
+        END;
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    """添加消息计数字段、未读计数表及维护触发器"""
+    op.add_column('messages', sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('messages', sa.Column('admin_unread_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('messages', sa.Column('member_unread_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table(
+        'message_unread_counts',
+        sa.Column('owner_key', sa.String(length=64), primary_key=True),
+        sa.Column('unread_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    lock_down('message_unread_counts')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION messages_apply_counters(
+            p_thread_id uuid,
+            p_sender_type text,
+            p_recipient_id uuid,
+            p_is_read boolean,
+            p_delta integer
+        ) RETURNS void AS $$
+        BEGIN
+            IF p_thread_id IS NOT NULL THEN
+                -- Only counter columns are set, so the UPDATE trigger below does not fire
+                UPDATE messages SET
+                    message_count = message_count + p_delta,
+                    admin_unread_count = admin_unread_count
+                        + CASE WHEN NOT p_is_read AND p_sender_type = 'member' THEN p_delta ELSE 0 END,
+                    member_unread_count = member_unread_count
+                        + CASE WHEN NOT p_is_read AND p_sender_type = 'admin' THEN p_delta ELSE 0 END
+                WHERE id = p_thread_id;
+            END IF;
+
+            IF NOT p_is_read THEN
+                IF p_recipient_id IS NOT NULL THEN
+                    INSERT INTO message_unread_counts (owner_key, unread_count)
+                    VALUES ('member:' || p_recipient_id::text, p_delta)
+                    ON CONFLICT (owner_key) DO UPDATE
+                    SET unread_count = message_unread_counts.unread_count + EXCLUDED.unread_count,
+                        updated_at = now();
+                END IF;
+                IF p_sender_type = 'member' THEN
+                    INSERT INTO message_unread_counts (owner_key, unread_count)
+                    VALUES ('admin', p_delta)
+                    ON CONFLICT (owner_key) DO UPDATE
+                    SET unread_count = message_unread_counts.unread_count + EXCLUDED.unread_count,
+                        updated_at = now();
+                END IF;
+            END IF;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION messages_maintain_counters() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM messages_apply_counters(
+                    OLD.thread_id, OLD.sender_type, OLD.recipient_id, OLD.is_read, -1
+                );
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM messages_apply_counters(
+                    NEW.thread_id, NEW.sender_type, NEW.recipient_id, NEW.is_read, 1
+                );
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql SECURITY DEFINER SET search_path = public;
+    """)
+    # The trigger runs as the table owner, so inserts by any role can update message_unread_counts;
+    # the counter function itself is not callable through the API
+    op.execute("""
+        DO $$
+        DECLARE
+            v_role text;
+        BEGIN
+            REVOKE EXECUTE ON FUNCTION messages_apply_counters(uuid, text, uuid, boolean, integer) FROM PUBLIC;
+            FOR v_role IN SELECT rolname FROM pg_roles WHERE rolname IN ('anon', 'authenticated') LOOP
+                EXECUTE format(
+                    'REVOKE EXECUTE ON FUNCTION messages_apply_counters(uuid, text, uuid, boolean, integer) FROM %I',
+                    v_role
+                );
+            END LOOP;
+        END;
+        $$;
+    """)
+
+    op.execute("""
+        CREATE TRIGGER trg_messages_counters_insert_delete
+        AFTER INSERT OR DELETE ON messages
+        FOR EACH ROW EXECUTE FUNCTION messages_maintain_counters();
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_messages_counters_update
+        AFTER UPDATE OF is_read, thread_id, sender_type, recipient_id ON messages
+        FOR EACH ROW
+        WHEN (
+            OLD.is_read IS DISTINCT FROM NEW.is_read
+            OR OLD.thread_id IS DISTINCT FROM NEW.thread_id
+            OR OLD.sender_type IS DISTINCT FROM NEW.sender_type
+            OR OLD.recipient_id IS DISTINCT FROM NEW.recipient_id
+        )
+        EXECUTE FUNCTION messages_maintain_counters();
+    """)
+
+    # Backfill from existing rows
+    op.execute("""
+        UPDATE messages AS t SET
+            message_count = s.message_count,
+            admin_unread_count = s.admin_unread_count,
+            member_unread_count = s.member_unread_count
+        FROM (
+            SELECT
+                thread_id,
+                count(*) AS message_count,
+                count(*) FILTER (WHERE NOT is_read AND sender_type = 'member') AS admin_unread_count,
+                count(*) FILTER (WHERE NOT is_read AND sender_type = 'admin') AS member_unread_count
+            FROM messages
+            WHERE thread_id IS NOT NULL
+            GROUP BY thread_id
+        ) AS s
+        WHERE t.id = s.thread_id;
+    """)
+    op.execute("""
+        INSERT INTO message_unread_counts (owner_key, unread_count)
+        SELECT 'member:' || recipient_id::text, count(*)
+        FROM messages
+        WHERE NOT is_read AND recipient_id IS NOT NULL
+        GROUP BY recipient_id
+        UNION ALL
+        SELECT 'admin', count(*)
+        FROM messages
+        WHERE NOT is_read AND sender_type = 'member';
+    """)
+
+
+def downgrade() -> None:
+    """移除消息计数触发器、未读计数表及计数字段"""
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_counters_update ON messages;")
+    op.execute("DROP TRIGGER IF EXISTS trg_messages_counters_insert_delete ON messages;")
+    op.execute("DROP FUNCTION IF EXISTS messages_maintain_counters();")
+    op.execute("DROP FUNCTION IF EXISTS messages_apply_counters(uuid, text, uuid, boolean, integer);")
+    op.drop_table('message_unread_counts')
+    op.drop_column('messages', 'member_unread_count')
+    op.drop_column('messages', 'admin_unread_count')
+    op.drop_column('messages', 'message_count')
@@ -0,0 +1,116 @@
+"""add_message_analytics_function
+
+Revision ID: 20260203090000
+Revises: 20260201090000
+Create Date: 2026-02-03 09:00:00.000000
+
+get_message_analytics(p_start_date) aggregates message analytics in the
+database and returns a single JSON object (called via RPC):
+
+- total_messages / unread_messages
+- messages_by_day:      [{"date": "YYYY-MM-DD", "count": n}]
+- messages_by_category: [{"category": "...", "count": n}]
+- response_time:        average first admin response in minutes
+- response_time_by_day: [{"date": "YYYY-MM-DD", "responseTime": minutes}]
+
+First responses are found per thread with window functions, backed by the
+(thread_id, created_at) index.
+"""
+from alembic import op
+
+
+revision = '20260203090000'
+down_revision = '20260201090000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """添加 (thread_id, created_at) 索引及消息分析函数"""
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_messages_unified_thread "
+        "ON messages (thread_id, created_at);"
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION get_message_analytics(p_start_date timestamptz DEFAULT NULL)
+        RETURNS jsonb
+        LANGUAGE sql
+        STABLE
+        AS $$
+            WITH scoped AS (
+                SELECT
+                    created_at,
+                    to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD') AS day,
+                    COALESCE(NULLIF(category, ''), 'general') AS category,
+                    thread_id,
+                    sender_type,
+                    is_read
+                FROM messages
+                WHERE p_start_date IS NULL OR created_at >= p_start_date
+            ),
+            thread_messages AS (
+                SELECT
+                    thread_id,
+                    created_at,
+                    sender_type,
+                    min(created_at) FILTER (WHERE sender_type = 'member')
+                        OVER (PARTITION BY thread_id) AS first_member_at
+                FROM scoped
+                WHERE thread_id IS NOT NULL
+            ),
+            first_responses AS (
+                SELECT
+                    thread_id,
+                    first_member_at,
+                    EXTRACT(EPOCH FROM min(created_at) - first_member_at) / 60.0 AS minutes
+                FROM thread_messages
+                WHERE sender_type = 'admin' AND created_at >= first_member_at
+                GROUP BY thread_id, first_member_at
+            ),
+            by_day AS (
+                SELECT day, count(*) AS count
+                FROM scoped
+                GROUP BY day
+            ),
+            by_category AS (
+                SELECT category, count(*) AS count
+                FROM scoped
+                GROUP BY category
+            ),
+            response_by_day AS (
+                SELECT
+                    to_char(first_member_at AT TIME ZONE 'UTC', 'YYYY-MM-DD') AS day,
+                    round(avg(minutes)::numeric, 1) AS response_time
+                FROM first_responses
+                GROUP BY 1
+            )
+            SELECT jsonb_build_object(
+                'total_messages', (SELECT count(*) FROM scoped),
+                'unread_messages', (SELECT count(*) FROM scoped WHERE NOT is_read),
+                'messages_by_day', COALESCE(
+                    (SELECT jsonb_agg(jsonb_build_object('date', day, 'count', count) ORDER BY day) FROM by_day),
+                    '[]'::jsonb
+                ),
+                'messages_by_category', COALESCE(
+                    (SELECT jsonb_agg(jsonb_build_object('category', category, 'count', count) ORDER BY count DESC)
+                     FROM by_category),
+                    '[]'::jsonb
+                ),
+                'response_time', COALESCE(
+                    (SELECT round(avg(minutes)::numeric, 1) FROM first_responses),
+                    0
+                ),
+                'response_time_by_day', COALESCE(
+                    (SELECT jsonb_agg(jsonb_build_object('date', day, 'responseTime', response_time) ORDER BY day)
+                     FROM response_by_day),
+                    '[]'::jsonb
+                )
+            );
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    """移除消息分析函数"""
+    op.execute("DROP FUNCTION IF EXISTS get_message_analytics(timestamptz);")
@@ -0,0 +1,88 @@
+"""add_email_outbox
+
+Revision ID: 20260205090000
+Revises: 20260203090000
+Create Date: 2026-02-05 09:00:00.000000
+
+Durable email outbox drained by EmailOutbox dispatchers.
+
+claim_email_outbox(p_limit, p_lease_seconds) atomically claims due rows
+(FOR UPDATE SKIP LOCKED, so several processes can dispatch concurrently),
+marks them 'sending' and increments attempts. Rows stuck in 'sending' longer
+than the lease (e.g. the process died mid-send) are claimed again.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '20260205090000'
+down_revision = '20260203090000'
+branch_labels = None
+depends_on = None
+
+
+def lock_down(table: str) -> None:
+    """Server-only table: row level security without policies, no anon/authenticated privileges."""
+    op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;")
+    op.execute(f"""
+        DO $$
+        DECLARE
+            v_role text;
+        BEGIN
+            FOR v_role IN SELECT rolname FROM pg_roles WHERE rolname IN ('anon', 'authenticated') LOOP
+                EXECUTE format('REVOKE ALL ON {table} FROM %I', v_role);
+            END LOOP;
+        END;
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    """添加 email_outbox 表及领取函数"""
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('to_email', sa.String(length=255), nullable=False),
+        sa.Column('subject', sa.String(length=500), nullable=False),
+        sa.Column('template_name', sa.String(length=100), nullable=False),
+        sa.Column('context', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('plain_text', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('locked_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('sent_at', sa.TIMESTAMP(timezone=True), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index('idx_email_outbox_due', 'email_outbox', ['status', 'next_attempt_at'])
+    # Rendered context holds password-reset links: not readable through the API
+    lock_down('email_outbox')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION claim_email_outbox(p_limit integer, p_lease_seconds integer)
+        RETURNS SETOF email_outbox
+        LANGUAGE sql
+        AS $$
+            UPDATE email_outbox
+            SET status = 'sending', locked_at = now(), attempts = attempts + 1
+            WHERE id IN (
+                SELECT id
+                FROM email_outbox
+                WHERE (status = 'pending' AND next_attempt_at <= now())
+                   OR (status = 'sending' AND locked_at < now() - make_interval(secs => p_lease_seconds))
+                ORDER BY next_attempt_at
+                LIMIT p_limit
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *;
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    """移除 email_outbox 表及领取函数"""
+    op.execute("DROP FUNCTION IF EXISTS claim_email_outbox(integer, integer);")
+    op.drop_index('idx_email_outbox_due', table_name='email_outbox')
+    op.drop_table('email_outbox')
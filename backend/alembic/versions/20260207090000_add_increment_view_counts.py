@@ -0,0 +1,52 @@
+"""add_increment_view_counts
+
+Revision ID: 20260207090000
+Revises: 20260205090000
+Create Date: 2026-02-07 09:00:00.000000
+
+increment_view_counts(p_table, p_ids, p_deltas) applies aggregated view
+increments flushed by the write-behind view counter in a single statement
+(view_count = view_count + n), so concurrent views are never lost.
+"""
+from alembic import op
+
+
+revision = '20260207090000'
+down_revision = '20260205090000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """添加批量浏览次数累加函数"""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION increment_view_counts(p_table text, p_ids uuid[], p_deltas integer[])
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_updated integer;
+        BEGIN
+            IF p_table = 'notices' THEN
+                UPDATE notices t
+                SET view_count = COALESCE(t.view_count, 0) + d.delta
+                FROM unnest(p_ids, p_deltas) AS d(id, delta)
+                WHERE t.id = d.id;
+            ELSIF p_table = 'projects' THEN
+                UPDATE projects t
+                SET view_count = COALESCE(t.view_count, 0) + d.delta
+                FROM unnest(p_ids, p_deltas) AS d(id, delta)
+                WHERE t.id = d.id;
+            ELSE
+                RAISE EXCEPTION 'unsupported view count table: %', p_table;
+            END IF;
+            GET DIAGNOSTICS v_updated = ROW_COUNT;
+            RETURN v_updated;
+        END;
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    """移除批量浏览次数累加函数"""
+    op.execute("DROP FUNCTION IF EXISTS increment_view_counts(text, uuid[], integer[]);")
@@ -0,0 +1,88 @@
+"""add_project_applications_count
+
+Revision ID: 20260209090000
+Revises: 20260207090000
+Create Date: 2026-02-09 09:00:00.000000
+
+Maintains projects.applications_count (non-deleted applications) with a
+trigger on project_applications, so project lists no longer load every
+application row to count them. Adds an index for the default listing order
+of non-deleted projects.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20260209090000'
+down_revision = '20260207090000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """添加 projects.applications_count 计数列及维护触发器"""
+    op.add_column(
+        'projects',
+        sa.Column('applications_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION project_applications_maintain_count()
+        RETURNS trigger
+        LANGUAGE plpgsql
+        AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.deleted_at IS NULL THEN
+                UPDATE projects
+                SET applications_count = GREATEST(applications_count - 1, 0)
+                WHERE id = OLD.project_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.deleted_at IS NULL THEN
+                UPDATE projects
+                SET applications_count = applications_count + 1
+                WHERE id = NEW.project_id;
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_project_applications_count_insert_delete
+        AFTER INSERT OR DELETE ON project_applications
+        FOR EACH ROW EXECUTE FUNCTION project_applications_maintain_count();
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_project_applications_count_update
+        AFTER UPDATE OF project_id, deleted_at ON project_applications
+        FOR EACH ROW
+        WHEN (OLD.project_id IS DISTINCT FROM NEW.project_id
+              OR (OLD.deleted_at IS NULL) IS DISTINCT FROM (NEW.deleted_at IS NULL))
+        EXECUTE FUNCTION project_applications_maintain_count();
+    """)
+
+    # Backfill existing counts
+    op.execute("""
+        UPDATE projects p
+        SET applications_count = c.count
+        FROM (
+            SELECT project_id, count(*) AS count
+            FROM project_applications
+            WHERE deleted_at IS NULL
+            GROUP BY project_id
+        ) c
+        WHERE p.id = c.project_id;
+    """)
+
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_projects_active_created "
+        "ON projects (status, created_at DESC) WHERE deleted_at IS NULL;"
+    )
+
+
+def downgrade() -> None:
+    """移除 projects.applications_count 计数列及维护触发器"""
+    op.execute("DROP INDEX IF EXISTS idx_projects_active_created;")
+    op.execute("DROP TRIGGER IF EXISTS trg_project_applications_count_update ON project_applications;")
+    op.execute("DROP TRIGGER IF EXISTS trg_project_applications_count_insert_delete ON project_applications;")
+    op.execute("DROP FUNCTION IF EXISTS project_applications_maintain_count();")
+    op.drop_column('projects', 'applications_count')
@@ -0,0 +1,149 @@
+"""add_log_rollups
+
+Revision ID: 20260213090000
+Revises: 20260209090000
+Create Date: 2026-02-13 09:00:00.000000
+
+Per-minute log rollups written by the in-process rollup aggregator, so
+statistics and trend charts read O(minutes) rows instead of raw log tables.
+
+merge_log_rollups(p_rows, p_flush_id) upserts a batch of rollup rows
+additively: counts and sums are added, min/max combined and histogram bucket
+counts summed, so several processes can write the same minute. Every batch
+carries a flush id (process id + flush sequence) recorded in
+log_rollup_flushes in the same transaction; a batch whose id is already
+recorded is skipped, so retrying a flush whose outcome was unknown (timeout
+after commit) does not count it twice.
+
+Existing log rows are not backfilled: statistics and trend charts only cover
+minutes logged after this migration.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '20260213090000'
+down_revision = '20260209090000'
+branch_labels = None
+depends_on = None
+
+
+def lock_down(table: str) -> None:
+    """Server-only table: row level security without policies, no anon/authenticated privileges."""
+    op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;")
+    op.execute(f"""
+        DO $$
+        DECLARE
+            v_role text;
+        BEGIN
+            FOR v_role IN SELECT rolname FROM pg_roles WHERE rolname IN ('anon', 'authenticated') LOOP
+                EXECUTE format('REVOKE ALL ON {table} FROM %I', v_role);
+            END LOOP;
+        END;
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    """添加 log_rollups 表、flush 去重表及合并函数"""
+    op.create_table(
+        'log_rollups',
+        sa.Column('bucket_start', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('log_type', sa.String(length=20), nullable=False),
+        sa.Column('layer', sa.String(length=100), nullable=False, server_default=''),
+        sa.Column('level', sa.String(length=20), nullable=False),
+        sa.Column('route', sa.String(length=255), nullable=False, server_default=''),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('slow_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_sum', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('duration_min', sa.Integer(), nullable=True),
+        sa.Column('duration_max', sa.Integer(), nullable=True),
+        sa.Column('histogram', postgresql.JSONB(), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('bucket_start', 'log_type', 'layer', 'level', 'route'),
+    )
+
+    op.create_table(
+        'log_rollup_flushes',
+        sa.Column('flush_id', sa.String(length=64), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('flush_id'),
+    )
+    op.create_index('idx_log_rollup_flushes_created_at', 'log_rollup_flushes', ['created_at'])
+    lock_down('log_rollups')
+    lock_down('log_rollup_flushes')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION jsonb_sum_counts(a jsonb, b jsonb)
+        RETURNS jsonb
+        LANGUAGE sql
+        IMMUTABLE
+        AS $$
+            SELECT COALESCE(jsonb_object_agg(key, total), '{}'::jsonb)
+            FROM (
+                SELECT key, sum(value::bigint) AS total
+                FROM (
+                    SELECT * FROM jsonb_each_text(COALESCE(a, '{}'::jsonb))
+                    UNION ALL
+                    SELECT * FROM jsonb_each_text(COALESCE(b, '{}'::jsonb))
+                ) s
+                GROUP BY key
+            ) t;
+        $$;
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION merge_log_rollups(p_rows jsonb, p_flush_id text)
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_merged integer;
+        BEGIN
+            -- A retried flush that was already committed is skipped
+            INSERT INTO log_rollup_flushes (flush_id) VALUES (p_flush_id)
+            ON CONFLICT (flush_id) DO NOTHING;
+            IF NOT FOUND THEN
+                RETURN 0;
+            END IF;
+            -- Flushes are retried for at most an hour; older ids are not needed
+            DELETE FROM log_rollup_flushes WHERE created_at < now() - interval '1 day';
+
+            INSERT INTO log_rollups AS r (
+                bucket_start, log_type, layer, level, route,
+                count, slow_count, duration_count, duration_sum,
+                duration_min, duration_max, histogram
+            )
+            SELECT
+                x.bucket_start, x.log_type, COALESCE(x.layer, ''), x.level, COALESCE(x.route, ''),
+                x.count, x.slow_count, x.duration_count, x.duration_sum,
+                x.duration_min, x.duration_max, COALESCE(x.histogram, '{}'::jsonb)
+            FROM jsonb_to_recordset(p_rows) AS x(
+                bucket_start timestamptz, log_type text, layer text, level text, route text,
+                count integer, slow_count integer, duration_count integer, duration_sum bigint,
+                duration_min integer, duration_max integer, histogram jsonb
+            )
+            ON CONFLICT (bucket_start, log_type, layer, level, route) DO UPDATE SET
+                count = r.count + EXCLUDED.count,
+                slow_count = r.slow_count + EXCLUDED.slow_count,
+                duration_count = r.duration_count + EXCLUDED.duration_count,
+                duration_sum = r.duration_sum + EXCLUDED.duration_sum,
+                duration_min = LEAST(r.duration_min, EXCLUDED.duration_min),
+                duration_max = GREATEST(r.duration_max, EXCLUDED.duration_max),
+                histogram = jsonb_sum_counts(r.histogram, EXCLUDED.histogram),
+                updated_at = now();
+            GET DIAGNOSTICS v_merged = ROW_COUNT;
+            RETURN v_merged;
+        END;
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    """移除 log_rollups 表、flush 去重表及合并函数"""
+    op.execute("DROP FUNCTION IF EXISTS merge_log_rollups(jsonb, text);")
+    op.execute("DROP FUNCTION IF EXISTS jsonb_sum_counts(jsonb, jsonb);")
+    op.drop_index('idx_log_rollup_flushes_created_at', table_name='log_rollup_flushes')
+    op.drop_table('log_rollup_flushes')
+    op.drop_table('log_rollups')
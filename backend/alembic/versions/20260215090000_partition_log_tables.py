@@ -0,0 +1,369 @@
+"""partition_log_tables
+
+Revision ID: 20260215090000
+Revises: 20260213090000
+Create Date: 2026-02-15 09:00:00.000000
+
+Converts app_logs, error_logs, performance_logs, system_logs and audit_logs
+to tables partitioned by month on created_at, so retention drops whole
+partitions instead of running DELETEs.
+
+Existing rows are not copied: each old table is renamed to
+<table>_p_legacy and attached as the partition for everything before the
+first monthly partition (its indexes are reused by the new parent). The
+primary key becomes (id, created_at), as required for partitioned tables.
+A DEFAULT partition catches rows past the last monthly partition, so
+inserts keep working if maintenance falls behind.
+
+Work that scans the old tables runs first, outside a transaction, while the
+tables still take writes: the unique (id, created_at) index is built
+CONCURRENTLY and the partition range CHECK is added NOT VALID, then
+validated separately. The swap itself only holds its exclusive locks for
+catalog changes: the prebuilt index replaces the legacy (id) primary key
+(ATTACH PARTITION only reuses an index backing a primary key for the
+parent's primary key), and ATTACH PARTITION skips its scan thanks to the
+validated CHECK.
+
+maintain_log_partitions(p_retention_days, p_months_ahead, p_rollup_retention_days)
+creates upcoming monthly partitions and detaches/drops partitions whose
+range ends before now() - retention. Rows that already reached the DEFAULT
+partition are moved into the monthly partition created for them. It is
+called periodically by the log retention job over RPC with the service
+role, which does not own the log tables, so it runs as SECURITY DEFINER
+and only service_role may execute it; only one caller runs at a time
+(advisory lock). New partitions get row level security and no
+anon/authenticated privileges, so they cannot be read directly through the
+API around the parent's policies.
+"""
+from alembic import op
+
+
+revision = '20260215090000'
+down_revision = '20260213090000'
+branch_labels = None
+depends_on = None
+
+
+LOG_TABLES = ('app_logs', 'error_logs', 'performance_logs', 'system_logs', 'audit_logs')
+
+
+def upgrade() -> None:
+    """日志表按月分区，并添加分区维护函数"""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION log_partition_upper_bound(p_partition regclass)
+        RETURNS timestamptz
+        LANGUAGE sql
+        STABLE
+        AS $$
+            SELECT (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'TO \\(''([^'']+)''\\)'))[1]::timestamptz
+            FROM pg_class c
+            WHERE c.oid = p_partition;
+        $$;
+    """)
+
+    # Scans of the old tables, without blocking writes
+    with op.get_context().autocommit_block():
+        for table in LOG_TABLES:
+            op.execute(
+                f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {table}_p_legacy_id_created ON {table} (id, created_at);"
+            )
+            op.execute(f"""
+                DO $$
+                DECLARE
+                    v_cutoff timestamptz;
+                BEGIN
+                    SET LOCAL timezone = 'UTC';
+                    IF NOT EXISTS (
+                        SELECT 1 FROM pg_constraint
+                        WHERE conrelid = '{table}'::regclass AND conname = '{table}_p_legacy_range'
+                    ) THEN
+                        SELECT greatest(date_trunc('month', now()), date_trunc('month', max(created_at))) + interval '1 month'
+                        INTO v_cutoff
+                        FROM {table};
+                        EXECUTE format(
+                            'ALTER TABLE {table} ADD CONSTRAINT {table}_p_legacy_range CHECK (created_at < %L) NOT VALID',
+                            v_cutoff
+                        );
+                    END IF;
+                END;
+                $$;
+            """)
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {table}_p_legacy_range;")
+
+    for table in LOG_TABLES:
+        op.execute(f"""
+            DO $$
+            DECLARE
+                v_table text := '{table}';
+                v_legacy text := '{table}_p_legacy';
+                v_index record;
+                v_policy record;
+                v_grant record;
+                v_index_defs text[] := '{{}}';
+                v_def text;
+                v_cutoff timestamptz;
+                v_pkey text;
+                v_role text;
+            BEGIN
+                SET LOCAL timezone = 'UTC';
+                EXECUTE format('ALTER TABLE %I RENAME TO %I', v_table, v_legacy);
+
+                -- Free the index names for the parent; non-unique definitions are recreated on it
+                FOR v_index IN
+                    SELECT ic.relname AS name, pg_get_indexdef(ix.indexrelid) AS def, ix.indisunique AS is_unique
+                    FROM pg_index ix
+                    JOIN pg_class ic ON ic.oid = ix.indexrelid
+                    WHERE ix.indrelid = v_legacy::regclass
+                      AND ic.relname <> v_legacy || '_id_created'
+                LOOP
+                    EXECUTE format('ALTER INDEX %I RENAME TO %I', v_index.name, left(v_index.name, 56) || '_legacy');
+                    IF NOT v_index.is_unique THEN
+                        v_index_defs := v_index_defs || format(
+                            'CREATE INDEX %I ON %I USING %s', v_index.name, v_table, split_part(v_index.def, ' USING ', 2)
+                        );
+                    END IF;
+                END LOOP;
+
+                EXECUTE format(
+                    'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS) '
+                    'PARTITION BY RANGE (created_at)',
+                    v_table, v_legacy
+                );
+                -- LIKE copied the legacy range CHECK; it only belongs to the legacy partition
+                EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', v_table, v_legacy || '_range');
+                EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id, created_at)', v_table);
+                FOREACH v_def IN ARRAY v_index_defs LOOP
+                    EXECUTE v_def;
+                END LOOP;
+
+                -- Keep row level security, policies and grants of the old table
+                IF (SELECT relrowsecurity FROM pg_class WHERE oid = v_legacy::regclass) THEN
+                    EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', v_table);
+                END IF;
+                FOR v_policy IN SELECT * FROM pg_policies WHERE schemaname = 'public' AND tablename = v_legacy LOOP
+                    EXECUTE format(
+                        'CREATE POLICY %I ON %I AS %s FOR %s TO %s%s%s',
+                        v_policy.policyname, v_table, v_policy.permissive, v_policy.cmd,
+                        array_to_string(v_policy.roles, ', '),
+                        COALESCE(' USING (' || v_policy.qual || ')', ''),
+                        COALESCE(' WITH CHECK (' || v_policy.with_check || ')', '')
+                    );
+                END LOOP;
+                FOR v_grant IN
+                    SELECT grantee, privilege_type
+                    FROM information_schema.role_table_grants
+                    WHERE table_schema = 'public' AND table_name = v_legacy
+                LOOP
+                    EXECUTE format('GRANT %s ON %I TO %I', v_grant.privilege_type, v_table, v_grant.grantee);
+                END LOOP;
+
+                -- The parent's primary key only reuses a partition index that backs a primary key;
+                -- swap the legacy (id) key for the prebuilt (id, created_at) index (no scan, columns are NOT NULL)
+                SELECT conname INTO v_pkey
+                FROM pg_constraint
+                WHERE conrelid = v_legacy::regclass AND contype = 'p';
+                IF v_pkey IS NOT NULL THEN
+                    EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', v_legacy, v_pkey);
+                END IF;
+                EXECUTE format(
+                    'ALTER TABLE %I ADD CONSTRAINT %I PRIMARY KEY USING INDEX %I',
+                    v_legacy, v_legacy || '_pkey', v_legacy || '_id_created'
+                );
+
+                -- Old rows become the partition for everything before the first monthly partition;
+                -- the bound is the one of the CHECK validated above
+                SELECT (regexp_match(pg_get_constraintdef(c.oid), '< ''([^'']+)'''))[1]::timestamptz
+                INTO v_cutoff
+                FROM pg_constraint c
+                WHERE c.conrelid = v_legacy::regclass AND c.conname = v_legacy || '_range';
+                EXECUTE format(
+                    'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (MINVALUE) TO (%L)',
+                    v_table, v_legacy, v_cutoff
+                );
+
+                -- Rows past the last monthly partition land here instead of failing the insert
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I DEFAULT', v_table || '_p_default', v_table);
+                EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', v_table || '_p_default');
+                FOR v_role IN SELECT rolname FROM pg_roles WHERE rolname IN ('anon', 'authenticated') LOOP
+                    EXECUTE format('REVOKE ALL ON %I FROM %I', v_table || '_p_default', v_role);
+                END LOOP;
+            END;
+            $$;
+        """)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION maintain_log_partitions(
+            p_retention_days jsonb,
+            p_months_ahead integer DEFAULT 3,
+            p_rollup_retention_days integer DEFAULT 0
+        )
+        RETURNS jsonb
+        LANGUAGE plpgsql
+        SECURITY DEFINER
+        SET search_path = public
+        SET timezone = 'UTC'
+        AS $$
+        DECLARE
+            v_table text;
+            v_days integer;
+            v_month timestamptz;
+            v_until timestamptz := date_trunc('month', now()) + make_interval(months => p_months_ahead + 1);
+            v_name text;
+            v_default text;
+            v_has_default_rows boolean;
+            v_moved integer;
+            v_moved_total integer := 0;
+            v_partition regclass;
+            v_role text;
+            v_created text[] := '{}';
+            v_dropped text[] := '{}';
+            v_rollups_deleted integer := 0;
+        BEGIN
+            IF NOT pg_try_advisory_xact_lock(hashtext('maintain_log_partitions')) THEN
+                RETURN jsonb_build_object('skipped', true);
+            END IF;
+
+            FOR v_table, v_days IN SELECT key, value::integer FROM jsonb_each_text(p_retention_days) LOOP
+                IF v_table NOT IN ('app_logs', 'error_logs', 'performance_logs', 'system_logs', 'audit_logs') THEN
+                    RAISE EXCEPTION 'unsupported log table: %', v_table;
+                END IF;
+
+                -- Upcoming monthly partitions
+                SELECT max(log_partition_upper_bound(i.inhrelid::regclass))
+                INTO v_month
+                FROM pg_inherits i
+                WHERE i.inhparent = v_table::regclass;
+                v_month := greatest(COALESCE(v_month, '-infinity'), date_trunc('month', now()));
+                WHILE v_month < v_until LOOP
+                    v_name := v_table || '_p' || to_char(v_month, 'YYYYMM');
+                    IF to_regclass(v_name) IS NULL THEN
+                        -- The new range must not overlap rows in the default partition: move them over
+                        v_default := v_table || '_p_default';
+                        EXECUTE format(
+                            'SELECT EXISTS (SELECT 1 FROM %I WHERE created_at >= %L AND created_at < %L)',
+                            v_default, v_month, v_month + interval '1 month'
+                        ) INTO v_has_default_rows;
+                        IF v_has_default_rows THEN
+                            EXECUTE format(
+                                'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', v_name, v_table
+                            );
+                            EXECUTE format(
+                                'WITH moved AS (DELETE FROM %I WHERE created_at >= %L AND created_at < %L RETURNING *) '
+                                'INSERT INTO %I SELECT * FROM moved',
+                                v_default, v_month, v_month + interval '1 month', v_name
+                            );
+                            GET DIAGNOSTICS v_moved = ROW_COUNT;
+                            v_moved_total := v_moved_total + v_moved;
+                            EXECUTE format(
+                                'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+                                v_table, v_name, v_month, v_month + interval '1 month'
+                            );
+                        ELSE
+                            EXECUTE format(
+                                'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                                v_name, v_table, v_month, v_month + interval '1 month'
+                            );
+                        END IF;
+                        -- Partitions are tables of their own: the parent's policies do not apply to them
+                        EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', v_name);
+                        FOR v_role IN SELECT rolname FROM pg_roles WHERE rolname IN ('anon', 'authenticated') LOOP
+                            EXECUTE format('REVOKE ALL ON %I FROM %I', v_name, v_role);
+                        END LOOP;
+                        v_created := v_created || v_name;
+                    END IF;
+                    v_month := v_month + interval '1 month';
+                END LOOP;
+
+                -- Expired partitions: detach and drop (no row-by-row delete)
+                IF v_days > 0 THEN
+                    FOR v_partition IN
+                        SELECT i.inhrelid::regclass
+                        FROM pg_inherits i
+                        WHERE i.inhparent = v_table::regclass
+                          AND log_partition_upper_bound(i.inhrelid::regclass) <= now() - make_interval(days => v_days)
+                    LOOP
+                        EXECUTE format('ALTER TABLE %I DETACH PARTITION %s', v_table, v_partition);
+                        EXECUTE format('DROP TABLE %s', v_partition);
+                        v_dropped := v_dropped || v_partition::text;
+                    END LOOP;
+                END IF;
+            END LOOP;
+
+            IF p_rollup_retention_days > 0 THEN
+                DELETE FROM log_rollups WHERE bucket_start < now() - make_interval(days => p_rollup_retention_days);
+                GET DIAGNOSTICS v_rollups_deleted = ROW_COUNT;
+            END IF;
+
+            RETURN jsonb_build_object(
+                'created', to_jsonb(v_created),
+                'dropped', to_jsonb(v_dropped),
+                'moved_from_default', v_moved_total,
+                'rollups_deleted', v_rollups_deleted
+            );
+        END;
+        $$;
+    """)
+
+    # Owner rights (partition DDL) for the retention job only
+    op.execute("""
+        DO $$
+        DECLARE
+            v_role text;
+        BEGIN
+            REVOKE EXECUTE ON FUNCTION maintain_log_partitions(jsonb, integer, integer) FROM PUBLIC;
+            FOR v_role IN SELECT rolname FROM pg_roles WHERE rolname IN ('anon', 'authenticated') LOOP
+                EXECUTE format(
+                    'REVOKE EXECUTE ON FUNCTION maintain_log_partitions(jsonb, integer, integer) FROM %I', v_role
+                );
+            END LOOP;
+            IF EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'service_role') THEN
+                GRANT EXECUTE ON FUNCTION maintain_log_partitions(jsonb, integer, integer) TO service_role;
+            END IF;
+        END;
+        $$;
+    """)
+
+    # Create the first monthly partitions (no retention yet)
+    op.execute("""
+        SELECT maintain_log_partitions(
+            '{"app_logs": 0, "error_logs": 0, "performance_logs": 0, "system_logs": 0, "audit_logs": 0}'::jsonb
+        );
+    """)
+
+
+def downgrade() -> None:
+    """日志表恢复为普通表（复制现有数据）"""
+    op.execute("DROP FUNCTION IF EXISTS maintain_log_partitions(jsonb, integer, integer);")
+
+    for table in LOG_TABLES:
+        op.execute(f"""
+            DO $$
+            DECLARE
+                v_table text := '{table}';
+                v_index record;
+            BEGIN
+                EXECUTE format('ALTER TABLE %I RENAME TO %I', v_table, v_table || '_partitioned');
+                EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', v_table || '_partitioned', v_table || '_pkey');
+                EXECUTE format(
+                    'CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE INCLUDING COMMENTS)',
+                    v_table, v_table || '_partitioned'
+                );
+                EXECUTE format('INSERT INTO %I SELECT * FROM %I', v_table, v_table || '_partitioned');
+                EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (id)', v_table);
+                FOR v_index IN
+                    SELECT ic.relname AS name, pg_get_indexdef(ix.indexrelid) AS def
+                    FROM pg_index ix
+                    JOIN pg_class ic ON ic.oid = ix.indexrelid
+                    WHERE ix.indrelid = (v_table || '_partitioned')::regclass AND NOT ix.indisunique
+                LOOP
+                    EXECUTE format('DROP INDEX %I', v_index.name);
+                    EXECUTE format(
+                        'CREATE INDEX %I ON %I USING %s', v_index.name, v_table, split_part(v_index.def, ' USING ', 2)
+                    );
+                END LOOP;
+                EXECUTE format('DROP TABLE %I', v_table || '_partitioned');
+            END;
+            $$;
+        """)
+
+    op.execute("DROP FUNCTION IF EXISTS log_partition_upper_bound(regclass);")
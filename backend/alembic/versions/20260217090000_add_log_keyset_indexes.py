@@ -0,0 +1,68 @@
+"""add_log_keyset_indexes
+
+Revision ID: 20260217090000
+Revises: 20260215090000
+Create Date: 2026-02-17 09:00:00.000000
+
+The log viewer pages with a keyset cursor on (created_at, id) and looks up
+whole traces by trace_id ordered by created_at. Replaces the (created_at)
+and (trace_id) indexes of the log tables with composite ones serving both
+the filter and the sort; the old ones become redundant prefixes.
+
+The tables are partitioned and CREATE INDEX CONCURRENTLY is not supported
+on a partitioned parent, so each index is created invalid ON ONLY the
+parent, built CONCURRENTLY on every partition and attached; the parent
+index becomes valid once all partitions are attached. Partitions created
+later get the index automatically.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20260217090000'
+down_revision = '20260215090000'
+branch_labels = None
+depends_on = None
+
+
+KEYSET_TABLES = ('app_logs', 'error_logs', 'performance_logs', 'system_logs', 'audit_logs')
+TRACE_TABLES = ('app_logs', 'error_logs', 'performance_logs', 'audit_logs')
+
+
+def create_partitioned_index(name: str, table: str, definition: str) -> None:
+    """Create an index on a partitioned table without blocking writes (runs in an autocommit block)."""
+    op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} {definition};")
+    partitions = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+        ),
+        {"table": table},
+    ).scalars().all()
+    suffix = name[len(f"idx_{table}"):]
+    for partition in partitions:
+        partition_index = f"idx_{partition}{suffix}"[:63]
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} {definition};")
+        op.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index};")
+
+
+def upgrade() -> None:
+    """日志表添加 (created_at, id) 游标分页索引和 (trace_id, created_at) 追踪索引"""
+    with op.get_context().autocommit_block():
+        for table in KEYSET_TABLES:
+            create_partitioned_index(f"idx_{table}_created_id", table, "(created_at, id)")
+            op.execute(f"DROP INDEX IF EXISTS idx_{table}_created;")
+        for table in TRACE_TABLES:
+            create_partitioned_index(f"idx_{table}_trace_created", table, "(trace_id, created_at)")
+            op.execute(f"DROP INDEX IF EXISTS idx_{table}_trace_id;")
+
+
+def downgrade() -> None:
+    """恢复日志表原有的 created_at 和 trace_id 索引"""
+    with op.get_context().autocommit_block():
+        for table in TRACE_TABLES:
+            create_partitioned_index(f"idx_{table}_trace_id", table, "(trace_id)")
+            op.execute(f"DROP INDEX IF EXISTS idx_{table}_trace_created;")
+        for table in KEYSET_TABLES:
+            create_partitioned_index(f"idx_{table}_created", table, "(created_at)")
+            op.execute(f"DROP INDEX IF EXISTS idx_{table}_created_id;")
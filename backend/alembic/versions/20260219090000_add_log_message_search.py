@@ -0,0 +1,70 @@
+"""add_log_message_search
+
+Revision ID: 20260219090000
+Revises: 20260217090000
+Create Date: 2026-02-19 09:00:00.000000
+
+Adds GIN expression indexes over to_tsvector(...) to app_logs (message) and
+error_logs (message plus extra_data error_type, error_message and
+request_path), so message search in the log viewer uses the index instead of
+scanning with LIKE. Queries must use exactly the same expression (see
+AppLog.search_document / ErrorLog.search_document).
+
+No stored tsvector column is added: a generated column would rewrite the
+tables and store a second copy of every message.
+
+The tables are partitioned, so each index is created invalid ON ONLY the
+parent, built CONCURRENTLY on every partition and attached.
+
+The 'simple' text search configuration is used: messages mix Korean,
+Chinese and English plus identifiers, which must not be stemmed.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '20260219090000'
+down_revision = '20260217090000'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_EXPRESSIONS = {
+    'app_logs': "to_tsvector('simple'::regconfig, coalesce(message, ''))",
+    'error_logs': (
+        "to_tsvector('simple'::regconfig, coalesce(message, '') || ' ' || "
+        "coalesce(extra_data->>'error_type', '') || ' ' || "
+        "coalesce(extra_data->>'error_message', '') || ' ' || "
+        "coalesce(extra_data->>'request_path', ''))"
+    ),
+}
+
+
+def create_partitioned_index(name: str, table: str, definition: str) -> None:
+    """Create an index on a partitioned table without blocking writes (runs in an autocommit block)."""
+    op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} {definition};")
+    partitions = op.get_bind().execute(
+        sa.text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass) ORDER BY c.relname"
+        ),
+        {"table": table},
+    ).scalars().all()
+    suffix = name[len(f"idx_{table}"):]
+    for partition in partitions:
+        partition_index = f"idx_{partition}{suffix}"[:63]
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} ON {partition} {definition};")
+        op.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index};")
+
+
+def upgrade() -> None:
+    """app_logs / error_logs 添加全文检索 GIN 表达式索引"""
+    with op.get_context().autocommit_block():
+        for table, expression in SEARCH_EXPRESSIONS.items():
+            create_partitioned_index(f"idx_{table}_search", table, f"USING gin (({expression}))")
+
+
+def downgrade() -> None:
+    """移除日志全文检索索引"""
+    for table in SEARCH_EXPRESSIONS:
+        op.execute(f"DROP INDEX IF EXISTS idx_{table}_search;")
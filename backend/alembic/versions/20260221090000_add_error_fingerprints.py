@@ -0,0 +1,112 @@
+"""add_error_fingerprints
+
+Revision ID: 20260221090000
+Revises: 20260219090000
+Create Date: 2026-02-21 09:00:00.000000
+
+Running totals per exception fingerprint (same type, message template and
+top stack frames), written by the exception aggregator once per window.
+
+merge_error_fingerprints(p_rows) upserts a batch of window rows: counts are
+added, first/last seen combined and the newest sample trace ids kept, so
+several processes can write the same fingerprint safely.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = '20260221090000'
+down_revision = '20260219090000'
+branch_labels = None
+depends_on = None
+
+
+def lock_down(table: str) -> None:
+    """Server-only table: row level security without policies, no anon/authenticated privileges."""
+    op.execute(f"ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;")
+    op.execute(f"""
+        DO $$
+        DECLARE
+            v_role text;
+        BEGIN
+            FOR v_role IN SELECT rolname FROM pg_roles WHERE rolname IN ('anon', 'authenticated') LOOP
+                EXECUTE format('REVOKE ALL ON {table} FROM %I', v_role);
+            END LOOP;
+        END;
+        $$;
+    """)
+
+
+def upgrade() -> None:
+    """添加 error_fingerprints 表及合并函数"""
+    op.create_table(
+        'error_fingerprints',
+        sa.Column('fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=False),
+        sa.Column('level', sa.String(length=20), nullable=False),
+        sa.Column('exception_type', sa.String(length=255), nullable=False),
+        sa.Column('message_template', sa.Text(), nullable=False, server_default=''),
+        sa.Column('frames', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")),
+        sa.Column('sample_message', sa.Text(), nullable=True),
+        sa.Column('total_count', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('first_seen', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('last_seen', sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column('sample_trace_ids', postgresql.JSONB(), nullable=False, server_default=sa.text("'[]'::jsonb")),
+        sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('fingerprint'),
+    )
+    op.create_index('idx_error_fingerprints_last_seen', 'error_fingerprints', [sa.text('last_seen DESC')])
+    lock_down('error_fingerprints')
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION merge_error_fingerprints(p_rows jsonb)
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_merged integer;
+        BEGIN
+            INSERT INTO error_fingerprints AS f (
+                fingerprint, source, level, exception_type, message_template, frames,
+                sample_message, total_count, first_seen, last_seen, sample_trace_ids
+            )
+            SELECT
+                x.fingerprint, x.source, x.level, x.exception_type, COALESCE(x.message_template, ''),
+                COALESCE(x.frames, '[]'::jsonb), x.sample_message, x.count, x.first_seen, x.last_seen,
+                COALESCE(x.sample_trace_ids, '[]'::jsonb)
+            FROM jsonb_to_recordset(p_rows) AS x(
+                fingerprint text, source text, level text, exception_type text, message_template text,
+                frames jsonb, sample_message text, count integer, first_seen timestamptz,
+                last_seen timestamptz, sample_trace_ids jsonb
+            )
+            ON CONFLICT (fingerprint) DO UPDATE SET
+                level = EXCLUDED.level,
+                sample_message = EXCLUDED.sample_message,
+                total_count = f.total_count + EXCLUDED.total_count,
+                first_seen = LEAST(f.first_seen, EXCLUDED.first_seen),
+                last_seen = GREATEST(f.last_seen, EXCLUDED.last_seen),
+                -- Newest window first, 10 trace ids at most
+                sample_trace_ids = (
+                    SELECT COALESCE(jsonb_agg(t.value ORDER BY t.ord), '[]'::jsonb)
+                    FROM (
+                        SELECT value, ord
+                        FROM jsonb_array_elements(EXCLUDED.sample_trace_ids || f.sample_trace_ids)
+                            WITH ORDINALITY AS e(value, ord)
+                        ORDER BY ord
+                        LIMIT 10
+                    ) t
+                ),
+                updated_at = now();
+            GET DIAGNOSTICS v_merged = ROW_COUNT;
+            RETURN v_merged;
+        END;
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    """移除 error_fingerprints 表及合并函数"""
+    op.execute("DROP FUNCTION IF EXISTS merge_error_fingerprints(jsonb);")
+    op.drop_index('idx_error_fingerprints_last_seen', table_name='error_fingerprints')
+    op.drop_table('error_fingerprints')
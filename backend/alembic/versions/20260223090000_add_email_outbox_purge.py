@@ -0,0 +1,65 @@
+"""add_email_outbox_purge
+
+Revision ID: 20260223090000
+Revises: 20260221090000
+Create Date: 2026-02-23 09:00:00.000000
+
+Retention for the email outbox.
+
+Delivered and dead-lettered rows no longer keep their render context or
+plain text (password reset links carry a token), and
+purge_email_outbox(p_sent_before, p_dead_before, p_limit) deletes up to
+p_limit finished rows older than the cutoffs, so EmailOutbox can purge in
+bounded batches.
+"""
+from alembic import op
+
+
+revision = '20260223090000'
+down_revision = '20260221090000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """清除已完成邮件的内容并添加 purge_email_outbox 函数"""
+    op.execute("""
+        UPDATE email_outbox
+        SET context = '{}'::jsonb, plain_text = NULL
+        WHERE status IN ('sent', 'dead')
+          AND (context <> '{}'::jsonb OR plain_text IS NOT NULL);
+    """)
+
+    op.create_index('idx_email_outbox_finished', 'email_outbox', ['status', 'created_at'])
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION purge_email_outbox(
+            p_sent_before timestamptz,
+            p_dead_before timestamptz,
+            p_limit integer
+        )
+        RETURNS integer
+        LANGUAGE plpgsql
+        AS $$
+        DECLARE
+            v_deleted integer;
+        BEGIN
+            DELETE FROM email_outbox
+            WHERE id IN (
+                SELECT id
+                FROM email_outbox
+                WHERE (status = 'sent' AND created_at < p_sent_before)
+                   OR (status = 'dead' AND created_at < p_dead_before)
+                LIMIT p_limit
+            );
+            GET DIAGNOSTICS v_deleted = ROW_COUNT;
+            RETURN v_deleted;
+        END;
+        $$;
+    """)
+
+
+def downgrade() -> None:
+    """移除 purge_email_outbox 函数"""
+    op.execute("DROP FUNCTION IF EXISTS purge_email_outbox(timestamptz, timestamptz, integer);")
+    op.drop_index('idx_email_outbox_finished', table_name='email_outbox')
@@ -0,0 +1,129 @@
+"""
+Benchmark Excel export engines.
+
+Compares the write-only engine used by ExportService.export_to_excel with the
+regular in-memory workbook. Each engine runs in a fresh process so that peak
+RSS is measured independently.
+
+Usage:
+    cd backend
+    python -m scripts.benchmark_excel_export
+    python -m scripts.benchmark_excel_export --rows 50000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def build_rows(count: int) -> list[dict]:
+    """Build member-export shaped rows."""
+    base = datetime(2026, 1, 1)
+    return [
+        {
+            "ID": f"00000000-0000-0000-0000-{i:012d}",
+            "사업자번호": f"{1000000000 + i}",
+            "기업명": f"강원 테스트 기업 {i}",
+            "이메일": f"company{i}@example.com",
+            "상태": "active",
+            "승인상태": "approved" if i % 3 else "pending",
+            "업종": "정보통신업",
+            "매출액": 1_000_000 + i * 37,
+            "직원수": i % 500,
+            "설립일": "2020-01-01",
+            "지역": "춘천시",
+            "주소": f"강원특별자치도 춘천시 테스트로 {i}번길",
+            "웹사이트": f"https://company{i}.example.com",
+            "로고 URL": None,
+            "가입일": base + timedelta(minutes=i),
+            "수정일": base + timedelta(minutes=i * 2),
+        }
+        for i in range(count)
+    ]
+
+
+def peak_rss_mb() -> float | None:
+    """Return peak resident set size of the current process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_engine(write_only: bool, row_count: int, queue) -> None:
+    """Export rows with one engine and report timings to the parent."""
+    from src.common.modules.export import ExportService
+
+    rows = build_rows(row_count)
+    baseline_rss = peak_rss_mb()
+
+    started = time.perf_counter()
+    content = ExportService.export_to_excel(
+        data=rows,
+        sheet_name="Members",
+        title="Members Export - benchmark",
+        write_only=write_only,
+    )
+    elapsed = time.perf_counter() - started
+
+    queue.put({
+        "elapsed": elapsed,
+        "size": len(content),
+        "baseline_rss": baseline_rss,
+        "peak_rss": peak_rss_mb(),
+    })
+
+
+def measure(write_only: bool, row_count: int) -> dict:
+    """Run one engine in a fresh process."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_engine, args=(write_only, row_count, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def format_mb(value: float | None) -> str:
+    return f"{value:8.1f} MB" if value is not None else "     n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Excel export engines")
+    parser.add_argument("--rows", type=int, default=50000, help="Number of rows to export")
+    args = parser.parse_args()
+
+    print(f"Exporting {args.rows} rows x 16 columns\n")
+    print(f"{'engine':<12} {'time':>9} {'file':>11} {'peak RSS':>11} {'export RSS':>11}")
+
+    results = {}
+    for name, write_only in (("workbook", False), ("write_only", True)):
+        result = measure(write_only, args.rows)
+        results[name] = result
+        delta = None
+        if result["peak_rss"] is not None and result["baseline_rss"] is not None:
+            delta = result["peak_rss"] - result["baseline_rss"]
+        print(
+            f"{name:<12} {result['elapsed']:8.2f}s {result['size'] / 1024 / 1024:8.1f} MB "
+            f"{format_mb(result['peak_rss'])} {format_mb(delta)}"
+        )
+
+    speedup = results["workbook"]["elapsed"] / results["write_only"]["elapsed"]
+    print(f"\nwrite_only speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Run an export job from the command line (e.g. from a cron / scheduled job).
+
+The export is rendered, uploaded to the export bucket and printed as a JSON
+job record that includes a signed download URL.
+
+Usage:
+    cd backend
+    python -m scripts.run_export_job --list
+    python -m scripts.run_export_job members --format excel
+    python -m scripts.run_export_job members --params '{"approval_status": "approved", "language": "zh"}'
+    python -m scripts.run_export_job applications --format csv --params '{"project_id": "<uuid>"}'
+    python -m scripts.run_export_job statistics --params '{"year": 2025}'
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def run_export_job(kind: str, export_format: str, params: dict) -> int:
+    """Run a single export job and print its record."""
+    from src.common.modules.export import ExportJobStatus, export_job_manager
+
+    job = await export_job_manager.run(kind, params, export_format, requested_by="cli")
+    print(json.dumps(job.to_dict(), ensure_ascii=False, indent=2))
+    return 0 if job.status == ExportJobStatus.COMPLETED else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a background export job")
+    parser.add_argument("kind", nargs="?", help="Export kind (see --list)")
+    parser.add_argument("--format", default="excel", choices=["excel", "csv"], help="Export format")
+    parser.add_argument("--params", default="{}", help="Export filters as a JSON object")
+    parser.add_argument("--list", action="store_true", help="List available export kinds")
+    args = parser.parse_args()
+
+    # Importing the app registers every module's export producer
+    import src.main  # noqa: F401
+    from src.common.modules.export import export_job_manager
+
+    if args.list or not args.kind:
+        print("\n".join(export_job_manager.kinds))
+        return
+
+    try:
+        params = json.loads(args.params)
+    except json.JSONDecodeError as e:
+        parser.error(f"--params must be a JSON object: {e}")
+    if not isinstance(params, dict):
+        parser.error("--params must be a JSON object")
+
+    sys.exit(asyncio.run(run_export_job(args.kind, args.format, params)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Bulk-verify companies against the Nice D&B API (e.g. annual re-verification).
+
+Business numbers come from a CSV / text file, the command line, or the
+member table. Results are stored in nice_dnb_company_info; numbers with a
+fresh stored result are skipped unless --refresh is given. A per-number
+summary is written as CSV to stdout or --output.
+
+Usage:
+    cd backend
+    python -m scripts.verify_companies --members
+    python -m scripts.verify_companies --members --approval-status approved --refresh
+    python -m scripts.verify_companies --file numbers.csv --output results.csv
+    python -m scripts.verify_companies 123-45-67890 234-56-78901
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def verify_companies(args: argparse.Namespace) -> int:
+    """Run a single bulk verification job and write its results."""
+    from src.common.modules.integrations.nice_dnb import (
+        bulk_verifier,
+        nice_dnb_client,
+        parse_business_numbers,
+    )
+
+    if not nice_dnb_client.is_configured():
+        print("Nice D&B API is not configured (NICE_DNB_API_KEY / NICE_DNB_API_SECRET_KEY)", file=sys.stderr)
+        return 1
+
+    business_numbers = list(args.business_numbers)
+    if args.file:
+        with open(args.file, encoding="utf-8-sig") as f:
+            business_numbers += parse_business_numbers(f.read())
+    if args.members:
+        from src.modules.member.service import MemberService
+        business_numbers += await MemberService().get_member_business_numbers(args.approval_status)
+
+    if args.concurrency:
+        bulk_verifier.concurrency = args.concurrency
+    if args.rate is not None:
+        bulk_verifier.rate_limiter.rate_per_second = args.rate
+
+    try:
+        job = await bulk_verifier.run(business_numbers, requested_by="cli", refresh=args.refresh)
+    finally:
+        await nice_dnb_client.close()
+
+    output = open(args.output, "w", newline="", encoding="utf-8-sig") if args.output else sys.stdout
+    try:
+        writer = csv.DictWriter(
+            output,
+            fieldnames=["business_number", "status", "company_name", "representative"],
+        )
+        writer.writeheader()
+        writer.writerows(job.results.values())
+        for value in job.invalid:
+            writer.writerow({"business_number": value, "status": "invalid"})
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(json.dumps(job.to_dict(), ensure_ascii=False, indent=2), file=sys.stderr)
+    return 0 if job.status == "completed" else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-verify companies against the Nice D&B API")
+    parser.add_argument("business_numbers", nargs="*", help="Business registration numbers")
+    parser.add_argument("--file", help="CSV or text file containing business numbers")
+    parser.add_argument("--members", action="store_true", help="Verify all member business numbers")
+    parser.add_argument("--approval-status", help="With --members, only include this approval status")
+    parser.add_argument("--refresh", action="store_true", help="Query the API even for fresh stored results")
+    parser.add_argument("--concurrency", type=int, help="Parallel API requests")
+    parser.add_argument("--rate", type=float, help="Max API requests per second (0 = unlimited)")
+    parser.add_argument("--output", help="Write the per-number results CSV here instead of stdout")
+    args = parser.parse_args()
+
+    if not (args.business_numbers or args.file or args.members):
+        parser.error("Provide business numbers, --file or --members")
+
+    sys.exit(asyncio.run(verify_companies(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Background module.
+
+Shared building blocks for in-process background work: a registry of job
+progress records with their tasks, and a rate limiter that spaces calls to
+rate-limited services (SMTP, external APIs).
+"""
+from .registry import JobRecord, JobRegistry
+from .throttle import RateLimiter
+
+__all__ = [
+    "JobRecord",
+    "JobRegistry",
+    "RateLimiter",
+]
@@ -0,0 +1,116 @@
+"""
+Job registry.
+
+Keeps the progress records of in-process background jobs (exports, bulk
+verifications, broadcasts) and the tasks running them:
+
+    jobs: JobRegistry[ExportJob] = JobRegistry("Export job", max_jobs=200)
+    jobs.add(job.id, job)
+    jobs.spawn(run(job))               # tracked until it finishes
+    job = jobs.get(job_id)             # NotFoundError if unknown or evicted
+    await jobs.close(timeout=10.0)     # on shutdown
+
+Records live in memory only. Once more than `max_jobs` are tracked, the
+oldest finished records are evicted; running jobs are never dropped.
+"""
+import asyncio
+from collections import OrderedDict
+from typing import Coroutine, Generic, Iterator, List, Optional, Protocol, TypeVar
+
+from ..exception import NotFoundError
+
+
+class JobRecord(Protocol):
+    """Anything with an `is_finished` flag can be tracked."""
+
+    @property
+    def is_finished(self) -> bool: ...
+
+
+JobT = TypeVar("JobT", bound=JobRecord)
+
+
+class JobRegistry(Generic[JobT]):
+    """Bounded, insertion-ordered job records plus their background tasks."""
+
+    def __init__(self, resource_type: str, max_jobs: int = 100):
+        """
+        Initialize job registry.
+
+        Args:
+            resource_type: Name used in NotFoundError (e.g. "Export job")
+            max_jobs: Number of records kept in memory
+        """
+        self.resource_type = resource_type
+        self.max_jobs = max_jobs
+
+        self._jobs: "OrderedDict[str, JobT]" = OrderedDict()
+        self._tasks: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __iter__(self) -> Iterator[JobT]:
+        """Iterate over records, oldest first."""
+        return iter(list(self._jobs.values()))
+
+    @property
+    def running(self) -> int:
+        """Number of spawned tasks that have not finished yet."""
+        return len(self._tasks)
+
+    def add(self, job_id: str, job: JobT) -> JobT:
+        """Track a record, evicting old finished records if over capacity."""
+        self._jobs[job_id] = job
+        self._evict_finished()
+        return job
+
+    def find(self, job_id: str) -> Optional[JobT]:
+        return self._jobs.get(job_id)
+
+    def get(self, job_id: str) -> JobT:
+        """
+        Get a record by ID.
+
+        Raises:
+            NotFoundError: If the job is unknown (or has been evicted)
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise NotFoundError(resource_type=self.resource_type, resource_id=job_id)
+        return job
+
+    def newest_first(self) -> List[JobT]:
+        return list(reversed(self._jobs.values()))
+
+    def spawn(self, coro: Coroutine) -> asyncio.Task:
+        """Run `coro` as a background task that close() waits for."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def close(self, timeout: float = 10.0) -> int:
+        """
+        Wait up to `timeout` seconds for spawned tasks, then cancel the rest.
+
+        Returns:
+            Number of tasks that had to be cancelled
+        """
+        if not self._tasks:
+            return 0
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            # Let cancelled jobs record their failure before the loop stops
+            await asyncio.wait(pending)
+        return len(pending)
+
+    def _evict_finished(self) -> None:
+        """Drop the oldest finished records once more than max_jobs are tracked."""
+        excess = len(self._jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        for job_id in [jid for jid, job in self._jobs.items() if job.is_finished][:excess]:
+            del self._jobs[job_id]
@@ -0,0 +1,37 @@
+"""
+Rate limiter.
+
+Spaces calls to a rate-limited service so that all callers sharing one
+limiter together stay under `rate_per_second`:
+
+    limiter = RateLimiter(rate_per_second=5.0)
+    await limiter.acquire()            # before each request
+"""
+import asyncio
+import time
+
+
+class RateLimiter:
+    """Reserves evenly spaced call slots; callers sleep until their slot."""
+
+    def __init__(self, rate_per_second: float):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate_per_second: Maximum calls per second (0 = unlimited)
+        """
+        self.rate_per_second = rate_per_second
+        self._next_slot_at = 0.0
+
+    async def acquire(self) -> None:
+        """Reserve the next slot and wait until it is due."""
+        if self.rate_per_second <= 0:
+            return
+        # No await between reading and advancing the slot, so this is atomic
+        # on the event loop without a lock
+        now = time.monotonic()
+        wait = self._next_slot_at - now
+        self._next_slot_at = max(now, self._next_slot_at) + 1 / self.rate_per_second
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -61,6 +61,14 @@ class Settings(BaseSettings):
     NICE_DNB_FINANCIAL_STATEMENT_ENDPOINT: str | None = None  # 财务报表端点
     NICE_DNB_GLOBAL_RATE_ENDPOINT: str | None = None  # 全球等级端点
     NICE_DNB_CRITERIA_SEARCH_ENDPOINT: str | None = None  # 标准查询端点
+    NICE_DNB_MAX_CONNECTIONS: int = 10  # 共享 HTTP 客户端的最大连接数
+    NICE_DNB_TOKEN_REFRESH_MARGIN: int = 300  # 令牌过期前提前刷新的秒数
+    NICE_DNB_CACHE_SIZE: int = 1000  # 内存中缓存的企业查询结果数
+    NICE_DNB_CACHE_FRESH_SECONDS: int = 7 * 86400  # 缓存新鲜期（秒），期内直接返回
+    NICE_DNB_CACHE_STALE_SECONDS: int = 30 * 86400  # 过期后仍可返回并后台刷新的时长（秒）
+    NICE_DNB_BULK_CONCURRENCY: int = 4  # 批量核验时并发请求数
+    NICE_DNB_BULK_RATE_PER_SECOND: float = 5.0  # 批量核验每秒最大请求数（0 = 不限）
+    NICE_DNB_BULK_UPSERT_BATCH_SIZE: int = 100  # 批量核验每次写入的结果数
 
     # Email Configuration
     EMAIL_SMTP_HOST: str = "smtp.gmail.com"
@@ -70,7 +78,19 @@ class Settings(BaseSettings):
     EMAIL_SMTP_USE_TLS: bool = True
     EMAIL_FROM: str = "noreply@gangwon-portal.kr"
     EMAIL_FROM_NAME: str = "Gangwon Business Portal"
+    EMAIL_RENDER_CACHE_SIZE: int = 256  # Rendered email bodies kept for identical contexts
+    EMAIL_SMTP_POOL_SIZE: int = 3  # Max concurrent pooled SMTP sessions
+    EMAIL_SMTP_IDLE_TIMEOUT: int = 60  # Close pooled SMTP sessions idle longer than this (seconds)
+    EMAIL_SMTP_HEALTH_CHECK_AFTER: int = 15  # NOOP-check sessions idle longer than this before reuse (seconds)
     FRONTEND_URL: str = "http://localhost:5173"  # Frontend URL for email links
+    EMAIL_OUTBOX_CONCURRENCY: int = 4  # Parallel SMTP sessions used by the outbox dispatcher
+    EMAIL_OUTBOX_RATE_PER_SECOND: float = 10.0  # Max outbox sends per second (0 = unlimited)
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50  # Outbox rows claimed per dispatcher round
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 6  # Delivery attempts before an email is dead-lettered
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS: int = 30  # First retry delay (doubles per attempt, max 1h)
+    EMAIL_OUTBOX_POLL_INTERVAL: int = 5  # Seconds between outbox polls when idle
+    EMAIL_OUTBOX_SENT_RETENTION_DAYS: int = 7  # Days delivered outbox rows are kept (0 = forever)
+    EMAIL_OUTBOX_DEAD_RETENTION_DAYS: int = 30  # Days dead-lettered outbox rows are kept (0 = forever)
 
     # File Upload Configuration
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB (default for backward compatibility)
@@ -92,6 +112,21 @@ class Settings(BaseSettings):
     ALLOWED_IMAGE_EXTENSIONS: str = "jpg,jpeg,png,gif,webp"
     ALLOWED_DOCUMENT_EXTENSIONS: str = "pdf,doc,docx,xls,xlsx,ppt,pptx,txt,hwp"
 
+    # Messages Configuration
+    MESSAGE_UNREAD_RESYNC_SECONDS: int = 300  # Reload cached unread counts from DB after this age
+    MESSAGE_SSE_HEARTBEAT_SECONDS: int = 20  # Keep-alive interval for unread-count event streams
+    BROADCAST_CHUNK_SIZE: int = 500  # Broadcast messages per insert request
+    BROADCAST_CONCURRENCY: int = 4  # Broadcast insert requests in flight
+
+    # View Counters (notices, projects)
+    VIEW_COUNT_FLUSH_INTERVAL: int = 5  # Seconds between write-behind view count flushes
+    VIEW_COUNT_MAX_PENDING: int = 1000  # Pending records that trigger an early flush
+
+    # Export Jobs Configuration
+    EXPORT_JOB_WORKERS: int = 2  # Concurrent background export workers
+    EXPORT_JOB_BUCKET: str = "private-files"  # Storage bucket for export artifacts
+    EXPORT_JOB_URL_EXPIRES_IN: int = 86400  # Signed download URL lifetime (seconds)
+
     # Logging Configuration
     LOG_LEVEL: str = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL (default: INFO)
     LOG_FILE: str | None = None  # Path to system log file (None = auto-detect backend/logs/system.log)
@@ -123,6 +158,45 @@ class Settings(BaseSettings):
     LOG_DB_APP_MIN_LEVEL: str = "INFO"  # Minimum log level for app logs (app_logs table) - INFO/WARNING/ERROR/CRITICAL
     LOG_DB_BATCH_SIZE: int = 50  # Batch size for database inserts (reduce database overhead)
     LOG_DB_BATCH_INTERVAL: float = 5.0  # Batch interval in seconds (flush batch after this time)
+    LOG_STATS_CACHE_SECONDS: float = 15.0  # Cache monitoring dashboard statistics for this many seconds
+    LOG_ROLLUP_ENABLED: bool = True  # Aggregate per-minute log rollups (log_rollups table) for stats and trends
+    LOG_ROLLUP_FLUSH_INTERVAL: float = 30.0  # Seconds between writes of closed rollup minutes
+    LOG_ROLLUP_MAX_SERIES: int = 500  # Distinct (type, layer, level, route) series per minute before routes are grouped
+    LOG_ROLLUP_RETENTION_DAYS: int = 400  # Days of log_rollups rows kept (0 = forever)
+
+    # Log Retention (monthly partitions of the log tables)
+    LOG_RETENTION_ENABLED: bool = True  # Periodically create upcoming partitions and drop expired ones
+    LOG_RETENTION_DAYS: int = 90  # Days app/error/performance/system logs are kept (0 = forever)
+    LOG_AUDIT_RETENTION_DAYS: int = 365  # Days audit logs are kept (0 = forever)
+    LOG_RETENTION_INTERVAL: float = 21600.0  # Seconds between partition maintenance runs
+    LOG_PARTITION_MONTHS_AHEAD: int = 3  # Monthly partitions created ahead of the current month
+    LOG_DELETE_BATCH_SIZE: int = 5000  # Rows per batch when deleting logs by message
+
+    # Log Viewer
+    LOG_COUNT_CAP: int = 10000  # Log lists count matching rows up to this number (total_capped beyond)
+    LOG_TRACE_MAX_ENTRIES: int = 5000  # Max entries returned by the whole-trace endpoint
+
+    # Exception Aggregation (one error log per fingerprint per window)
+    EXCEPTION_AGGREGATION_ENABLED: bool = True  # False = one error log per exception occurrence
+    EXCEPTION_AGGREGATION_WINDOW: float = 30.0  # Seconds identical exceptions are grouped before their error log is written
+    EXCEPTION_AGGREGATION_MAX_FINGERPRINTS: int = 1000  # Distinct fingerprints per window before new ones are written unaggregated
+    EXCEPTION_SAMPLE_TRACE_IDS: int = 5  # Trace ids kept per fingerprint and window
+
+    # Exception Alerts (sliding window over per-minute counters)
+    EXCEPTION_ALERT_WINDOW_MINUTES: int = 60  # Sliding window the alert thresholds apply to (max 1440)
+    EXCEPTION_ALERT_CRITICAL_THRESHOLD: int = 10  # Critical exceptions per window that trigger an alert
+    EXCEPTION_ALERT_ERROR_THRESHOLD: int = 100  # Error exceptions per window that trigger an alert
+
+    # Frontend Log Ingestion (POST /api/v1/logging/frontend/logs)
+    LOG_INGEST_MAX_BATCH: int = 500  # Entries accepted per request (the rest are dropped)
+    LOG_INGEST_MAX_BODY_BYTES: int = 2097152  # Max request body after gzip decompression (2MB)
+    LOG_INGEST_RATE_PER_SECOND: float = 20.0  # Entries per second per client (0 = unlimited)
+    LOG_INGEST_BURST: int = 500  # Entries a client may send at once before the rate applies
+    LOG_INGEST_TRUSTED_PROXIES: int = 1  # Proxies appending X-Forwarded-For in front of the app (Render: 1, 0 = key on the connection peer)
+
+    # Metrics (GET /metrics, Prometheus text format)
+    METRICS_ENABLED: bool = True  # Record latency histograms and expose /metrics
+    METRICS_TOKEN: str = ""  # Bearer token required to scrape /metrics (empty = /metrics only served in DEBUG)
 
     class Config:
         # Try .env.local first (for local development), then .env
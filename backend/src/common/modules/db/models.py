@@ -9,6 +9,7 @@ from sqlalchemy import (
     Column,
     String,
     Integer,
+    BigInteger,
     Text,
     TIMESTAMP,
     DECIMAL,
@@ -18,6 +19,7 @@ from sqlalchemy import (
     CheckConstraint,
     Index,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -191,6 +193,7 @@ class Project(Base):
     image_url = Column(String(500))
     status = Column(String(50), default="active")  # active, inactive, archived
     view_count = Column(Integer, nullable=False, server_default='0')  # 浏览次数
+    applications_count = Column(Integer, nullable=False, server_default='0')  # 有效申请数（触发器维护）
     attachments = Column(JSONB, nullable=True)  # Store file attachments as JSON array
     
     # Soft delete field
@@ -205,6 +208,12 @@ class Project(Base):
     # Indexes
     __table_args__ = (
         Index("idx_projects_deleted_at", "deleted_at"),
+        Index(
+            "idx_projects_active_created",
+            "status",
+            text("created_at DESC"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
     )
 
     def __repr__(self):
@@ -465,13 +474,14 @@ class AuditLog(Base):
     # Extension field
     extra_data = Column(JSONB)  # action, result, ip_address, user_agent, resource_type, resource_id
     
-    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at = Column(TIMESTAMP(timezone=True), primary_key=True, server_default=func.now(), nullable=False, index=True)  # Partition key, part of the primary key
 
     # Indexes
     __table_args__ = (
-        Index("idx_audit_logs_trace_id", "trace_id"),
+        Index("idx_audit_logs_trace_created", "trace_id", "created_at"),
         Index("idx_audit_logs_user_id", "user_id", "created_at"),
-        Index("idx_audit_logs_created", "created_at"),
+        Index("idx_audit_logs_created_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},  # Monthly partitions, see maintain_log_partitions
     )
 
     def __repr__(self):
@@ -510,14 +520,19 @@ class AppLog(Base):
     # Extension field
     extra_data = Column(JSONB)  # ip_address, user_agent, request_method, request_path, response_status, etc.
     
-    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Full-text search document over message (GIN expression index; queries must use the same expression)
+    search_document = "to_tsvector('simple'::regconfig, coalesce(message, ''))"
+    
+    created_at = Column(TIMESTAMP(timezone=True), primary_key=True, server_default=func.now(), nullable=False, index=True)  # Partition key, part of the primary key
 
     # Indexes (no relationship - user_id has no FK)
     __table_args__ = (
         Index("idx_app_logs_source_level", "source", "level", "created_at"),
-        Index("idx_app_logs_trace_id", "trace_id"),
+        Index("idx_app_logs_trace_created", "trace_id", "created_at"),
         Index("idx_app_logs_user_id", "user_id", "created_at"),
-        Index("idx_app_logs_created", "created_at"),
+        Index("idx_app_logs_created_id", "created_at", "id"),
+        Index("idx_app_logs_search", text(search_document), postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},  # Monthly partitions, see maintain_log_partitions
     )
 
     def __repr__(self):
@@ -555,14 +570,24 @@ class ErrorLog(Base):
     # Extension field
     extra_data = Column(JSONB)  # error_type, error_message, stack_trace, error_code, status_code, request_method, request_path, ip_address
     
-    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True)
+    # Full-text search document over message and error details (GIN expression index; queries must use the same expression)
+    search_document = (
+        "to_tsvector('simple'::regconfig, coalesce(message, '') || ' ' || "
+        "coalesce(extra_data->>'error_type', '') || ' ' || "
+        "coalesce(extra_data->>'error_message', '') || ' ' || "
+        "coalesce(extra_data->>'request_path', ''))"
+    )
+    
+    created_at = Column(TIMESTAMP(timezone=True), primary_key=True, server_default=func.now(), nullable=False, index=True)  # Partition key, part of the primary key
 
     # Indexes (no relationship - user_id has no FK)
     __table_args__ = (
         Index("idx_error_logs_source_level", "source", "level", "created_at"),
-        Index("idx_error_logs_trace_id", "trace_id"),
+        Index("idx_error_logs_trace_created", "trace_id", "created_at"),
         Index("idx_error_logs_user_id", "user_id", "created_at"),
-        Index("idx_error_logs_created", "created_at"),
+        Index("idx_error_logs_created_id", "created_at", "id"),
+        Index("idx_error_logs_search", text(search_document), postgresql_using="gin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},  # Monthly partitions, see maintain_log_partitions
     )
 
     def __repr__(self):
@@ -594,12 +619,13 @@ class SystemLog(Base):
     # Extension field
     extra_data = Column(JSONB)  # server, host, port, workers
     
-    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at = Column(TIMESTAMP(timezone=True), primary_key=True, server_default=func.now(), nullable=False, index=True)  # Partition key, part of the primary key
 
     # Indexes
     __table_args__ = (
         Index("idx_system_logs_level", "level", "created_at"),
-        Index("idx_system_logs_created", "created_at"),
+        Index("idx_system_logs_created_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},  # Monthly partitions, see maintain_log_partitions
     )
 
     def __repr__(self):
@@ -638,20 +664,95 @@ class PerformanceLog(Base):
     # Extension field
     extra_data = Column(JSONB)  # metric_name, metric_value, metric_unit, threshold_ms, is_slow, component_name, web_vitals
     
-    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at = Column(TIMESTAMP(timezone=True), primary_key=True, server_default=func.now(), nullable=False, index=True)  # Partition key, part of the primary key
 
     # Indexes (no relationship - user_id has no FK)
     __table_args__ = (
         Index("idx_performance_logs_source", "source", "created_at"),
-        Index("idx_performance_logs_trace_id", "trace_id"),
+        Index("idx_performance_logs_trace_created", "trace_id", "created_at"),
         Index("idx_performance_logs_user_id", "user_id", "created_at"),
-        Index("idx_performance_logs_created", "created_at"),
+        Index("idx_performance_logs_created_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (created_at)"},  # Monthly partitions, see maintain_log_partitions
     )
 
     def __repr__(self):
         return f"<PerformanceLog(id={self.id}, source={self.source}, created_at={self.created_at})>"
 
 
+class LogRollup(Base):
+    """Per-minute log rollups written by the log rollup aggregator.
+
+    One row per minute and (log_type, layer, level, route) series; histogram
+    holds HDR-style latency bucket counts ({bucket_index: count}).
+    """
+
+    __tablename__ = "log_rollups"
+
+    bucket_start = Column(TIMESTAMP(timezone=True), primary_key=True)  # Start of the minute (UTC)
+    log_type = Column(String(20), primary_key=True)  # app, error, performance
+    layer = Column(String(100), primary_key=True, server_default="")
+    level = Column(String(20), primary_key=True)
+    route = Column(String(255), primary_key=True, server_default="")  # Normalized request path
+
+    count = Column(Integer, nullable=False, server_default="0")
+    slow_count = Column(Integer, nullable=False, server_default="0")
+    duration_count = Column(Integer, nullable=False, server_default="0")
+    duration_sum = Column(BigInteger, nullable=False, server_default="0")
+    duration_min = Column(Integer, nullable=True)
+    duration_max = Column(Integer, nullable=True)
+    histogram = Column(JSONB, nullable=False, server_default="{}")
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<LogRollup(bucket_start={self.bucket_start}, log_type={self.log_type}, count={self.count})>"
+
+
+class LogRollupFlush(Base):
+    """Flush ids already merged into log_rollups (a retried flush is skipped)."""
+
+    __tablename__ = "log_rollup_flushes"
+
+    flush_id = Column(String(64), primary_key=True)  # <process id>:<flush sequence>
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_log_rollup_flushes_created_at", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<LogRollupFlush(flush_id={self.flush_id})>"
+
+
+class ErrorFingerprint(Base):
+    """Running totals per exception fingerprint, written by the exception aggregator.
+
+    A fingerprint groups occurrences of the same bug: exception type, message
+    template (variable parts replaced) and the innermost stack frames.
+    """
+
+    __tablename__ = "error_fingerprints"
+
+    fingerprint = Column(String(64), primary_key=True)
+    source = Column(String(20), nullable=False)  # backend, frontend
+    level = Column(String(20), nullable=False)  # Level of the latest occurrence
+    exception_type = Column(String(255), nullable=False)
+    message_template = Column(Text, nullable=False, server_default="")
+    frames = Column(JSONB, nullable=False, server_default="[]")  # ["file:function", ...], innermost first
+    sample_message = Column(Text)  # Message of the latest occurrence
+    total_count = Column(BigInteger, nullable=False, server_default="0")
+    first_seen = Column(TIMESTAMP(timezone=True), nullable=False)
+    last_seen = Column(TIMESTAMP(timezone=True), nullable=False)
+    sample_trace_ids = Column(JSONB, nullable=False, server_default="[]")  # Newest first, at most 10
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_error_fingerprints_last_seen", text("last_seen DESC")),
+    )
+
+    def __repr__(self):
+        return f"<ErrorFingerprint(fingerprint={self.fingerprint}, exception_type={self.exception_type}, total_count={self.total_count})>"
+
+
 class Admin(Base):
     """Admin user table."""
 
@@ -697,6 +798,11 @@ class Message(Base):
     
     # Attachments stored as JSONB
     attachments = Column(JSONB, nullable=True)
+
+    # Thread root counters (maintained by trigger messages_maintain_counters)
+    message_count = Column(Integer, nullable=False, server_default="0")
+    admin_unread_count = Column(Integer, nullable=False, server_default="0")  # Unread member messages
+    member_unread_count = Column(Integer, nullable=False, server_default="0")  # Unread admin messages
     
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -714,6 +820,46 @@ class Message(Base):
         return f"<Message(id={self.id}, type={self.message_type}, subject={self.subject})>"
 
 
+class MessageUnreadCount(Base):
+    """Unread message tally per inbox (maintained by trigger messages_maintain_counters)."""
+
+    __tablename__ = "message_unread_counts"
+
+    owner_key = Column(String(64), primary_key=True)  # "admin" or "member:<recipient_id>"
+    unread_count = Column(Integer, nullable=False, server_default="0")
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<MessageUnreadCount(owner_key={self.owner_key}, unread_count={self.unread_count})>"
+
+
+class EmailOutbox(Base):
+    """Durable email queue drained by the email outbox dispatcher."""
+
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(500), nullable=False)
+    template_name = Column(String(100), nullable=False)
+    context = Column(JSONB, nullable=False, server_default="{}")  # Template render context
+    plain_text = Column(Text, nullable=True)
+    status = Column(String(20), nullable=False, server_default="pending")  # pending, sending, sent, dead
+    attempts = Column(Integer, nullable=False, server_default="0")
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    locked_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    sent_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("idx_email_outbox_due", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, to_email={self.to_email}, status={self.status})>"
+
+
 class NiceDnbCompanyInfo(Base):
     """Snapshot of Nice D&B company info responses."""
 
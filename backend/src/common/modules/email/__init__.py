@@ -5,7 +5,17 @@ Exposes a reusable email service instance for application modules.
 """
 
 from .service import EmailService, email_service
+from .outbox import EmailOutbox, OutboxEmail, email_outbox
+from .smtp_pool import SMTPConnectionPool, smtp_pool
 
-__all__ = ["EmailService", "email_service"]
+__all__ = [
+    "EmailService",
+    "email_service",
+    "EmailOutbox",
+    "OutboxEmail",
+    "email_outbox",
+    "SMTPConnectionPool",
+    "smtp_pool",
+]
 
 
@@ -0,0 +1,387 @@
+"""
+Email outbox.
+
+Durable queue for outgoing emails backed by the `email_outbox` table.
+EmailService.send_* methods enqueue rows and return immediately; dispatcher
+tasks claim due rows (claim_email_outbox RPC, safe across processes),
+deliver them over pooled SMTP sessions and record the outcome:
+
+- sent:   status 'sent'
+- failed: retried with exponential backoff (retry_base_seconds * 2^n)
+- after max_attempts failures: status 'dead' (kept for inspection)
+
+Rows claimed by a process that died mid-send are reclaimed once their lease
+expires, so queued emails survive restarts and deploys. Every single send is
+spaced so all dispatchers together stay under `rate_per_second`.
+
+Sent and dead rows drop their render context and plain text (password reset
+links carry a token) and are purged after their retention period.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+from postgrest.types import ReturnMethod
+
+from ..background import RateLimiter
+from ..config import settings
+from ..logger import get_logger
+from ..supabase.client import get_supabase_service_client
+
+logger = get_logger(__name__)
+
+OUTBOX_TABLE = "email_outbox"
+INSERT_CHUNK_SIZE = 500
+MAX_RETRY_DELAY_SECONDS = 3600
+PURGE_INTERVAL_SECONDS = 3600
+PURGE_BATCH_SIZE = 1000
+
+# Applied when a row is finished, so message content does not outlive delivery
+SCRUBBED_CONTENT = {"context": {}, "plain_text": None}
+
+
+@dataclass(slots=True)
+class OutboxEmail:
+    """A queued email, rendered from `template_name` with `context` at send time."""
+
+    to_email: str
+    subject: str
+    template_name: str
+    context: Dict[str, Any] = field(default_factory=dict)
+    plain_text: Optional[str] = None
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "to_email": self.to_email,
+            "subject": self.subject,
+            "template_name": self.template_name,
+            "context": self.context,
+            "plain_text": self.plain_text,
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "OutboxEmail":
+        return cls(
+            to_email=row["to_email"],
+            subject=row["subject"],
+            template_name=row["template_name"],
+            context=row.get("context") or {},
+            plain_text=row.get("plain_text"),
+        )
+
+
+class EmailOutbox:
+    """Table-backed email queue with a bounded, rate-limited dispatcher."""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        rate_per_second: float = 10.0,
+        batch_size: int = 50,
+        max_attempts: int = 6,
+        retry_base_seconds: float = 30.0,
+        poll_interval: float = 5.0,
+        lease_seconds: int = 300,
+        sent_retention_days: int = 7,
+        dead_retention_days: int = 30,
+    ):
+        """
+        Initialize email outbox.
+
+        Args:
+            concurrency: Parallel SMTP sessions used per claimed batch
+            rate_per_second: Maximum sends per second (0 = unlimited)
+            batch_size: Rows claimed per dispatcher round
+            max_attempts: Attempts before an email is dead-lettered
+            retry_base_seconds: First retry delay; doubles with each attempt
+            poll_interval: Seconds between polls when the outbox is idle
+            lease_seconds: Age after which a 'sending' row is reclaimed
+            sent_retention_days: Days sent rows are kept (0 = forever)
+            dead_retention_days: Days dead rows are kept (0 = forever)
+        """
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.sent_retention_days = sent_retention_days
+        self.dead_retention_days = dead_retention_days
+
+        self._dispatcher_task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self.rate_limiter = RateLimiter(rate_per_second)
+        self._next_purge_at = 0.0
+
+        self._stats = {
+            "total_enqueued": 0,
+            "total_sent": 0,
+            "total_failed": 0,
+            "total_retried": 0,
+            "total_dead": 0,
+            "total_purged": 0,
+            "in_flight": 0,
+        }
+        self._latency_count = 0
+        self._latency_total_ms = 0.0
+        self._latency_max_ms = 0.0
+
+    @property
+    def client(self):
+        return get_supabase_service_client()
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    async def enqueue(self, email: OutboxEmail) -> None:
+        """Persist an email for delivery."""
+        await self.enqueue_many([email])
+
+    async def enqueue_many(self, emails: Iterable[OutboxEmail]) -> int:
+        """Persist several emails (chunked inserts). Returns the number queued."""
+        rows = [email.to_row() for email in emails]
+        if not rows:
+            return 0
+
+        for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+            await asyncio.to_thread(self._insert_rows, rows[i:i + INSERT_CHUNK_SIZE])
+        self._stats["total_enqueued"] += len(rows)
+
+        self.start()
+        self._wakeup.set()
+        return len(rows)
+
+    def start(self) -> None:
+        """Start the dispatcher (idempotent). Called on startup to drain leftovers."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._dispatcher_task is None or self._dispatcher_task.done():
+            self._stopping = False
+            self._dispatcher_task = asyncio.create_task(self._dispatch_loop())
+
+    async def count_pending(self) -> int:
+        """Number of emails waiting for delivery (across all processes)."""
+        result = await asyncio.to_thread(
+            lambda: self.client.table(OUTBOX_TABLE)
+            .select("id", count="exact")
+            .in_("status", ["pending", "sending"])
+            .limit(1)
+            .execute()
+        )
+        return result.count or 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "latency_avg_ms": (
+                round(self._latency_total_ms / self._latency_count, 1) if self._latency_count else 0.0
+            ),
+            "latency_max_ms": round(self._latency_max_ms, 1),
+            "dispatcher_running": bool(self._dispatcher_task and not self._dispatcher_task.done()),
+        }
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """
+        Stop the dispatcher, giving the current batch up to `timeout` seconds.
+
+        Unsent rows stay in the table and are delivered after restart.
+        """
+        if self._dispatcher_task is None or self._dispatcher_task.done():
+            return
+        self._stopping = True
+        self._wakeup.set()
+        done, _ = await asyncio.wait([self._dispatcher_task], timeout=timeout)
+        if not done:
+            # Interrupted rows stay 'sending' and are reclaimed after the lease
+            self._dispatcher_task.cancel()
+        self._dispatcher_task = None
+
+    # =========================================================================
+    # Dispatcher
+    # =========================================================================
+
+    async def _dispatch_loop(self) -> None:
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                rows = await asyncio.to_thread(self._claim, self.batch_size)
+            except Exception as e:
+                logger.error(
+                    f"Email outbox claim failed: {str(e)}",
+                    exc_info=True,
+                    extra={"module_name": __name__},
+                )
+                rows = []
+
+            if rows:
+                await self._process(rows)
+                continue
+
+            if time.monotonic() >= self._next_purge_at:
+                self._next_purge_at = time.monotonic() + PURGE_INTERVAL_SECONDS
+                await self.purge()
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _process(self, rows: List[Dict[str, Any]]) -> None:
+        """Deliver claimed rows, one batch per SMTP session."""
+        batch_count = min(self.concurrency, len(rows))
+        batches = [rows[i::batch_count] for i in range(batch_count)]
+        self._stats["in_flight"] += len(rows)
+        try:
+            await asyncio.gather(*(self._deliver_batch(batch) for batch in batches))
+        finally:
+            self._stats["in_flight"] -= len(rows)
+
+    async def _deliver_batch(self, rows: List[Dict[str, Any]]) -> None:
+        from .service import email_service
+
+        try:
+            results = await email_service.deliver_many(
+                [OutboxEmail.from_row(row) for row in rows],
+                before_send=self.rate_limiter.acquire,
+            )
+            errors = [None if ok else "SMTP delivery failed" for ok in results]
+        except Exception as e:
+            logger.error(
+                f"Email outbox delivery failed: {str(e)}",
+                exc_info=True,
+                extra={"module_name": __name__},
+            )
+            errors = [str(e)] * len(rows)
+
+        sent_ids = [row["id"] for row, error in zip(rows, errors) if error is None]
+        try:
+            if sent_ids:
+                await asyncio.to_thread(self._mark_sent, sent_ids)
+                self._record_sent(row for row, error in zip(rows, errors) if error is None)
+            for row, error in zip(rows, errors):
+                if error is not None:
+                    await asyncio.to_thread(self._mark_failed, row, error)
+        except Exception as e:
+            # Rows stay 'sending' and are reclaimed after the lease expires
+            logger.error(
+                f"Email outbox status update failed: {str(e)}",
+                exc_info=True,
+                extra={"module_name": __name__},
+            )
+
+    async def purge(self) -> int:
+        """Delete sent/dead rows past their retention in bounded batches. Returns rows deleted."""
+        if self.sent_retention_days <= 0 and self.dead_retention_days <= 0:
+            return 0
+
+        now = datetime.now(timezone.utc)
+        # 0 = keep forever: a cutoff before any row exists matches nothing
+        never = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        sent_before = now - timedelta(days=self.sent_retention_days) if self.sent_retention_days > 0 else never
+        dead_before = now - timedelta(days=self.dead_retention_days) if self.dead_retention_days > 0 else never
+
+        total = 0
+        try:
+            while not self._stopping:
+                deleted = await asyncio.to_thread(self._purge_batch, sent_before, dead_before)
+                total += deleted
+                if deleted < PURGE_BATCH_SIZE:
+                    break
+        except Exception as e:
+            logger.warning(
+                f"Email outbox purge failed: {str(e)}",
+                extra={"module_name": __name__},
+            )
+        self._stats["total_purged"] += total
+        return total
+
+    def _record_sent(self, rows: Iterable[Dict[str, Any]]) -> None:
+        now = datetime.now(timezone.utc)
+        for row in rows:
+            self._stats["total_sent"] += 1
+            try:
+                created_at = datetime.fromisoformat(row["created_at"].replace("Z", "+00:00"))
+            except (KeyError, AttributeError, ValueError):
+                continue
+            latency_ms = (now - created_at).total_seconds() * 1000
+            self._latency_count += 1
+            self._latency_total_ms += latency_ms
+            self._latency_max_ms = max(self._latency_max_ms, latency_ms)
+
+    def _retry_delay(self, attempts: int) -> float:
+        """Exponential backoff with +/-10% jitter, capped at one hour."""
+        delay = min(self.retry_base_seconds * (2 ** max(0, attempts - 1)), MAX_RETRY_DELAY_SECONDS)
+        return delay * random.uniform(0.9, 1.1)
+
+    # =========================================================================
+    # Persistence (sync, run in worker threads)
+    # =========================================================================
+
+    def _insert_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self.client.table(OUTBOX_TABLE).insert(rows, returning=ReturnMethod.minimal).execute()
+
+    def _claim(self, limit: int) -> List[Dict[str, Any]]:
+        result = self.client.rpc(
+            "claim_email_outbox",
+            {"p_limit": limit, "p_lease_seconds": self.lease_seconds},
+        ).execute()
+        return result.data or []
+
+    def _mark_sent(self, ids: List[str]) -> None:
+        self.client.table(OUTBOX_TABLE).update({
+            "status": "sent",
+            "sent_at": datetime.now(timezone.utc).isoformat(),
+            "last_error": None,
+            **SCRUBBED_CONTENT,
+        }).in_("id", ids).execute()
+
+    def _mark_failed(self, row: Dict[str, Any], error: str) -> None:
+        attempts = row.get("attempts") or 1
+        if attempts >= self.max_attempts:
+            update = {"status": "dead", "last_error": error, **SCRUBBED_CONTENT}
+            self._stats["total_dead"] += 1
+            logger.error(
+                f"Email dead-lettered after {attempts} attempts: {row.get('template_name')}",
+                extra={"module_name": __name__, "outbox_id": row["id"], "error": error},
+            )
+        else:
+            next_attempt_at = datetime.now(timezone.utc) + timedelta(seconds=self._retry_delay(attempts))
+            update = {
+                "status": "pending",
+                "last_error": error,
+                "next_attempt_at": next_attempt_at.isoformat(),
+            }
+            self._stats["total_retried"] += 1
+        self._stats["total_failed"] += 1
+        self.client.table(OUTBOX_TABLE).update(update).eq("id", row["id"]).execute()
+
+    def _purge_batch(self, sent_before: datetime, dead_before: datetime) -> int:
+        result = self.client.rpc(
+            "purge_email_outbox",
+            {
+                "p_sent_before": sent_before.isoformat(),
+                "p_dead_before": dead_before.isoformat(),
+                "p_limit": PURGE_BATCH_SIZE,
+            },
+        ).execute()
+        return result.data or 0
+
+
+# Global email outbox instance
+email_outbox = EmailOutbox(
+    concurrency=settings.EMAIL_OUTBOX_CONCURRENCY,
+    rate_per_second=settings.EMAIL_OUTBOX_RATE_PER_SECOND,
+    batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+    max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+    retry_base_seconds=settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+    poll_interval=settings.EMAIL_OUTBOX_POLL_INTERVAL,
+    sent_retention_days=settings.EMAIL_OUTBOX_SENT_RETENTION_DAYS,
+    dead_retention_days=settings.EMAIL_OUTBOX_DEAD_RETENTION_DAYS,
+)
@@ -3,17 +3,27 @@ Email service implementation built on top of SMTP + Jinja templates.
 """
 from __future__ import annotations
 
+import json
+import logging
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime, timezone, timedelta
 from email.message import EmailMessage
+from email.policy import SMTP
 from email.utils import formataddr
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
 
 import aiosmtplib
-from jinja2 import Environment, FileSystemLoader, TemplateNotFound, select_autoescape
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound, select_autoescape
+from markupsafe import escape
 
 from ..config.settings import settings
+from .outbox import OutboxEmail, email_outbox
+from .smtp_pool import SMTPConnectionPool, smtp_pool
+
+logger = logging.getLogger(__name__)
 
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
@@ -32,7 +42,7 @@ class EmailContext:
 class EmailService:
     """Provides high-level helpers for sending transactional emails."""
 
-    def __init__(self) -> None:
+    def __init__(self, pool: SMTPConnectionPool | None = None) -> None:
         TEMPLATE_DIR.mkdir(parents=True, exist_ok=True)
         self._env = Environment(
             loader=FileSystemLoader(str(TEMPLATE_DIR)),
@@ -40,30 +50,190 @@ class EmailService:
             enable_async=True,
             trim_blocks=True,
             lstrip_blocks=True,
+            # Templates ship with the code; skip the per-render mtime check
+            auto_reload=False,
         )
         self._settings = settings
+        self._pool = pool or smtp_pool
+
+        # Compiled templates and LRU cache of rendered bodies
+        self._templates: Dict[str, Template] = {}
+        self._render_cache: OrderedDict[Tuple[str, ...], Any] = OrderedDict()
+        self._render_cache_size = settings.EMAIL_RENDER_CACHE_SIZE
+        self._render_stats = {"hits": 0, "misses": 0}
+
+    def precompile_templates(self) -> int:
+        """Compile every template under TEMPLATE_DIR. Returns the number compiled."""
+        for path in sorted(TEMPLATE_DIR.glob("*.html")):
+            self._templates[path.name] = self._env.get_template(path.name)
+        return len(self._templates)
+
+    def get_render_stats(self) -> Dict[str, Any]:
+        return {
+            **self._render_stats,
+            "templates": len(self._templates),
+            "cached_bodies": len(self._render_cache),
+        }
 
-    async def _render_template(self, template_name: str, context: Dict[str, Any]) -> str:
-        """Render HTML template, raising a helpful error when missing."""
+    def _get_template(self, template_name: str) -> Template:
+        """Load a template, raising a helpful error when missing."""
+        template = self._templates.get(template_name)
+        if template is not None:
+            return template
         try:
             template = self._env.get_template(template_name)
         except TemplateNotFound as exc:
             raise TemplateNotFound(
                 f"Email template '{template_name}' not found in {TEMPLATE_DIR}"
             ) from exc
+        self._templates[template_name] = template
+        return template
+
+    @staticmethod
+    def _context_key(context: Dict[str, Any]) -> Optional[str]:
+        """Stable cache key for a render context (None if it cannot be serialized)."""
+        try:
+            return json.dumps(context, sort_keys=True, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+
+    def _cache_get(self, key: Tuple[str, ...]) -> Any:
+        body = self._render_cache.get(key)
+        if body is None:
+            self._render_stats["misses"] += 1
+            return None
+        self._render_cache.move_to_end(key)
+        self._render_stats["hits"] += 1
+        return body
+
+    def _cache_put(self, key: Tuple[str, ...], body: Any) -> None:
+        self._render_cache[key] = body
+        if len(self._render_cache) > self._render_cache_size:
+            self._render_cache.popitem(last=False)
+
+    async def _render_template(self, template_name: str, context: Dict[str, Any]) -> str:
+        """Render HTML template (cached per identical context), raising a helpful error when missing."""
+        context_key = self._context_key(context)
+        cache_key = ("html", template_name, context_key)
+        if context_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
+        html = await self._get_template(template_name).render_async(**context)
+        if context_key is not None:
+            self._cache_put(cache_key, html)
+        return html
+
+    async def render_batch(
+        self,
+        template_name: str,
+        context: Dict[str, Any],
+        recipients: Sequence[Dict[str, Any]],
+    ) -> List[str]:
+        """
+        Render one template for many recipients.
+
+        `context` holds the shared values and each recipient dict its
+        personalized fields. The template is rendered once with placeholder
+        tokens and the escaped personal values substituted per recipient.
+        Personalized fields must therefore be plain `{{ field }}` outputs;
+        when one is used in a condition or filter the batch falls back to a
+        (cached) full render per recipient.
+        """
+        if not recipients:
+            return []
+
+        personal_fields = sorted({field for recipient in recipients for field in recipient})
+        if not personal_fields:
+            html = await self._render_template(template_name, context)
+            return [html] * len(recipients)
+
+        token = uuid4().hex
+        placeholders = {field: f"@@{token}:{field}@@" for field in personal_fields}
+        skeleton = await self._get_template(template_name).render_async(**{**context, **placeholders})
+
+        if not all(placeholder in skeleton for placeholder in placeholders.values()):
+            return [
+                await self._render_template(template_name, {**context, **recipient})
+                for recipient in recipients
+            ]
+
+        rendered = []
+        for recipient in recipients:
+            html = skeleton
+            for field, placeholder in placeholders.items():
+                value = recipient.get(field)
+                html = html.replace(placeholder, str(escape(value if value is not None else "")))
+            rendered.append(html)
+        return rendered
+
+    async def _render_personalized(self, emails: Sequence[OutboxEmail]) -> List[Optional[str]]:
+        """
+        Batch-render emails that share a template but differ in a few fields.
 
-        return await template.render_async(**context)
+        Emails are grouped by template, subject and plain text. Values equal
+        across a group form the shared context and the differing ones are
+        rendered through render_batch. Only non-empty strings count as
+        personalized fields, so a `{% if field %}` test sees the same truth
+        value as the placeholder. Other emails get None and render as usual.
+        """
+        html_bodies: List[Optional[str]] = [None] * len(emails)
+        groups: Dict[Tuple[str, str, str], List[int]] = {}
+        for index, email in enumerate(emails):
+            key = (email.template_name, email.subject, email.plain_text or "")
+            groups.setdefault(key, []).append(index)
+
+        for (template_name, _, _), indexes in groups.items():
+            if len(indexes) < 2:
+                continue
+            contexts = [emails[index].context for index in indexes]
+            fields = set().union(*contexts)
+            personal = {
+                field for field in fields
+                if any(context.get(field) != contexts[0].get(field) for context in contexts)
+            }
+            # Identical content is already served by the cached MIME body
+            if not personal:
+                continue
+            if not all(
+                isinstance(context.get(field), str) and context[field]
+                for context in contexts
+                for field in personal
+            ):
+                continue
+
+            shared = {field: value for field, value in contexts[0].items() if field not in personal}
+            rendered = await self.render_batch(
+                template_name,
+                shared,
+                [{field: context[field] for field in personal} for context in contexts],
+            )
+            for index, html in zip(indexes, rendered):
+                html_bodies[index] = html
+        return html_bodies
 
     def _build_plain_text(self, default_message: str, context: Dict[str, Any]) -> str:
+        context_key = self._context_key(context)
+        cache_key = ("text", default_message, context_key)
+        if context_key is not None:
+            cached = self._cache_get(cache_key)
+            if cached is not None:
+                return cached
+
         lines = [default_message, ""]
         for key, value in context.items():
             if isinstance(value, str) and value.strip():
                 lines.append(f"{key.replace('_', ' ').title()}: {value}")
         lines.append("")
         lines.append(self._settings.EMAIL_FROM_NAME)
-        return "\n".join(lines)
+        text = "\n".join(lines)
 
-    async def _send_email(
+        if context_key is not None:
+            self._cache_put(cache_key, text)
+        return text
+
+    async def _build_message(
         self,
         *,
         to_email: str,
@@ -71,51 +241,216 @@ class EmailService:
         template_name: str,
         context: Dict[str, Any],
         plain_text: str | None = None,
-    ) -> bool:
-        html_body = await self._render_template(template_name, context)
+        html_body: str | None = None,
+    ) -> EmailMessage:
+        if html_body is None:
+            html_body = await self._render_template(template_name, context)
         text_body = plain_text or self._build_plain_text(subject, context)
 
         message = EmailMessage()
         message["From"] = formataddr(
             (self._settings.EMAIL_FROM_NAME, self._settings.EMAIL_FROM)
         )
-        message["To"] = to_email
+        if to_email:
+            message["To"] = to_email
         message["Subject"] = subject
         message.set_content(text_body)
         message.add_alternative(html_body, subtype="html")
+        return message
 
+    async def _build_raw_message(
+        self,
+        *,
+        to_email: str,
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        plain_text: str | None = None,
+        html_body: str | None = None,
+    ) -> bytes:
+        """
+        Serialize a message for SMTP.
+
+        Building the MIME structure (header parsing, transfer encoding) costs
+        far more than rendering, so the serialized message without its To
+        header is cached per identical content and only the To line differs
+        per recipient. A batch-rendered `html_body` is personalized and is
+        serialized without caching.
+        """
+        if html_body is not None or not to_email.isascii():
+            message = await self._build_message(
+                to_email=to_email,
+                subject=subject,
+                template_name=template_name,
+                context=context,
+                plain_text=plain_text,
+                html_body=html_body,
+            )
+            return message.as_bytes(policy=SMTP)
+
+        context_key = self._context_key(context)
+        cache_key = ("mime", template_name, subject, plain_text or "", context_key)
+        body = self._cache_get(cache_key) if context_key is not None else None
+        if body is None:
+            message = await self._build_message(
+                to_email="",
+                subject=subject,
+                template_name=template_name,
+                context=context,
+                plain_text=plain_text,
+            )
+            body = message.as_bytes(policy=SMTP)
+            if context_key is not None:
+                self._cache_put(cache_key, body)
+        return f"To: {to_email}\r\n".encode("ascii") + body
+
+    def _is_configured(self) -> bool:
         # 检查邮件配置是否完整
-        if not self._settings.EMAIL_SMTP_USER or not self._settings.EMAIL_SMTP_PASSWORD:
+        return bool(self._settings.EMAIL_SMTP_USER and self._settings.EMAIL_SMTP_PASSWORD)
+
+    async def _deliver(
+        self,
+        messages: Sequence[Tuple[str, bytes]],
+        before_send: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> List[bool]:
+        """
+        Send serialized (recipient, message) pairs over one pooled SMTP session.
+
+        A session dropped by the server (e.g. after idling) is replaced and
+        the unsent remainder retried once. `before_send` is awaited before
+        every single message (used for rate limiting).
+        """
+        results: List[bool] = []
+        for attempt in range(2):
+            try:
+                async with self._pool.connection() as smtp:
+                    for to_email, raw_message in messages[len(results):]:
+                        if before_send is not None:
+                            await before_send()
+                        try:
+                            await smtp.sendmail(self._settings.EMAIL_FROM, [to_email], raw_message)
+                            results.append(True)
+                        except (aiosmtplib.SMTPRecipientsRefused, aiosmtplib.SMTPSenderRefused) as e:
+                            logger.error(f"SMTP recipient refused ({to_email}): {e}")
+                            results.append(False)
+                            await smtp.rset()
+                return results
+            except aiosmtplib.SMTPServerDisconnected as e:
+                if attempt == 0:
+                    logger.warning(f"SMTP connection lost, reconnecting: {e}")
+                    continue
+                logger.error(f"SMTP connection lost: {e}")
+            except aiosmtplib.SMTPAuthenticationError as e:
+                logger.error(f"SMTP Authentication failed: {e}")
+            except aiosmtplib.SMTPConnectError as e:
+                logger.error(f"SMTP Connection failed: {e}")
+            except Exception as e:  # pragma: no cover - covered via unit tests
+                logger.error(f"SMTP Error: {e}")
+            break
+        return results + [False] * (len(messages) - len(results))
+
+    async def _send_email(
+        self,
+        *,
+        to_email: str,
+        subject: str,
+        template_name: str,
+        context: Dict[str, Any],
+        plain_text: str | None = None,
+    ) -> bool:
+        """Queue an email on the durable outbox. Returns True once it is queued."""
+        # Fail fast on unknown templates instead of dead-lettering later
+        self._get_template(template_name)
+        if not self._is_configured():
             return False
-        
         try:
-            smtp = aiosmtplib.SMTP(
-                hostname=self._settings.EMAIL_SMTP_HOST,
-                port=self._settings.EMAIL_SMTP_PORT,
-                start_tls=True,  # 587端口使用STARTTLS
-            )
-            await smtp.connect()
-            if self._settings.EMAIL_SMTP_USER:
-                await smtp.login(
-                    self._settings.EMAIL_SMTP_USER,
-                    self._settings.EMAIL_SMTP_PASSWORD,
-                )
-            await smtp.send_message(message)
-            await smtp.quit()
+            await email_outbox.enqueue(OutboxEmail(
+                to_email=to_email,
+                subject=subject,
+                template_name=template_name,
+                context=context,
+                plain_text=plain_text,
+            ))
             return True
-        except aiosmtplib.SMTPAuthenticationError as e:
-            import logging
-            logging.getLogger(__name__).error(f"SMTP Authentication failed: {e}")
-            return False
-        except aiosmtplib.SMTPConnectError as e:
-            import logging
-            logging.getLogger(__name__).error(f"SMTP Connection failed: {e}")
-            return False
-        except Exception as e:  # pragma: no cover - covered via unit tests
-            import logging
-            logging.getLogger(__name__).error(f"SMTP Error: {e}")
+        except Exception as e:
+            logger.error(f"Failed to queue email ({template_name}): {e}")
             return False
 
+    async def deliver_many(
+        self,
+        emails: Sequence[OutboxEmail],
+        before_send: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> List[bool]:
+        """
+        Render and send emails immediately over one pooled SMTP session.
+
+        Used by the outbox dispatcher (which paces sends via `before_send`);
+        application code should use the send_* methods, which queue instead.
+        """
+        if not emails:
+            return []
+        if not self._is_configured():
+            return [False] * len(emails)
+
+        html_bodies = await self._render_personalized(emails)
+        messages = []
+        for email, html_body in zip(emails, html_bodies):
+            raw_message = await self._build_raw_message(
+                to_email=email.to_email,
+                subject=email.subject,
+                template_name=email.template_name,
+                context=email.context,
+                plain_text=email.plain_text,
+                html_body=html_body,
+            )
+            messages.append((email.to_email, raw_message))
+        return await self._deliver(messages, before_send=before_send)
+
+    async def send_email_to_many(
+        self,
+        *,
+        to_emails: Sequence[str],
+        subject: str,
+        template_name: str,
+        template_data: Dict[str, Any],
+        plain_text: str | None = None,
+        recipient_data: Sequence[Dict[str, Any]] | None = None,
+    ) -> int:
+        """
+        Queue the same templated email for many recipients.
+
+        Each recipient gets an individual message (own To header). The rows are
+        inserted in bulk and the dispatcher sends them in batches over the
+        pooled SMTP sessions. `recipient_data` optionally holds personalized
+        fields per recipient (aligned with `to_emails`); the dispatcher renders
+        such batches once through render_batch.
+
+        Returns:
+            Number of emails queued
+        """
+        if not template_name.endswith('.html'):
+            template_name = f"{template_name}.html"
+        self._get_template(template_name)
+        if not to_emails or not self._is_configured():
+            return 0
+        if recipient_data is not None and len(recipient_data) != len(to_emails):
+            raise ValueError("recipient_data must have one entry per recipient")
+
+        context = {
+            **template_data,
+            "year": datetime.now(timezone.utc).year,
+        }
+        return await email_outbox.enqueue_many(
+            OutboxEmail(
+                to_email=to_email,
+                subject=subject,
+                template_name=template_name,
+                context={**context, **personal},
+                plain_text=plain_text,
+            )
+            for to_email, personal in zip(to_emails, recipient_data or [{}] * len(to_emails))
+        )
+
     async def send_registration_confirmation_email(
         self, *, to_email: str, company_name: str, business_number: str
     ) -> bool:
@@ -250,7 +585,7 @@ class EmailService:
         plain_text: str | None = None,
     ) -> bool:
         """
-        Generic method to send email using a template.
+        Generic method to send email using a template (queued on the outbox).
         
         Args:
             to_email: Recipient email address
@@ -260,7 +595,7 @@ class EmailService:
             plain_text: Optional plain text version
             
         Returns:
-            True if email sent successfully, False otherwise
+            True if the email was queued, False otherwise
         """
         # Ensure template name has .html extension
         if not template_name.endswith('.html'):
@@ -0,0 +1,189 @@
+"""
+SMTP connection pool.
+
+Keeps a few authenticated SMTP sessions open so consecutive emails do not
+each pay for TCP connect + STARTTLS + AUTH. Sessions are checked out for one
+or more sends and returned afterwards:
+
+    async with smtp_pool.connection() as smtp:
+        await smtp.send_message(message)
+
+Idle sessions are closed after `idle_timeout` seconds, sessions idle for
+more than `health_check_after` seconds are verified with NOOP before reuse,
+and a session that raised during use is discarded instead of returned.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiosmtplib
+
+from ..config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _PooledConnection:
+    smtp: aiosmtplib.SMTP
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class SMTPConnectionPool:
+    """Bounded pool of authenticated aiosmtplib sessions."""
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: str = "",
+        password: str = "",
+        start_tls: bool = True,
+        size: int = 3,
+        idle_timeout: float = 60.0,
+        health_check_after: float = 15.0,
+        timeout: float = 30.0,
+    ):
+        """
+        Initialize SMTP connection pool.
+
+        Args:
+            hostname: SMTP server host
+            port: SMTP server port
+            username: Login user (no AUTH when empty)
+            password: Login password
+            start_tls: Upgrade the connection with STARTTLS
+            size: Maximum number of concurrent sessions
+            idle_timeout: Seconds after which an unused session is closed
+            health_check_after: Idle seconds after which a session is checked with NOOP
+            timeout: Socket timeout for SMTP commands
+        """
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.start_tls = start_tls
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.health_check_after = health_check_after
+        self.timeout = timeout
+
+        self._idle: List[_PooledConnection] = []
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._stats = {
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "connections_discarded": 0,
+        }
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """Check out a ready session, waiting when all sessions are busy."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+
+        async with self._semaphore:
+            conn = await self._checkout()
+            try:
+                yield conn.smtp
+            except BaseException:
+                # State after a failed command is unknown; never reuse it
+                self._stats["connections_discarded"] += 1
+                await self._close(conn)
+                raise
+            conn.last_used = time.monotonic()
+            self._idle.append(conn)
+            await self._close_expired()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "idle": len(self._idle),
+            "size": self.size,
+        }
+
+    async def close(self) -> None:
+        """Close all idle sessions."""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            await self._close(conn, quit=True)
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    async def _checkout(self) -> _PooledConnection:
+        now = time.monotonic()
+        while self._idle:
+            # Most recently used first - the least likely to have been dropped
+            conn = self._idle.pop()
+            idle_for = now - conn.last_used
+            if idle_for >= self.idle_timeout or not conn.smtp.is_connected:
+                await self._close(conn, quit=True)
+                continue
+            if idle_for >= self.health_check_after:
+                try:
+                    await conn.smtp.noop()
+                except aiosmtplib.SMTPException:
+                    self._stats["connections_discarded"] += 1
+                    await self._close(conn)
+                    continue
+            self._stats["connections_reused"] += 1
+            return conn
+        return await self._open()
+
+    async def _open(self) -> _PooledConnection:
+        smtp = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            start_tls=self.start_tls,
+            timeout=self.timeout,
+        )
+        await smtp.connect()
+        if self.username:
+            try:
+                await smtp.login(self.username, self.password)
+            except BaseException:
+                smtp.close()
+                raise
+        self._stats["connections_opened"] += 1
+        return _PooledConnection(smtp=smtp)
+
+    async def _close_expired(self) -> None:
+        now = time.monotonic()
+        expired = [c for c in self._idle if now - c.last_used >= self.idle_timeout]
+        if not expired:
+            return
+        self._idle = [c for c in self._idle if c not in expired]
+        for conn in expired:
+            await self._close(conn, quit=True)
+
+    @staticmethod
+    async def _close(conn: _PooledConnection, quit: bool = False) -> None:
+        try:
+            if quit and conn.smtp.is_connected:
+                await conn.smtp.quit()
+            else:
+                conn.smtp.close()
+        except Exception as e:
+            logger.debug(f"Error closing SMTP connection: {e}")
+            conn.smtp.close()
+
+
+# Shared pool used by EmailService
+smtp_pool = SMTPConnectionPool(
+    hostname=settings.EMAIL_SMTP_HOST,
+    port=settings.EMAIL_SMTP_PORT,
+    username=settings.EMAIL_SMTP_USER,
+    password=settings.EMAIL_SMTP_PASSWORD,
+    start_tls=settings.EMAIL_SMTP_USE_TLS,
+    size=settings.EMAIL_SMTP_POOL_SIZE,
+    idle_timeout=settings.EMAIL_SMTP_IDLE_TIMEOUT,
+    health_check_after=settings.EMAIL_SMTP_HEALTH_CHECK_AFTER,
+)
@@ -30,3 +30,4 @@ class DExceptionRecord:
     http_status: Optional[int] = None
     resolved: bool = False
     resolution_notes: Optional[str] = None
+    fingerprint: Optional[str] = None  # Groups occurrences of the same bug (see compute_fingerprint)
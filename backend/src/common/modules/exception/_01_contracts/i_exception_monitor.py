@@ -31,7 +31,8 @@ class IExceptionMonitor(ABC):
     def set_thresholds(
         self,
         critical_threshold: Optional[int] = None,
-        error_threshold: Optional[int] = None
+        error_threshold: Optional[int] = None,
+        window_minutes: Optional[int] = None
     ) -> None:
         """Set alert thresholds."""
         pass
@@ -1,9 +1,16 @@
 """Abstract exception monitor.
 
 Provides common monitoring logic that can be reused by concrete implementations.
+
+Counts are kept in a fixed ring of per-minute buckets covering the last 24
+hours: recording an exception touches one bucket, a statistics query reads
+at most every bucket once, and memory does not grow with uptime. Alert
+thresholds are checked against running totals of a sliding window (the last
+hour by default), so they are accurate to the minute and cost O(1) per
+exception.
 """
 from abc import abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 
 from .._01_contracts.i_exception_monitor import IExceptionMonitor
@@ -18,14 +25,30 @@ class AbstractExceptionMonitor(IExceptionMonitor):
     """
     
     # Default thresholds
-    DEFAULT_CRITICAL_THRESHOLD = 10  # Alert after 10 critical exceptions per hour
-    DEFAULT_ERROR_THRESHOLD = 100    # Alert after 100 errors per hour
+    DEFAULT_CRITICAL_THRESHOLD = 10  # Alert after 10 critical exceptions per window
+    DEFAULT_ERROR_THRESHOLD = 100    # Alert after 100 errors per window
+    DEFAULT_WINDOW_MINUTES = 60      # Sliding window the thresholds apply to
+    
+    # Ring buffer: one bucket per minute for 24 hours
+    BUCKET_COUNT = 24 * 60
     
     def __init__(self):
         """Initialize abstract exception monitor."""
-        self._exception_counts: Dict[str, Dict[str, Any]] = {}
         self._critical_threshold = self.DEFAULT_CRITICAL_THRESHOLD
         self._error_threshold = self.DEFAULT_ERROR_THRESHOLD
+        self._window_minutes = self.DEFAULT_WINDOW_MINUTES
+        
+        # Minute (since epoch) each bucket currently holds; -1 = empty
+        self._bucket_minutes: List[int] = [-1] * self.BUCKET_COUNT
+        self._bucket_totals: List[int] = [0] * self.BUCKET_COUNT
+        self._bucket_errors: List[int] = [0] * self.BUCKET_COUNT
+        self._bucket_criticals: List[int] = [0] * self.BUCKET_COUNT
+        self._bucket_types: List[Optional[Dict[str, int]]] = [None] * self.BUCKET_COUNT
+        
+        # Running totals of the sliding alert window ending at _window_head
+        self._window_head = -1
+        self._window_errors = 0
+        self._window_criticals = 0
     
     def update_stats(self, record: DExceptionRecord) -> None:
         """Update exception statistics for monitoring.
@@ -33,27 +56,34 @@ class AbstractExceptionMonitor(IExceptionMonitor):
         Args:
             record: The exception record to include in statistics
         """
-        hour_key = record.created_at.strftime("%Y-%m-%d-%H")
+        minute = self._minute_of(record.created_at)
+        self._advance_window(max(minute, self._current_minute()))
+        if minute <= self._window_head - self.BUCKET_COUNT:
+            return  # Older than the ring covers
         
-        if hour_key not in self._exception_counts:
-            self._exception_counts[hour_key] = {
-                'total': 0,
-                'error': 0,
-                'critical': 0,
-                'by_type': {}
-            }
-        
-        stats = self._exception_counts[hour_key]
-        stats['total'] += 1
+        slot = minute % self.BUCKET_COUNT
+        if self._bucket_minutes[slot] != minute:
+            self._bucket_minutes[slot] = minute
+            self._bucket_totals[slot] = 0
+            self._bucket_errors[slot] = 0
+            self._bucket_criticals[slot] = 0
+            self._bucket_types[slot] = None
         
+        self._bucket_totals[slot] += 1
+        in_window = minute > self._window_head - self._window_minutes
         if record.level == 'ERROR':
-            stats['error'] += 1
+            self._bucket_errors[slot] += 1
+            if in_window:
+                self._window_errors += 1
         elif record.level == 'CRITICAL':
-            stats['critical'] += 1
+            self._bucket_criticals[slot] += 1
+            if in_window:
+                self._window_criticals += 1
         
-        if record.exception_type not in stats['by_type']:
-            stats['by_type'][record.exception_type] = 0
-        stats['by_type'][record.exception_type] += 1
+        by_type = self._bucket_types[slot]
+        if by_type is None:
+            by_type = self._bucket_types[slot] = {}
+        by_type[record.exception_type] = by_type.get(record.exception_type, 0) + 1
     
     @abstractmethod
     async def check_alerts(self, record: DExceptionRecord) -> None:
@@ -74,33 +104,38 @@ class AbstractExceptionMonitor(IExceptionMonitor):
         """Get exception statistics for the specified number of hours.
         
         Args:
-            hours: Number of hours to include in statistics
+            hours: Number of hours to include in statistics (at most 24)
         
         Returns:
             Aggregated statistics
         """
         now = datetime.now(timezone.utc)
+        hours = max(0, min(hours, self.BUCKET_COUNT // 60))
         total_count = 0
         error_count = 0
         critical_count = 0
         by_type: Dict[str, int] = {}
         by_hour: Dict[str, int] = {}
         
+        current_hour = now.replace(minute=0, second=0, microsecond=0)
         for i in range(hours):
-            hour = now.replace(minute=0, second=0, microsecond=0) - timedelta(hours=i)
+            hour = current_hour - timedelta(hours=i)
             hour_key = hour.strftime("%Y-%m-%d-%H")
+            hour_total = 0
             
-            if hour_key in self._exception_counts:
-                stats = self._exception_counts[hour_key]
-                total_count += stats['total']
-                error_count += stats['error']
-                critical_count += stats['critical']
-                by_hour[hour_key] = stats['total']
-                
-                for exc_type, count in stats['by_type'].items():
+            first_minute = self._minute_of(hour)
+            for minute in range(first_minute, first_minute + 60):
+                slot = minute % self.BUCKET_COUNT
+                if self._bucket_minutes[slot] != minute:
+                    continue
+                hour_total += self._bucket_totals[slot]
+                error_count += self._bucket_errors[slot]
+                critical_count += self._bucket_criticals[slot]
+                for exc_type, count in (self._bucket_types[slot] or {}).items():
                     by_type[exc_type] = by_type.get(exc_type, 0) + count
-            else:
-                by_hour[hour_key] = 0
+            
+            total_count += hour_total
+            by_hour[hour_key] = hour_total
         
         # Get top errors
         top_errors = sorted(
@@ -121,39 +156,71 @@ class AbstractExceptionMonitor(IExceptionMonitor):
     def set_thresholds(
         self,
         critical_threshold: Optional[int] = None,
-        error_threshold: Optional[int] = None
+        error_threshold: Optional[int] = None,
+        window_minutes: Optional[int] = None
     ) -> None:
         """Set alert thresholds.
         
         Args:
-            critical_threshold: Number of critical exceptions per hour to trigger alert
-            error_threshold: Number of error exceptions per hour to trigger alert
+            critical_threshold: Number of critical exceptions per window to trigger alert
+            error_threshold: Number of error exceptions per window to trigger alert
+            window_minutes: Length of the sliding alert window (1 minute to 24 hours)
         """
         if critical_threshold is not None:
             self._critical_threshold = critical_threshold
         if error_threshold is not None:
             self._error_threshold = error_threshold
+        if window_minutes is not None:
+            self._window_minutes = max(1, min(window_minutes, self.BUCKET_COUNT))
+            self._recount_window()
     
-    def _should_alert_critical(self, hour_key: str) -> bool:
-        """Check if critical alert threshold is exceeded.
-        
-        Args:
-            hour_key: The hour key to check
+    def _should_alert_critical(self) -> bool:
+        """Check if critical alert threshold is exceeded in the current window.
             
         Returns:
             True if threshold exceeded
         """
-        stats = self._exception_counts.get(hour_key, {})
-        return stats.get('critical', 0) >= self._critical_threshold
+        self._advance_window(self._current_minute())
+        return self._window_criticals >= self._critical_threshold
     
-    def _should_alert_error(self, hour_key: str) -> bool:
-        """Check if error alert threshold is exceeded.
-        
-        Args:
-            hour_key: The hour key to check
+    def _should_alert_error(self) -> bool:
+        """Check if error alert threshold is exceeded in the current window.
             
         Returns:
             True if threshold exceeded
         """
-        stats = self._exception_counts.get(hour_key, {})
-        return stats.get('error', 0) >= self._error_threshold
+        self._advance_window(self._current_minute())
+        return self._window_errors >= self._error_threshold
+    
+    def _advance_window(self, minute: int) -> None:
+        """Move the end of the alert window to `minute`, subtracting the minutes that leave it."""
+        if minute <= self._window_head:
+            return
+        if self._window_head < 0 or minute - self._window_head >= self._window_minutes:
+            self._window_head = minute
+            self._recount_window()
+            return
+        for expired in range(self._window_head - self._window_minutes + 1, minute - self._window_minutes + 1):
+            slot = expired % self.BUCKET_COUNT
+            if self._bucket_minutes[slot] == expired:
+                self._window_errors -= self._bucket_errors[slot]
+                self._window_criticals -= self._bucket_criticals[slot]
+        self._window_head = minute
+    
+    def _recount_window(self) -> None:
+        """Recompute the alert window totals from the buckets."""
+        self._window_errors = 0
+        self._window_criticals = 0
+        for minute in range(self._window_head - self._window_minutes + 1, self._window_head + 1):
+            slot = minute % self.BUCKET_COUNT
+            if self._bucket_minutes[slot] == minute:
+                self._window_errors += self._bucket_errors[slot]
+                self._window_criticals += self._bucket_criticals[slot]
+    
+    def _current_minute(self) -> int:
+        return self._minute_of(datetime.now(timezone.utc))
+    
+    @staticmethod
+    def _minute_of(moment: datetime) -> int:
+        """Minutes since the epoch; naive datetimes are taken as local time."""
+        return int(moment.timestamp()) // 60
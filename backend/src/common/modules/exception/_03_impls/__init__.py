@@ -5,6 +5,7 @@ Concrete implementations of exception handling components.
 from .impl_classifier import ExceptionClassifier, exception_classifier
 from .impl_recorder import ExceptionRecorder, exception_recorder, file_path_to_module
 from .impl_monitor import ExceptionMonitor, exception_monitor
+from .impl_aggregator import ExceptionAggregator, exception_aggregator
 from .impl_layer_rule import LayerRule, layer_rule
 from .impl_custom_exception import (
     ValidationError,
@@ -36,6 +37,9 @@ __all__ = [
     # Monitor
     "ExceptionMonitor",
     "exception_monitor",
+    # Aggregator
+    "ExceptionAggregator",
+    "exception_aggregator",
     # Layer Rule
     "LayerRule",
     "layer_rule",
@@ -0,0 +1,198 @@
+"""Exception aggregator implementation.
+
+Groups recorded exceptions by fingerprint within a short window, so a bug
+in a hot path produces one error_logs row per window (with the occurrence
+count, first/last seen and sample trace ids) instead of one row per
+occurrence. Each window is also merged into the error_fingerprints table,
+which keeps the running totals per fingerprint.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from ...config import settings
+from ...logger import logging_service
+from ...logger.rollup import log_rollups
+from ...logger.schemas import ErrorLogCreate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExceptionGroup:
+    """Occurrences of one fingerprint within the current window."""
+
+    schema: ErrorLogCreate
+    exception_type: str
+    message_template: str
+    frames: List[str]
+    count: int = 0
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+    sample_trace_ids: List[str] = field(default_factory=list)
+
+    def add(self, seen_at: datetime, trace_id: Optional[str], max_samples: int) -> None:
+        self.count += 1
+        self.first_seen = self.first_seen or seen_at
+        self.last_seen = seen_at
+        if trace_id and trace_id not in self.sample_trace_ids and len(self.sample_trace_ids) < max_samples:
+            self.sample_trace_ids.append(trace_id)
+
+    def to_row(self, fingerprint: str) -> Dict[str, Any]:
+        return {
+            "fingerprint": fingerprint,
+            "source": self.schema.source,
+            "level": self.schema.level,
+            "exception_type": self.exception_type[:255],
+            "message_template": self.message_template,
+            "frames": self.frames,
+            "sample_message": self.schema.error_message[:1000],
+            "count": self.count,
+            "first_seen": self.first_seen.isoformat(),
+            "last_seen": self.last_seen.isoformat(),
+            "sample_trace_ids": self.sample_trace_ids,
+        }
+
+
+class ExceptionAggregator:
+    """Writes one error log per exception fingerprint per window."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        window_seconds: float = 30.0,
+        max_fingerprints: int = 1000,
+        max_sample_trace_ids: int = 5,
+    ):
+        """
+        Initialize exception aggregator.
+
+        Args:
+            enabled: Aggregate at all (False = one error log per occurrence)
+            window_seconds: Length of an aggregation window
+            max_fingerprints: Distinct fingerprints per window; beyond it new fingerprints are written unaggregated
+            max_sample_trace_ids: Trace ids kept per fingerprint and window
+        """
+        self.enabled = enabled and window_seconds > 0
+        self.window_seconds = window_seconds
+        self.max_fingerprints = max(1, max_fingerprints)
+        self.max_sample_trace_ids = max(1, max_sample_trace_ids)
+
+        self._groups: Dict[str, ExceptionGroup] = {}
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+        self._stats: Dict[str, Any] = {
+            "total_occurrences": 0,
+            "total_rows_written": 0,
+            "total_unaggregated": 0,
+            "total_store_errors": 0,
+        }
+
+    async def add(
+        self,
+        schema: ErrorLogCreate,
+        fingerprint: str,
+        message_template: str,
+        frames: List[str],
+    ) -> None:
+        """Count one occurrence; its error log is written when the window closes."""
+        self._stats["total_occurrences"] += 1
+        # Stats and trends count every occurrence, in the minute it happened
+        try:
+            log_rollups.record_schema("error", schema)
+        except Exception:
+            pass
+
+        group = self._groups.get(fingerprint)
+        if group is None:
+            if not self.enabled or len(self._groups) >= self.max_fingerprints:
+                self._stats["total_unaggregated"] += 1
+                await self._write_log(fingerprint, ExceptionGroup(schema, schema.error_type, message_template, frames))
+                return
+            group = self._groups[fingerprint] = ExceptionGroup(schema, schema.error_type, message_template, frames)
+        group.add(datetime.now(timezone.utc), schema.trace_id or None, self.max_sample_trace_ids)
+        self._ensure_started()
+
+    async def flush(self) -> int:
+        """Write the current window: one error log per fingerprint, then merge into error_fingerprints."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            groups, self._groups = self._groups, {}
+            if not groups:
+                return 0
+            for fingerprint, group in groups.items():
+                await self._write_log(fingerprint, group)
+
+            rows = [group.to_row(fingerprint) for fingerprint, group in groups.items()]
+            try:
+                await asyncio.to_thread(self._apply, rows)
+            except Exception as e:
+                # The error logs are written; only the running totals miss this window
+                self._stats["total_store_errors"] += 1
+                logger.warning(f"Error fingerprint merge failed ({len(rows)} rows): {str(e)}")
+            return len(groups)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "pending_fingerprints": len(self._groups),
+            "flusher_running": bool(self._flusher_task and not self._flusher_task.done()),
+        }
+
+    async def close(self) -> None:
+        """Stop the flusher and write the current window."""
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+        await self.flush()
+
+    async def _write_log(self, fingerprint: str, group: ExceptionGroup) -> None:
+        schema = group.schema
+        details = dict(schema.error_details or {})
+        details["fingerprint"] = fingerprint
+        if group.count > 1:
+            details.update({
+                "occurrences": group.count,
+                "first_seen": group.first_seen.isoformat(),
+                "last_seen": group.last_seen.isoformat(),
+                "sample_trace_ids": group.sample_trace_ids,
+            })
+        schema.error_details = details
+        await logging_service.error(schema, count_in_rollups=False)
+        self._stats["total_rows_written"] += 1
+
+    def _ensure_started(self) -> None:
+        """Start the flusher on first use (lazy initialization)."""
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.warning(f"Exception aggregation flush failed: {str(e)}")
+
+    def _apply(self, rows: List[Dict[str, Any]]) -> None:
+        # Raw service client (error_fingerprints is closed to API roles), so a
+        # failing write is not recorded as another exception
+        from ...supabase.client import get_supabase_service_client
+        get_supabase_service_client().rpc("merge_error_fingerprints", {"p_rows": rows}).execute()
+
+
+# Global aggregator instance
+exception_aggregator = ExceptionAggregator(
+    enabled=settings.EXCEPTION_AGGREGATION_ENABLED,
+    window_seconds=settings.EXCEPTION_AGGREGATION_WINDOW,
+    max_fingerprints=settings.EXCEPTION_AGGREGATION_MAX_FINGERPRINTS,
+    max_sample_trace_ids=settings.EXCEPTION_SAMPLE_TRACE_IDS,
+)
@@ -76,17 +76,26 @@ class LayerRule(AbstractLayerRule):
             "common/modules/audit/router.py": {"NotFoundError", "DatabaseError"},
             "common/modules/audit/decorator.py": set(),
             "common/modules/audit/schemas.py": set(),
+            "common/modules/background/registry.py": {"NotFoundError"},
+            "common/modules/background/throttle.py": set(),
             "common/modules/config/settings.py": {"InternalError"},
             "common/modules/db/session.py": {"DatabaseError"},
             "common/modules/db/models.py": set(),
             "common/modules/email/service.py": {"ExternalServiceError"},
-            "common/modules/email/background.py": {"ExternalServiceError"},
+            "common/modules/email/outbox.py": {"ExternalServiceError"},
+            "common/modules/email/smtp_pool.py": {"ExternalServiceError"},
             "common/modules/exception": self.ALL_EXCEPTIONS,
             "common/modules/export/exporter.py": {"ValidationError", "InternalError"},
+            "common/modules/export/jobs.py": {"ValidationError", "NotFoundError", "InternalError"},
+            "common/modules/export/router.py": {"NotFoundError"},
             "common/modules/health/service.py": {"InternalError", "ExternalServiceError"},
             "common/modules/health/adapter.py": {"ExternalServiceError"},
             "common/modules/health/router.py": {"InternalError"},
             "common/modules/health/config.py": set(),
+            "common/modules/health/prober.py": set(),
+            "common/modules/metrics/registry.py": set(),
+            "common/modules/metrics/instruments.py": set(),
+            "common/modules/metrics/router.py": {"AuthenticationError", "NotFoundError"},
             "common/modules/integrations": {"ExternalServiceError", "ValidationError"},
             "common/modules/interceptor/error.py": self.ALL_EXCEPTIONS,
             "common/modules/interceptor/database.py": {"DatabaseError"},
@@ -97,6 +106,9 @@ class LayerRule(AbstractLayerRule):
             "common/modules/logger/service.py": {"InternalError"},
             "common/modules/logger/router.py": {"NotFoundError", "ValidationError"},
             "common/modules/logger/db_writer.py": {"DatabaseError"},
+            "common/modules/logger/rollup.py": set(),
+            "common/modules/logger/retention.py": set(),
+            "common/modules/logger/ingest.py": {"ValidationError", "RateLimitError"},
             "common/modules/logger/file_writer.py": {"InternalError"},
             "common/modules/logger/handlers.py": set(),
             "common/modules/logger/filters.py": set(),
@@ -111,6 +123,8 @@ class LayerRule(AbstractLayerRule):
             "common/modules/supabase/client.py": {"ExternalServiceError"},
             "common/modules/supabase/service.py": {"DatabaseError", "ExternalServiceError"},
             "common/modules/supabase/message_service.py": {"DatabaseError", "ExternalServiceError"},
+            "common/modules/supabase/unread_hub.py": set(),
+            "common/modules/supabase/view_counter.py": set(),
             "modules/": self.ALL_EXCEPTIONS,
         }
     
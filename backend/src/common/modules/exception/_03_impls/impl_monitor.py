@@ -2,9 +2,13 @@
 
 Concrete implementation of exception monitoring and alerting.
 """
+from typing import Dict
+
 from .._02_abstracts import AbstractExceptionMonitor
 from .._01_contracts import DExceptionRecord, DExceptionStats
+from ...config import settings
 from ...logger import logging_service
+from ...logger.schemas import AppLogCreate
 
 
 class ExceptionMonitor(AbstractExceptionMonitor):
@@ -13,34 +17,43 @@ class ExceptionMonitor(AbstractExceptionMonitor):
     def __init__(self):
         """Initialize the exception monitor."""
         super().__init__()
+        # Alert kind -> minute it last fired; an alert fires at most once per window
+        self._last_alert_minute: Dict[str, int] = {}
     
     async def check_alerts(self, record: DExceptionRecord) -> None:
         """Check if alerts should be triggered based on exception patterns."""
-        hour_key = record.created_at.strftime("%Y-%m-%d-%H")
-        stats = self._exception_counts.get(hour_key, {})
-        
-        if record.level == 'CRITICAL' and stats.get('critical', 0) >= self._critical_threshold:
+        if record.level == 'CRITICAL' and self._should_alert_critical() and self._claim_alert('critical'):
             await self._trigger_alert(
                 "Critical Exception Threshold Exceeded",
-                f"Critical exceptions in the last hour: {stats['critical']}"
+                f"Critical exceptions in the last {self._window_minutes} minutes: {self._window_criticals}"
             )
         
-        if stats.get('error', 0) >= self._error_threshold:
+        if record.level == 'ERROR' and self._should_alert_error() and self._claim_alert('error'):
             await self._trigger_alert(
                 "Error Exception Threshold Exceeded",
-                f"Error exceptions in the last hour: {stats['error']}"
+                f"Error exceptions in the last {self._window_minutes} minutes: {self._window_errors}"
             )
     
+    def _claim_alert(self, kind: str) -> bool:
+        """Return True (and remember it) if `kind` has not fired within the current window."""
+        last = self._last_alert_minute.get(kind)
+        if last is not None and self._window_head - last < self._window_minutes:
+            return False
+        self._last_alert_minute[kind] = self._window_head
+        return True
+    
     async def _trigger_alert(self, title: str, message: str) -> None:
         """Trigger an alert for exception monitoring."""
         try:
-            await logging_service.log(
+            await logging_service.app(AppLogCreate(
                 source="backend",
                 level="CRITICAL",
                 layer="Exception",
+                module="src.common.modules.exception",
+                function="check_alerts",
                 message=f"ALERT: {title} - {message}",
                 extra_data={"alert_type": "exception_threshold"}
-            )
+            ))
             
             # TODO: Integrate with external alerting system (email, Slack, etc.)
             
@@ -64,3 +77,8 @@ class ExceptionMonitor(AbstractExceptionMonitor):
 
 # Global monitor instance
 exception_monitor = ExceptionMonitor()
+exception_monitor.set_thresholds(
+    critical_threshold=settings.EXCEPTION_ALERT_CRITICAL_THRESHOLD,
+    error_threshold=settings.EXCEPTION_ALERT_ERROR_THRESHOLD,
+    window_minutes=settings.EXCEPTION_ALERT_WINDOW_MINUTES,
+)
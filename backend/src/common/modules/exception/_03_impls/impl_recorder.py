@@ -8,8 +8,8 @@ from uuid import uuid4
 
 from .._02_abstracts import AbstractExceptionRecorder, AbstractCustomException
 from .._01_contracts import DExceptionContext, DExceptionRecord
-from ...logger import logging_service
 from ...logger.schemas import ErrorLogCreate
+from .impl_aggregator import exception_aggregator
 
 
 def file_path_to_module(file_path: Optional[str]) -> str:
@@ -176,8 +176,13 @@ class ExceptionRecorder(AbstractExceptionRecorder):
         """Log the exception using the unified logging service.
         
         This is the only method specific to this implementation,
-        as it depends on the concrete logging_service.
+        as it depends on the concrete logging_service. The error log goes
+        through the aggregator, which writes one row per fingerprint and
+        window.
         """
+        # Lazy import: _08_utils imports the handlers, which import this layer
+        from .._08_utils.helper_fingerprint import compute_fingerprint
+        
         try:
             request_method = record.context.get('request_method')
             request_path = record.context.get('request_path')
@@ -185,7 +190,16 @@ class ExceptionRecorder(AbstractExceptionRecorder):
             
             module_path = file_path_to_module(record.file)
             
-            await logging_service.error(ErrorLogCreate(
+            fingerprint, message_template, frames = compute_fingerprint(
+                source=record.source,
+                exception_type=record.exception_type,
+                message=record.message,
+                stack_trace=record.stack_trace,
+                location=f"{module_path}:{record.function}" if record.function else module_path,
+            )
+            record.fingerprint = fingerprint
+            
+            schema = ErrorLogCreate(
                 source=record.source,
                 level=record.level,
                 error_type=record.exception_type,
@@ -194,11 +208,11 @@ class ExceptionRecorder(AbstractExceptionRecorder):
                 stack_trace=record.stack_trace,
                 layer=record.layer,
                 module=module_path,
-                function=record.function,
-                line_number=record.line_number,
-                file_path=record.file,
-                trace_id=str(record.trace_id) if record.trace_id else None,
-                request_id=record.request_id,
+                function=record.function or "",
+                line_number=record.line_number or 0,
+                file_path=record.file or "",
+                trace_id=str(record.trace_id) if record.trace_id else "",
+                request_id=record.request_id or "",
                 user_id=record.user_id,
                 request_method=request_method,
                 request_path=request_path,
@@ -207,7 +221,8 @@ class ExceptionRecorder(AbstractExceptionRecorder):
                     k: v for k, v in record.context.items() 
                     if k not in ('request_method', 'request_path', 'ip_address')
                 }
-            ))
+            )
+            await exception_aggregator.add(schema, fingerprint, message_template, frames)
             
         except Exception as e:
             import logging
@@ -31,6 +31,11 @@ from .helper_message import (
     format_file_extension_error,
     format_operation_failed,
 )
+from .helper_fingerprint import (
+    compute_fingerprint,
+    normalize_message,
+    extract_top_frames,
+)
 
 __all__ = [
     # Codes
@@ -64,4 +69,9 @@ __all__ = [
     "format_file_size_error",
     "format_file_extension_error",
     "format_operation_failed",
+    
+    # Fingerprint Helpers
+    "compute_fingerprint",
+    "normalize_message",
+    "extract_top_frames",
 ]
@@ -0,0 +1,111 @@
+"""Exception fingerprint helper functions.
+
+A fingerprint identifies "the same bug" across occurrences: the normalized
+exception type, the message with variable parts (ids, numbers, quoted
+values) replaced by placeholders, and the innermost stack frames without
+line numbers, so it stays stable across requests and small deploys.
+"""
+import hashlib
+import re
+from typing import List, Optional, Tuple
+
+# Frames of the stack trace that go into the fingerprint
+FINGERPRINT_FRAMES = 3
+MESSAGE_TEMPLATE_MAX_LENGTH = 300
+
+_MESSAGE_PATTERNS = [
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "<uuid>"),
+    (re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"), "<email>"),
+    (re.compile(r"https?://[^\s'\"]+"), "<url>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"\b[0-9a-fA-F]{16,}\b"), "<hex>"),
+    (re.compile(r"'[^']*'"), "'<str>'"),
+    (re.compile(r'"[^"]*"'), '"<str>"'),
+    (re.compile(r"\d+(\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+# Python: File "/app/src/modules/user/service.py", line 42, in get_user
+_PYTHON_FRAME = re.compile(r'File "([^"]+)", line \d+, in (\S+)')
+# JavaScript: "at fetchData (https://host/assets/index-3f9a1c.js:10:5)" or "fetchData@https://host/app.js:10:5"
+_JS_FRAME = re.compile(r"(?:at\s+(?:async\s+)?([\w$.<>\[\] ]+?)\s+\(|^\s*([\w$.<>]*)@)?\(?([^\s()]+?):\d+:\d+\)?\s*$")
+# Build hashes in bundle names (index-3f9a1c.js, chunk.3f9a1c2b.js)
+_BUNDLE_HASH = re.compile(r"[-.][0-9a-zA-Z_]{6,}(?=\.m?js$)")
+
+
+def normalize_message(message: Optional[str]) -> str:
+    """Replace the variable parts of an exception message with placeholders.
+
+    Args:
+        message: Exception message
+
+    Returns:
+        Message template, e.g. "User <uuid> not found" for "User 1b9d...e2 not found"
+    """
+    template = message or ""
+    for pattern, replacement in _MESSAGE_PATTERNS:
+        template = pattern.sub(replacement, template)
+    return template.strip()[:MESSAGE_TEMPLATE_MAX_LENGTH]
+
+
+def extract_top_frames(stack_trace: Optional[str], limit: int = FINGERPRINT_FRAMES) -> List[str]:
+    """Get the innermost stack frames as "file:function", without line numbers.
+
+    Args:
+        stack_trace: Python traceback or JavaScript error stack
+        limit: Number of frames
+
+    Returns:
+        Frames, innermost first
+    """
+    if not stack_trace:
+        return []
+
+    python_frames = _PYTHON_FRAME.findall(stack_trace)
+    if python_frames:
+        # Python tracebacks list the innermost frame last
+        frames = [f"{_short_path(path)}:{function}" for path, function in python_frames]
+        return frames[::-1][:limit]
+
+    frames = []
+    for line in stack_trace.splitlines():
+        match = _JS_FRAME.search(line.strip())
+        if not match:
+            continue
+        function = (match.group(1) or match.group(2) or "<anonymous>").strip()
+        path = _BUNDLE_HASH.sub("", _short_path(match.group(3).split("?")[0]))
+        frames.append(f"{path}:{function}")
+        if len(frames) >= limit:
+            break
+    return frames
+
+
+def compute_fingerprint(
+    source: str,
+    exception_type: str,
+    message: Optional[str],
+    stack_trace: Optional[str] = None,
+    location: Optional[str] = None,
+) -> Tuple[str, str, List[str]]:
+    """Compute the fingerprint of an exception.
+
+    Args:
+        source: backend or frontend
+        exception_type: Exception class name
+        message: Exception message
+        stack_trace: Stack trace, if any
+        location: Fallback frame ("module:function") when there is no stack trace
+
+    Returns:
+        Tuple of (fingerprint, message template, top frames)
+    """
+    template = normalize_message(message)
+    frames = extract_top_frames(stack_trace) or ([location] if location else [])
+    key = "\n".join([source or "", (exception_type or "").strip(), template, *frames])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32], template, frames
+
+
+def _short_path(path: str) -> str:
+    """Last two path segments, so the same code hashes alike on every host."""
+    parts = path.replace("\\", "/").rstrip("/").split("/")
+    return "/".join(parts[-2:])
@@ -79,6 +79,9 @@ from ._03_impls import (
     # Monitor
     ExceptionMonitor,
     exception_monitor,
+    # Aggregator
+    ExceptionAggregator,
+    exception_aggregator,
     # Layer Rule
     LayerRule,
     layer_rule,
@@ -201,6 +204,8 @@ __all__ = [
     "file_path_to_module",
     "ExceptionMonitor",
     "exception_monitor",
+    "ExceptionAggregator",
+    "exception_aggregator",
     "LayerRule",
     "layer_rule",
     
@@ -1,9 +1,26 @@
 """
 Export module.
 
-Provides utilities for exporting data to Excel and CSV formats.
+Provides utilities for exporting data to Excel and CSV formats, and a
+background job runner for exports that are too large to build in-request.
 """
-from .exporter import ExportService
-
-__all__ = ["ExportService"]
+from .exporter import CsvStreamWriter, ExcelStreamWriter, ExportService
+from .jobs import (
+    ExportJob,
+    ExportJobManager,
+    ExportJobStatus,
+    ExportPayload,
+    export_job_manager,
+)
+# NOTE: router is imported lazily (see main.py) to avoid circular import with user dependencies
 
+__all__ = [
+    "ExportService",
+    "ExcelStreamWriter",
+    "CsvStreamWriter",
+    "ExportJob",
+    "ExportJobManager",
+    "ExportJobStatus",
+    "ExportPayload",
+    "export_job_manager",
+]
@@ -4,10 +4,12 @@ Export service.
 Provides functionality to export data to Excel and CSV formats.
 """
 import io
-from typing import Any, Optional
+import tempfile
+from typing import Any, BinaryIO, Iterable, Optional, Sequence
 from datetime import datetime
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, NamedStyle
 from openpyxl.utils import get_column_letter
 import csv
 
@@ -15,6 +17,171 @@ from ..logger import get_logger
 
 logger = get_logger(__name__)
 
+# Workbooks smaller than this stay in memory; larger ones roll over to disk
+EXCEL_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+# Upper bound for auto-sized column widths (in characters)
+EXCEL_MAX_COLUMN_WIDTH = 50
+
+TITLE_STYLE = "export_title"
+HEADER_STYLE = "export_header"
+CELL_STYLE = "export_cell"
+
+
+def _build_named_styles() -> list[NamedStyle]:
+    """Create the shared named styles used by write-only exports."""
+    title_style = NamedStyle(name=TITLE_STYLE)
+    title_style.font = Font(size=14, bold=True, color="FFFFFF")
+    title_style.alignment = Alignment(horizontal="center", vertical="center")
+    title_style.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+
+    header_style = NamedStyle(name=HEADER_STYLE)
+    header_style.font = Font(bold=True, size=11)
+    header_style.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+    header_style.fill = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+
+    cell_style = NamedStyle(name=CELL_STYLE)
+    cell_style.alignment = Alignment(vertical="top", wrap_text=True)
+
+    return [title_style, header_style, cell_style]
+
+
+def _format_excel_value(value: Any) -> Any:
+    """Normalize a value into something openpyxl can write."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict)):
+        return str(value)
+    return value
+
+
+def _format_csv_row(row_data: dict[str, Any]) -> dict[str, Any]:
+    """Format datetime and None values for CSV output."""
+    formatted_row = {}
+    for key, value in row_data.items():
+        if isinstance(value, datetime):
+            formatted_row[key] = value.strftime("%Y-%m-%d %H:%M:%S")
+        elif value is None:
+            formatted_row[key] = ""
+        else:
+            formatted_row[key] = value
+    return formatted_row
+
+
+class ExcelStreamWriter:
+    """
+    Write-only workbook that receives its rows in chunks.
+
+    Write-only sheets need column widths before the first row is written,
+    so widths are measured on `sample_rows` (e.g. the first chunk). The
+    workbook is saved to `output` by close().
+    """
+
+    def __init__(
+        self,
+        output: BinaryIO,
+        sheet_name: str = "Data",
+        headers: Optional[list[str]] = None,
+        title: Optional[str] = None,
+        sample_rows: Sequence[dict[str, Any]] = (),
+    ):
+        self.output = output
+        self.row_count = 0
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet(title=sheet_name)
+
+        # Set default headers if not provided
+        if not headers and sample_rows:
+            headers = list(sample_rows[0].keys())
+        self.headers = headers
+        if not headers:
+            # Empty data: close() saves an empty workbook
+            return
+
+        for style in _build_named_styles():
+            self._wb.add_named_style(style)
+
+        widths = [len(str(header)) for header in headers]
+        for row_data in sample_rows:
+            for col_idx, header in enumerate(headers):
+                value = _format_excel_value(row_data.get(header, ""))
+                if value != "":
+                    length = len(value) if isinstance(value, str) else len(str(value))
+                    if length > widths[col_idx]:
+                        widths[col_idx] = length
+
+        for col_num, width in enumerate(widths, 1):
+            self._ws.column_dimensions[get_column_letter(col_num)].width = min(
+                width + 2, EXCEL_MAX_COLUMN_WIDTH
+            )
+
+        # Add title row if provided
+        if title:
+            title_cell = WriteOnlyCell(self._ws, value=title)
+            title_cell.style = TITLE_STYLE
+            self._ws.append([title_cell])
+            self._ws.merged_cells.add(f"A1:{get_column_letter(len(headers))}1")
+
+        # Add headers
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(self._ws, value=header)
+            cell.style = HEADER_STYLE
+            header_cells.append(cell)
+        self._ws.append(header_cells)
+
+    def write_rows(self, rows: Iterable[dict[str, Any]]) -> None:
+        if not self.headers:
+            return
+        for row_data in rows:
+            row_cells = []
+            for header in self.headers:
+                cell = WriteOnlyCell(self._ws, value=_format_excel_value(row_data.get(header, "")))
+                cell.style = CELL_STYLE
+                row_cells.append(cell)
+            self._ws.append(row_cells)
+            self.row_count += 1
+
+    def close(self) -> None:
+        self._wb.save(self.output)
+
+
+class CsvStreamWriter:
+    """
+    CSV writer that receives its rows in chunks and writes UTF-8 bytes
+    (with a BOM for Excel) to a binary `output`.
+
+    Headers default to the keys of the first row; nothing is written when
+    there are no rows, matching ExportService.export_to_csv.
+    """
+
+    def __init__(self, output: BinaryIO, headers: Optional[list[str]] = None):
+        self.output = output
+        self.headers = headers
+        self.row_count = 0
+        self._header_written = False
+
+    def write_rows(self, rows: Sequence[dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if not self.headers:
+            self.headers = list(rows[0].keys())
+
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.headers, extrasaction="ignore")
+        if not self._header_written:
+            buffer.write("\ufeff")
+            writer.writeheader()
+            self._header_written = True
+        for row_data in rows:
+            writer.writerow(_format_csv_row(row_data))
+        self.output.write(buffer.getvalue().encode("utf-8"))
+        self.row_count += len(rows)
+
+    def close(self) -> None:
+        pass
+
 
 class ExportService:
     """Service for exporting data to Excel and CSV formats."""
@@ -25,6 +192,7 @@ class ExportService:
         sheet_name: str = "Data",
         headers: Optional[list[str]] = None,
         title: Optional[str] = None,
+        write_only: bool = True,
     ) -> bytes:
         """
         Export data to Excel format.
@@ -34,10 +202,24 @@ class ExportService:
             sheet_name: Name of the Excel sheet
             headers: Optional list of header names (if None, uses dict keys from first row)
             title: Optional title row
+            write_only: Use the streaming write-only engine (default). Set to False
+                to build a regular in-memory workbook.
 
         Returns:
             Excel file as bytes
         """
+        if write_only:
+            with tempfile.SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_SIZE) as output:
+                ExportService.write_excel(
+                    output,
+                    data=data,
+                    sheet_name=sheet_name,
+                    headers=headers,
+                    title=title,
+                )
+                output.seek(0)
+                return output.read()
+
         try:
             wb = Workbook()
             ws = wb.active
@@ -139,6 +321,56 @@ class ExportService:
             )
             raise
 
+    @staticmethod
+    def write_excel(
+        output: BinaryIO,
+        data: list[dict[str, Any]],
+        sheet_name: str = "Data",
+        headers: Optional[list[str]] = None,
+        title: Optional[str] = None,
+    ) -> None:
+        """
+        Write data to Excel format using openpyxl's write-only engine.
+
+        Rows are streamed to the output instead of being kept as cell objects,
+        and every cell shares one of three named styles. Column widths are
+        measured over all rows before the first one is written.
+
+        Args:
+            output: Seekable binary file object to write the workbook to
+            data: List of dictionaries containing data to export
+            sheet_name: Name of the Excel sheet
+            headers: Optional list of header names (if None, uses dict keys from first row)
+            title: Optional title row
+        """
+        try:
+            writer = ExcelStreamWriter(
+                output,
+                sheet_name=sheet_name,
+                headers=headers,
+                title=title,
+                sample_rows=data,
+            )
+            writer.write_rows(data)
+            writer.close()
+
+            logger.info(
+                f"Exported {len(data)} rows to Excel",
+                extra={
+                    "module_name": __name__,
+                    "sheet_name": sheet_name,
+                    "row_count": len(data),
+                },
+            )
+
+        except Exception as e:
+            logger.error(
+                f"Error exporting to Excel: {str(e)}",
+                exc_info=True,
+                extra={"export_module": __name__},
+            )
+            raise
+
     @staticmethod
     def export_to_csv(
         data: list[dict[str, Any]],
@@ -168,16 +400,7 @@ class ExportService:
             writer.writeheader()
 
             for row_data in data:
-                # Format datetime objects
-                formatted_row = {}
-                for key, value in row_data.items():
-                    if isinstance(value, datetime):
-                        formatted_row[key] = value.strftime("%Y-%m-%d %H:%M:%S")
-                    elif value is None:
-                        formatted_row[key] = ""
-                    else:
-                        formatted_row[key] = value
-                writer.writerow(formatted_row)
+                writer.writerow(_format_csv_row(row_data))
 
             csv_content = output.getvalue()
             output.close()
@@ -0,0 +1,435 @@
+"""
+Export jobs.
+
+Runs large exports outside the request cycle. Jobs are queued to a small
+in-process worker pool, written with the streaming Excel/CSV writers,
+uploaded to the private storage bucket and reported back with a signed
+download URL.
+
+Business modules register a producer per export kind. A producer receives
+the JSON-serializable job parameters and returns an ExportPayload. Its data
+is either a list of rows or an async iterable of row chunks; chunks are
+written to a spooled file as they arrive, so large exports are never held
+in memory as rows:
+
+    async def build_members_export(params: dict) -> ExportPayload:
+        ...
+
+    export_job_manager.register("members", build_members_export)
+
+    # From a request handler (returns immediately)
+    job = await export_job_manager.submit("members", params, "excel")
+
+    # Poll progress (re-signs the download URL once it has expired)
+    job = await export_job_manager.get(job.id)
+
+    # From a script (runs to completion in the current task)
+    job = await export_job_manager.run("members", params, "csv")
+"""
+import asyncio
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, AsyncIterable, Awaitable, BinaryIO, Callable, Optional, Union
+from uuid import uuid4
+
+from ..background import JobRegistry
+from ..config import settings
+from ..exception import ValidationError
+from ..logger import get_logger
+from ..storage import storage_service
+from .exporter import EXCEL_SPOOL_MAX_SIZE, CsvStreamWriter, ExcelStreamWriter
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = {
+    "excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("csv", "text/csv"),
+}
+
+
+class ExportJobStatus(str, Enum):
+    """Export job lifecycle states."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass(slots=True)
+class ExportPayload:
+    """Rows (or chunks of rows) and presentation options returned by an export producer."""
+
+    data: Union[list[dict[str, Any]], AsyncIterable[list[dict[str, Any]]]]
+    sheet_name: str
+    filename_prefix: str
+    headers: Optional[list[str]] = None
+    title: Optional[str] = None
+
+
+ExportProducer = Callable[[dict[str, Any]], Awaitable[ExportPayload]]
+
+
+@dataclass(slots=True)
+class ExportJob:
+    """Progress record for a single export job."""
+
+    id: str
+    kind: str
+    format: str
+    params: dict[str, Any]
+    requested_by: Optional[str] = None
+    status: ExportJobStatus = ExportJobStatus.QUEUED
+    stage: str = "queued"
+    progress: int = 0
+    row_count: Optional[int] = None
+    file_name: Optional[str] = None
+    file_path: Optional[str] = None
+    file_size: Optional[int] = None
+    download_url: Optional[str] = None
+    url_expires_at: Optional[datetime] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in (ExportJobStatus.COMPLETED, ExportJobStatus.FAILED)
+
+    def set_stage(self, stage: str, progress: int) -> None:
+        self.stage = stage
+        self.progress = progress
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the job for API responses and CLI output."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "format": self.format,
+            "status": self.status.value,
+            "stage": self.stage,
+            "progress": self.progress,
+            "row_count": self.row_count,
+            "file_name": self.file_name,
+            "file_size": self.file_size,
+            "download_url": self.download_url,
+            "url_expires_at": self.url_expires_at.isoformat() if self.url_expires_at else None,
+            "error": self.error,
+            "requested_by": self.requested_by,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ExportJobManager:
+    """In-process worker pool for export jobs."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        bucket: str = "private-files",
+        url_expires_in: int = 86400,
+        max_jobs: int = 200,
+    ):
+        """
+        Initialize export job manager.
+
+        Args:
+            workers: Number of concurrent export workers
+            bucket: Storage bucket for export artifacts
+            url_expires_in: Signed URL lifetime in seconds
+            max_jobs: Number of job records kept in memory
+        """
+        self.workers = max(1, workers)
+        self.bucket = bucket
+        self.url_expires_in = url_expires_in
+
+        self._producers: dict[str, ExportProducer] = {}
+        self._jobs: JobRegistry[ExportJob] = JobRegistry("Export job", max_jobs=max_jobs)
+        self._queue: Optional[asyncio.Queue[ExportJob]] = None
+        self._worker_tasks: list[asyncio.Task] = []
+
+        self._stats = {
+            "total_submitted": 0,
+            "total_completed": 0,
+            "total_failed": 0,
+        }
+
+    # =========================================================================
+    # Registration
+    # =========================================================================
+
+    def register(self, kind: str, producer: ExportProducer) -> None:
+        """Register the producer used to build rows for an export kind."""
+        self._producers[kind] = producer
+
+    @property
+    def kinds(self) -> list[str]:
+        return sorted(self._producers)
+
+    # =========================================================================
+    # Job API
+    # =========================================================================
+
+    async def submit(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        export_format: str = "excel",
+        requested_by: Optional[str] = None,
+    ) -> ExportJob:
+        """
+        Queue an export job and return its progress record immediately.
+
+        Args:
+            kind: Registered export kind (e.g. "members")
+            params: JSON-serializable producer parameters
+            export_format: "excel" or "csv"
+            requested_by: ID of the user that requested the export
+
+        Returns:
+            The queued ExportJob
+        """
+        job = self._create_job(kind, params, export_format, requested_by)
+        self._ensure_workers_started()
+        await self._queue.put(job)
+        return job
+
+    async def run(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        export_format: str = "excel",
+        requested_by: Optional[str] = None,
+    ) -> ExportJob:
+        """Run an export job to completion in the current task (used by scripts)."""
+        job = self._create_job(kind, params, export_format, requested_by)
+        await self._execute(job)
+        return job
+
+    async def get(self, job_id: str) -> ExportJob:
+        """
+        Get a job by ID, refreshing its download URL when it has expired.
+
+        Signing is a blocking storage API call, so it runs in a worker thread.
+
+        Raises:
+            NotFoundError: If the job is unknown (or has been evicted)
+        """
+        job = self._jobs.get(job_id)
+        if (
+            job.status == ExportJobStatus.COMPLETED
+            and job.url_expires_at
+            and job.url_expires_at <= datetime.now(timezone.utc)
+        ):
+            await asyncio.to_thread(self._sign, job)
+        return job
+
+    def list_jobs(self, requested_by: Optional[str] = None) -> list[ExportJob]:
+        """List known jobs, newest first."""
+        jobs = self._jobs.newest_first()
+        if requested_by:
+            return [job for job in jobs if job.requested_by == requested_by]
+        return jobs
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "workers": len([t for t in self._worker_tasks if not t.done()]),
+            "jobs_in_memory": len(self._jobs),
+        }
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Stop workers, giving running jobs up to `timeout` seconds to finish."""
+        if not self._worker_tasks:
+            return
+
+        if self._queue is not None and not self._queue.empty():
+            logger.warning(
+                f"Export job manager closing with {self._queue.qsize()} queued jobs",
+                extra={"module_name": __name__},
+            )
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.wait(self._worker_tasks, timeout=timeout)
+        self._worker_tasks = []
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _create_job(
+        self,
+        kind: str,
+        params: dict[str, Any],
+        export_format: str,
+        requested_by: Optional[str],
+    ) -> ExportJob:
+        if kind not in self._producers:
+            raise ValidationError(
+                f"Unknown export kind: {kind}",
+                field_errors={"kind": f"Must be one of: {', '.join(self.kinds)}"},
+            )
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                f"Unsupported export format: {export_format}",
+                field_errors={"format": f"Must be one of: {', '.join(EXPORT_FORMATS)}"},
+            )
+
+        job = ExportJob(
+            id=str(uuid4()),
+            kind=kind,
+            format=export_format,
+            params=params,
+            requested_by=str(requested_by) if requested_by else None,
+        )
+        self._jobs.add(job.id, job)
+        self._stats["total_submitted"] += 1
+        return job
+
+    def _ensure_workers_started(self) -> None:
+        """Start worker tasks on first use (lazy initialization)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._worker_tasks = [t for t in self._worker_tasks if not t.done()]
+        while len(self._worker_tasks) < self.workers:
+            self._worker_tasks.append(asyncio.create_task(self._worker_loop()))
+
+    async def _worker_loop(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: ExportJob) -> None:
+        """Produce, render, upload and sign a single job. Never raises."""
+        job.status = ExportJobStatus.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        extension, content_type = EXPORT_FORMATS[job.format]
+
+        try:
+            job.set_stage("fetching", 10)
+            payload = await self._producers[job.kind](job.params)
+
+            job.set_stage("rendering", 50)
+            with tempfile.SpooledTemporaryFile(max_size=EXCEL_SPOOL_MAX_SIZE) as output:
+                job.row_count = await self._write(payload, job.format, output)
+                output.seek(0)
+                content = await asyncio.to_thread(output.read)
+
+            job.set_stage("uploading", 80)
+            timestamp = job.started_at.strftime("%Y%m%d_%H%M%S")
+            job.file_name = f"{payload.filename_prefix}_{timestamp}.{extension}"
+            job.file_path = f"gangwon-portal/exports/{job.kind}/{job.id}/{job.file_name}"
+            await storage_service.upload_bytes(
+                content=content,
+                bucket=self.bucket,
+                path=job.file_path,
+                content_type=content_type,
+            )
+            job.file_size = len(content)
+
+            job.set_stage("signing", 95)
+            await asyncio.to_thread(self._sign, job)
+
+            job.status = ExportJobStatus.COMPLETED
+            job.set_stage("completed", 100)
+            self._stats["total_completed"] += 1
+        except asyncio.CancelledError:
+            job.status = ExportJobStatus.FAILED
+            job.error = "Export job was cancelled"
+            self._stats["total_failed"] += 1
+            raise
+        except Exception as e:
+            job.status = ExportJobStatus.FAILED
+            job.error = str(e)
+            self._stats["total_failed"] += 1
+            logger.error(
+                f"Export job failed: {job.kind} ({job.id}): {str(e)}",
+                exc_info=True,
+                extra={"export_module": __name__, "job_id": job.id, "kind": job.kind},
+            )
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+        if job.status == ExportJobStatus.COMPLETED:
+            logger.info(
+                f"Export job completed: {job.kind} ({job.row_count} rows)",
+                extra={
+                    "module_name": __name__,
+                    "job_id": job.id,
+                    "kind": job.kind,
+                    "row_count": job.row_count,
+                    "file_size": job.file_size,
+                    "duration_ms": int((job.finished_at - job.started_at).total_seconds() * 1000),
+                },
+            )
+
+    @staticmethod
+    async def _write(payload: ExportPayload, export_format: str, output: BinaryIO) -> int:
+        """
+        Write the payload to `output` chunk by chunk. Returns the row count.
+
+        Fetching the next chunk runs on the event loop while writing runs in a
+        worker thread. Excel column widths are measured on the first chunk.
+        """
+        if isinstance(payload.data, list):
+            chunks = _single_chunk(payload.data)
+        else:
+            chunks = payload.data
+
+        writer = None
+        async for rows in chunks:
+            if not rows:
+                continue
+            if writer is None:
+                writer = await asyncio.to_thread(_open_writer, payload, export_format, output, rows)
+            await asyncio.to_thread(writer.write_rows, rows)
+
+        if writer is None:
+            writer = _open_writer(payload, export_format, output, [])
+        await asyncio.to_thread(writer.close)
+        return writer.row_count
+
+    def _sign(self, job: ExportJob) -> None:
+        job.download_url = storage_service.create_signed_url(
+            self.bucket, job.file_path, expires_in=self.url_expires_in
+        )
+        job.url_expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.url_expires_in)
+
+
+async def _single_chunk(rows: list[dict[str, Any]]) -> AsyncIterable[list[dict[str, Any]]]:
+    yield rows
+
+
+def _open_writer(
+    payload: ExportPayload,
+    export_format: str,
+    output: BinaryIO,
+    first_rows: list[dict[str, Any]],
+):
+    if export_format == "excel":
+        return ExcelStreamWriter(
+            output,
+            sheet_name=payload.sheet_name,
+            headers=payload.headers,
+            title=payload.title,
+            sample_rows=first_rows,
+        )
+    return CsvStreamWriter(output, headers=payload.headers)
+
+
+# Global export job manager instance
+export_job_manager = ExportJobManager(
+    workers=settings.EXPORT_JOB_WORKERS,
+    bucket=settings.EXPORT_JOB_BUCKET,
+    url_expires_in=settings.EXPORT_JOB_URL_EXPIRES_IN,
+)
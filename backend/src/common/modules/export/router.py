@@ -0,0 +1,44 @@
+"""
+Export job router.
+
+API endpoints for tracking background export jobs (admin only).
+Jobs are submitted through the regular export endpoints with `background=true`.
+"""
+from fastapi import APIRouter, Depends, Query
+
+from .jobs import export_job_manager
+
+router = APIRouter()
+
+
+def get_admin_user_dependency():
+    """
+    Lazy import of get_current_admin_user to avoid circular import issues.
+    """
+    from ....modules.user.dependencies import get_current_admin_user
+    return get_current_admin_user
+
+
+@router.get("/api/admin/exports", tags=["admin-exports"], summary="List export jobs")
+async def list_export_jobs(
+    mine: bool = Query(False, description="Only show jobs requested by the current admin"),
+    current_user: dict = Depends(get_admin_user_dependency()),
+):
+    """List background export jobs, newest first (admin only)."""
+    requested_by = str(current_user.get("id")) if mine else None
+    jobs = export_job_manager.list_jobs(requested_by=requested_by)
+    return {"items": [job.to_dict() for job in jobs], "total": len(jobs)}
+
+
+@router.get("/api/admin/exports/{job_id}", tags=["admin-exports"], summary="Get export job")
+async def get_export_job(
+    job_id: str,
+    current_user: dict = Depends(get_admin_user_dependency()),
+):
+    """
+    Get export job progress (admin only).
+
+    Completed jobs include a signed `download_url` for the generated file.
+    """
+    job = await export_job_manager.get(job_id)
+    return job.to_dict()
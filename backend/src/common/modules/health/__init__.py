@@ -21,15 +21,22 @@ Health Check Module
         }
     )
     HealthService.configure(config=config)
+    
+    # 3. 启动/停止后台探测（接口返回最新快照，?fresh=1 仅限管理员）
+    HealthService.start_prober()       # lifespan 启动时
+    await HealthService.stop_prober()  # lifespan 关闭时
 """
 
 from .router import router
 from .service import HealthService
+from .prober import HealthProber, HealthSnapshot
 from .config import HealthModuleConfig, ServiceConfig, configure, get_default_config
 
 __all__ = [
     "router",
     "HealthService",
+    "HealthProber",
+    "HealthSnapshot",
     "HealthModuleConfig",
     "ServiceConfig",
     "configure",
@@ -9,6 +9,10 @@ Health Module Adapter
 """
 
 import logging
+from typing import Optional
+
+from fastapi import Depends, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 logger = logging.getLogger(__name__)
 
@@ -64,12 +68,29 @@ except ImportError:
 # 迁移时修改这个 import 路径指向新项目的认证中间件
 # ============================================================
 
-try:
-    from ..interceptor.auth import get_current_admin_user
-except ImportError:
-    # 如果没有认证中间件，提供一个空实现
-    async def get_current_admin_user():
-        return {"id": "anonymous", "role": "admin"}
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def get_current_admin_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer),
+) -> dict:
+    """管理员认证（延迟导入，避免循环依赖）"""
+    from ....modules.user.dependencies import get_current_admin_user as _get_current_admin_user
+    return await _get_current_admin_user(credentials)
+
+
+async def is_admin_request(request: Request) -> bool:
+    """请求是否带有有效的、已启用管理员的令牌（公开接口中判断管理员功能，不抛出认证错误）"""
+    credentials = await _bearer(request)
+    if credentials is None:
+        return False
+    try:
+        from ....modules.user.dependencies import get_current_user_optional
+        user = await get_current_user_optional(credentials)
+    except Exception:
+        return False
+    # 与 get_current_admin_user 一致：停用的管理员不算管理员
+    return bool(user) and user.get("role") == "admin" and user.get("is_active") == "true"
 
 
 # ============================================================
@@ -115,3 +136,8 @@ def get_app_version():
 def get_auth_dependency():
     """获取认证依赖"""
     return get_current_admin_user
+
+
+def get_admin_check():
+    """获取"是否管理员请求"的判断函数"""
+    return is_admin_request
@@ -20,9 +20,17 @@ class ServiceConfig(BaseModel):
 class HealthModuleConfig(BaseModel):
     """健康检查模块配置"""
     
-    # 缓存配置
+    # 缓存配置（后台探测关闭时，快照的最大年龄）
     cache_ttl: int = 60  # Increased from 30 to reduce external service checks
     
+    # 后台探测配置（每项检查按自己的间隔刷新，接口只返回最新快照）
+    probe_enabled: bool = True
+    database_probe_interval: float = 30.0  # 数据库连通性
+    database_metrics_probe_interval: float = 300.0  # 数据库大小、连接数（pg_database_size / pg_stat_activity）
+    external_probe_interval: float = 60.0  # 外部服务（如 Render）
+    custom_probe_interval: float = 60.0  # register_check 注册的检查
+    probe_timeout: float = 10.0  # 单次检查的超时时间
+    
     # 检查超时
     default_timeout: float = 3.0  # Reduced from 5.0 for faster failure on cold starts
     
@@ -74,6 +82,10 @@ def get_default_config() -> HealthModuleConfig:
             external_services=external_services,
             enable_database_metrics=os.getenv("HEALTH_ENABLE_DB_METRICS", "true").lower() == "true",
             enable_external_services=os.getenv("HEALTH_ENABLE_EXTERNAL", "true").lower() == "true",
+            probe_enabled=os.getenv("HEALTH_PROBE_ENABLED", "true").lower() == "true",
+            database_probe_interval=float(os.getenv("HEALTH_DB_PROBE_INTERVAL", "30")),
+            database_metrics_probe_interval=float(os.getenv("HEALTH_DB_METRICS_PROBE_INTERVAL", "300")),
+            external_probe_interval=float(os.getenv("HEALTH_EXTERNAL_PROBE_INTERVAL", "60")),
             app_version=os.getenv("APP_VERSION", "1.0.0")
         )
     
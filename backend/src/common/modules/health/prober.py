@@ -0,0 +1,187 @@
+"""
+Health Prober
+后台健康探测 - 每项检查按各自的间隔在后台刷新，接口只读取最新快照
+
+外部监控频繁访问健康检查接口时，不再每次请求都查询数据库和外部服务：
+    prober.register("database", check_database, interval=30)
+    prober.start()                                   # 启动时
+    snapshot = await prober.get_or_refresh("database", max_age=60)
+    await prober.close()                             # 关闭时
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HealthSnapshot:
+    """单项检查的最新结果"""
+    data: Any
+    checked_at: datetime
+    checked_monotonic: float
+    duration_ms: float
+
+    def age_seconds(self) -> float:
+        """结果的年龄（秒）"""
+        return round(time.monotonic() - self.checked_monotonic, 1)
+
+
+@dataclass
+class HealthProbe:
+    """注册的检查项"""
+    name: str
+    check: Callable[[], Awaitable[Any]]
+    interval: float
+
+
+class HealthProber:
+    """
+    后台健康探测器
+
+    - 每项检查一个后台任务，按自己的间隔刷新
+    - 同一检查的并发刷新合并为一次（例如多个 ?fresh=1 请求）
+    - 检查异常或超时记为 unhealthy 结果，不抛出
+    """
+
+    def __init__(self, timeout: float = 10.0):
+        """
+        Args:
+            timeout: 单次检查的超时时间（秒）
+        """
+        self.timeout = timeout
+        self._probes: Dict[str, HealthProbe] = {}
+        self._snapshots: Dict[str, HealthSnapshot] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._running = False
+
+        self._stats: Dict[str, Any] = {
+            "total_checks": 0,
+            "total_failures": 0,
+            "total_on_demand": 0,
+        }
+
+    def register(self, name: str, check: Callable[[], Awaitable[Any]], interval: float) -> None:
+        """注册检查项（探测器已启动时立即开始刷新）"""
+        self._probes[name] = HealthProbe(name=name, check=check, interval=max(1.0, interval))
+        if self._running:
+            self._start_task(name)
+
+    def has(self, name: str) -> bool:
+        return name in self._probes
+
+    def get(self, name: str) -> Optional[HealthSnapshot]:
+        """获取最新快照（尚未检查过则为 None）"""
+        return self._snapshots.get(name)
+
+    async def get_or_refresh(self, name: str, max_age: float, fresh: bool = False) -> HealthSnapshot:
+        """
+        获取快照；fresh、尚无快照或快照超过 max_age 时立即检查
+
+        后台任务运行时快照按间隔刷新，max_age 只在探测器未启动时起作用
+        """
+        snapshot = self._snapshots.get(name)
+        if fresh or snapshot is None or (not self._running and snapshot.age_seconds() > max_age):
+            self._stats["total_on_demand"] += 1
+            snapshot = await self.refresh(name)
+        return snapshot
+
+    async def refresh(self, name: str) -> HealthSnapshot:
+        """立即执行一次检查并更新快照"""
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        requested_at = time.monotonic()
+        async with lock:
+            # 等待期间已有其他请求完成了检查，直接使用其结果
+            snapshot = self._snapshots.get(name)
+            if snapshot is not None and snapshot.checked_monotonic >= requested_at:
+                return snapshot
+
+            probe = self._probes[name]
+            self._stats["total_checks"] += 1
+            started = time.monotonic()
+            try:
+                data = await asyncio.wait_for(probe.check(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                self._stats["total_failures"] += 1
+                data = {"status": "unhealthy", "error": "timeout"}
+            except Exception as e:
+                self._stats["total_failures"] += 1
+                logger.warning(f"Health check '{name}' failed: {e}")
+                data = {"status": "unhealthy", "error": str(e)}
+
+            finished = time.monotonic()
+            snapshot = HealthSnapshot(
+                data=data,
+                checked_at=datetime.now(timezone.utc),
+                checked_monotonic=finished,
+                duration_ms=round((finished - started) * 1000, 2),
+            )
+            self._snapshots[name] = snapshot
+            return snapshot
+
+    def describe(self, name: str, snapshot: HealthSnapshot, max_age: float) -> Dict[str, Any]:
+        """快照的时效信息（用于接口响应）"""
+        probe = self._probes.get(name)
+        if self._running and probe is not None:
+            # 后台任务两个周期都没有刷新，视为过期
+            stale_after = probe.interval * 2 + self.timeout
+        else:
+            stale_after = max_age
+        age = snapshot.age_seconds()
+        return {
+            "checkedAt": snapshot.checked_at.isoformat(),
+            "ageSeconds": age,
+            "durationMs": snapshot.duration_ms,
+            "stale": age > stale_after,
+        }
+
+    def start(self) -> None:
+        """启动所有检查的后台任务（幂等）"""
+        self._running = True
+        for name in self._probes:
+            self._start_task(name)
+
+    def cancel(self) -> List[asyncio.Task]:
+        """取消后台任务，不等待结束（供同步代码调用），返回被取消的任务"""
+        self._running = False
+        tasks, self._tasks = list(self._tasks.values()), {}
+        for task in tasks:
+            task.cancel()
+        return tasks
+
+    async def close(self) -> None:
+        """停止后台任务并等待结束"""
+        tasks = self.cancel()
+        for task in tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "running": self._running,
+            "probes": {name: probe.interval for name, probe in self._probes.items()},
+        }
+
+    def _start_task(self, name: str) -> None:
+        task = self._tasks.get(name)
+        if task is None or task.done():
+            self._tasks[name] = asyncio.create_task(self._run_loop(name))
+
+    async def _run_loop(self, name: str) -> None:
+        while True:
+            try:
+                await self.refresh(name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Health probe '{name}' failed: {e}")
+            await asyncio.sleep(self._probes[name].interval)
@@ -1,43 +1,52 @@
 """
 Health Check Router
 系统健康检查 API 路由
+
+各接口返回后台探测的最新快照（snapshot 字段给出结果的年龄和是否过期），
+管理员可以用 ?fresh=1 立即重新检查。
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from typing import Dict, Any
 
 from .service import HealthService
-from .adapter import get_auth_dependency
+from .adapter import get_auth_dependency, get_admin_check
 
 router = APIRouter(prefix="/api/health", tags=["Health"])
 
 # 获取认证依赖
 _get_current_admin_user = get_auth_dependency()
+_is_admin_request = get_admin_check()
 
 
 @router.get("")
 async def get_system_health(
-    skip_external: bool = False
+    request: Request,
+    skip_external: bool = False,
+    fresh: bool = False
 ) -> Dict[str, Any]:
     """
     获取系统健康状态（公开接口，用于外部监控）
-    
+
     Args:
         skip_external: 是否跳过外部服务检查（防止循环调用）
+        fresh: 立即重新检查（仅管理员有效，其他请求返回快照）
     """
-    return await HealthService.get_system_health(skip_external=skip_external)
+    fresh = fresh and await _is_admin_request(request)
+    return await HealthService.get_system_health(skip_external=skip_external, fresh=fresh)
 
 
 @router.get("/detailed")
 async def get_detailed_health(
+    fresh: bool = False,
     current_user: dict = Depends(_get_current_admin_user)
 ) -> Dict[str, Any]:
     """
     获取详细的系统健康状态（需要管理员权限）
     """
-    health = await HealthService.get_system_health()
-    db_metrics = await HealthService.get_database_metrics()
-    
+    health = await HealthService.get_system_health(fresh=fresh)
+    db_metrics = await HealthService.get_database_metrics(fresh=fresh)
+
     return {
         **health,
         "database_metrics": db_metrics
@@ -46,19 +55,21 @@ async def get_detailed_health(
 
 @router.get("/database")
 async def get_database_health(
+    fresh: bool = False,
     current_user: dict = Depends(_get_current_admin_user)
 ) -> Dict[str, Any]:
     """
     获取数据库详细指标（需要管理员权限）
     """
-    return await HealthService.get_database_metrics()
+    return await HealthService.get_database_metrics(fresh=fresh)
 
 
 @router.get("/render")
 async def get_render_status(
+    fresh: bool = False,
     current_user: dict = Depends(_get_current_admin_user)
 ) -> Dict[str, Any]:
     """
     获取 Render 服务状态（需要管理员权限）
     """
-    return await HealthService.get_render_status()
+    return await HealthService.get_render_status(fresh=fresh)
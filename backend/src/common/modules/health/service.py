@@ -13,6 +13,7 @@ from datetime import datetime
 from sqlalchemy import text
 
 from .config import get_default_config, HealthModuleConfig, ServiceConfig
+from .prober import HealthProber
 from .adapter import (
     get_db_session_factory, 
     get_app_version, 
@@ -32,10 +33,10 @@ class HealthService:
     - 通过 config 配置外部服务
     - 通过 db_session_factory 注入数据库连接
     - 支持自定义检查函数
+    - 各项检查由后台探测器按间隔刷新，接口返回最新快照（fresh=True 时立即检查）
     """
     
-    # 健康状态缓存（避免频繁查询）
-    _cache: Dict[str, Any] = {}
+    _prober: Optional[HealthProber] = None
     _config: Optional[HealthModuleConfig] = None
     _db_session_factory: Optional[Callable] = None
     _custom_checks: Dict[str, Callable] = {}
@@ -55,11 +56,65 @@ class HealthService:
         """
         cls._config = config or get_default_config()
         cls._db_session_factory = db_session_factory
+        # 按新配置重新注册检查项（应在 start_prober 之前调用）；
+        # 旧探测器的后台任务先取消，否则会按旧配置继续运行
+        if cls._prober is not None:
+            cls._prober.cancel()
+        cls._prober = None
     
     @classmethod
     def register_check(cls, name: str, check_func: Callable) -> None:
         """注册自定义健康检查"""
         cls._custom_checks[name] = check_func
+        if cls._prober is not None:
+            cls._prober.register(f"custom:{name}", check_func, cls._get_config().custom_probe_interval)
+    
+    @classmethod
+    def _get_prober(cls) -> HealthProber:
+        """获取探测器，首次使用时按配置注册检查项"""
+        if cls._prober is None:
+            config = cls._get_config()
+            prober = HealthProber(timeout=config.probe_timeout)
+            prober.register("database", cls._check_database, config.database_probe_interval)
+            if config.enable_database_metrics:
+                prober.register("database_metrics", cls._collect_database_metrics, config.database_metrics_probe_interval)
+            if config.enable_external_services and config.external_services:
+                prober.register("external", cls._check_external_services, config.external_probe_interval)
+            for name, check_func in cls._custom_checks.items():
+                prober.register(f"custom:{name}", check_func, config.custom_probe_interval)
+            cls._prober = prober
+        return cls._prober
+    
+    @classmethod
+    def start_prober(cls) -> None:
+        """启动后台探测（应用启动时调用）"""
+        if cls._get_config().probe_enabled:
+            cls._get_prober().start()
+    
+    @classmethod
+    async def stop_prober(cls) -> None:
+        """停止后台探测（应用关闭时调用）"""
+        if cls._prober is not None:
+            await cls._prober.close()
+    
+    @classmethod
+    async def _snapshot(cls, name: str, fresh: bool, meta: Dict[str, Any]) -> Any:
+        """获取检查项的快照数据，并把时效信息写入 meta"""
+        prober = cls._get_prober()
+        max_age = cls._get_config().cache_ttl
+        snapshot = await prober.get_or_refresh(name, max_age=max_age, fresh=fresh)
+        meta[name] = prober.describe(name, snapshot, max_age)
+        return snapshot.data
+    
+    @staticmethod
+    def _snapshot_info(meta: Dict[str, Any], fresh: bool) -> Dict[str, Any]:
+        """响应中的快照信息：最旧结果的年龄、是否过期、各项检查的时间"""
+        return {
+            "fresh": fresh,
+            "ageSeconds": max((m["ageSeconds"] for m in meta.values()), default=0),
+            "stale": any(m["stale"] for m in meta.values()),
+            "checks": meta,
+        }
     
     @classmethod
     def _get_config(cls) -> HealthModuleConfig:
@@ -80,48 +135,35 @@ class HealthService:
         raise RuntimeError("No database session factory configured")
     
     @classmethod
-    async def get_system_health(cls, skip_external: bool = False) -> Dict[str, Any]:
+    async def get_system_health(cls, skip_external: bool = False, fresh: bool = False) -> Dict[str, Any]:
         """
         获取完整的系统健康状态
         
+        返回后台探测的最新快照（snapshot 字段给出各项结果的年龄），
+        不会因为请求而查询数据库或外部服务。
+        
         Args:
             skip_external: 是否跳过外部服务检查（防止循环调用）
+            fresh: 是否立即重新检查（仅限管理员）
         """
         config = cls._get_config()
+        prober = cls._get_prober()
+        meta: Dict[str, Any] = {}
         
-        # 检查缓存
-        cache_key = f"system_health_{skip_external}"
-        if cache_key in cls._cache:
-            cached = cls._cache[cache_key]
-            if time.time() - cached["timestamp"] < config.cache_ttl:
-                return cached["data"]
-        
-        # 构建检查任务列表
-        tasks = [
-            cls._check_database(),
-            cls._check_api(),
-            cls._check_storage(),
-        ]
-        
-        # 添加外部服务检查（仅当未跳过时）
-        if not skip_external and config.enable_external_services and config.external_services:
-            tasks.append(cls._check_external_services())
-        
-        # 添加自定义检查
-        for check_func in cls._custom_checks.values():
-            tasks.append(check_func())
-        
-        # 并行检查各个服务
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # 构建检查列表（API、存储检查无 I/O，直接计算）
+        names = ["database"]
+        if not skip_external and prober.has("external"):
+            names.append("external")
+        names.extend(f"custom:{name}" for name in cls._custom_checks)
         
-        db_health = results[0] if not isinstance(results[0], Exception) else {"status": "unhealthy", "error": str(results[0])}
-        api_health = results[1] if not isinstance(results[1], Exception) else {"status": "unhealthy", "error": str(results[1])}
-        storage_health = results[2] if not isinstance(results[2], Exception) else {"status": "unhealthy", "error": str(results[2])}
+        # 并行获取各项快照（fresh 时并行检查）
+        results = await asyncio.gather(*(cls._snapshot(name, fresh, meta) for name in names))
+        snapshots = dict(zip(names, results))
         
-        external_health = {}
-        # 只有当添加了外部服务检查任务时才访问 results[3]
-        if not skip_external and config.enable_external_services and config.external_services:
-            external_health = results[3] if not isinstance(results[3], Exception) else {}
+        db_health = snapshots["database"]
+        api_health = await cls._check_api()
+        storage_health = await cls._check_storage()
+        external_health = snapshots.get("external") or {}
         
         # 计算整体状态
         statuses = [db_health.get("status"), api_health.get("status"), storage_health.get("status")]
@@ -142,37 +184,43 @@ class HealthService:
                 "storage": storage_health,
                 "cache": {"status": "healthy", "type": "memory"}
             },
+            "snapshot": cls._snapshot_info(meta, fresh),
         }
         
+        # 添加自定义检查结果
+        for name in cls._custom_checks:
+            health_data["services"][name] = snapshots[f"custom:{name}"]
+        
         # 添加外部服务状态
         if external_health:
             health_data["render"] = external_health
         
-        # 更新缓存
-        cls._cache[cache_key] = {
-            "timestamp": time.time(),
-            "data": health_data
-        }
-        
         return health_data
     
     @classmethod
-    async def get_database_metrics(cls) -> Dict[str, Any]:
+    async def get_database_metrics(cls, fresh: bool = False) -> Dict[str, Any]:
         """
-        获取数据库详细指标
+        获取数据库详细指标（后台探测的快照，fresh 时立即查询）
         """
         config = cls._get_config()
         if not config.enable_database_metrics:
             return {"status": "disabled", "message": "Database metrics disabled"}
         
+        meta: Dict[str, Any] = {}
+        metrics = await cls._snapshot("database_metrics", fresh, meta)
+        return {**metrics, "snapshot": cls._snapshot_info(meta, fresh)}
+    
+    @classmethod
+    async def _collect_database_metrics(cls) -> Dict[str, Any]:
+        """查询数据库详细指标（pg_database_size、pg_stat_activity 等）"""
         try:
             # 优先使用 Supabase 客户端
             if is_using_supabase():
                 client = get_supabase_client_instance()
                 if client:
                     start_time = time.time()
-                    # 测试连接响应时间
-                    result = client.table('members').select('id').limit(1).execute()
+                    # 测试连接响应时间（同步客户端，放到线程中执行）
+                    await asyncio.to_thread(client.table('members').select('id').limit(1).execute)
                     response_time = round((time.time() - start_time) * 1000, 2)
                     
                     return {
@@ -257,8 +305,8 @@ class HealthService:
                 client = get_supabase_client_instance()
                 if client:
                     start_time = time.time()
-                    # 简单查询测试连接
-                    result = client.table('members').select('id').limit(1).execute()
+                    # 简单查询测试连接（同步客户端，放到线程中执行）
+                    await asyncio.to_thread(client.table('members').select('id').limit(1).execute)
                     response_time = round((time.time() - start_time) * 1000, 2)
                     
                     return {
@@ -388,6 +436,11 @@ class HealthService:
         return results
     
     @classmethod
-    async def get_render_status(cls) -> Dict[str, Any]:
-        """获取外部服务状态（独立接口）"""
-        return await cls._check_external_services()
+    async def get_render_status(cls, fresh: bool = False) -> Dict[str, Any]:
+        """获取外部服务状态（独立接口，后台探测的快照）"""
+        prober = cls._get_prober()
+        if not prober.has("external"):
+            return {}
+        meta: Dict[str, Any] = {}
+        services = await cls._snapshot("external", fresh, meta)
+        return {**services, "snapshot": cls._snapshot_info(meta, fresh)}
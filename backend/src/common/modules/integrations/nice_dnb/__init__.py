@@ -5,6 +5,15 @@ Provides company information verification and search functionality
 through the Nice D&B Open API.
 """
 
+from .bulk import (
+    MAX_CSV_BYTES,
+    MAX_CSV_ROWS,
+    BulkVerificationJob,
+    NiceDnBBulkVerifier,
+    bulk_verifier,
+    parse_business_numbers,
+)
+from .cache import NiceDnBCache, nice_dnb_cache
 from .service import NiceDnBClient, nice_dnb_client
 from .schemas import (
     NiceDnBCompanyData,
@@ -13,6 +22,14 @@ from .schemas import (
 )
 
 __all__ = [
+    "MAX_CSV_BYTES",
+    "MAX_CSV_ROWS",
+    "BulkVerificationJob",
+    "NiceDnBBulkVerifier",
+    "bulk_verifier",
+    "parse_business_numbers",
+    "NiceDnBCache",
+    "nice_dnb_cache",
     "NiceDnBClient",
     "nice_dnb_client",
     "NiceDnBCompanyData",
@@ -0,0 +1,341 @@
+"""
+Nice D&B bulk verification.
+
+Resolves many business numbers in one job, e.g. the annual re-verification
+of the member base:
+
+1. Normalize and dedupe the input (invalid numbers are reported, not queried)
+2. Skip numbers with a fresh `nice_dnb_company_info` row (unless refresh)
+3. Query the rest with bounded concurrency and a requests-per-second limit
+4. Upsert results in batches instead of one write per company
+
+    # From a request handler (returns immediately)
+    job = bulk_verifier.submit(["123-45-67890", ...], requested_by=user_id)
+
+    # From a script (runs to completion in the current task)
+    job = await bulk_verifier.run(numbers)
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+from ...background import JobRegistry, RateLimiter
+from ...config.settings import settings
+from ...exception import ValidationError
+from ...logger import get_logger
+from .cache import nice_dnb_cache
+from .schemas import NiceDnBResponse
+
+logger = get_logger(__name__)
+
+BUSINESS_NUMBER_PATTERN = re.compile(r"^\d{10}$")
+MAX_BULK_SIZE = 50000
+# Upload limits, checked before parsing (a header plus some blank/extra rows)
+MAX_CSV_BYTES = 5 * 1024 * 1024
+MAX_CSV_ROWS = MAX_BULK_SIZE + 1000
+
+
+def normalize_business_number(value: str) -> str:
+    """Strip hyphens and whitespace from a business registration number."""
+    return re.sub(r"[\s-]", "", str(value or ""))
+
+
+def parse_business_numbers(text: str, max_rows: Optional[int] = None) -> List[str]:
+    """
+    Extract business numbers from CSV (or newline separated) text.
+
+    Every cell that looks like a business number (10 digits, hyphens
+    allowed) is used, so header rows and extra columns are ignored.
+
+    Raises:
+        ValidationError: If the text has more than `max_rows` rows
+    """
+    numbers = []
+    for row_count, row in enumerate(csv.reader(io.StringIO(text)), start=1):
+        if max_rows is not None and row_count > max_rows:
+            raise ValidationError(
+                f"Too many CSV rows: more than {max_rows}",
+                field_errors={"file": f"At most {max_rows} rows per file"},
+            )
+        for cell in row:
+            normalized = normalize_business_number(cell)
+            if BUSINESS_NUMBER_PATTERN.match(normalized):
+                numbers.append(normalized)
+    return numbers
+
+
+@dataclass(slots=True)
+class BulkVerificationJob:
+    """Progress record and results for a bulk verification job."""
+
+    id: str
+    total: int
+    requested_by: Optional[str] = None
+    refresh: bool = False
+    status: str = "queued"  # queued, running, completed, failed
+    processed: int = 0
+    results: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    invalid: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def progress(self) -> int:
+        if not self.total:
+            return 100
+        return int(self.processed * 100 / self.total)
+
+    def record(self, business_number: str, outcome: str, response: Optional[NiceDnBResponse] = None) -> None:
+        self.results[business_number] = {
+            "business_number": business_number,
+            "status": outcome,  # verified, cached, failed
+            "company_name": response.data.company_name if response else None,
+            "representative": response.data.representative if response else None,
+        }
+        self.processed += 1
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"verified": 0, "cached": 0, "failed": 0, "invalid": len(self.invalid)}
+        for result in self.results.values():
+            counts[result["status"]] += 1
+        return counts
+
+    def to_dict(self, include_results: bool = False) -> Dict[str, Any]:
+        data = {
+            "id": self.id,
+            "status": self.status,
+            "progress": self.progress,
+            "total": self.total,
+            "processed": self.processed,
+            "counts": self.counts(),
+            "refresh": self.refresh,
+            "error": self.error,
+            "requested_by": self.requested_by,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+        if include_results:
+            data["results"] = list(self.results.values())
+            data["invalid"] = self.invalid
+        return data
+
+
+class NiceDnBBulkVerifier:
+    """Runs bulk verification jobs with bounded concurrency and rate limiting."""
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        rate_per_second: float = 5.0,
+        upsert_batch_size: int = 100,
+        max_jobs: int = 20,
+    ):
+        """
+        Initialize bulk verifier.
+
+        Args:
+            concurrency: API lookups in flight per job
+            rate_per_second: Maximum API lookups per second across jobs (0 = unlimited)
+            upsert_batch_size: Results written per upsert
+            max_jobs: Number of job records kept in memory
+        """
+        self.concurrency = max(1, concurrency)
+        self.upsert_batch_size = max(1, upsert_batch_size)
+
+        self._jobs: JobRegistry[BulkVerificationJob] = JobRegistry("Bulk verification job", max_jobs=max_jobs)
+        # Shared by all jobs, so concurrent jobs together stay under the API limit
+        self.rate_limiter = RateLimiter(rate_per_second)
+
+        self._stats = {
+            "total_jobs": 0,
+            "total_api_lookups": 0,
+            "total_skipped_fresh": 0,
+        }
+
+    # =========================================================================
+    # Job API
+    # =========================================================================
+
+    def submit(
+        self,
+        business_numbers: Iterable[str],
+        requested_by: Optional[str] = None,
+        refresh: bool = False,
+    ) -> BulkVerificationJob:
+        """Start a bulk verification in the background and return its record."""
+        job, numbers = self._create_job(business_numbers, requested_by, refresh)
+        self._jobs.spawn(self._execute(job, numbers))
+        return job
+
+    async def run(
+        self,
+        business_numbers: Iterable[str],
+        requested_by: Optional[str] = None,
+        refresh: bool = False,
+    ) -> BulkVerificationJob:
+        """Run a bulk verification to completion in the current task (used by scripts)."""
+        job, numbers = self._create_job(business_numbers, requested_by, refresh)
+        await self._execute(job, numbers)
+        return job
+
+    def get(self, job_id: str) -> BulkVerificationJob:
+        return self._jobs.get(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "running": self._jobs.running,
+            "jobs_in_memory": len(self._jobs),
+        }
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Wait up to `timeout` seconds for running jobs, then cancel them."""
+        await self._jobs.close(timeout)
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _create_job(
+        self,
+        business_numbers: Iterable[str],
+        requested_by: Optional[str],
+        refresh: bool,
+    ) -> Tuple[BulkVerificationJob, List[str]]:
+        numbers: Dict[str, None] = {}
+        invalid: Dict[str, None] = {}
+        for value in business_numbers:
+            normalized = normalize_business_number(value)
+            if BUSINESS_NUMBER_PATTERN.match(normalized):
+                numbers[normalized] = None
+            elif normalized:
+                invalid[str(value)] = None
+
+        if not numbers:
+            raise ValidationError(
+                "No valid business numbers provided",
+                field_errors={"business_numbers": "Expected 10-digit business registration numbers"},
+            )
+        if len(numbers) > MAX_BULK_SIZE:
+            raise ValidationError(
+                f"Too many business numbers: {len(numbers)}",
+                field_errors={"business_numbers": f"At most {MAX_BULK_SIZE} per job"},
+            )
+
+        job = BulkVerificationJob(
+            id=str(uuid4()),
+            total=len(numbers),
+            requested_by=str(requested_by) if requested_by else None,
+            refresh=refresh,
+            invalid=list(invalid),
+        )
+        self._jobs.add(job.id, job)
+        self._stats["total_jobs"] += 1
+        return job, list(numbers)
+
+    async def _execute(self, job: BulkVerificationJob, numbers: List[str]) -> None:
+        """Resolve all numbers of a job. Never raises (except on cancellation)."""
+        from .service import nice_dnb_client
+
+        job.status = "running"
+        job.started_at = datetime.now(timezone.utc)
+        try:
+            # Dedupe against stored results: one query per chunk instead of one per number
+            pending = numbers
+            if not job.refresh:
+                cached = await nice_dnb_cache.get_many(numbers)
+                pending = []
+                for business_number in numbers:
+                    entry = cached.get(business_number)
+                    if entry is not None and nice_dnb_cache.is_fresh(entry):
+                        job.record(business_number, "cached", entry.response)
+                    else:
+                        pending.append(business_number)
+                self._stats["total_skipped_fresh"] += len(numbers) - len(pending)
+
+            buffer: Dict[str, NiceDnBResponse] = {}
+            queue: asyncio.Queue[str] = asyncio.Queue()
+            for business_number in pending:
+                queue.put_nowait(business_number)
+
+            async def worker() -> None:
+                while True:
+                    try:
+                        business_number = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    await self.rate_limiter.acquire()
+                    self._stats["total_api_lookups"] += 1
+                    response = await nice_dnb_client.fetch_company_raw(business_number)
+                    if response is not None and response.success:
+                        job.record(business_number, "verified", response)
+                        buffer[business_number] = response
+                        if len(buffer) >= self.upsert_batch_size:
+                            await self._flush(buffer, job.requested_by)
+                    else:
+                        job.record(business_number, "failed")
+
+            try:
+                async with asyncio.TaskGroup() as group:
+                    for _ in range(min(self.concurrency, len(pending))):
+                        group.create_task(worker())
+            except ExceptionGroup as e:
+                # The other workers were cancelled; report the original error
+                raise e.exceptions[0]
+            await self._flush(buffer, job.requested_by)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Bulk verification was cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(
+                f"Bulk verification failed: {job.id}: {str(e)}",
+                exc_info=True,
+                extra={"module_name": __name__, "job_id": job.id},
+            )
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+        if job.status == "completed":
+            logger.info(
+                f"Bulk verification completed: {job.id} ({job.total} numbers)",
+                extra={
+                    "module_name": __name__,
+                    "job_id": job.id,
+                    "counts": job.counts(),
+                    "duration_ms": int((job.finished_at - job.started_at).total_seconds() * 1000),
+                },
+            )
+
+    async def _flush(self, buffer: Dict[str, NiceDnBResponse], queried_by: Optional[str]) -> None:
+        """Upsert buffered results in one request and clear the buffer."""
+        if not buffer:
+            return
+        batch = dict(buffer)
+        buffer.clear()
+        await nice_dnb_cache.store_many(batch, queried_by=queried_by)
+
+
+# Global bulk verifier instance
+bulk_verifier = NiceDnBBulkVerifier(
+    concurrency=settings.NICE_DNB_BULK_CONCURRENCY,
+    rate_per_second=settings.NICE_DNB_BULK_RATE_PER_SECOND,
+    upsert_batch_size=settings.NICE_DNB_BULK_UPSERT_BATCH_SIZE,
+)
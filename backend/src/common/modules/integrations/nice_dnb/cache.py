@@ -0,0 +1,378 @@
+"""
+Nice D&B lookup cache.
+
+Read-through cache for company lookups, in two tiers:
+
+1. In-process LRU of parsed responses (microsecond hits)
+2. The `nice_dnb_company_info` table (shared across processes and restarts)
+
+An entry younger than `fresh_seconds` is served as-is. An entry older than
+that but younger than `fresh_seconds + stale_seconds` is served immediately
+while a background lookup refreshes it (stale-while-revalidate). Anything
+older is treated as a miss and fetched synchronously.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ...config.settings import settings
+from ...logger import get_logger
+from ...supabase.client import get_supabase_service_client
+from .schemas import NiceDnBResponse
+
+logger = get_logger(__name__)
+
+CACHE_TABLE = "nice_dnb_company_info"
+TABLE_READ_CHUNK_SIZE = 200
+
+
+@dataclass(slots=True)
+class CachedLookup:
+    """A parsed lookup result and the time it was fetched from the API."""
+
+    response: NiceDnBResponse
+    fetched_at: datetime
+
+    def age_seconds(self) -> float:
+        return (datetime.now(timezone.utc) - self.fetched_at).total_seconds()
+
+
+def response_to_row(
+    business_number: str,
+    response: NiceDnBResponse,
+    queried_by: Optional[str] = None,
+    fetched_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Map a lookup result to a `nice_dnb_company_info` row."""
+    fetched_at = fetched_at or datetime.now(timezone.utc)
+    data = response.data
+
+    # Latest financial data (most recent year) for single record storage
+    latest_financial = max(response.financials, key=lambda f: f.year) if response.financials else None
+
+    raw_json = {
+        "data": {
+            "businessNumber": data.business_number,
+            "companyName": data.company_name,
+            "representative": data.representative,
+            "address": data.address,
+            "industry": data.industry,
+            "establishedDate": data.established_date.isoformat() if data.established_date else None,
+            "creditGrade": data.credit_grade,
+        },
+        "financials": [
+            {"year": f.year, "revenue": f.revenue, "profit": f.profit, "employees": f.employees}
+            for f in response.financials
+        ],
+        # Full parsed response, used to rebuild cache entries
+        "response": response.model_dump(mode="json"),
+        "queried_at": fetched_at.isoformat(),
+        "queried_by": queried_by,
+    }
+
+    row = {
+        "biz_no": business_number,
+        "cmp_nm": data.company_name,
+        "ceo_nm": data.representative,
+        "ind_nm": data.industry,
+        "estb_date": data.established_date.strftime("%Y%m%d") if data.established_date else None,
+        "cri_grd": data.credit_grade,
+        "bzcnd_nm": data.main_business,
+        "raw_json": raw_json,
+        "updated_at": fetched_at.isoformat(),
+    }
+
+    # Address handling (split if needed)
+    if data.address:
+        addr_parts = data.address.split(" ", 1)
+        row["addr1"] = addr_parts[0]
+        row["addr2"] = addr_parts[1] if len(addr_parts) > 1 else None
+
+    if latest_financial:
+        row["sales_amt"] = float(latest_financial.revenue)
+        row["emp_cnt"] = latest_financial.employees
+
+    return row
+
+
+def row_to_cached(row: Dict[str, Any]) -> Optional[CachedLookup]:
+    """Rebuild a cache entry from a table row (None if it predates the cache)."""
+    raw_json = row.get("raw_json") or {}
+    payload = raw_json.get("response")
+    fetched_at = _parse_timestamp(row.get("updated_at") or row.get("created_at"))
+    if not payload or fetched_at is None:
+        return None
+    try:
+        return CachedLookup(response=NiceDnBResponse.model_validate(payload), fetched_at=fetched_at)
+    except ValueError:
+        return None
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class NiceDnBCache:
+    """LRU + table read-through cache with stale-while-revalidate."""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        fresh_seconds: float = 7 * 86400,
+        stale_seconds: float = 30 * 86400,
+    ):
+        """
+        Initialize lookup cache.
+
+        Args:
+            max_entries: Parsed responses kept in memory
+            fresh_seconds: Age up to which an entry is served without refreshing
+            stale_seconds: Extra age during which an entry is served while refreshing
+        """
+        self.max_entries = max(1, max_entries)
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+
+        self._entries: "OrderedDict[str, CachedLookup]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+        self._stats = {
+            "memory_hits": 0,
+            "table_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "fetch_failures": 0,
+        }
+
+    @property
+    def client(self):
+        return get_supabase_service_client()
+
+    async def get_or_fetch(
+        self,
+        business_number: str,
+        fetch: Callable[[], Awaitable[Optional[NiceDnBResponse]]],
+        queried_by: Optional[str] = None,
+        refresh: bool = False,
+    ) -> Optional[NiceDnBResponse]:
+        """
+        Return the cached lookup for `business_number`, calling `fetch` on a miss.
+
+        Args:
+            business_number: Cleaned business registration number
+            fetch: Coroutine factory that queries the external API
+            queried_by: User ID recorded with a newly fetched result
+            refresh: Skip the cache and always fetch
+        """
+        if not refresh:
+            entry = self._memory_get(business_number)
+            if entry is not None:
+                self._stats["memory_hits"] += 1
+            else:
+                entry = await self._table_get(business_number)
+                if entry is not None:
+                    self._stats["table_hits"] += 1
+                    self._memory_put(business_number, entry)
+
+            if entry is not None:
+                age = entry.age_seconds()
+                if self.is_fresh(entry):
+                    return entry.response
+                if age < self.fresh_seconds + self.stale_seconds:
+                    self._stats["stale_hits"] += 1
+                    self._revalidate(business_number, fetch, queried_by)
+                    return entry.response
+
+        self._stats["misses"] += 1
+        return await self._fetch(business_number, fetch, queried_by)
+
+    async def store(
+        self,
+        business_number: str,
+        response: NiceDnBResponse,
+        queried_by: Optional[str] = None,
+    ) -> None:
+        """Write a lookup result to the table and the in-memory LRU."""
+        entry = CachedLookup(response=response, fetched_at=datetime.now(timezone.utc))
+        self._memory_put(business_number, entry)
+        row = response_to_row(business_number, response, queried_by, entry.fetched_at)
+        await asyncio.to_thread(
+            lambda: self.client.table(CACHE_TABLE).upsert(row, on_conflict="biz_no").execute()
+        )
+
+    async def store_many(
+        self,
+        responses: Dict[str, NiceDnBResponse],
+        queried_by: Optional[str] = None,
+    ) -> None:
+        """Write several lookup results with a single upsert."""
+        if not responses:
+            return
+        fetched_at = datetime.now(timezone.utc)
+        rows = []
+        for business_number, response in responses.items():
+            self._memory_put(business_number, CachedLookup(response=response, fetched_at=fetched_at))
+            rows.append(response_to_row(business_number, response, queried_by, fetched_at))
+        await asyncio.to_thread(
+            lambda: self.client.table(CACHE_TABLE).upsert(rows, on_conflict="biz_no").execute()
+        )
+
+    async def get_many(self, business_numbers: List[str]) -> Dict[str, CachedLookup]:
+        """
+        Load cached entries for several business numbers (memory first, then
+        one table query per chunk). Entries are returned regardless of age.
+        """
+        found: Dict[str, CachedLookup] = {}
+        missing = []
+        for business_number in business_numbers:
+            entry = self._memory_get(business_number)
+            if entry is not None:
+                found[business_number] = entry
+            else:
+                missing.append(business_number)
+
+        for i in range(0, len(missing), TABLE_READ_CHUNK_SIZE):
+            chunk = missing[i:i + TABLE_READ_CHUNK_SIZE]
+            result = await asyncio.to_thread(
+                lambda: self.client.table(CACHE_TABLE)
+                .select("biz_no, raw_json, created_at, updated_at")
+                .in_("biz_no", chunk)
+                .execute()
+            )
+            for row in result.data or []:
+                entry = row_to_cached(row)
+                if entry is not None:
+                    found[row["biz_no"]] = entry
+                    self._memory_put(row["biz_no"], entry)
+        return found
+
+    def is_fresh(self, entry: CachedLookup) -> bool:
+        return entry.age_seconds() < self.fresh_seconds
+
+    def invalidate(self, business_number: Optional[str] = None) -> None:
+        """Drop one entry (or everything) from memory; table rows are kept."""
+        if business_number is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(business_number, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = sum(self._stats[k] for k in ("memory_hits", "table_hits", "misses"))
+        hits = self._stats["memory_hits"] + self._stats["table_hits"]
+        return {
+            **self._stats,
+            "entries": len(self._entries),
+            "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    async def _fetch(
+        self,
+        business_number: str,
+        fetch: Callable[[], Awaitable[Optional[NiceDnBResponse]]],
+        queried_by: Optional[str],
+    ) -> Optional[NiceDnBResponse]:
+        """Fetch from the API once per business number, however many callers wait."""
+        pending = self._inflight.get(business_number)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[business_number] = future
+        try:
+            response = await fetch()
+            if response is not None and response.success:
+                try:
+                    await self.store(business_number, response, queried_by)
+                except Exception as e:
+                    # The lookup itself succeeded; only persistence failed
+                    logger.error(
+                        f"Failed to store Nice D&B data: {str(e)}",
+                        exc_info=True,
+                        extra={"module_name": __name__, "business_number": business_number},
+                    )
+            else:
+                self._stats["fetch_failures"] += 1
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so waiter-less failures are not reported as unhandled
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(business_number, None)
+
+    def _revalidate(
+        self,
+        business_number: str,
+        fetch: Callable[[], Awaitable[Optional[NiceDnBResponse]]],
+        queried_by: Optional[str],
+    ) -> None:
+        if business_number in self._inflight:
+            return
+        self._stats["revalidations"] += 1
+        task = asyncio.create_task(self._fetch(business_number, fetch, queried_by))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_revalidated)
+
+    def _on_revalidated(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(
+                f"Nice D&B background refresh failed: {task.exception()}",
+                extra={"module_name": __name__},
+            )
+
+    def _memory_get(self, business_number: str) -> Optional[CachedLookup]:
+        entry = self._entries.get(business_number)
+        if entry is not None:
+            self._entries.move_to_end(business_number)
+        return entry
+
+    def _memory_put(self, business_number: str, entry: CachedLookup) -> None:
+        self._entries[business_number] = entry
+        self._entries.move_to_end(business_number)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _table_get(self, business_number: str) -> Optional[CachedLookup]:
+        try:
+            result = await asyncio.to_thread(
+                lambda: self.client.table(CACHE_TABLE)
+                .select("raw_json, created_at, updated_at")
+                .eq("biz_no", business_number)
+                .limit(1)
+                .execute()
+            )
+        except Exception as e:
+            # A cache read failure must never block a lookup
+            logger.warning(
+                f"Nice D&B cache read failed: {str(e)}",
+                extra={"module_name": __name__, "business_number": business_number},
+            )
+            return None
+        return row_to_cached(result.data[0]) if result.data else None
+
+
+# Global lookup cache instance
+nice_dnb_cache = NiceDnBCache(
+    max_entries=settings.NICE_DNB_CACHE_SIZE,
+    fresh_seconds=settings.NICE_DNB_CACHE_FRESH_SECONDS,
+    stale_seconds=settings.NICE_DNB_CACHE_STALE_SECONDS,
+)
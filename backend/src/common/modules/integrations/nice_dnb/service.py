@@ -7,16 +7,25 @@ verification and search.
 OAuth 2.0 Authentication:
 - Uses Client Credentials Grant flow
 - Documentation: https://openapi.nicednb.com/#/guide/common/oauth
+
+All requests share one pooled httpx.AsyncClient (keep-alive, so bursts of
+lookups reuse TLS connections); it is closed in the application lifespan.
+The access token is fetched single-flight behind an asyncio lock and
+refreshed in the background shortly before it expires, as long as it has
+been used since the last refresh. An idle client lets the token lapse and
+fetches a new one on the next call.
 """
+import asyncio
 import httpx
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
 from ...config.settings import settings
 from ...logger import get_logger
+from .cache import nice_dnb_cache
+from .schemas import NiceDnBResponse, NiceDnBCompanyData, NiceDnBFinancialData
 
 logger = get_logger(__name__)
-from .schemas import NiceDnBResponse, NiceDnBCompanyData, NiceDnBFinancialData
 
 
 class NiceDnBClient:
@@ -35,12 +44,28 @@ class NiceDnBClient:
         # OAuth documentation: https://openapi.nicednb.com/#/guide/common/oauth
         self.base_url = settings.NICE_DNB_API_URL or "https://gate.nicednb.com"
         self.timeout = 30.0  # Request timeout in seconds
-        
+        self.max_connections = settings.NICE_DNB_MAX_CONNECTIONS
+        self.token_refresh_margin = timedelta(seconds=settings.NICE_DNB_TOKEN_REFRESH_MARGIN)
+
+        # Shared HTTP client (created lazily, closed by close())
+        self._client: Optional[httpx.AsyncClient] = None
+
         # OAuth token cache
         self._access_token: Optional[str] = None
         self._token_expires_at: Optional[datetime] = None
+        self._token_lock: Optional[asyncio.Lock] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Set on every API call, cleared when a new token is fetched
+        self._token_used = False
+
+        self._stats = {
+            "token_requests": 0,
+            "token_refreshes": 0,
+            "token_refreshes_skipped": 0,
+            "api_requests": 0,
+        }
 
-    def _is_configured(self) -> bool:
+    def is_configured(self) -> bool:
         """Check if API key and secret key are configured."""
         return (
             self.api_key is not None
@@ -49,12 +74,32 @@ class NiceDnBClient:
             and self.api_secret_key != ""
         )
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    def _has_valid_token(self) -> bool:
+        """Check if the cached token is usable (not within the refresh margin)."""
+        return bool(
+            self._access_token
+            and self._token_expires_at
+            and datetime.now() < (self._token_expires_at - self.token_refresh_margin)
+        )
+
     async def _get_access_token(self) -> Optional[str]:
         """
         Get OAuth 2.0 access token using Client Credentials Grant flow.
         
-        Implements token caching to avoid unnecessary token requests.
-        Token is refreshed if expired or about to expire within 5 minutes.
+        The cached token is returned while valid. Otherwise one caller fetches
+        a new token while concurrent callers wait on the lock and reuse it.
         
         Returns:
             Access token string, or None if authentication fails
@@ -62,17 +107,56 @@ class NiceDnBClient:
         Reference:
             OAuth documentation: https://openapi.nicednb.com/#/guide/common/oauth
         """
-        # Check if we have a valid cached token
-        if (
-            self._access_token
-            and self._token_expires_at
-            and datetime.now() < (self._token_expires_at - timedelta(minutes=5))
-        ):
+        if self._has_valid_token():
+            self._token_used = True
             return self._access_token
         
-        if not self._is_configured():
+        if not self.is_configured():
             return None
-        
+
+        if self._token_lock is None:
+            self._token_lock = asyncio.Lock()
+
+        async with self._token_lock:
+            # Another caller may have refreshed the token while we waited
+            if self._has_valid_token():
+                self._token_used = True
+                return self._access_token
+            token = await self._request_access_token()
+
+        if token:
+            self._token_used = True
+            self._schedule_refresh()
+        return token
+
+    def _schedule_refresh(self) -> None:
+        """Refresh the token in the background just before it enters the refresh margin."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def _refresh_loop(self) -> None:
+        # Wake slightly before the margin so callers never see an expiring token
+        lead = timedelta(seconds=30)
+        while self._token_expires_at is not None:
+            refresh_at = self._token_expires_at - self.token_refresh_margin - lead
+            delay = (refresh_at - datetime.now()).total_seconds()
+            await asyncio.sleep(max(delay, 30.0))
+            if not self._token_used:
+                # No API call since the last refresh: let the token lapse
+                self._stats["token_refreshes_skipped"] += 1
+                return
+            async with self._token_lock:
+                token = await self._request_access_token()
+            if not token:
+                # Callers fall back to fetching on demand
+                return
+            self._stats["token_refreshes"] += 1
+
+    async def _request_access_token(self) -> Optional[str]:
+        """Request a new access token from the OAuth endpoint (caller holds the lock)."""
+        self._stats["token_requests"] += 1
+        token_url = None
         try:
             # OAuth 2.0 Client Credentials Grant
             # Use endpoint from settings if configured, otherwise use default
@@ -81,35 +165,35 @@ class NiceDnBClient:
                 # Fallback to default endpoint if not configured
                 token_url = f"{self.base_url}/nice/oauth/v1.0/accesstoken"
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # OAuth 2.0 Client Credentials Grant request
-                # Using JSON body as per Nice D&B API specification
-                response = await client.post(
-                    token_url,
-                    json={
-                        "appKey": self.api_key,
-                        "appSecret": self.api_secret_key,
-                        "grantType": "client_credentials",
-                        "scope": "oob",
-                    },
-                    headers={
-                        "Content-Type": "application/json; charset=UTF-8",
-                        "Accept": "application/json",
-                    },
-                )
-                response.raise_for_status()
-                
-                token_data = response.json()
-                
-                # Extract access token and expiration
-                # Nice D&B uses "accessToken" (camelCase), not "access_token"
-                self._access_token = token_data.get("accessToken")
-                
-                # Calculate expiration time
-                expires_in = token_data.get("expiresIn", 3600)  # Default to 1 hour
-                self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
-                
-                return self._access_token
+            # OAuth 2.0 Client Credentials Grant request
+            # Using JSON body as per Nice D&B API specification
+            response = await self._get_client().post(
+                token_url,
+                json={
+                    "appKey": self.api_key,
+                    "appSecret": self.api_secret_key,
+                    "grantType": "client_credentials",
+                    "scope": "oob",
+                },
+                headers={
+                    "Content-Type": "application/json; charset=UTF-8",
+                    "Accept": "application/json",
+                },
+            )
+            response.raise_for_status()
+            
+            token_data = response.json()
+            
+            # Extract access token and expiration
+            # Nice D&B uses "accessToken" (camelCase), not "access_token"
+            self._access_token = token_data.get("accessToken")
+            self._token_used = False
+            
+            # Calculate expiration time
+            expires_in = token_data.get("expiresIn", 3600)  # Default to 1 hour
+            self._token_expires_at = datetime.now() + timedelta(seconds=expires_in)
+            
+            return self._access_token
                 
         except httpx.HTTPStatusError as e:
             logger.error(
@@ -167,13 +251,21 @@ class NiceDnBClient:
         return headers
 
     async def search_company(
-        self, business_number: str
+        self,
+        business_number: str,
+        queried_by: Optional[str] = None,
+        refresh: bool = False,
     ) -> Optional[NiceDnBResponse]:
         """
         Search for company information by business registration number.
 
+        Results are served from the lookup cache when available; API results
+        are written through to `nice_dnb_company_info`.
+
         Args:
             business_number: Business registration number (사업자등록번호)
+            queried_by: User ID recorded with a newly fetched result (optional)
+            refresh: Bypass the cache and query the API
 
         Returns:
             NiceDnBResponse if successful, None if API is not configured or request fails
@@ -181,7 +273,7 @@ class NiceDnBClient:
         Raises:
             Exception: If API call fails and error handling is needed
         """
-        if not self._is_configured():
+        if not self.is_configured():
             return None
 
         # Clean business number (remove hyphens if present)
@@ -190,6 +282,21 @@ class NiceDnBClient:
         if not business_number:
             return None
 
+        return await nice_dnb_cache.get_or_fetch(
+            business_number,
+            lambda: self.fetch_company_raw(business_number),
+            queried_by=queried_by,
+            refresh=refresh,
+        )
+
+    async def fetch_company_raw(self, business_number: str) -> Optional[NiceDnBResponse]:
+        """
+        Query the company info endpoint directly, bypassing the lookup cache.
+
+        Used by callers that manage caching themselves (e.g. bulk
+        verification, which dedupes and upserts in batches). Other code
+        should use search_company.
+        """
         # Use endpoint from settings if configured
         api_url = settings.NICE_DNB_COMPANY_INFO_ENDPOINT
         if not api_url:
@@ -206,55 +313,55 @@ class NiceDnBClient:
 
         # Try POST method first (certification endpoint typically uses POST)
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                # Try POST with JSON body
-                response = await client.post(
-                    api_url,
-                    headers=self._get_headers(access_token),
-                    json={"bizNo": business_number},
-                )
-                response.raise_for_status()
+            # Try POST with JSON body
+            self._stats["api_requests"] += 1
+            response = await self._get_client().post(
+                api_url,
+                headers=self._get_headers(access_token),
+                json={"bizNo": business_number},
+            )
+            response.raise_for_status()
 
-                data = response.json()
-                
-                logger.info(
-                    f"Nice D&B API request succeeded with endpoint: {api_url}",
-                    extra={
-                        "business_number": business_number,
-                        "api_url": api_url,
-                        "method": "POST",
-                        "response_data": str(data)[:1000],  # Log first 1000 chars of response
-                        "response_keys": list(data.keys()) if isinstance(data, dict) else None,
-                    }
-                )
+            data = response.json()
+            
+            logger.info(
+                f"Nice D&B API request succeeded with endpoint: {api_url}",
+                extra={
+                    "business_number": business_number,
+                    "api_url": api_url,
+                    "method": "POST",
+                    "response_data": str(data)[:1000],  # Log first 1000 chars of response
+                    "response_keys": list(data.keys()) if isinstance(data, dict) else None,
+                }
+            )
 
-                return self._parse_response(data, business_number)
+            return self._parse_response(data, business_number)
                 
         except httpx.HTTPStatusError as e:
             # If POST returns 405, try GET method
             if e.response.status_code == 405:
                 try:
-                    async with httpx.AsyncClient(timeout=self.timeout) as client:
-                        response = await client.get(
-                            api_url,
-                            headers=self._get_headers(access_token),
-                            params={"bizNo": business_number},
-                        )
-                        response.raise_for_status()
-
-                        data = response.json()
-                        
-                        logger.info(
-                            f"Nice D&B API request succeeded with endpoint: {api_url}",
-                            extra={
-                                "business_number": business_number,
-                                "api_url": api_url,
-                                "method": "GET",
-                                "response_data": str(data)[:500],  # Log first 500 chars of response
-                            }
-                        )
-
-                        return self._parse_response(data, business_number)
+                    self._stats["api_requests"] += 1
+                    response = await self._get_client().get(
+                        api_url,
+                        headers=self._get_headers(access_token),
+                        params={"bizNo": business_number},
+                    )
+                    response.raise_for_status()
+
+                    data = response.json()
+                    
+                    logger.info(
+                        f"Nice D&B API request succeeded with endpoint: {api_url}",
+                        extra={
+                            "business_number": business_number,
+                            "api_url": api_url,
+                            "method": "GET",
+                            "response_data": str(data)[:500],  # Log first 500 chars of response
+                        }
+                    )
+
+                    return self._parse_response(data, business_number)
                 except httpx.HTTPStatusError as get_error:
                     logger.error(
                         f"Nice D&B API request failed with status {get_error.response.status_code}",
@@ -530,6 +637,27 @@ class NiceDnBClient:
 
         return True
 
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "cache": nice_dnb_cache.get_stats(),
+            "token_valid": self._has_valid_token(),
+            "client_open": self._client is not None and not self._client.is_closed,
+        }
+
+    async def close(self) -> None:
+        """Stop background token refresh and close the shared HTTP client."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._refresh_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
 
 # Global client instance
 nice_dnb_client = NiceDnBClient()
@@ -12,6 +12,8 @@ import threading
 import logging
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
+from ..config import settings
+from ..metrics.instruments import db_operation_duration
 from .config import DatabaseConfig, SENSITIVE_FIELDS
 
 if TYPE_CHECKING:
@@ -51,6 +53,14 @@ def _get_database_error():
     return DatabaseError
 
 
+def _observe_operation(table_name: str, operation_type: str, duration_ms: float, success: bool) -> None:
+    """记录 DB 操作耗时指标"""
+    if settings.METRICS_ENABLED:
+        db_operation_duration.observe(
+            duration_ms / 1000, table_name, operation_type, "success" if success else "error"
+        )
+
+
 def _schedule_coro(coro):
     """安全地调度协程"""
     try:
@@ -269,6 +279,7 @@ class UnifiedQuery:
         try:
             result = self._query.execute()
             duration_ms = (time.time() - start_time) * 1000
+            _observe_operation(self._table_name, self._operation_type, duration_ms, True)
             
             _schedule_coro(self._logger.log_operation(
                 self._table_name, self._operation_type, duration_ms, True,
@@ -279,6 +290,7 @@ class UnifiedQuery:
             
         except Exception as exc:
             duration_ms = (time.time() - start_time) * 1000
+            _observe_operation(self._table_name, self._operation_type, duration_ms, False)
             
             _schedule_coro(self._logger.log_operation(
                 self._table_name, self._operation_type, duration_ms, False, error=exc
@@ -14,6 +14,8 @@ from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+from ..config import settings
+from ..metrics.instruments import http_request_duration, UNMATCHED_ROUTE
 from .error import get_client_ip
 
 logger = logging.getLogger(__name__)
@@ -24,6 +26,7 @@ SKIP_PATHS = [
     "/healthz",
     "/readyz",
     "/api/health",
+    "/metrics",
     "/docs",
     "/openapi.json",
     "/redoc",
@@ -71,6 +74,15 @@ def extract_user_id_from_token(request: Request) -> Optional[str]:
         return None
 
 
+def _observe_request(request: Request, status_code: int, duration_ms: float) -> None:
+    """记录请求耗时指标（按路由模板，避免路径参数产生大量序列）"""
+    if not settings.METRICS_ENABLED:
+        return
+    route = request.scope.get("route")
+    route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+    http_request_duration.observe(duration_ms / 1000, request.method, route_path, str(status_code))
+
+
 class HTTPLoggingMiddleware(BaseHTTPMiddleware):
     """
     HTTP 日志中间件
@@ -124,6 +136,8 @@ class HTTPLoggingMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         duration_ms = (time.time() - start_time) * 1000
 
+        _observe_request(request, response.status_code, duration_ms)
+
         # 从 token 中提取 user_id（在请求处理后，确保 token 已被验证）
         user_id_str = extract_user_id_from_token(request)
         user_id = UUID(user_id_str) if user_id_str else None
@@ -13,6 +13,8 @@ import inspect
 from typing import Any, Callable, Optional, TypeVar, Type
 from uuid import UUID
 
+from ..config import settings
+from ..metrics.instruments import service_method_duration
 from .config import InterceptorConfig
 
 # Type variables for generic decorators
@@ -220,6 +222,14 @@ async def _log_method_call(
         logging.error(f"Failed to log service method call: {log_exc}", exc_info=True)
 
 
+def _observe_method(layer: str, class_name: str, method_name: str, duration_ms: float, success: bool) -> None:
+    """记录方法耗时指标"""
+    if settings.METRICS_ENABLED:
+        service_method_duration.observe(
+            duration_ms / 1000, layer, class_name, method_name, "success" if success else "error"
+        )
+
+
 def intercept_method(
     config: Optional[InterceptorConfig] = None,
     log_args: bool = True,
@@ -261,6 +271,7 @@ def intercept_method(
                 try:
                     result = await func(*args, **kwargs)
                     duration_ms = (time.time() - start_time) * 1000
+                    _observe_method(layer, class_name, method_name, duration_ms, True)
                     
                     # 异步记录日志（不阻塞）
                     asyncio.create_task(_log_method_call(
@@ -273,6 +284,7 @@ def intercept_method(
                     
                 except Exception as exc:
                     duration_ms = (time.time() - start_time) * 1000
+                    _observe_method(layer, class_name, method_name, duration_ms, False)
                     
                     # 异步记录错误日志
                     asyncio.create_task(_log_method_call(
@@ -301,6 +313,7 @@ def intercept_method(
                 try:
                     result = func(*args, **kwargs)
                     duration_ms = (time.time() - start_time) * 1000
+                    _observe_method(layer, class_name, method_name, duration_ms, True)
                     
                     # 同步上下文中调度异步日志
                     try:
@@ -317,6 +330,7 @@ def intercept_method(
                     
                 except Exception as exc:
                     duration_ms = (time.time() - start_time) * 1000
+                    _observe_method(layer, class_name, method_name, duration_ms, False)
                     
                     try:
                         loop = asyncio.get_running_loop()
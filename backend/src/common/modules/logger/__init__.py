@@ -41,6 +41,9 @@ from .formatter import JSONFormatter
 from .base_writer import BaseLogWriter
 from .file_writer import file_log_writer
 from .db_writer import db_log_writer
+from .rollup import log_rollups, LogRollupAggregator, LatencyHistogram
+from .retention import log_retention, LogRetentionManager
+from .ingest import frontend_log_ingestor, FrontendLogIngestor
 from .service import LoggingService
 # NOTE: router is imported lazily to avoid circular import with db.session
 # Use get_logging_router() instead of logging_router directly
@@ -99,6 +102,13 @@ __all__ = [
     "db_log_writer",
     "LoggingService",
     "logging_service",
+    "log_rollups",
+    "LogRollupAggregator",
+    "LatencyHistogram",
+    "log_retention",
+    "LogRetentionManager",
+    "frontend_log_ingestor",
+    "FrontendLogIngestor",
     "get_logging_router",
     "get_trace_id",
     "set_request_context",
@@ -301,6 +301,10 @@ class DatabaseLogWriter(BaseLogWriter):
             "performance": "DEBUG",
         }.get(log_type, "INFO")
 
+    def stores_level(self, log_type: str, level: Optional[str]) -> bool:
+        """Check if entries of a log type and level are kept in the database (the write() filter)."""
+        return self.should_write_with_level(level or "INFO", self._get_min_level_for_type(log_type))
+
     def _is_batch_type(self, log_type: str) -> bool:
         """Check if log type uses batch processing."""
         return log_type in ("app", "performance")
@@ -362,6 +366,44 @@ class DatabaseLogWriter(BaseLogWriter):
             logging.warning(f"Log database queue is full, dropping {log_type} entry")
             self._stats[fail_key] += 1
 
+    def enqueue_many(self, log_type: str, entries: list[Dict[str, Any]]) -> int:
+        """Enqueue converted rows (schema.to_db_dict()) of a batch type in one call.
+        
+        App rows below the database level are skipped. Rows that do not fit
+        in the queue are dropped and counted as failed.
+        
+        Args:
+            log_type: Type of log (app or performance)
+            entries: Database rows
+            
+        Returns:
+            Number of rows enqueued
+        """
+        if not self._enabled or not entries:
+            return 0
+        self._ensure_worker_started()
+        
+        queue = self.performance_queue if log_type == "performance" else self.log_queue
+        stats_key = "performance_total_enqueued" if log_type == "performance" else "total_enqueued"
+        fail_key = "performance_total_failed" if log_type == "performance" else "total_failed"
+        created_at = format_timestamp()
+        
+        enqueued = 0
+        for index, entry in enumerate(entries):
+            if log_type == "app" and not self._should_write_to_db(entry.get("level") or "INFO"):
+                continue
+            entry.setdefault("created_at", created_at)
+            try:
+                queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                dropped = len(entries) - index
+                logging.warning(f"Log database queue is full, dropping {dropped} {log_type} entries")
+                self._stats[fail_key] += dropped
+                break
+            enqueued += 1
+        self._stats[stats_key] += enqueued
+        return enqueued
+
     def _write_immediate(self, log_data: Dict[str, Any], log_type: str) -> None:
         """Write a log entry immediately (non-batch).
         
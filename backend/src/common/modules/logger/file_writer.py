@@ -273,6 +273,21 @@ class FileLogWriter(BaseLogWriter):
         
         self._enqueue_entry(file_path, formatted_entry, log_type)
 
+    def write_many(self, log_type: str, entries: list[dict]) -> None:
+        """Write converted entries (schema.to_file_dict()) of one log type.
+        
+        The entries are written as one queue item, so a batch costs a single
+        file append.
+        """
+        min_level = self._get_min_level_for_type(log_type)
+        lines = [
+            json.dumps(entry, ensure_ascii=False, default=str)
+            for entry in entries
+            if self.should_write_with_level(entry.get("level") or "INFO", min_level)
+        ]
+        if lines:
+            self._enqueue_entry(self._get_file_for_type(log_type), "\n".join(lines), log_type)
+
     def _enqueue_entry(self, file_path: Path, entry: str, log_type: str = "log") -> None:
         """Enqueue a log entry for asynchronous writing."""
         try:
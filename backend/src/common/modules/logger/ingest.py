@@ -0,0 +1,370 @@
+"""
+Frontend log ingestion.
+
+Bulk path behind POST /api/v1/logging/frontend/logs. A request body is read
+once (JSON `{"logs": [...]}`, a JSON list, or NDJSON; optionally gzip
+compressed), validated as one batch, converted to database and file rows
+without per-entry validation, and handed to the DB and file writers in one
+call per log type.
+
+Each client has a token bucket of entries, so a noisy browser tab cannot
+flood the log tables. Behind a reverse proxy the connection peer is the
+proxy, so the client is the X-Forwarded-For hop appended by the outermost
+trusted proxy (counted from the right; hops further left are set by the
+client and can be forged).
+
+    entries = await frontend_log_ingestor.read_entries(request)
+    result = frontend_log_ingestor.ingest(entries, client_key=frontend_log_ingestor.client_key(request))
+"""
+import json
+import math
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import Request
+from pydantic import TypeAdapter, ValidationError as PydanticValidationError
+
+from ..config import settings
+from .schemas import AppLogCreate, FrontendLogCreate, PerformanceLogCreate
+from .file_writer import file_log_writer
+from .db_writer import db_log_writer
+from .rollup import log_rollups
+
+VALID_LEVELS = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-lines")
+GZIP_MAGIC = b"\x1f\x8b"
+
+_ENTRIES_ADAPTER = TypeAdapter(List[FrontendLogCreate])
+
+
+class ClientRateLimiter:
+    """Token bucket per client key; tokens are log entries."""
+
+    def __init__(self, rate_per_second: float, burst: int, max_clients: int = 10000):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate_per_second: Entries refilled per second (0 = unlimited)
+            burst: Bucket size (entries a client may send at once)
+            max_clients: Buckets kept in memory (least recently used evicted)
+        """
+        self.rate_per_second = rate_per_second
+        self.burst = max(1, burst)
+        self.max_clients = max(1, max_clients)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def acquire(self, key: str, requested: int) -> int:
+        """Take up to `requested` tokens for `key` and return how many were granted."""
+        if self.rate_per_second <= 0:
+            return requested
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate_per_second)
+        granted = min(requested, int(tokens))
+        self._buckets[key] = (tokens - granted, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return granted
+
+    def retry_after(self) -> int:
+        """Seconds until a client with an empty bucket may send one entry."""
+        return max(1, math.ceil(1 / self.rate_per_second)) if self.rate_per_second > 0 else 0
+
+
+class FrontendLogIngestor:
+    """Reads, validates and enqueues frontend log batches."""
+
+    def __init__(
+        self,
+        max_batch: int = 500,
+        max_body_bytes: int = 2097152,
+        rate_per_second: float = 20.0,
+        burst: int = 500,
+        trusted_proxies: int = 1,
+    ):
+        """
+        Initialize ingestor.
+
+        Args:
+            max_batch: Entries accepted per request (the rest are dropped)
+            max_body_bytes: Maximum body size, after gzip decompression
+            rate_per_second: Entries per second per client (0 = unlimited)
+            burst: Entries a client may send at once before the rate applies
+            trusted_proxies: Reverse proxies in front of the app (0 = key on the connection peer)
+        """
+        self.max_batch = max(1, max_batch)
+        self.max_body_bytes = max_body_bytes
+        self.trusted_proxies = max(0, trusted_proxies)
+        self.rate_limiter = ClientRateLimiter(rate_per_second, burst)
+
+        self._stats: Dict[str, Any] = {
+            "total_requests": 0,
+            "total_received": 0,
+            "total_processed": 0,
+            "total_failed": 0,
+            "total_dropped": 0,
+            "total_rate_limited_requests": 0,
+        }
+
+    # =========================================================================
+    # Reading
+    # =========================================================================
+
+    def client_key(self, request: Request) -> str:
+        """Rate limit key of a request: the client address as seen by the trusted proxies."""
+        peer = request.client.host if request.client else "unknown"
+        if self.trusted_proxies == 0:
+            return peer
+        hops = [
+            hop.strip()
+            for header in request.headers.getlist("x-forwarded-for")
+            for hop in header.split(",")
+            if hop.strip()
+        ]
+        if len(hops) < self.trusted_proxies:
+            # Not forwarded by the expected proxies (e.g. a direct connection)
+            return peer
+        return hops[-self.trusted_proxies]
+
+    async def read_entries(self, request: Request) -> List[Any]:
+        """Read the raw log entries of a request body.
+
+        Raises:
+            ValidationError: Body too large, not valid gzip, or not valid JSON/NDJSON
+        """
+        body = bytearray()
+        async for chunk in request.stream():
+            body.extend(chunk)
+            if len(body) > self.max_body_bytes:
+                self._reject("Request body too large")
+        data = bytes(body)
+
+        if request.headers.get("content-encoding", "").lower() == "gzip" or data.startswith(GZIP_MAGIC):
+            data = self._gunzip(data)
+
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        try:
+            if content_type in NDJSON_CONTENT_TYPES:
+                return [json.loads(line) for line in data.splitlines() if line.strip()]
+            payload = json.loads(data) if data.strip() else {}
+        except (ValueError, UnicodeDecodeError):
+            self._reject("Invalid JSON body")
+
+        if isinstance(payload, list):
+            return payload
+        if isinstance(payload, dict) and isinstance(payload.get("logs", []), list):
+            return payload.get("logs", [])
+        self._reject("Expected {\"logs\": [...]}, a JSON list or NDJSON")
+
+    def _gunzip(self, data: bytes) -> bytes:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            result = decompressor.decompress(data, self.max_body_bytes + 1)
+        except zlib.error:
+            self._reject("Invalid gzip body")
+        if len(result) > self.max_body_bytes or decompressor.unconsumed_tail:
+            self._reject("Request body too large")
+        return result
+
+    @staticmethod
+    def _reject(message: str) -> None:
+        from ..exception import ValidationError
+        raise ValidationError(message, field_errors={"body": message})
+
+    # =========================================================================
+    # Ingesting
+    # =========================================================================
+
+    def ingest(self, entries: List[Any], client_key: str) -> Dict[str, Any]:
+        """Validate a batch and enqueue it for the file and database writers.
+
+        Raises:
+            RateLimitError: The client has no entries left in its bucket
+        """
+        total = len(entries)
+        self._stats["total_requests"] += 1
+        self._stats["total_received"] += total
+        if not entries:
+            return {"status": "ok", "processed": 0, "failed": 0, "dropped": 0, "total": 0}
+
+        accepted = entries[:self.max_batch]
+        granted = self.rate_limiter.acquire(client_key, len(accepted))
+        if granted == 0:
+            self._stats["total_rate_limited_requests"] += 1
+            self._stats["total_dropped"] += total
+            from ..exception import RateLimitError
+            raise RateLimitError(
+                "Too many frontend log entries",
+                retry_after=self.rate_limiter.retry_after(),
+                limit_type="frontend_logs",
+            )
+        accepted = accepted[:granted]
+        dropped = total - len(accepted)
+
+        logs, failed = self._validate(accepted)
+
+        rows: Dict[str, List[Tuple[dict, dict]]] = {"app": [], "performance": []}
+        for log in logs:
+            try:
+                schema = self._to_schema(log)
+            except (TypeError, ValueError):
+                failed += 1
+                continue
+            if schema is None:
+                continue  # Deliberately not recorded (periodic performance reports)
+            log_type = "performance" if isinstance(schema, PerformanceLogCreate) else "app"
+            rows[log_type].append((schema.to_db_dict(), schema.to_file_dict()))
+            try:
+                if db_log_writer.stores_level(log_type, schema.level):
+                    log_rollups.record(
+                        log_type,
+                        level=schema.level,
+                        layer=schema.layer,
+                        route=(schema.extra_data or {}).get("request_path"),
+                        duration_ms=schema.duration_ms,
+                    )
+            except Exception:
+                pass
+
+        for log_type, type_rows in rows.items():
+            if not type_rows:
+                continue
+            try:
+                file_log_writer.write_many(log_type, [file_row for _, file_row in type_rows])
+            except Exception:
+                pass
+            try:
+                db_log_writer.enqueue_many(log_type, [db_row for db_row, _ in type_rows])
+            except Exception:
+                pass
+
+        processed = len(accepted) - failed
+        self._stats["total_processed"] += processed
+        self._stats["total_failed"] += failed
+        self._stats["total_dropped"] += dropped
+        return {"status": "ok", "processed": processed, "failed": failed, "dropped": dropped, "total": total}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self._stats, "tracked_clients": len(self.rate_limiter._buckets)}
+
+    @staticmethod
+    def _validate(entries: List[Any]) -> Tuple[List[FrontendLogCreate], int]:
+        """Validate the whole batch at once; only on failure find the bad entries."""
+        try:
+            return _ENTRIES_ADAPTER.validate_python(entries), 0
+        except PydanticValidationError:
+            pass
+        logs: List[FrontendLogCreate] = []
+        for entry in entries:
+            try:
+                logs.append(FrontendLogCreate.model_validate(entry))
+            except PydanticValidationError:
+                pass
+        return logs, len(entries) - len(logs)
+
+    @staticmethod
+    def _to_schema(log: FrontendLogCreate) -> Optional[Any]:
+        """Build the app or performance log schema of an entry without re-validating it.
+
+        Returns None for entries that are not recorded.
+        """
+        level = (log.level or "INFO").upper()
+        if level not in VALID_LEVELS:
+            raise ValueError(f"Invalid log level: {log.level}")
+
+        user_id = None
+        if log.user_id:
+            try:
+                user_id = UUID(str(log.user_id))
+            except (ValueError, TypeError):
+                pass
+
+        if log.layer != "Performance":
+            return AppLogCreate.model_construct(
+                timestamp=log.timestamp,
+                source="frontend",
+                level=level,
+                message=log.message,
+                layer=log.layer or "Frontend",
+                module=log.module or "frontend",
+                function=log.function or "",
+                line_number=log.line_number or 0,
+                file_path=log.file_path or "",
+                trace_id=log.trace_id or "",
+                request_id=log.request_id or "",
+                user_id=user_id,
+                duration_ms=log.duration_ms,
+                extra_data=log.extra_data or None,
+            )
+
+        extra_data = log.extra_data or {}
+
+        # Normalize metric name and value
+        metric_name = extra_data.get("metric_name", "frontend_performance")
+        metric_value = float(extra_data.get("metric_value", extra_data.get("duration_ms", 0.0)))
+        metric_unit = extra_data.get("metric_unit", "ms")
+
+        # Periodic performance reports are not recorded
+        if metric_name == "performance_report":
+            return None
+
+        # Infer the metric type from the message
+        if metric_name == "frontend_performance":
+            message = log.message.lower()
+            if "memory" in message:
+                metric_name = "memory_usage"
+                metric_value = float(extra_data.get("used", 0))
+                metric_unit = "bytes"
+            elif "network" in message or "request" in message:
+                metric_name = "network_request"
+                metric_value = float(extra_data.get("duration_ms", 0))
+                metric_unit = "ms"
+
+        # duration_ms only applies to time metrics
+        duration_ms = None
+        if metric_unit == "ms":
+            duration_ms = float(extra_data.get("duration_ms", metric_value))
+
+        threshold_ms = extra_data.get("threshold_ms") or extra_data.get("threshold")
+        is_slow = bool(
+            extra_data.get("is_slow")
+            or extra_data.get("performance_issue")
+            or (threshold_ms and duration_ms and duration_ms > float(threshold_ms))
+        )
+
+        return PerformanceLogCreate.model_construct(
+            source="frontend",
+            level="WARNING" if is_slow else "INFO",
+            message="",
+            layer="Performance",
+            module=log.module or "frontend",
+            function=log.function or "",
+            line_number=log.line_number or 0,
+            file_path=log.file_path or "",
+            trace_id=log.trace_id or "",
+            request_id=str(extra_data["request_id"]) if extra_data.get("request_id") else "",
+            user_id=user_id,
+            duration_ms=duration_ms,
+            extra_data=extra_data or None,
+            metric_name=metric_name,
+            metric_value=metric_value,
+            metric_unit=metric_unit,
+            component_name=extra_data.get("component_name") or extra_data.get("url"),
+            threshold_ms=float(threshold_ms) if threshold_ms else None,
+            is_slow=is_slow,
+            web_vitals=extra_data.get("web_vitals"),
+        )
+
+
+# Global ingestor instance
+frontend_log_ingestor = FrontendLogIngestor(
+    max_batch=settings.LOG_INGEST_MAX_BATCH,
+    max_body_bytes=settings.LOG_INGEST_MAX_BODY_BYTES,
+    rate_per_second=settings.LOG_INGEST_RATE_PER_SECOND,
+    burst=settings.LOG_INGEST_BURST,
+    trusted_proxies=settings.LOG_INGEST_TRUSTED_PROXIES,
+)
@@ -0,0 +1,160 @@
+"""
+Log retention.
+
+The log tables are partitioned by month on created_at. A background job
+periodically calls the `maintain_log_partitions` RPC, which creates the
+upcoming monthly partitions and detaches/drops partitions older than the
+retention period, so retention is a metadata operation instead of a DELETE
+over millions of rows. Rows written past the last monthly partition go to
+a DEFAULT partition (inserts never fail) and are moved into their monthly
+partition on the next run; a run that had to move rows logs a warning,
+since it means maintenance fell behind.
+
+    log_retention.start()          # on startup
+    await log_retention.run_once() # e.g. from the admin endpoint
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Log type -> partitioned table
+LOG_TABLES = {
+    "app": "app_logs",
+    "error": "error_logs",
+    "performance": "performance_logs",
+    "system": "system_logs",
+    "audit": "audit_logs",
+}
+
+
+def retention_days(log_type: str) -> int:
+    """Days a log type is kept (0 = forever)."""
+    if log_type == "audit":
+        return settings.LOG_AUDIT_RETENTION_DAYS
+    return settings.LOG_RETENTION_DAYS
+
+
+def retention_start(log_type: str) -> Optional[datetime]:
+    """Oldest created_at that can still exist for a log type (None = no limit).
+
+    Partitions are dropped whole, so rows up to one month older than the
+    retention period may remain; the bound includes them.
+    """
+    days = retention_days(log_type)
+    if days <= 0:
+        return None
+    return datetime.now(timezone.utc) - timedelta(days=days + 31)
+
+
+class LogRetentionManager:
+    """Runs partition maintenance for the log tables periodically."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        interval: float = 21600.0,
+        months_ahead: int = 3,
+    ):
+        """
+        Initialize retention manager.
+
+        Args:
+            enabled: Run maintenance at all
+            interval: Seconds between maintenance runs
+            months_ahead: Monthly partitions created ahead of the current month
+        """
+        self.enabled = enabled
+        self.interval = interval
+        self.months_ahead = max(1, months_ahead)
+
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+        self._stats: Dict[str, Any] = {
+            "total_runs": 0,
+            "total_errors": 0,
+            "partitions_created": 0,
+            "partitions_dropped": 0,
+            "rows_moved_from_default": 0,
+            "last_run_at": None,
+            "last_result": None,
+        }
+
+    def start(self) -> None:
+        """Start the periodic job (idempotent). Called on startup."""
+        if not self.enabled:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def run_once(self) -> Dict[str, Any]:
+        """Create upcoming partitions and drop expired ones now."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            params = {
+                "p_retention_days": {table: retention_days(log_type) for log_type, table in LOG_TABLES.items()},
+                "p_months_ahead": self.months_ahead,
+                "p_rollup_retention_days": settings.LOG_ROLLUP_RETENTION_DAYS,
+            }
+            result = await asyncio.to_thread(self._apply, params) or {}
+
+            self._stats["total_runs"] += 1
+            self._stats["partitions_created"] += len(result.get("created") or [])
+            self._stats["partitions_dropped"] += len(result.get("dropped") or [])
+            self._stats["rows_moved_from_default"] += result.get("moved_from_default") or 0
+            self._stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+            self._stats["last_result"] = result
+            if result.get("moved_from_default"):
+                logger.warning(
+                    f"Log partitions were missing: moved {result['moved_from_default']} rows "
+                    f"from the default partitions into {result.get('created')}"
+                )
+            if result.get("created") or result.get("dropped"):
+                logger.info(
+                    f"Log partitions maintained: created={result.get('created')}, dropped={result.get('dropped')}"
+                )
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "running": bool(self._task and not self._task.done()),
+        }
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._stats["total_errors"] += 1
+                logger.warning(f"Log partition maintenance failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    def _apply(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        from ..supabase.client import get_supabase_service_client
+        return get_supabase_service_client().rpc("maintain_log_partitions", params).execute().data
+
+
+# Global retention manager instance
+log_retention = LogRetentionManager(
+    enabled=settings.LOG_RETENTION_ENABLED,
+    interval=settings.LOG_RETENTION_INTERVAL,
+    months_ahead=settings.LOG_PARTITION_MONTHS_AHEAD,
+)
@@ -0,0 +1,422 @@
+"""
+Per-minute log rollups.
+
+Every app, error and performance log passing through LoggingService and
+stored in the database (app logs below LOG_DB_APP_MIN_LEVEL are not) is also
+counted in memory, per minute and per (log type, layer, level, route) series,
+together with an HDR-style latency histogram. Closed minutes are periodically
+merged into the `log_rollups` table with one `merge_log_rollups` RPC, so
+statistics and trend charts read O(minutes) rollup rows instead of scanning
+raw log tables.
+
+Merging is additive, so each flushed batch carries a flush id (process id +
+sequence). A failed batch is retried as is, with the same id, and the
+database skips ids it has already merged: a flush that committed but timed
+out on the way back is not counted twice.
+
+    log_rollups.record_schema("app", schema)     # called by LoggingService
+    log_rollups.pending_series(start, end)       # not yet flushed, for reads
+"""
+import asyncio
+import logging
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Log types that are rolled up
+ROLLUP_LOG_TYPES = ("app", "error", "performance")
+
+# Durations above this count as slow requests in the rollups
+ROLLUP_SLOW_THRESHOLD_MS = 500
+
+# Series key used once a minute has max_series distinct routes
+OVERFLOW_ROUTE = "__other__"
+
+MAX_ROUTE_LENGTH = 255
+
+_ID_SEGMENT = re.compile(
+    r"^(?:\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{24,})$"
+)
+
+
+def normalize_route(path: Optional[str]) -> str:
+    """Collapse ID path segments so /api/notices/<uuid> and /api/notices/<uuid2> share a series."""
+    if not path:
+        return ""
+    path = path.split("?", 1)[0]
+    segments = ["{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return "/".join(segments)[:MAX_ROUTE_LENGTH]
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram (milliseconds), HDR-style.
+
+    Values below 2^SUB_BUCKET_BITS are counted exactly; above that every
+    power of two is split into 2^(SUB_BUCKET_BITS-1) buckets, so percentiles
+    are within ~3% of the true value. Values are clamped to MAX_VALUE_MS,
+    which bounds a histogram to a few hundred buckets regardless of volume.
+    """
+
+    SUB_BUCKET_BITS = 6
+    MAX_VALUE_MS = 3_600_000
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    @classmethod
+    def bucket_index(cls, value: int) -> int:
+        linear = 1 << cls.SUB_BUCKET_BITS
+        if value < linear:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        half = linear >> 1
+        return linear + (shift - 1) * half + ((value >> shift) - half)
+
+    @classmethod
+    def bucket_bounds(cls, index: int) -> Tuple[int, int]:
+        """Lowest and highest value counted in a bucket."""
+        linear = 1 << cls.SUB_BUCKET_BITS
+        if index < linear:
+            return index, index
+        half = linear >> 1
+        shift = (index - linear) // half + 1
+        sub_bucket = (index - linear) % half + half
+        return sub_bucket << shift, ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value_ms: float, count: int = 1) -> None:
+        value = min(max(int(value_ms), 0), self.MAX_VALUE_MS)
+        index = self.bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        if other.max is not None:
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percent: float) -> Optional[int]:
+        """Approximate value below which `percent` % of the recorded values fall."""
+        if not self.count:
+            return None
+        rank = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = self.bucket_bounds(index)
+                value = (low + high) // 2
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def to_json(self) -> Dict[str, int]:
+        """Bucket counts keyed by bucket index (JSONB object keys are strings)."""
+        return {str(index): count for index, count in self.counts.items()}
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild from a log_rollups row (histogram + duration columns)."""
+        histogram = cls()
+        histogram.counts = {int(index): int(count) for index, count in (row.get("histogram") or {}).items()}
+        histogram.count = row.get("duration_count") or 0
+        histogram.total = row.get("duration_sum") or 0
+        histogram.min = row.get("duration_min")
+        histogram.max = row.get("duration_max")
+        return histogram
+
+
+class RollupKey(NamedTuple):
+    log_type: str
+    layer: str
+    level: str
+    route: str
+
+
+@dataclass(slots=True)
+class RollupSeries:
+    """Counters for one series in one minute."""
+
+    count: int = 0
+    slow_count: int = 0
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    def record(self, duration_ms: Optional[float]) -> None:
+        self.count += 1
+        if duration_ms is not None:
+            self.histogram.record(duration_ms)
+            if duration_ms > ROLLUP_SLOW_THRESHOLD_MS:
+                self.slow_count += 1
+
+    def merge(self, other: "RollupSeries") -> None:
+        self.count += other.count
+        self.slow_count += other.slow_count
+        self.histogram.merge(other.histogram)
+
+    def to_row(self, bucket_start: datetime, key: RollupKey) -> Dict[str, Any]:
+        return {
+            "bucket_start": bucket_start.isoformat(),
+            **key._asdict(),
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "duration_count": self.histogram.count,
+            "duration_sum": self.histogram.total,
+            "duration_min": self.histogram.min,
+            "duration_max": self.histogram.max,
+            "histogram": self.histogram.to_json(),
+        }
+
+
+@dataclass(slots=True)
+class RollupBatch:
+    """Closed minutes taken out for one flush, kept with their flush id until merged."""
+
+    flush_id: str
+    minutes: Dict[datetime, Dict[RollupKey, RollupSeries]]
+
+    def to_rows(self) -> List[Dict[str, Any]]:
+        return [
+            series.to_row(bucket_start, key)
+            for bucket_start, series_map in self.minutes.items()
+            for key, series in series_map.items()
+        ]
+
+
+class LogRollupAggregator:
+    """Aggregates log counters per minute and flushes closed minutes to log_rollups."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        flush_interval: float = 30.0,
+        max_series: int = 500,
+        max_pending_minutes: int = 60,
+    ):
+        """
+        Initialize rollup aggregator.
+
+        Args:
+            enabled: Record rollups at all
+            flush_interval: Seconds between flushes of closed minutes
+            max_series: Distinct series per minute before routes collapse into OVERFLOW_ROUTE
+            max_pending_minutes: Unflushed minutes kept in memory (oldest dropped while the database is unreachable)
+        """
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.max_series = max(1, max_series)
+        self.max_pending_minutes = max(2, max_pending_minutes)
+
+        self._minutes: Dict[datetime, Dict[RollupKey, RollupSeries]] = {}
+        # Batches not merged yet, oldest first; retried with their own flush id
+        self._unsent: List[RollupBatch] = []
+        self._process_id = uuid.uuid4().hex[:16]
+        self._flush_seq = 0
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+        self._stats = {
+            "total_recorded": 0,
+            "total_flushes": 0,
+            "total_rows_flushed": 0,
+            "total_flush_errors": 0,
+            "dropped_minutes": 0,
+        }
+
+    # =========================================================================
+    # Recording
+    # =========================================================================
+
+    def record(
+        self,
+        log_type: str,
+        level: Optional[str] = None,
+        layer: Optional[str] = None,
+        route: Optional[str] = None,
+        duration_ms: Optional[float] = None,
+        at: Optional[datetime] = None,
+    ) -> None:
+        """Count one log entry in its minute and series."""
+        if not self.enabled:
+            return
+        bucket_start = (at or datetime.now(timezone.utc)).replace(second=0, microsecond=0)
+        series_map = self._minutes.get(bucket_start)
+        if series_map is None:
+            series_map = self._minutes[bucket_start] = {}
+            self._drop_excess_minutes()
+
+        key = RollupKey(log_type, (layer or "")[:100], (level or "").upper(), normalize_route(route))
+        series = series_map.get(key)
+        if series is None:
+            if len(series_map) >= self.max_series:
+                key = key._replace(route=OVERFLOW_ROUTE)
+                series = series_map.get(key)
+            if series is None:
+                series = series_map[key] = RollupSeries()
+        series.record(duration_ms)
+        self._stats["total_recorded"] += 1
+        self._ensure_started()
+
+    def record_schema(self, log_type: str, schema: Any) -> None:
+        """Count a LoggingService log schema (AppLogCreate, ErrorLogCreate, PerformanceLogCreate)."""
+        extra_data = getattr(schema, "extra_data", None) or {}
+        route = getattr(schema, "request_path", None) or extra_data.get("request_path")
+        if not route and getattr(schema, "source", None) == "backend":
+            from .request import get_request_context
+            route = get_request_context().get("request_path")
+        self.record(
+            log_type,
+            level=getattr(schema, "level", None),
+            layer=getattr(schema, "layer", None),
+            route=route,
+            duration_ms=getattr(schema, "duration_ms", None),
+        )
+
+    # =========================================================================
+    # Reading
+    # =========================================================================
+
+    def pending_series(
+        self,
+        start: datetime,
+        end: datetime,
+    ) -> Iterator[Tuple[datetime, RollupKey, RollupSeries]]:
+        """Unflushed series (including batches waiting for a retry) with start <= minute < end."""
+        for minutes in [batch.minutes for batch in self._unsent] + [self._minutes]:
+            for bucket_start, series_map in list(minutes.items()):
+                if start <= bucket_start < end:
+                    for key, series in list(series_map.items()):
+                        yield bucket_start, key, series
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "pending_minutes": len(self._minutes) + sum(len(batch.minutes) for batch in self._unsent),
+            "pending_series": sum(len(series_map) for series_map in self._minutes.values()),
+            "unsent_batches": len(self._unsent),
+            "flusher_running": bool(self._flusher_task and not self._flusher_task.done()),
+        }
+
+    # =========================================================================
+    # Flushing
+    # =========================================================================
+
+    async def flush(self, include_current: bool = False) -> int:
+        """
+        Merge closed minutes (all minutes if include_current) into log_rollups.
+
+        Batches left by failed flushes are retried first, unchanged and with
+        their original flush id, so a batch the database already merged is
+        skipped instead of counted again. Returns rows written.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            current_minute = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+            minutes = {
+                bucket_start: series_map
+                for bucket_start, series_map in self._minutes.items()
+                if include_current or bucket_start < current_minute
+            }
+            if minutes:
+                for bucket_start in minutes:
+                    del self._minutes[bucket_start]
+                self._flush_seq += 1
+                self._unsent.append(RollupBatch(f"{self._process_id}:{self._flush_seq}", minutes))
+
+            written = 0
+            while self._unsent:
+                batch = self._unsent[0]
+                rows = batch.to_rows()
+                try:
+                    await asyncio.to_thread(self._apply, batch.flush_id, rows)
+                except Exception as e:
+                    # The outcome is unknown: keep the batch and its id for the next flush
+                    self._stats["total_flush_errors"] += 1
+                    self._drop_excess_minutes()
+                    logger.warning(f"Log rollup flush {batch.flush_id} failed ({len(rows)} rows): {str(e)}")
+                    break
+                # record() may have dropped old batches meanwhile, so remove by identity
+                self._unsent = [unsent for unsent in self._unsent if unsent is not batch]
+                self._stats["total_flushes"] += 1
+                self._stats["total_rows_flushed"] += len(rows)
+                written += len(rows)
+            return written
+
+    async def close(self) -> None:
+        """Stop the flusher and write all remaining minutes, including the current one."""
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+        await self.flush(include_current=True)
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _ensure_started(self) -> None:
+        """Start the flusher on first use (lazy initialization)."""
+        if self._flusher_task is None or self._flusher_task.done():
+            try:
+                self._flusher_task = asyncio.get_running_loop().create_task(self._flush_loop())
+            except RuntimeError:
+                # No running loop (sync caller); the next async record starts it
+                pass
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _drop_excess_minutes(self) -> None:
+        # Unsent batches hold the oldest minutes, so they go first
+        excess = len(self._minutes) + sum(len(batch.minutes) for batch in self._unsent) - self.max_pending_minutes
+        while excess > 0 and self._unsent:
+            dropped = len(self._unsent.pop(0).minutes)
+            self._stats["dropped_minutes"] += dropped
+            excess -= dropped
+        if excess <= 0:
+            return
+        for bucket_start in sorted(self._minutes)[:excess]:
+            del self._minutes[bucket_start]
+        self._stats["dropped_minutes"] += excess
+
+    def _apply(self, flush_id: str, rows: List[Dict[str, Any]]) -> None:
+        # Raw service client (log_rollups is closed to API roles), so the flush
+        # itself is not logged back into the rollups
+        from ..supabase.client import get_supabase_service_client
+        get_supabase_service_client().rpc("merge_log_rollups", {"p_rows": rows, "p_flush_id": flush_id}).execute()
+
+
+# Global rollup aggregator instance
+log_rollups = LogRollupAggregator(
+    enabled=settings.LOG_ROLLUP_ENABLED,
+    flush_interval=settings.LOG_ROLLUP_FLUSH_INTERVAL,
+    max_series=settings.LOG_ROLLUP_MAX_SERIES,
+)
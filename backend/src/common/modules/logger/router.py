@@ -4,13 +4,14 @@ Application logging router.
 API endpoints for viewing application logs (admin only).
 Exception endpoints are in the exception module.
 """
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime
 from uuid import UUID
 
-from .service import LoggingService
+from .service import logging_service
+from .ingest import frontend_log_ingestor
 from ..db.session import get_db
 
 # Use TYPE_CHECKING to avoid circular import
@@ -21,12 +22,13 @@ from .schemas import (
     LogListQuery,
     AppLogResponse,
     FrontendLogCreate,
-    FrontendLogBatchCreate,
-    AppLogCreate,
+    LogTrendResponse,
+    LogTraceResponse,
+    ErrorFingerprintListResponse,
+    decode_log_cursor,
 )
 
 router = APIRouter()
-logging_service = LoggingService()
 
 
 def get_admin_user_dependency():
@@ -47,10 +49,24 @@ def get_member_type():
     return Member
 
 
+def _check_cursor(cursor: Optional[str]) -> None:
+    """Reject malformed keyset cursors with a 400."""
+    if cursor is None:
+        return
+    try:
+        decode_log_cursor(cursor)
+    except ValueError:
+        from ..exception import ValidationError
+        raise ValidationError("Invalid cursor", field_errors={"cursor": "Use next_cursor from a previous page"})
+
+
 @router.get("/api/v1/logging/logs", response_model=LogListResponse)
 async def list_logs(
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=20, ge=1, le=1000, description="Items per page"),
+    q: Optional[str] = Query(default=None, max_length=200, description="Search messages (words, \"phrase\", OR, -word); app/error results are ranked by relevance"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page (keyset paging; page is ignored)"),
+    include_total: bool = Query(default=True, description="Count matching rows (capped)"),
     source: Optional[str] = Query(default=None, description="Filter by source (backend/frontend)"),
     level: Optional[str] = Query(default=None, description="Filter by level (DEBUG/INFO/WARNING/ERROR/CRITICAL)"),
     layer: Optional[str] = Query(default=None, description="Filter by layer (Router/Service/Database/Auth/Performance/System)"),
@@ -67,9 +83,13 @@ async def list_logs(
     This endpoint allows administrators to view application logs for debugging
     and monitoring purposes. Use source parameter to filter by backend or frontend.
     """
+    _check_cursor(cursor)
     query = LogListQuery(
         page=page,
         page_size=page_size,
+        q=q,
+        cursor=cursor,
+        include_total=include_total,
         source=source,
         level=level,
         layer=layer,
@@ -86,6 +106,9 @@ async def list_logs(
 async def list_error_logs(
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=20, ge=1, le=1000, description="Items per page"),
+    q: Optional[str] = Query(default=None, max_length=200, description="Search messages (words, \"phrase\", OR, -word); app/error results are ranked by relevance"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page (keyset paging; page is ignored)"),
+    include_total: bool = Query(default=True, description="Count matching rows (capped)"),
     level: Optional[str] = Query(default=None, description="Filter by level (ERROR/CRITICAL)"),
     trace_id: Optional[str] = Query(default=None, description="Filter by trace ID"),
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
@@ -99,9 +122,13 @@ async def list_error_logs(
     
     This endpoint queries the error_logs table for ERROR and CRITICAL level logs.
     """
+    _check_cursor(cursor)
     query = LogListQuery(
         page=page,
         page_size=page_size,
+        q=q,
+        cursor=cursor,
+        include_total=include_total,
         level=level or "ERROR,CRITICAL",
         trace_id=trace_id,
         user_id=user_id,
@@ -116,6 +143,9 @@ async def list_error_logs(
 async def list_performance_logs(
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=20, ge=1, le=1000, description="Items per page"),
+    q: Optional[str] = Query(default=None, max_length=200, description="Search messages (words, \"phrase\", OR, -word); app/error results are ranked by relevance"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page (keyset paging; page is ignored)"),
+    include_total: bool = Query(default=True, description="Count matching rows (capped)"),
     source: Optional[str] = Query(default=None, description="Filter by source (backend/frontend)"),
     trace_id: Optional[str] = Query(default=None, description="Filter by trace ID"),
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
@@ -129,9 +159,13 @@ async def list_performance_logs(
     
     This endpoint queries the performance_logs table.
     """
+    _check_cursor(cursor)
     query = LogListQuery(
         page=page,
         page_size=page_size,
+        q=q,
+        cursor=cursor,
+        include_total=include_total,
         source=source,
         trace_id=trace_id,
         user_id=user_id,
@@ -146,6 +180,9 @@ async def list_performance_logs(
 async def list_system_logs(
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=20, ge=1, le=500, description="Items per page"),
+    q: Optional[str] = Query(default=None, max_length=200, description="Search messages (words, \"phrase\", OR, -word); app/error results are ranked by relevance"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page (keyset paging; page is ignored)"),
+    include_total: bool = Query(default=True, description="Count matching rows (capped)"),
     level: Optional[str] = Query(default=None, description="Filter by level (DEBUG/INFO/WARNING/ERROR/CRITICAL)"),
     trace_id: Optional[str] = Query(default=None, description="Filter by trace ID"),
     start_date: Optional[datetime] = Query(default=None, description="Start date filter"),
@@ -158,9 +195,13 @@ async def list_system_logs(
     
     This endpoint queries the system_logs table for Python standard logging output.
     """
+    _check_cursor(cursor)
     query = LogListQuery(
         page=page,
         page_size=page_size,
+        q=q,
+        cursor=cursor,
+        include_total=include_total,
         level=level,
         trace_id=trace_id,
         start_date=start_date,
@@ -173,23 +214,20 @@ async def list_system_logs(
 @router.delete("/api/v1/logging/system/by-message")
 async def delete_system_logs_by_message(
     message: str = Query(..., description="Message pattern to match"),
+    start_date: Optional[datetime] = Query(default=None, description="Only logs created at or after this time"),
+    end_date: Optional[datetime] = Query(default=None, description="Only logs created at or before this time"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Delete system logs matching a specific message (admin only).
     """
-    from sqlalchemy import delete
-    from ..db.models import SystemLog
-    
-    stmt = delete(SystemLog).where(SystemLog.message.ilike(f"%{message}%"))
-    result = await db.execute(stmt)
-    await db.commit()
+    deleted = await logging_service.delete_logs_by_message(db, "system", message, start_date, end_date)
     
     return {
         "status": "ok",
-        "deleted": result.rowcount,
-        "message": f"Deleted {result.rowcount} system logs matching '{message}'"
+        "deleted": deleted,
+        "message": f"Deleted {deleted} system logs matching '{message}'"
     }
 
 
@@ -220,6 +258,9 @@ async def delete_system_log(
 async def list_backend_logs(
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=20, ge=1, le=1000, description="Items per page"),
+    q: Optional[str] = Query(default=None, max_length=200, description="Search messages (words, \"phrase\", OR, -word); app/error results are ranked by relevance"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page (keyset paging; page is ignored)"),
+    include_total: bool = Query(default=True, description="Count matching rows (capped)"),
     level: Optional[str] = Query(default=None, description="Filter by level (DEBUG/INFO/WARNING/ERROR/CRITICAL)"),
     trace_id: Optional[str] = Query(default=None, description="Filter by trace ID"),
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
@@ -233,9 +274,13 @@ async def list_backend_logs(
     
     This endpoint shows only backend logs (recorded by backend services).
     """
+    _check_cursor(cursor)
     query = LogListQuery(
         page=page,
         page_size=page_size,
+        q=q,
+        cursor=cursor,
+        include_total=include_total,
         source="backend",  # Force backend only
         level=level,
         trace_id=trace_id,
@@ -251,6 +296,9 @@ async def list_backend_logs(
 async def list_frontend_logs(
     page: int = Query(default=1, ge=1, description="Page number"),
     page_size: int = Query(default=20, ge=1, le=1000, description="Items per page"),
+    q: Optional[str] = Query(default=None, max_length=200, description="Search messages (words, \"phrase\", OR, -word); app/error results are ranked by relevance"),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page (keyset paging; page is ignored)"),
+    include_total: bool = Query(default=True, description="Count matching rows (capped)"),
     level: Optional[str] = Query(default=None, description="Filter by level (DEBUG/INFO/WARNING/ERROR/CRITICAL)"),
     trace_id: Optional[str] = Query(default=None, description="Filter by trace ID"),
     user_id: Optional[UUID] = Query(default=None, description="Filter by user ID"),
@@ -264,9 +312,13 @@ async def list_frontend_logs(
     
     This endpoint shows only frontend logs (recorded by frontend and sent via API).
     """
+    _check_cursor(cursor)
     query = LogListQuery(
         page=page,
         page_size=page_size,
+        q=q,
+        cursor=cursor,
+        include_total=include_total,
         source="frontend",  # Force frontend only
         level=level,
         trace_id=trace_id,
@@ -279,173 +331,25 @@ async def list_frontend_logs(
 
 
 @router.post("/api/v1/logging/frontend/logs")
-async def create_frontend_log(
-    log_data: FrontendLogBatchCreate,
-):
+async def create_frontend_log(request: Request):
     """
     Create frontend application log entries (batch).
     
     This endpoint is specifically for frontend to record logs in batches.
     Backend logs should be recorded directly via logging_service (not through this API).
-    No authentication required for this endpoint (but should be rate-limited in production).
-    
-    Optimized for fast response to avoid logging loops.
-    """
-    import asyncio
-    from uuid import UUID
-    
-    # Quick validation and early return for empty batches
-    if not log_data.logs:
-        return {"status": "ok", "processed": 0, "failed": 0, "total": 0}
-    
-    # Limit batch size to prevent performance issues
-    max_batch_size = 50
-    if len(log_data.logs) > max_batch_size:
-        # Process only the first batch_size logs to maintain performance
-        log_data.logs = log_data.logs[:max_batch_size]
-    
-    async def process_log_entry(log_entry):
-        """Process a single log entry asynchronously with minimal overhead."""
-        try:
-            # Convert user_id from string to UUID if provided
-            user_id = None
-            if log_entry.user_id:
-                try:
-                    user_id = UUID(log_entry.user_id)
-                except (ValueError, TypeError):
-                    # Invalid UUID format, ignore user_id
-                    pass
-            
-            # Simplified performance log detection
-            is_performance_log = (hasattr(log_entry, 'layer') and 
-                                log_entry.layer == 'Performance')
-            
-            if is_performance_log:
-                # 统一性能日志处理 - 按照日志规范格式
-                from .schemas import PerformanceLogCreate
-                
-                extra_data = log_entry.extra_data or {}
-                
-                # 标准化指标名称和值
-                metric_name = extra_data.get("metric_name", "frontend_performance")
-                metric_value = float(extra_data.get("metric_value", extra_data.get("duration_ms", 0.0)))
-                metric_unit = extra_data.get("metric_unit", "ms")
-                
-                # 跳过无意义的 performance_report 类型（定期汇报）
-                if metric_name == "performance_report":
-                    return True  # 跳过，不记录
-                
-                # 从消息中推断指标类型
-                if metric_name == "frontend_performance":
-                    message = log_entry.message.lower()
-                    if "memory" in message:
-                        metric_name = "memory_usage"
-                        metric_value = float(extra_data.get("used", 0))
-                        metric_unit = "bytes"
-                    elif "network" in message or "request" in message:
-                        metric_name = "network_request"
-                        metric_value = float(extra_data.get("duration_ms", 0))
-                        metric_unit = "ms"
-                
-                # duration_ms 只对时间类指标有意义
-                # 对于内存等非时间指标，不设置 duration_ms
-                duration_ms = None
-                if metric_unit == "ms":
-                    duration_ms = float(extra_data.get("duration_ms", metric_value))
-                
-                # 获取阈值和慢查询标识
-                threshold_ms = extra_data.get("threshold_ms") or extra_data.get("threshold")
-                is_slow = bool(extra_data.get("is_slow")) or bool(extra_data.get("performance_issue")) or (
-                    threshold_ms and duration_ms and duration_ms > threshold_ms
-                )
-                
-                # 确定日志级别
-                level = "WARNING" if is_slow else "INFO"
-                
-                # 组件名称
-                component_name = extra_data.get("component_name") or extra_data.get("url")
-                
-                await logging_service.performance(PerformanceLogCreate(
-                    source="frontend",
-                    level=level,
-                    metric_name=metric_name,
-                    metric_value=metric_value,
-                    metric_unit=metric_unit,
-                    layer="Performance",
-                    module=log_entry.module or "frontend",
-                    function=log_entry.function or "",
-                    line_number=log_entry.line_number or 0,
-                    file_path=log_entry.file_path,
-                    component_name=component_name,
-                    trace_id=log_entry.trace_id,
-                    request_id=str(extra_data.get("request_id", "")) if extra_data.get("request_id") else None,
-                    user_id=user_id,
-                    duration_ms=duration_ms,
-                    threshold_ms=float(threshold_ms) if threshold_ms else None,
-                    is_slow=is_slow,
-                    web_vitals=extra_data.get("web_vitals"),
-                    extra_data=extra_data if extra_data else None,
-                ))
-            else:
-                # 统一应用日志处理 - 精简格式，避免冗余
-                await logging_service.log(AppLogCreate(
-                    timestamp=log_entry.timestamp,
-                    source="frontend",
-                    level=log_entry.level or "INFO",
-                    message=log_entry.message,
-                    layer=log_entry.layer or "Frontend",
-                    module=log_entry.module or "frontend",
-                    function=log_entry.function,
-                    line_number=log_entry.line_number,
-                    file_path=log_entry.file_path,
-                    trace_id=log_entry.trace_id,
-                    request_id=log_entry.request_id,
-                    user_id=user_id,
-                    duration_ms=log_entry.duration_ms,
-                    extra_data=log_entry.extra_data if log_entry.extra_data else None,
-                ))
-            return True
-        except Exception as e:
-            # Minimal error logging to avoid recursion
-            return False
-    
-    # Optimized concurrent processing with smaller batches
-    concurrent_batch_size = 5  # Reduced from 10 to improve response time
-    processed = 0
-    failed = 0
-    
-    # Process in smaller concurrent batches for better performance
-    for i in range(0, len(log_data.logs), concurrent_batch_size):
-        batch = log_data.logs[i:i + concurrent_batch_size]
-        
-        # Process batch with timeout to prevent hanging
-        try:
-            tasks = [process_log_entry(log_entry) for log_entry in batch]
-            results = await asyncio.wait_for(
-                asyncio.gather(*tasks, return_exceptions=True),
-                timeout=2.0  # 2 second timeout per batch
-            )
-            
-            # Count results
-            for result in results:
-                if result is True:
-                    processed += 1
-                else:
-                    failed += 1
-                    
-        except asyncio.TimeoutError:
-            # If batch times out, count all as failed
-            failed += len(batch)
-        except Exception:
-            # If batch fails completely, count all as failed
-            failed += len(batch)
+    No authentication required; entries are rate-limited per client address,
+    taken from the X-Forwarded-For hop appended by the trusted proxy (the
+    leftmost hops are set by the client, so keying on them would let a client
+    rotate through fresh buckets).
     
-    return {
-        "status": "ok", 
-        "processed": processed,
-        "failed": failed,
-        "total": len(log_data.logs)
-    }
+    The body is FrontendLogBatchCreate JSON (`{"logs": [...]}`), a JSON list
+    of FrontendLogCreate entries, or NDJSON (application/x-ndjson), optionally
+    gzip-compressed. The batch is validated once and enqueued for the file and
+    database writers in one call per log type.
+    """
+    entries = await frontend_log_ingestor.read_entries(request)
+    client_key = frontend_log_ingestor.client_key(request)
+    return frontend_log_ingestor.ingest(entries, client_key=client_key)
 
 
 @router.get("/api/v1/logging/logs/{log_id}", response_model=AppLogResponse)
@@ -510,90 +414,87 @@ async def get_log_stats(
     - Average response time
     - System health status
     """
-    from sqlalchemy import select, func, and_, cast, Date
-    from datetime import date, timedelta
-    from ..db.models import AppLog, ErrorLog, PerformanceLog
-    
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-    
-    # Today's errors (from error_logs table)
-    today_errors_query = select(func.count()).select_from(ErrorLog).where(
-        cast(ErrorLog.created_at, Date) == today
-    )
-    today_errors_result = await db.execute(today_errors_query)
-    today_errors = today_errors_result.scalar() or 0
+    return await logging_service.get_log_stats(db)
+
+
+@router.get("/api/v1/logging/trends", response_model=LogTrendResponse)
+async def get_log_trends(
+    log_type: str = Query(default="app", pattern="^(app|error|performance)$", description="Log type"),
+    hours: int = Query(default=24, ge=1, le=24 * 31, description="Window length in hours (ending now)"),
+    interval_minutes: int = Query(default=5, ge=1, le=1440, description="Minutes per point"),
+    layer: Optional[str] = Query(default=None, description="Filter by layer"),
+    level: Optional[str] = Query(default=None, description="Filter by level (comma separated)"),
+    route: Optional[str] = Query(default=None, description="Filter by normalized route (e.g. /api/notices/{id})"),
+    current_user = Depends(get_admin_user_dependency),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get log volume, error and latency trends for charts (admin only).
     
-    # Yesterday's errors (for comparison)
-    yesterday_errors_query = select(func.count()).select_from(ErrorLog).where(
-        cast(ErrorLog.created_at, Date) == yesterday
-    )
-    yesterday_errors_result = await db.execute(yesterday_errors_query)
-    yesterday_errors = yesterday_errors_result.scalar() or 0
-    
-    # Calculate error change percentage
-    error_change = 0
-    if yesterday_errors > 0:
-        error_change = round(((today_errors - yesterday_errors) / yesterday_errors) * 100)
-    elif today_errors > 0:
-        error_change = 100
-    
-    # Slow requests (from performance_logs table, duration > 500ms)
-    slow_requests_query = select(func.count()).select_from(PerformanceLog).where(
-        and_(
-            cast(PerformanceLog.created_at, Date) == today,
-            PerformanceLog.duration_ms > 500
-        )
-    )
-    slow_requests_result = await db.execute(slow_requests_query)
-    slow_requests = slow_requests_result.scalar() or 0
-    
-    # Security alerts (auth warnings/errors from app_logs)
-    security_query = select(func.count()).select_from(AppLog).where(
-        and_(
-            cast(AppLog.created_at, Date) == today,
-            AppLog.layer == "Auth",
-            AppLog.level.in_(["WARNING", "ERROR", "CRITICAL"])
+    Reads the per-minute log rollups, so the cost depends on the window
+    length, not on the number of log rows.
+    """
+    if hours * 60 // interval_minutes > logging_service.MAX_TREND_POINTS:
+        from ..exception import ValidationError
+        raise ValidationError(
+            f"Too many points: use an interval of at least {-(-hours * 60 // logging_service.MAX_TREND_POINTS)} minutes",
+            field_errors={"interval_minutes": "Too small for the requested window"},
         )
+
+    return await logging_service.get_log_trends(
+        db,
+        log_type=log_type,
+        hours=hours,
+        interval_minutes=interval_minutes,
+        layer=layer,
+        level=level,
+        route=route,
     )
-    security_result = await db.execute(security_query)
-    security_alerts = security_result.scalar() or 0
+
+
+@router.get("/api/v1/logging/fingerprints", response_model=ErrorFingerprintListResponse)
+async def list_error_fingerprints(
+    hours: int = Query(default=24, ge=1, le=24 * 90, description="Only fingerprints last seen within this many hours"),
+    source: Optional[str] = Query(default=None, description="Filter by source (backend/frontend)"),
+    q: Optional[str] = Query(default=None, max_length=200, description="Filter by exception type or message template"),
+    sort: str = Query(default="last_seen", pattern="^(last_seen|total_count)$", description="last_seen or total_count"),
+    page: int = Query(default=1, ge=1, description="Page number"),
+    page_size: int = Query(default=20, ge=1, le=200, description="Items per page"),
+    current_user = Depends(get_admin_user_dependency),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List exception fingerprints (admin only).
     
-    # Today's total requests (from app_logs)
-    today_requests_query = select(func.count()).select_from(AppLog).where(
-        cast(AppLog.created_at, Date) == today
-    )
-    today_requests_result = await db.execute(today_requests_query)
-    today_requests = today_requests_result.scalar() or 0
-    
-    # Average response time (from performance_logs)
-    avg_response_query = select(func.avg(PerformanceLog.duration_ms)).select_from(PerformanceLog).where(
-        and_(
-            cast(PerformanceLog.created_at, Date) == today,
-            PerformanceLog.duration_ms.isnot(None)
-        )
+    Each fingerprint groups occurrences of the same bug (type, message
+    template, top stack frames) with its total count, first/last seen and
+    sample trace ids (see /api/v1/logging/traces/{trace_id}).
+    """
+    return await logging_service.list_error_fingerprints(
+        db, hours=hours, source=source, q=q, sort=sort, page=page, page_size=page_size
     )
-    avg_response_result = await db.execute(avg_response_query)
-    avg_response_time = avg_response_result.scalar() or 0
-    
-    return {
-        "today_errors": today_errors,
-        "error_change": error_change,
-        "slow_requests": slow_requests,
-        "security_alerts": security_alerts,
-        "today_requests": today_requests,
-        "avg_response_time": round(avg_response_time) if avg_response_time else 0,
-        "api_health": "healthy",
-        "db_health": "healthy",
-        "cache_health": "healthy",
-        "storage_health": "healthy",
-    }
 
 
+@router.get("/api/v1/logging/traces/{trace_id}", response_model=LogTraceResponse)
+async def get_trace_logs(
+    trace_id: str,
+    current_user = Depends(get_admin_user_dependency),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get every app, error and performance log of one trace (admin only).
+    
+    Entries from all three tables are returned oldest first, tagged with
+    log_type, so an incident can be followed end to end in one call.
+    """
+    return await logging_service.get_trace(db, trace_id)
+
 
 @router.delete("/api/v1/logging/logs/by-message")
 async def delete_logs_by_message(
     message: str = Query(..., description="Error message pattern to match"),
+    start_date: Optional[datetime] = Query(default=None, description="Only logs created at or after this time"),
+    end_date: Optional[datetime] = Query(default=None, description="Only logs created at or before this time"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
@@ -603,18 +504,12 @@ async def delete_logs_by_message(
     Used to clean up resolved/fixed errors from the database.
     Matches logs where the message contains the provided pattern.
     """
-    from sqlalchemy import delete
-    from ..db.models import AppLog
-    
-    # Delete logs matching the message pattern
-    stmt = delete(AppLog).where(AppLog.message.ilike(f"%{message}%"))
-    result = await db.execute(stmt)
-    await db.commit()
+    deleted = await logging_service.delete_logs_by_message(db, "app", message, start_date, end_date)
     
     return {
         "status": "ok",
-        "deleted": result.rowcount,
-        "message": f"Deleted {result.rowcount} logs matching '{message}'"
+        "deleted": deleted,
+        "message": f"Deleted {deleted} logs matching '{message}'"
     }
 
 
@@ -644,23 +539,20 @@ async def delete_log(
 @router.delete("/api/v1/logging/errors/by-message")
 async def delete_error_logs_by_message(
     message: str = Query(..., description="Error message pattern to match"),
+    start_date: Optional[datetime] = Query(default=None, description="Only logs created at or after this time"),
+    end_date: Optional[datetime] = Query(default=None, description="Only logs created at or before this time"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Delete error logs matching a specific message (admin only).
     """
-    from sqlalchemy import delete
-    from ..db.models import ErrorLog
-    
-    stmt = delete(ErrorLog).where(ErrorLog.message.ilike(f"%{message}%"))
-    result = await db.execute(stmt)
-    await db.commit()
+    deleted = await logging_service.delete_logs_by_message(db, "error", message, start_date, end_date)
     
     return {
         "status": "ok",
-        "deleted": result.rowcount,
-        "message": f"Deleted {result.rowcount} error logs matching '{message}'"
+        "deleted": deleted,
+        "message": f"Deleted {deleted} error logs matching '{message}'"
     }
 
 
@@ -690,23 +582,20 @@ async def delete_error_log(
 @router.delete("/api/v1/logging/performance/by-message")
 async def delete_performance_logs_by_message(
     message: str = Query(..., description="Message pattern to match"),
+    start_date: Optional[datetime] = Query(default=None, description="Only logs created at or after this time"),
+    end_date: Optional[datetime] = Query(default=None, description="Only logs created at or before this time"),
     current_user = Depends(get_admin_user_dependency),
     db: AsyncSession = Depends(get_db),
 ):
     """
     Delete performance logs matching a specific message (admin only).
     """
-    from sqlalchemy import delete
-    from ..db.models import PerformanceLog
-    
-    stmt = delete(PerformanceLog).where(PerformanceLog.message.ilike(f"%{message}%"))
-    result = await db.execute(stmt)
-    await db.commit()
+    deleted = await logging_service.delete_logs_by_message(db, "performance", message, start_date, end_date)
     
     return {
         "status": "ok",
-        "deleted": result.rowcount,
-        "message": f"Deleted {result.rowcount} performance logs matching '{message}'"
+        "deleted": deleted,
+        "message": f"Deleted {deleted} performance logs matching '{message}'"
     }
 
 
@@ -743,34 +632,28 @@ async def delete_all_logs(
     
     WARNING: This is a destructive operation that cannot be undone.
     Clears: app_logs, error_logs, performance_logs, system_logs, audit_logs
+    (TRUNCATE, so the cost does not depend on the number of rows).
     """
-    from sqlalchemy import delete, text
-    from ..db.models import AppLog, ErrorLog, PerformanceLog, SystemLog, AuditLog
-    
-    deleted_counts = {}
-    
-    # Delete from each log table
-    for model, name in [
-        (AppLog, "app_logs"),
-        (ErrorLog, "error_logs"),
-        (PerformanceLog, "performance_logs"),
-        (SystemLog, "system_logs"),
-        (AuditLog, "audit_logs"),
-    ]:
-        try:
-            stmt = delete(model)
-            result = await db.execute(stmt)
-            deleted_counts[name] = result.rowcount
-        except Exception as e:
-            deleted_counts[name] = f"error: {str(e)}"
-    
-    await db.commit()
-    
-    total_deleted = sum(v for v in deleted_counts.values() if isinstance(v, int))
+    tables = await logging_service.truncate_logs(db)
     
     return {
         "status": "ok",
-        "total_deleted": total_deleted,
-        "details": deleted_counts,
-        "message": f"Deleted {total_deleted} logs from all tables"
+        "details": {table: "truncated" for table in tables},
+        "message": f"Deleted all logs from {len(tables)} tables"
     }
+
+
+@router.post("/api/v1/logging/retention/run")
+async def run_log_retention(
+    current_user = Depends(get_admin_user_dependency),
+):
+    """
+    Run log partition maintenance now (admin only).
+    
+    Creates upcoming monthly partitions and drops partitions older than
+    LOG_RETENTION_DAYS (LOG_AUDIT_RETENTION_DAYS for audit logs).
+    """
+    from .retention import log_retention
+    
+    result = await log_retention.run_once()
+    return {"status": "ok", **result}
@@ -12,6 +12,7 @@ This module provides:
 
 Requirements: 4.1, 4.2, 4.3, 4.4, 4.5, 4.6
 """
+import base64
 from abc import ABC
 from datetime import datetime
 from typing import Optional, Any, Union
@@ -598,6 +599,9 @@ class LogListQuery(BaseModel):
     user_id: Optional[UUID] = None
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    q: Optional[str] = Field(default=None, max_length=200)  # Full-text message search, ranked on app/error logs
+    cursor: Optional[str] = None  # next_cursor of the previous page (keyset paging, page is ignored)
+    include_total: bool = True  # Count matching rows (capped at LOG_COUNT_CAP)
 
 
 class LogListResponse(BaseModel):
@@ -608,6 +612,93 @@ class LogListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[str] = None  # Pass as cursor to get the next page
+    has_more: bool = False
+    total_capped: bool = False  # total is a lower bound (more than LOG_COUNT_CAP rows match)
+
+
+def encode_log_cursor(created_at: datetime, log_id: UUID) -> str:
+    """Encode the (created_at, id) position of the last row of a page."""
+    raw = f"{created_at.isoformat()}|{log_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_log_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor from encode_log_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, log_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(log_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class LogTraceEntry(AppLogResponse):
+    """A log entry of a trace, tagged with its log type (app, error, performance)."""
+
+    log_type: str
+
+
+class LogTraceResponse(BaseModel):
+    """Every app, error and performance log of one trace, oldest first."""
+
+    trace_id: str
+    items: list[LogTraceEntry]
+    counts: dict[str, int]
+    truncated: bool = False
+
+
+class ErrorFingerprintResponse(BaseModel):
+    """Running totals of one exception fingerprint."""
+
+    fingerprint: str
+    source: str
+    level: str
+    exception_type: str
+    message_template: str
+    frames: list[str] = []
+    sample_message: Optional[str] = None
+    total_count: int
+    first_seen: datetime
+    last_seen: datetime
+    sample_trace_ids: list[str] = []
+
+    class Config:
+        from_attributes = True
+
+
+class ErrorFingerprintListResponse(BaseModel):
+    """Exception fingerprints seen in a time range."""
+
+    items: list[ErrorFingerprintResponse]
+    total: int
+    page: int
+    page_size: int
+    total_pages: int
+
+
+class LogTrendPoint(BaseModel):
+    """One interval of a log trend (from per-minute rollups)."""
+
+    bucket_start: datetime
+    count: int = 0
+    error_count: int = 0
+    slow_count: int = 0
+    avg_ms: Optional[int] = None
+    p50_ms: Optional[int] = None
+    p95_ms: Optional[int] = None
+    p99_ms: Optional[int] = None
+    max_ms: Optional[int] = None
+
+
+class LogTrendResponse(BaseModel):
+    """Response schema for log trends."""
+
+    log_type: str
+    interval_minutes: int
+    start: datetime
+    end: datetime
+    items: list[LogTrendPoint]
 
 
 class FrontendLogCreate(BaseModel):
@@ -11,14 +11,21 @@ Usage:
     await logging_service.performance(PerformanceLogCreate(...))  # -> performance.log + DB
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, true, cast, text, tuple_, delete, literal, literal_column, null, union_all, BigInteger
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import selectinload
-from typing import Optional, TYPE_CHECKING, Type, Any, List
+from typing import Optional, TYPE_CHECKING, Type, Any, List, Dict
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
+import asyncio
 import logging
+import time
 
+from ..config import settings
 from .file_writer import file_log_writer
 from .db_writer import db_log_writer
+from .rollup import log_rollups, RollupSeries
+from .retention import LOG_TABLES, retention_start
 from .schemas import (
     AppLogCreate,
     ErrorLogCreate,
@@ -27,6 +34,14 @@ from .schemas import (
     LogListQuery,
     LogListResponse,
     AppLogResponse,
+    LogTrendPoint,
+    LogTrendResponse,
+    LogTraceEntry,
+    LogTraceResponse,
+    ErrorFingerprintResponse,
+    ErrorFingerprintListResponse,
+    encode_log_cursor,
+    decode_log_cursor,
 )
 
 logger = logging.getLogger(__name__)
@@ -49,6 +64,17 @@ class LoggingService:
     All methods write to both file and database.
     """
 
+    # Levels of Auth layer app logs counted as security alerts
+    SECURITY_ALERT_LEVELS = ("WARNING", "ERROR", "CRITICAL")
+
+    # Upper bound on points returned by get_log_trends
+    MAX_TREND_POINTS = 2000
+
+    def __init__(self):
+        self._stats_cache: Optional[Dict[str, Any]] = None
+        self._stats_cache_expires_at = 0.0
+        self._stats_lock: Optional[asyncio.Lock] = None
+
     # =========================================================================
     # Unified Log Methods - 统一日志入口
     # =========================================================================
@@ -75,14 +101,24 @@ class LoggingService:
         except Exception:
             pass
         
+        # Count in per-minute rollups (stats and trends read these); only levels
+        # stored in app_logs, so the counts match the table
+        try:
+            if db_log_writer.stores_level("app", schema.level):
+                log_rollups.record_schema("app", schema)
+        except Exception:
+            pass
+        
         return schema.to_db_dict()
 
-    async def error(self, schema: ErrorLogCreate) -> dict:
+    async def error(self, schema: ErrorLogCreate, count_in_rollups: bool = True) -> dict:
         """
         Create an error log entry.
         
         Args:
             schema: ErrorLogCreate schema instance
+            count_in_rollups: Count the entry in the per-minute rollups (False when
+                the caller already counted its occurrences, e.g. exception aggregation)
             
         Returns:
             dict: The log entry data
@@ -99,6 +135,13 @@ class LoggingService:
         except Exception:
             pass
         
+        # Count in per-minute rollups (stats and trends read these)
+        if count_in_rollups:
+            try:
+                log_rollups.record_schema("error", schema)
+            except Exception:
+                pass
+        
         return schema.to_db_dict()
 
     async def audit(self, schema: AuditLogCreate) -> dict:
@@ -147,6 +190,12 @@ class LoggingService:
         except Exception:
             pass
         
+        # Count in per-minute rollups (stats and trends read these)
+        try:
+            log_rollups.record_schema("performance", schema)
+        except Exception:
+            pass
+        
         return schema.to_db_dict()
 
     # =========================================================================
@@ -205,6 +254,11 @@ class LoggingService:
         
         if query.start_date and hasattr(model, 'created_at'):
             conditions.append(model.created_at >= query.start_date)
+        elif hasattr(model, 'created_at'):
+            # Only scan partitions that can still hold rows (partition pruning)
+            oldest = retention_start(log_type)
+            if oldest:
+                conditions.append(model.created_at >= oldest)
         
         if query.end_date and hasattr(model, 'created_at'):
             conditions.append(model.created_at <= query.end_date)
@@ -218,8 +272,31 @@ class LoggingService:
             if query.layer and hasattr(model, 'layer'):
                 conditions.append(model.layer == query.layer)
         
+        if query.q:
+            tsquery = self._search_query(model, query.q)
+            if tsquery is not None:
+                conditions.append(self._search_document(model).op("@@")(tsquery))
+            elif hasattr(model, 'message'):
+                # Tables without a search column (small or short-lived) fall back to a substring match
+                conditions.append(model.message.ilike(f"%{query.q}%"))
+        
         return conditions
 
+    @staticmethod
+    def _search_query(model: Type[Any], q: str) -> Optional[Any]:
+        """Full-text query for q, or None if the table has no search index.
+        
+        q uses web search syntax: words are ANDed, "quoted phrases", OR, -excluded.
+        """
+        if not hasattr(model, 'search_document'):
+            return None
+        return func.websearch_to_tsquery(text("'simple'::regconfig"), q)
+
+    @staticmethod
+    def _search_document(model: Type[Any]) -> Any:
+        """The tsvector expression of the table's GIN search index (must match it exactly to use it)."""
+        return literal_column(model.search_document, type_=TSVECTOR)
+
     def _to_response(self, log: Any, log_type: str) -> AppLogResponse:
         """Convert a log model to AppLogResponse.
         
@@ -257,6 +334,14 @@ class LoggingService:
     ) -> LogListResponse:
         """Unified method to list logs with filtering and pagination.
         
+        Pages are ordered by (created_at, id) descending. With query.cursor
+        the page starts right after the cursor row (keyset paging, no
+        OFFSET); otherwise query.page is used. The total is counted up to
+        LOG_COUNT_CAP rows only, and skipped when include_total is False.
+        
+        With query.q on a table with a search column, results are ordered
+        by relevance instead and paged by query.page (no cursor).
+        
         Args:
             db: Database session
             query: Query parameters
@@ -267,30 +352,50 @@ class LoggingService:
         """
         model = self._get_model_for_type(log_type)
         
-        # Build base query
-        base_query = select(model)
-        
         # Build and apply conditions
         conditions = self._build_conditions(model, query, log_type)
-        if conditions:
-            base_query = base_query.where(and_(*conditions))
-        
-        # Get total count
-        count_query = select(func.count()).select_from(model)
-        if conditions:
-            count_query = count_query.where(and_(*conditions))
         
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
+        # Count matching rows, stopping at the cap
+        total = 0
+        total_capped = False
+        if query.include_total:
+            cap = settings.LOG_COUNT_CAP
+            matching = select(model.id)
+            if conditions:
+                matching = matching.where(and_(*conditions))
+            count_query = select(func.count()).select_from(matching.limit(cap + 1).subquery())
+            total = (await db.execute(count_query)).scalar() or 0
+            if total > cap:
+                total, total_capped = cap, True
         
-        # Apply pagination and ordering
-        offset = (query.page - 1) * query.page_size
-        base_query = base_query.order_by(model.created_at.desc())
-        base_query = base_query.offset(offset).limit(query.page_size)
+        base_query = select(model)
+        if conditions:
+            base_query = base_query.where(and_(*conditions))
+        tsquery = self._search_query(model, query.q) if query.q else None
+        if tsquery is not None:
+            # Ranked search: best matches first, newest first among equals
+            ranked = True
+            base_query = base_query.order_by(
+                func.ts_rank_cd(self._search_document(model), tsquery).desc(), model.created_at.desc(), model.id.desc()
+            )
+        else:
+            ranked = False
+            base_query = base_query.order_by(model.created_at.desc(), model.id.desc())
+        if query.cursor and not ranked:
+            cursor_created_at, cursor_id = decode_log_cursor(query.cursor)
+            base_query = base_query.where(
+                tuple_(model.created_at, model.id) < tuple_(literal(cursor_created_at), literal(cursor_id))
+            )
+        else:
+            base_query = base_query.offset((query.page - 1) * query.page_size)
+        # One extra row tells whether there is a next page
+        base_query = base_query.limit(query.page_size + 1)
         
         # Execute query
         result = await db.execute(base_query)
         logs = result.scalars().all()
+        has_more = len(logs) > query.page_size
+        logs = logs[:query.page_size]
         
         # Convert to response models
         items = [self._to_response(log, log_type) for log in logs]
@@ -303,6 +408,9 @@ class LoggingService:
             page=query.page,
             page_size=query.page_size,
             total_pages=total_pages,
+            next_cursor=encode_log_cursor(logs[-1].created_at, logs[-1].id) if has_more and not ranked else None,
+            has_more=has_more,
+            total_capped=total_capped,
         )
 
     async def list_logs(
@@ -345,6 +453,158 @@ class LoggingService:
         """List audit logs with filtering and pagination."""
         return await self._list_logs(db, query, "audit")
 
+    # =========================================================================
+    # Delete Methods - 删除方法
+    # =========================================================================
+
+    async def delete_logs_by_message(
+        self,
+        db: AsyncSession,
+        log_type: str,
+        message: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> int:
+        """Delete logs whose message contains `message`, in batches.
+
+        Each batch deletes at most LOG_DELETE_BATCH_SIZE rows and commits, so
+        row locks and dead tuples stay bounded; the date range limits the
+        scan to the matching partitions. Matching is a plain substring match:
+        the full-text index splits words differently (e.g. "a.b" is one
+        token), so it cannot narrow the candidates without missing rows.
+
+        Returns:
+            Number of deleted logs
+        """
+        model = self._get_model_for_type(log_type)
+        conditions = [model.message.ilike(f"%{message}%")]
+        if start_date:
+            conditions.append(model.created_at >= start_date)
+        if end_date:
+            conditions.append(model.created_at <= end_date)
+
+        batch_size = settings.LOG_DELETE_BATCH_SIZE
+        deleted = 0
+        while True:
+            batch = select(model.id, model.created_at).where(and_(*conditions)).limit(batch_size)
+            result = await db.execute(
+                delete(model).where(tuple_(model.id, model.created_at).in_(batch))
+            )
+            await db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+
+    async def truncate_logs(self, db: AsyncSession) -> List[str]:
+        """Remove all rows from every log table (TRUNCATE, no row-by-row delete)."""
+        tables = list(LOG_TABLES.values())
+        await db.execute(text(f"TRUNCATE TABLE {', '.join(tables)}"))
+        await db.commit()
+        return tables
+
+    async def get_trace(
+        self,
+        db: AsyncSession,
+        trace_id: str,
+    ) -> LogTraceResponse:
+        """Get every app, error and performance log of a trace in one query.
+
+        The three tables are read with one UNION ALL statement, each branch
+        using its (trace_id, created_at) index. Results are oldest first and capped at
+        LOG_TRACE_MAX_ENTRIES.
+        """
+        columns = (
+            "id", "source", "level", "message", "layer", "module", "function", "line_number",
+            "file_path", "trace_id", "request_id", "user_id", "duration_ms", "extra_data", "created_at",
+        )
+        app_table = self._get_model_for_type("app").__table__
+        branches = []
+        for log_type in ("app", "error", "performance"):
+            model = self._get_model_for_type(log_type)
+            # Columns a table lacks (e.g. error_logs.duration_ms) are selected as typed NULLs
+            selected = [
+                model.__table__.c[c] if c in model.__table__.c else null().cast(app_table.c[c].type).label(c)
+                for c in columns
+            ]
+            branches.append(
+                select(literal(log_type).label("log_type"), *selected)
+                .where(model.trace_id == trace_id)
+            )
+        combined = union_all(*branches).subquery()
+        limit = settings.LOG_TRACE_MAX_ENTRIES
+        stmt = (
+            select(combined)
+            .order_by(combined.c.created_at, combined.c.id)
+            .limit(limit + 1)
+        )
+        rows = (await db.execute(stmt)).mappings().all()
+
+        items = [LogTraceEntry(**row) for row in rows[:limit]]
+        counts = {"app": 0, "error": 0, "performance": 0}
+        for item in items:
+            counts[item.log_type] += 1
+
+        return LogTraceResponse(
+            trace_id=trace_id,
+            items=items,
+            counts=counts,
+            truncated=len(rows) > limit,
+        )
+
+    async def list_error_fingerprints(
+        self,
+        db: AsyncSession,
+        hours: int = 24,
+        source: Optional[str] = None,
+        q: Optional[str] = None,
+        sort: str = "last_seen",
+        page: int = 1,
+        page_size: int = 20,
+    ) -> ErrorFingerprintListResponse:
+        """List exception fingerprints last seen in the past `hours`.
+
+        Args:
+            db: Database session
+            hours: Only fingerprints last seen within this many hours
+            source: Filter by source (backend/frontend)
+            q: Filter by exception type or message template (substring)
+            sort: last_seen (newest first) or total_count (most frequent first)
+            page: Page number
+            page_size: Items per page
+
+        Returns:
+            Paginated fingerprints
+        """
+        from ..db.models import ErrorFingerprint
+
+        conditions = [ErrorFingerprint.last_seen >= datetime.now(timezone.utc) - timedelta(hours=hours)]
+        if source:
+            conditions.append(ErrorFingerprint.source == source)
+        if q:
+            conditions.append(
+                ErrorFingerprint.exception_type.ilike(f"%{q}%") | ErrorFingerprint.message_template.ilike(f"%{q}%")
+            )
+
+        total = (await db.execute(select(func.count()).select_from(ErrorFingerprint).where(*conditions))).scalar() or 0
+
+        order = ErrorFingerprint.total_count.desc() if sort == "total_count" else ErrorFingerprint.last_seen.desc()
+        result = await db.execute(
+            select(ErrorFingerprint)
+            .where(*conditions)
+            .order_by(order, ErrorFingerprint.fingerprint)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        items = [ErrorFingerprintResponse.model_validate(row) for row in result.scalars().all()]
+
+        return ErrorFingerprintListResponse(
+            items=items,
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=(total + page_size - 1) // page_size,
+        )
+
     async def get_log(
         self,
         db: AsyncSession,
@@ -369,6 +629,249 @@ class LoggingService:
         )
         return result.scalar_one_or_none()
 
+    # =========================================================================
+    # Statistics - 统计
+    # =========================================================================
+
+    async def get_log_stats(self, db: AsyncSession) -> Dict[str, Any]:
+        """
+        Get log statistics for the monitoring dashboard.
+
+        Results are cached for LOG_STATS_CACHE_SECONDS; concurrent callers
+        share a single database round trip.
+        """
+        if self._stats_cache is not None and time.monotonic() < self._stats_cache_expires_at:
+            return self._stats_cache
+
+        if self._stats_lock is None:
+            self._stats_lock = asyncio.Lock()
+        async with self._stats_lock:
+            # Another caller may have refreshed the cache while we waited
+            if self._stats_cache is not None and time.monotonic() < self._stats_cache_expires_at:
+                return self._stats_cache
+
+            stats = await self._query_log_stats(db)
+            self._stats_cache = stats
+            self._stats_cache_expires_at = time.monotonic() + settings.LOG_STATS_CACHE_SECONDS
+            return stats
+
+    async def _query_log_stats(self, db: AsyncSession) -> Dict[str, Any]:
+        """Compute dashboard statistics from the per-minute log rollups.
+
+        Reads at most two days of rollup rows (grouped in the database) plus
+        the minutes this process has not flushed yet, so the cost does not
+        depend on the number of log rows.
+        """
+        from ..db.models import LogRollup
+
+        today_start = datetime.now().astimezone().replace(hour=0, minute=0, second=0, microsecond=0)
+        tomorrow_start = today_start + timedelta(days=1)
+        yesterday_start = today_start - timedelta(days=1)
+
+        is_today = (LogRollup.bucket_start >= today_start).label("is_today")
+        stmt = (
+            select(
+                is_today,
+                LogRollup.log_type,
+                LogRollup.layer,
+                LogRollup.level,
+                func.sum(LogRollup.count).label("count"),
+                func.sum(LogRollup.slow_count).label("slow_count"),
+                func.sum(LogRollup.duration_count).label("duration_count"),
+                func.sum(LogRollup.duration_sum).label("duration_sum"),
+            )
+            .where(LogRollup.bucket_start >= yesterday_start, LogRollup.bucket_start < tomorrow_start)
+            .group_by(text("is_today"), LogRollup.log_type, LogRollup.layer, LogRollup.level)
+        )
+        groups = [
+            (row.is_today, row.log_type, row.layer, row.level,
+             row.count or 0, row.slow_count or 0, row.duration_count or 0, row.duration_sum or 0)
+            for row in (await db.execute(stmt)).all()
+        ]
+        for bucket_start, key, series in log_rollups.pending_series(yesterday_start, tomorrow_start):
+            groups.append((
+                bucket_start >= today_start, key.log_type, key.layer, key.level,
+                series.count, series.slow_count, series.histogram.count, series.histogram.total,
+            ))
+
+        today_errors = yesterday_errors = 0
+        slow_requests = security_alerts = today_requests = 0
+        duration_count = duration_sum = 0
+        for today, log_type, layer, level, count, slow_count, group_duration_count, group_duration_sum in groups:
+            if log_type == "error":
+                if today:
+                    today_errors += count
+                else:
+                    yesterday_errors += count
+            if not today:
+                continue
+            if log_type == "performance":
+                slow_requests += slow_count
+                duration_count += group_duration_count
+                duration_sum += group_duration_sum
+            elif log_type == "app":
+                today_requests += count
+                if layer == "Auth" and level in self.SECURITY_ALERT_LEVELS:
+                    security_alerts += count
+
+        # Calculate error change percentage
+        error_change = 0
+        if yesterday_errors > 0:
+            error_change = round(((today_errors - yesterday_errors) / yesterday_errors) * 100)
+        elif today_errors > 0:
+            error_change = 100
+
+        return {
+            "today_errors": today_errors,
+            "error_change": error_change,
+            "slow_requests": slow_requests,
+            "security_alerts": security_alerts,
+            "today_requests": today_requests,
+            "avg_response_time": round(duration_sum / duration_count) if duration_count else 0,
+            "api_health": "healthy",
+            "db_health": "healthy",
+            "cache_health": "healthy",
+            "storage_health": "healthy",
+        }
+
+    async def get_log_trends(
+        self,
+        db: AsyncSession,
+        log_type: str = "app",
+        hours: int = 24,
+        interval_minutes: int = 5,
+        layer: Optional[str] = None,
+        level: Optional[str] = None,
+        route: Optional[str] = None,
+    ) -> LogTrendResponse:
+        """Request volume, error and latency trend from the per-minute log rollups.
+
+        Counts and histogram buckets are summed per interval in the database;
+        latency percentiles come from the merged histograms.
+
+        Args:
+            db: Database session
+            log_type: app, error or performance
+            hours: Length of the window ending now
+            interval_minutes: Width of each point
+            layer: Only this layer
+            level: Only these levels (comma separated)
+            route: Only this normalized route (e.g. /api/notices/{id})
+        """
+        from ..db.models import LogRollup
+
+        interval = timedelta(minutes=interval_minutes)
+        end = datetime.now(timezone.utc).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Align points to multiples of the interval since the epoch
+        epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+        start = end - timedelta(hours=hours)
+        start -= (start - epoch) % interval
+        levels = [l.strip().upper() for l in level.split(",")] if level else None
+
+        conditions = [
+            LogRollup.log_type == log_type,
+            LogRollup.bucket_start >= start,
+            LogRollup.bucket_start < end,
+        ]
+        if layer:
+            conditions.append(LogRollup.layer == layer)
+        if levels:
+            conditions.append(LogRollup.level.in_(levels))
+        if route is not None:
+            conditions.append(LogRollup.route == route)
+
+        bucket = func.date_bin(interval, LogRollup.bucket_start, epoch).label("bucket")
+        error_levels = ("ERROR", "CRITICAL")
+
+        totals_stmt = (
+            select(
+                bucket,
+                func.sum(LogRollup.count).label("count"),
+                func.coalesce(
+                    func.sum(LogRollup.count).filter(LogRollup.level.in_(error_levels)), 0
+                ).label("error_count"),
+                func.sum(LogRollup.slow_count).label("slow_count"),
+                func.sum(LogRollup.duration_count).label("duration_count"),
+                func.sum(LogRollup.duration_sum).label("duration_sum"),
+                func.min(LogRollup.duration_min).label("duration_min"),
+                func.max(LogRollup.duration_max).label("duration_max"),
+            )
+            .where(and_(*conditions))
+            .group_by(text("bucket"))
+        )
+        histogram_entries = func.jsonb_each_text(LogRollup.histogram).table_valued("key", "value").lateral("h")
+        histogram_stmt = (
+            select(
+                bucket,
+                histogram_entries.c.key,
+                func.sum(cast(histogram_entries.c.value, BigInteger)).label("count"),
+            )
+            .select_from(LogRollup)
+            .join(histogram_entries, true())
+            .where(and_(*conditions))
+            .group_by(text("bucket"), histogram_entries.c.key)
+        )
+
+        points: Dict[datetime, RollupSeries] = {}
+        error_counts: Dict[datetime, int] = {}
+
+        def point(bucket_start: datetime) -> RollupSeries:
+            series = points.get(bucket_start)
+            if series is None:
+                series = points[bucket_start] = RollupSeries()
+            return series
+
+        for row in (await db.execute(totals_stmt)).all():
+            series = point(row.bucket)
+            series.count += row.count or 0
+            series.slow_count += row.slow_count or 0
+            series.histogram.count = row.duration_count or 0
+            series.histogram.total = row.duration_sum or 0
+            series.histogram.min = row.duration_min
+            series.histogram.max = row.duration_max
+            error_counts[row.bucket] = error_counts.get(row.bucket, 0) + (row.error_count or 0)
+        for row in (await db.execute(histogram_stmt)).all():
+            point(row.bucket).histogram.counts[int(row.key)] = int(row.count)
+
+        # Minutes not flushed by this process yet
+        for bucket_start, key, pending in log_rollups.pending_series(start, end):
+            if (
+                key.log_type != log_type
+                or (layer and key.layer != layer)
+                or (levels and key.level not in levels)
+                or (route is not None and key.route != route)
+            ):
+                continue
+            bucket_start = bucket_start - (bucket_start - epoch) % interval
+            point(bucket_start).merge(pending)
+            if key.level in error_levels:
+                error_counts[bucket_start] = error_counts.get(bucket_start, 0) + pending.count
+
+        items = []
+        bucket_start = start
+        while bucket_start < end:
+            series = points.get(bucket_start) or RollupSeries()
+            histogram = series.histogram
+            items.append(LogTrendPoint(
+                bucket_start=bucket_start,
+                count=series.count,
+                error_count=error_counts.get(bucket_start, 0),
+                slow_count=series.slow_count,
+                avg_ms=round(histogram.mean) if histogram.count else None,
+                p50_ms=histogram.percentile(50),
+                p95_ms=histogram.percentile(95),
+                p99_ms=histogram.percentile(99),
+                max_ms=histogram.max,
+            ))
+            bucket_start += interval
+
+        return LogTrendResponse(
+            log_type=log_type,
+            interval_minutes=interval_minutes,
+            start=start,
+            end=end,
+            items=items,
+        )
 
 # Create singleton instance
 logging_service = LoggingService()
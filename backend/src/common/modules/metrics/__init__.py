@@ -0,0 +1,32 @@
+"""
+Metrics Module
+
+Prometheus /metrics endpoint with request, DB operation and service method
+latency histograms, log writer queue depths and cache hit ratios.
+
+    from src.common.modules.metrics import router as metrics_router
+    app.include_router(metrics_router)
+"""
+from .registry import MetricsRegistry, Counter, Histogram, GaugeFamily, DEFAULT_BUCKETS
+from .instruments import (
+    metrics_registry,
+    http_request_duration,
+    db_operation_duration,
+    service_method_duration,
+    UNMATCHED_ROUTE,
+)
+from .router import router
+
+__all__ = [
+    "MetricsRegistry",
+    "Counter",
+    "Histogram",
+    "GaugeFamily",
+    "DEFAULT_BUCKETS",
+    "metrics_registry",
+    "http_request_duration",
+    "db_operation_duration",
+    "service_method_duration",
+    "UNMATCHED_ROUTE",
+    "router",
+]
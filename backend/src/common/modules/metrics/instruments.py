@@ -0,0 +1,97 @@
+"""
+Application metrics.
+
+Instruments updated by the interceptors:
+    http_request_duration_seconds     HTTPLoggingMiddleware, per route template
+    db_operation_duration_seconds     UnifiedQuery.execute, per table and operation
+    service_method_duration_seconds   intercept_method, per layer, class and method
+
+Collected when /metrics is scraped:
+    log_writer_queue_size             DB and file log writer queues
+    cache_requests_total              hits/misses of the in-process caches
+    cache_hit_ratio
+"""
+from typing import List
+
+from .registry import GaugeFamily, MetricsRegistry
+
+# Label for requests that matched no route (keeps 404 scans from adding series)
+UNMATCHED_ROUTE = "<unmatched>"
+
+metrics_registry = MetricsRegistry()
+
+http_request_duration = metrics_registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    ["method", "route", "status"],
+)
+
+db_operation_duration = metrics_registry.histogram(
+    "db_operation_duration_seconds",
+    "Supabase operation latency by table, operation and outcome.",
+    ["table", "operation", "outcome"],
+)
+
+service_method_duration = metrics_registry.histogram(
+    "service_method_duration_seconds",
+    "Intercepted service method latency by layer, class, method and outcome.",
+    ["layer", "class_name", "method", "outcome"],
+)
+
+
+def _collect_log_writer_queues() -> List[GaugeFamily]:
+    from ..logger.db_writer import db_log_writer
+    from ..logger.file_writer import file_log_writer
+
+    queues = GaugeFamily(
+        "log_writer_queue_size",
+        "Entries waiting in the log writer queues.",
+        ("writer", "queue"),
+    )
+    queues.add(("db", "log"), db_log_writer.log_queue.qsize())
+    queues.add(("db", "performance"), db_log_writer.performance_queue.qsize())
+    queues.add(("file", "log"), file_log_writer.log_queue.qsize())
+
+    stats = db_log_writer.get_stats()
+    written = GaugeFamily(
+        "log_writer_entries_total",
+        "Log entries handled by the database log writer.",
+        ("queue", "result"),
+        type_name="counter",
+    )
+    for queue, prefix in (("log", ""), ("performance", "performance_")):
+        for result in ("enqueued", "written", "failed"):
+            written.add((queue, result), stats.get(f"{prefix}total_{result}") or 0)
+    return [queues, written]
+
+
+def _collect_caches() -> List[GaugeFamily]:
+    from ..email import email_service
+    from ..integrations.nice_dnb import nice_dnb_cache
+
+    email_stats = email_service.get_render_stats()
+    dnb_stats = nice_dnb_cache.get_stats()
+    caches = {
+        "email_render": (email_stats.get("hits", 0), email_stats.get("misses", 0)),
+        "nice_dnb": (
+            dnb_stats.get("memory_hits", 0) + dnb_stats.get("table_hits", 0),
+            dnb_stats.get("misses", 0),
+        ),
+    }
+
+    requests = GaugeFamily(
+        "cache_requests_total",
+        "Cache lookups by cache and result.",
+        ("cache", "result"),
+        type_name="counter",
+    )
+    ratio = GaugeFamily("cache_hit_ratio", "Share of cache lookups that were hits.", ("cache",))
+    for cache, (hits, misses) in caches.items():
+        requests.add((cache, "hit"), hits)
+        requests.add((cache, "miss"), misses)
+        ratio.add((cache,), hits / (hits + misses) if hits + misses else 0.0)
+    return [requests, ratio]
+
+
+metrics_registry.register_collector(_collect_log_writer_queues)
+metrics_registry.register_collector(_collect_caches)
@@ -0,0 +1,220 @@
+"""
+Metrics registry.
+
+Minimal Prometheus text exposition (format 0.0.4) without extra
+dependencies. Counters and histograms are updated on hot paths (every
+request, every DB call, every service method), so an update is a dict
+lookup plus a few integer/float additions and takes no lock. A lock is only
+taken when a new label combination is first seen. Updates from worker
+threads can, very rarely, lose an increment to a concurrent update; that is
+accepted for metrics.
+
+Values that already live elsewhere (queue sizes, cache statistics) are not
+mirrored into counters; collectors read them when /metrics is scraped.
+
+    requests = metrics_registry.histogram("http_request_duration_seconds", "...", ["method", "route"])
+    requests.observe(0.042, "GET", "/api/v1/members/{member_id}")
+    metrics_registry.register_collector(lambda: [GaugeFamily(...)])
+    text = metrics_registry.render()
+"""
+import bisect
+import logging
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Prometheus client default buckets (seconds)
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base for labelled metrics: one child per label value combination."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _child(self, labelvalues: Tuple[str, ...]):
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+            with self._lock:
+                child = self._children.get(labelvalues)
+                if child is None:
+                    child = self._children[labelvalues] = self._new_child()
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _render_child(self, labelvalues: Tuple[str, ...], child) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        # list() copies the items atomically, so new children added meanwhile are harmless
+        for labelvalues, child in sorted(list(self._children.items())):
+            lines.extend(self._render_child(labelvalues, child))
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> List[float]:
+        return [0.0]
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._child(labelvalues)[0] += amount
+
+    def _render_child(self, labelvalues, child) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(child[0])}"]
+
+
+@dataclass
+class _HistogramChild:
+    counts: List[int]
+    total: float = 0.0
+
+
+class Histogram(_Metric):
+    """Histogram with fixed buckets (cumulative counts are computed when rendering)."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+
+    def _new_child(self) -> _HistogramChild:
+        # One slot per bucket plus the +Inf slot
+        return _HistogramChild(counts=[0] * (len(self.buckets) + 1))
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        child = self._child(labelvalues)
+        child.counts[bisect.bisect_left(self.buckets, value)] += 1
+        child.total += value
+
+    def _render_child(self, labelvalues, child: _HistogramChild) -> List[str]:
+        counts = list(child.counts)
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}")
+        label_text = _format_labels(self.labelnames, labelvalues)
+        lines.append(f"{self.name}_sum{label_text} {_format_value(child.total)}")
+        lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+@dataclass
+class GaugeFamily:
+    """Gauge values produced by a collector at scrape time."""
+
+    name: str
+    documentation: str
+    labelnames: Tuple[str, ...] = ()
+    samples: List[Tuple[Tuple[str, ...], float]] = field(default_factory=list)
+    type_name: str = "gauge"
+
+    def add(self, labelvalues: Sequence[str], value: float) -> "GaugeFamily":
+        self.samples.append((tuple(str(v) for v in labelvalues), float(value)))
+        return self
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for labelvalues, value in self.samples:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds the metrics and collectors exposed on /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], List[GaugeFamily]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], List[GaugeFamily]]) -> None:
+        """Register a function called on every scrape; it returns gauge families."""
+        self._collectors.append(collector)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text format."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        for collector in list(self._collectors):
+            try:
+                families = collector()
+            except Exception as e:
+                # One broken collector must not break the whole scrape
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for family in families:
+                lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                raise ValueError(f"Metric {metric.name} already registered with a different definition")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
@@ -0,0 +1,36 @@
+"""
+Metrics Router
+
+GET /metrics - Prometheus text exposition. Rendering only reads the
+in-memory counters and the collectors' current values; it does no I/O.
+
+Route templates, table and class names are internal details, so the
+endpoint requires METRICS_TOKEN as a bearer token. Without a token it is
+only served in DEBUG and returns 404 otherwise.
+"""
+import hmac
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from ..config import settings
+from .instruments import metrics_registry
+from .registry import CONTENT_TYPE
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request) -> PlainTextResponse:
+    """Prometheus metrics (bearer token required; open only in DEBUG without METRICS_TOKEN)."""
+    # Deferred: the exception module imports the interceptors, which import this package
+    from ..exception import AuthenticationError, NotFoundError
+    if not settings.METRICS_TOKEN:
+        if not settings.DEBUG:
+            raise NotFoundError(resource_type="Metrics")
+    else:
+        auth_header = request.headers.get("authorization", "")
+        token = auth_header[7:] if auth_header.startswith("Bearer ") else ""
+        if not hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+            raise AuthenticationError("Invalid metrics token", auth_method="bearer")
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE)
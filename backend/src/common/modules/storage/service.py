@@ -2,6 +2,7 @@
 Storage service for file upload operations.
 """
 from fastapi import UploadFile
+import asyncio
 import uuid
 from typing import Optional
 
@@ -81,6 +82,47 @@ class StorageService:
                 ) from e
             raise
 
+    async def upload_bytes(
+        self,
+        content: bytes,
+        bucket: str,
+        path: str,
+        content_type: str = "application/octet-stream",
+    ) -> dict:
+        """
+        Upload generated content (e.g. an export file) to Supabase Storage.
+
+        The upload runs in a worker thread so large files do not block the
+        event loop.
+
+        Args:
+            content: File content
+            bucket: Storage bucket name
+            path: Full path within bucket
+            content_type: MIME type of the content
+
+        Returns:
+            dict: Stored path and size
+        """
+        try:
+            await asyncio.to_thread(
+                self.client.storage.from_(bucket).upload,
+                path,
+                content,
+                {"content-type": content_type},
+            )
+            return {"path": path, "size": len(content)}
+        except Exception as e:
+            error_str = str(e)
+            # Check for RLS policy violation errors
+            if "row-level security policy" in error_str.lower() or "403" in error_str:
+                raise ValueError(
+                    "File upload failed due to Supabase security policy. "
+                    "Please ensure SUPABASE_SERVICE_KEY is set in your .env file. "
+                    "Service role key is required to bypass Row-Level Security (RLS) policies for server-side operations."
+                ) from e
+            raise
+
     async def delete_file(self, bucket: str, path: str) -> bool:
         """
         Delete a file from Supabase Storage.
@@ -1,5 +1,12 @@
-from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Tuple
+from uuid import uuid4
+
+from postgrest.types import ReturnMethod
+
+from .client import get_supabase_service_client
 from .service import SupabaseService
+from .unread_hub import unread_count_hub
 from ...utils.formatters import now_iso
 
 
@@ -30,6 +37,7 @@ class MessageService(SupabaseService):
             .execute()
         if not result.data:
             raise ValueError("Failed to create message: no data returned")
+        unread_count_hub.on_messages_created(result.data)
         return result.data[0]
     
     async def update_message(self, message_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -40,6 +48,12 @@ class MessageService(SupabaseService):
             .execute()
         if not result.data:
             raise ValueError(f"Failed to update message {message_id}: no data returned")
+        if 'is_read' in update_data:
+            # Previous read state is unknown here, so reload the affected counters
+            message = result.data[0]
+            unread_count_hub.invalidate(message.get('recipient_id'))
+            if message.get('sender_type') == self.SENDER_MEMBER:
+                unread_count_hub.invalidate(is_admin=True)
         return result.data[0]
 
     async def delete_message(self, message_id: str) -> bool:
@@ -92,25 +106,31 @@ class MessageService(SupabaseService):
         return len(result.data) > 0
     
     async def get_unread_count(self, user_id: str, is_admin: bool = False) -> int:
-        """获取未读消息数量"""
-        query = self.client.table('messages').select('id', count='exact')
-        
-        if is_admin:
-            query = query.eq('sender_type', self.SENDER_MEMBER).eq('is_read', False)
-        else:
-            query = query.eq('recipient_id', user_id).eq('is_read', False)
-        
-        result = query.execute()
-        return result.count or 0
+        """获取未读消息数量（读取触发器维护的 message_unread_counts，日常读取请使用 unread_count_hub）"""
+        # message_unread_counts 不对 anon/authenticated 开放，使用 service role 读取
+        result = get_supabase_service_client().table('message_unread_counts')\
+            .select('unread_count')\
+            .eq('owner_key', unread_count_hub.key_for(user_id, is_admin))\
+            .execute()
+        return result.data[0]['unread_count'] if result.data else 0
     
     async def get_threads_paginated(
         self,
         page: int = 1,
         page_size: int = 20,
         status: Optional[str] = None,
-        sender_id: Optional[str] = None
+        sender_id: Optional[str] = None,
+        unread_for: Optional[str] = None,
+        has_unread: Optional[bool] = None,
     ) -> Tuple[List[Dict[str, Any]], int]:
-        """获取分页的 thread 列表"""
+        """
+        获取分页的 thread 列表
+        
+        thread 根消息行自带 message_count / admin_unread_count / member_unread_count
+        计数字段（由触发器维护），无需再读取 thread 内的消息。
+        has_unread 按 unread_for（'admin' 或 'member'）一侧的未读数过滤。
+        """
+        offset = (page - 1) * page_size
         query = self.client.table('messages').select('*', count='exact')
         query = query.eq('message_type', self.TYPE_THREAD).is_('thread_id', 'null')
         
@@ -118,48 +138,16 @@ class MessageService(SupabaseService):
             query = query.eq('status', status)
         if sender_id:
             query = query.eq('sender_id', sender_id)
+        if has_unread is not None and unread_for:
+            unread_column = f'{unread_for}_unread_count'
+            query = query.gt(unread_column, 0) if has_unread else query.eq(unread_column, 0)
         
-        count_result = query.execute()
-        total_count = count_result.count or 0
-        
-        offset = (page - 1) * page_size
-        threads_query = self.client.table('messages').select('*')
-        threads_query = threads_query.eq('message_type', self.TYPE_THREAD).is_('thread_id', 'null')
-        
-        if status:
-            threads_query = threads_query.eq('status', status)
-        if sender_id:
-            threads_query = threads_query.eq('sender_id', sender_id)
+        query = query.order('created_at', desc=True)
+        query = query.range(offset, offset + page_size - 1)
         
-        threads_query = threads_query.order('created_at', desc=True)
-        threads_query = threads_query.range(offset, offset + page_size - 1)
-        
-        result = threads_query.execute()
-        return result.data or [], total_count
-    
-    async def get_thread_stats_batch(self, thread_ids: List[str], for_admin: bool = False) -> Dict[str, Dict[str, int]]:
-        """批量获取 thread 的消息统计"""
-        if not thread_ids:
-            return {}
-        
-        query = self.client.table('messages').select('thread_id, sender_type, is_read')
-        query = query.in_('thread_id', thread_ids)
         result = query.execute()
-        
-        stats = {tid: {'message_count': 0, 'unread_count': 0} for tid in thread_ids}
-        
-        for msg in (result.data or []):
-            tid = msg['thread_id']
-            if tid in stats:
-                stats[tid]['message_count'] += 1
-                if not msg['is_read']:
-                    if for_admin and msg['sender_type'] == self.SENDER_MEMBER:
-                        stats[tid]['unread_count'] += 1
-                    elif not for_admin and msg['sender_type'] == self.SENDER_ADMIN:
-                        stats[tid]['unread_count'] += 1
-        
-        return stats
-
+        return result.data or [], result.count or 0
+    
     async def get_thread_by_id(self, thread_id: str) -> Optional[Dict[str, Any]]:
         """获取单个 thread"""
         result = self.client.table('messages')\
@@ -208,6 +196,8 @@ class MessageService(SupabaseService):
             .eq('is_read', False)\
             .execute()
         
+        if result.data:
+            unread_count_hub.on_messages_read(result.data)
         return len(result.data) if result.data else 0
     
     async def create_direct_message(
@@ -370,16 +360,19 @@ class MessageService(SupabaseService):
     async def send_broadcast_to_recipients(
         self,
         broadcast_template_id: str,
-        recipient_ids: List[str]
+        recipient_ids: List[str],
+        chunk_size: int = 500,
+        concurrency: int = 4,
     ) -> List[Dict[str, Any]]:
-        """向多个接收者发送广播消息"""
+        """向多个接收者发送广播消息（分块并发插入）"""
         template = await self.get_message_by_id(broadcast_template_id)
         if not template or template.get("message_type") != "broadcast":
             raise ValueError("Invalid broadcast template")
         
-        created_messages = []
-        for recipient_id in recipient_ids:
-            message_data = {
+        sent_at = now_iso()
+        messages = [
+            {
+                "id": str(uuid4()),
                 "message_type": "broadcast",
                 "thread_id": broadcast_template_id,
                 "sender_id": template["sender_id"],
@@ -393,17 +386,18 @@ class MessageService(SupabaseService):
                 "is_read": False,
                 "is_important": template["is_important"],
                 "is_broadcast": True,
-                "sent_at": now_iso(),
+                "sent_at": sent_at,
             }
-            
-            created_message = await self.create_message(message_data)
-            created_messages.append(created_message)
+            for recipient_id in recipient_ids
+        ]
+        
+        await self.insert_messages_chunked(messages, chunk_size=chunk_size, concurrency=concurrency)
         
         await self.update_message(broadcast_template_id, {
             "broadcast_count": len(recipient_ids)
         })
         
-        return created_messages
+        return messages
     
     async def get_broadcast_messages(
         self,
@@ -517,12 +511,18 @@ class MessageService(SupabaseService):
         return message
     
     async def mark_as_read(self, message_id: str) -> Dict[str, Any]:
-        """标记消息为已读"""
+        """标记消息为已读（仅更新未读消息，已读时返回空字典）"""
         update_data = {
             'is_read': True,
             'read_at': now_iso()
         }
-        result = self.client.table('messages').update(update_data).eq('id', message_id).execute()
+        result = self.client.table('messages')\
+            .update(update_data)\
+            .eq('id', message_id)\
+            .eq('is_read', False)\
+            .execute()
+        if result.data:
+            unread_count_hub.on_messages_read(result.data)
         return result.data[0] if result.data else {}
     
     async def soft_delete_message(self, message_id: str) -> bool:
@@ -536,6 +536,8 @@ class MessageService(SupabaseService):
     async def insert_message(self, message_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """插入消息"""
         result = self.client.table('messages').insert(message_data).execute()
+        if result.data:
+            unread_count_hub.on_messages_created(result.data)
         return result.data[0] if result.data else None
     
     async def insert_messages_batch(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -543,8 +545,62 @@ class MessageService(SupabaseService):
         if not messages:
             return []
         result = self.client.table('messages').insert(messages).execute()
+        if result.data:
+            unread_count_hub.on_messages_created(result.data)
         return result.data or []
     
+    async def insert_messages_chunked(
+        self,
+        messages: List[Dict[str, Any]],
+        chunk_size: int = 500,
+        concurrency: int = 4,
+        on_chunk: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None,
+        attempts: int = 3,
+        retry_delay: float = 1.0,
+    ) -> int:
+        """
+        分块并发插入消息，返回插入数量
+        
+        每块在线程中以 returning=minimal 插入（不回传行数据），最多 concurrency 块同时进行。
+        消息需自带 id，按 id 忽略已存在的行，因此失败的块可以安全重试（最多 attempts 次，
+        间隔 retry_delay 秒起翻倍），整个调用也可以用同样的消息重新执行。
+        每块完成后调用 on_chunk(chunk)（用于进度上报和后续处理）。
+        任一块最终失败时取消其余块并抛出该异常。
+        """
+        if not messages:
+            return 0
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        chunks = [messages[i:i + chunk_size] for i in range(0, len(messages), chunk_size)]
+        
+        async def insert_chunk(chunk: List[Dict[str, Any]]) -> int:
+            async with semaphore:
+                for attempt in range(max(1, attempts)):
+                    try:
+                        await asyncio.to_thread(self._insert_messages_minimal, chunk)
+                        break
+                    except Exception:
+                        if attempt + 1 >= attempts:
+                            raise
+                        await asyncio.sleep(retry_delay * (2 ** attempt))
+            unread_count_hub.on_messages_created(chunk)
+            if on_chunk:
+                await on_chunk(chunk)
+            return len(chunk)
+        
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(insert_chunk(chunk)) for chunk in chunks]
+        except ExceptionGroup as e:
+            # TaskGroup 已取消其余块；抛出第一个失败块的原始异常
+            raise e.exceptions[0]
+        return sum(task.result() for task in tasks)
+    
+    def _insert_messages_minimal(self, messages: List[Dict[str, Any]]) -> None:
+        self.client.table('messages')\
+            .upsert(messages, returning=ReturnMethod.minimal, ignore_duplicates=True, on_conflict='id')\
+            .execute()
+    
     async def update_thread_status(self, thread_id: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """更新 thread 状态"""
         result = self.client.table('messages')\
@@ -554,113 +610,48 @@ class MessageService(SupabaseService):
             .execute()
         return result.data[0] if result.data else None
     
-    async def get_active_member_ids(self) -> List[str]:
-        """获取所有活跃会员ID"""
-        result = self.client.table('members').select('id').eq('status', 'active').execute()
-        return [m['id'] for m in (result.data or [])]
+    async def get_member_contacts(
+        self,
+        member_ids: Optional[List[str]] = None,
+        batch_size: int = 200,
+    ) -> List[Dict[str, Any]]:
+        """
+        获取会员联系信息（id, email, company_name）
+        
+        member_ids 为空时返回所有活跃会员；否则按 batch_size 分批查询，避免 URL 过长。
+        """
+        columns = 'id, email, company_name'
+        if member_ids is None:
+            result = self.client.table('members').select(columns).eq('status', 'active').execute()
+            return result.data or []
+        
+        unique_ids = list(dict.fromkeys(mid for mid in member_ids if mid))
+        contacts = []
+        for i in range(0, len(unique_ids), batch_size):
+            result = self.client.table('members')\
+                .select(columns)\
+                .in_('id', unique_ids[i:i + batch_size])\
+                .execute()
+            contacts.extend(result.data or [])
+        return contacts
     
     async def get_analytics_data(self, start_date: Optional[str] = None) -> Dict[str, Any]:
-        """获取分析数据"""
-        from datetime import datetime as dt
-        
-        total_query = self.client.table('messages').select('id', count='exact')
-        if start_date:
-            total_query = total_query.gte('created_at', start_date)
-        total_result = total_query.execute()
-        
-        unread_query = self.client.table('messages').select('id', count='exact').eq('is_read', False)
-        if start_date:
-            unread_query = unread_query.gte('created_at', start_date)
-        unread_result = unread_query.execute()
+        """
+        获取分析数据
         
-        messages_by_day = []
-        messages_by_category = []
-        response_time_by_day = []
-        avg_response_time = 0.0
-        
-        messages_query = self.client.table('messages').select('created_at, category, thread_id, sender_type')
-        if start_date:
-            messages_query = messages_query.gte('created_at', start_date)
-        messages_result = messages_query.execute()
-        
-        if messages_result.data:
-            day_counts = {}
-            category_counts = {}
-            
-            thread_messages = {}
-            
-            for msg in messages_result.data:
-                if msg.get('created_at'):
-                    day = msg['created_at'][:10]
-                    day_counts[day] = day_counts.get(day, 0) + 1
-                
-                category = msg.get('category') or 'general'
-                category_counts[category] = category_counts.get(category, 0) + 1
-                
-                thread_id = msg.get('thread_id')
-                if thread_id:
-                    if thread_id not in thread_messages:
-                        thread_messages[thread_id] = []
-                    thread_messages[thread_id].append(msg)
-            
-            messages_by_day = [
-                {'date': day, 'count': count}
-                for day, count in sorted(day_counts.items())
-            ]
-            messages_by_category = [
-                {'category': cat, 'count': count}
-                for cat, count in category_counts.items()
-            ]
-            
-            response_times = []
-            day_response_times = {}
-            
-            for thread_id, msgs in thread_messages.items():
-                sorted_msgs = sorted(msgs, key=lambda x: x.get('created_at', ''))
-                
-                first_member_msg = None
-                first_admin_reply = None
-                
-                for msg in sorted_msgs:
-                    sender_type = msg.get('sender_type')
-                    if sender_type == 'member' and first_member_msg is None:
-                        first_member_msg = msg
-                    elif sender_type == 'admin' and first_member_msg and first_admin_reply is None:
-                        first_admin_reply = msg
-                        break
-                
-                if first_member_msg and first_admin_reply:
-                    try:
-                        created_at = first_member_msg['created_at']
-                        replied_at = first_admin_reply['created_at']
-                        created = dt.fromisoformat(created_at.replace('Z', '+00:00'))
-                        replied = dt.fromisoformat(replied_at.replace('Z', '+00:00'))
-                        response_minutes = (replied - created).total_seconds() / 60
-                        
-                        if response_minutes >= 0:
-                            response_times.append(response_minutes)
-                            day = created_at[:10]
-                            if day not in day_response_times:
-                                day_response_times[day] = []
-                            day_response_times[day].append(response_minutes)
-                    except (ValueError, TypeError):
-                        pass
-            
-            if response_times:
-                avg_response_time = sum(response_times) / len(response_times)
-            
-            response_time_by_day = [
-                {'date': day, 'responseTime': round(sum(times) / len(times), 1)}
-                for day, times in sorted(day_response_times.items())
-            ]
+        按天/分类统计及首次管理员回复时间均由数据库函数 get_message_analytics
+        聚合，返回数据量与消息数量无关。
+        """
+        result = self.client.rpc('get_message_analytics', {'p_start_date': start_date}).execute()
+        data = result.data or {}
         
         return {
-            'total_messages': total_result.count or 0,
-            'unread_messages': unread_result.count or 0,
-            'messages_by_day': messages_by_day,
-            'messages_by_category': messages_by_category,
-            'response_time': round(avg_response_time, 1),
-            'response_time_by_day': response_time_by_day,
+            'total_messages': data.get('total_messages') or 0,
+            'unread_messages': data.get('unread_messages') or 0,
+            'messages_by_day': data.get('messages_by_day') or [],
+            'messages_by_category': data.get('messages_by_category') or [],
+            'response_time': float(data.get('response_time') or 0.0),
+            'response_time_by_day': data.get('response_time_by_day') or [],
         }
 
 
@@ -1,11 +1,15 @@
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Tuple
 from datetime import datetime, timezone
 from supabase import Client
 from .client import get_supabase_client, get_unified_supabase_client
 
 logger = logging.getLogger(__name__)
 
+# 导出时每次请求的行数（不超过 PostgREST 默认 max-rows 1000）
+EXPORT_CHUNK_SIZE = 1000
+
 
 class SupabaseService:
     """统一的 Supabase 服务类，提供通用数据库操作方法"""
@@ -95,18 +99,7 @@ class SupabaseService:
         query = query.range(offset, offset + page_size - 1)
         
         result = query.execute()
-        records = result.data or []
-        
-        if table == 'projects':
-            for record in records:
-                app_count_result = self.client.table('project_applications')\
-                    .select('*', count='exact')\
-                    .eq('project_id', record['id'])\
-                    .is_('deleted_at', 'null')\
-                    .execute()
-                record['applications_count'] = app_count_result.count or 0
-        
-        return records, total
+        return result.data or [], total
 
     async def count_records(self, table: str, filters: Optional[Dict[str, Any]] = None) -> int:
         """统计记录数量"""
@@ -289,40 +282,34 @@ class SupabaseService:
         return records, count_result.count or 0
 
     async def list_projects_with_filters(self, **kwargs) -> Tuple[List[Dict[str, Any]], int]:
-        """查询项目列表（支持高级过滤）"""
+        """查询项目列表（数据库端过滤 + 范围分页，单次查询返回总数）"""
         sort_by = kwargs.get('sort_by', 'created_at')
         sort_order = kwargs.get('sort_order', 'desc')
+        page = kwargs.get('page', 1)
+        page_size = kwargs.get('page_size', 20)
+        status = kwargs.get('status')
+        search = kwargs.get('search')
         
+        # applications_count 由 project_applications 触发器维护
         query = self.client.table('projects')\
-            .select('*')\
-            .is_('deleted_at', 'null')\
-            .order(sort_by, desc=(sort_order == 'desc'))
-        
-        result = query.execute()
-        projects = result.data or []
-        
-        if projects:
-            project_ids = [p['id'] for p in projects]
-            app_counts_result = self.client.table('project_applications')\
-                .select('project_id')\
-                .in_('project_id', project_ids)\
-                .is_('deleted_at', 'null')\
-                .execute()
-            
-            app_counts = {}
-            for app in (app_counts_result.data or []):
-                pid = app['project_id']
-                app_counts[pid] = app_counts.get(pid, 0) + 1
-            
-            for project in projects:
-                project['applications_count'] = app_counts.get(project['id'], 0)
-        
-        count_result = self.client.table('projects')\
             .select('*', count='exact')\
-            .is_('deleted_at', 'null')\
+            .is_('deleted_at', 'null')
+        
+        if status:
+            query = query.eq('status', status)
+        if search:
+            # 去除 PostgREST or 语法中的分隔符
+            term = search.replace(',', ' ').replace('(', ' ').replace(')', ' ').strip()
+            if term:
+                query = query.or_(f'title.ilike.%{term}%,description.ilike.%{term}%')
+        
+        offset = (page - 1) * page_size
+        result = query.order(sort_by, desc=(sort_order == 'desc'))\
+            .order('id', desc=True)\
+            .range(offset, offset + page_size - 1)\
             .execute()
         
-        return projects, count_result.count or 0
+        return result.data or [], result.count or 0
 
     async def list_project_applications_with_filters(self, **kwargs) -> Tuple[List[Dict[str, Any]], int]:
         """查询项目申请列表（支持高级过滤）"""
@@ -412,69 +399,87 @@ class SupabaseService:
         result = query.execute()
         return result.data or []
 
-    async def export_performance_records(self, **kwargs) -> List[Dict[str, Any]]:
-        """导出绩效记录"""
-        query = self.client.table('performance_records')\
-            .select('*')\
-            .is_('deleted_at', 'null')\
-            .order('created_at', desc=True)
-        
+    def iter_performance_records_export(self, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """分块读取导出的绩效记录（每块一次请求）"""
         member_id = kwargs.get('member_id')
         year = kwargs.get('year')
         quarter = kwargs.get('quarter')
         status = kwargs.get('status')
         type_filter = kwargs.get('type')
-        
-        if member_id:
-            query = query.eq('member_id', member_id)
-        if year:
-            query = query.eq('year', year)
-        if quarter:
-            query = query.eq('quarter', quarter)
-        if status:
-            query = query.eq('status', status)
-        if type_filter:
-            query = query.eq('type', type_filter)
-        
-        result = query.execute()
-        return result.data or []
 
-    async def export_projects(self, **kwargs) -> List[Dict[str, Any]]:
-        """导出项目"""
-        query = self.client.table('projects')\
-            .select('*')\
-            .is_('deleted_at', 'null')\
-            .order('created_at', desc=True)
-        
+        def build_query():
+            query = self.client.table('performance_records')\
+                .select('*')\
+                .is_('deleted_at', 'null')
+            if member_id:
+                query = query.eq('member_id', member_id)
+            if year:
+                query = query.eq('year', year)
+            if quarter:
+                query = query.eq('quarter', quarter)
+            if status:
+                query = query.eq('status', status)
+            if type_filter:
+                query = query.eq('type', type_filter)
+            return query.order('created_at', desc=True).order('id', desc=True)
+
+        return self.iter_export_chunks(build_query)
+
+    async def iter_export_chunks(
+        self,
+        build_query: Callable[[], Any],
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        按范围分块读取导出数据
+
+        build_query 每块调用一次，返回新的查询（需已包含稳定排序）；
+        查询构建器会累积参数，不能在多次 range() 之间复用。请求在线程中执行。
+        """
+        offset = 0
+        while True:
+            query = build_query().range(offset, offset + chunk_size - 1)
+            result = await asyncio.to_thread(query.execute)
+            rows = result.data or []
+            if rows:
+                yield rows
+            if len(rows) < chunk_size:
+                return
+            offset += chunk_size
+
+    def iter_projects_export(self, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """分块读取导出的项目"""
         status = kwargs.get('status')
         search = kwargs.get('search')
-        
-        if status:
-            query = query.eq('status', status)
-        if search:
-            query = query.ilike('title', f'%{search}%')
-        
-        result = query.execute()
-        return result.data or []
 
-    async def export_project_applications(self, **kwargs) -> List[Dict[str, Any]]:
-        """导出项目申请"""
-        query = self.client.table('project_applications')\
-            .select('*')\
-            .is_('deleted_at', 'null')\
-            .order('submitted_at', desc=True)
-        
+        def build_query():
+            query = self.client.table('projects')\
+                .select('*')\
+                .is_('deleted_at', 'null')
+            if status:
+                query = query.eq('status', status)
+            if search:
+                query = query.ilike('title', f'%{search}%')
+            return query.order('created_at', desc=True).order('id', desc=True)
+
+        return self.iter_export_chunks(build_query)
+
+    def iter_project_applications_export(self, **kwargs) -> AsyncIterator[List[Dict[str, Any]]]:
+        """分块读取导出的项目申请（内嵌项目标题与企业信息）"""
         project_id = kwargs.get('project_id')
         status = kwargs.get('status')
-        
-        if project_id:
-            query = query.eq('project_id', project_id)
-        if status:
-            query = query.eq('status', status)
-        
-        result = query.execute()
-        return result.data or []
 
+        def build_query():
+            query = self.client.table('project_applications')\
+                .select('*, projects(title), members(company_name, business_number)')\
+                .is_('deleted_at', 'null')
+            if project_id:
+                query = query.eq('project_id', project_id)
+            if status:
+                query = query.eq('status', status)
+            return query.order('submitted_at', desc=True).order('id', desc=True)
+
+        return self.iter_export_chunks(build_query)
 
 supabase_service = SupabaseService()
 
@@ -0,0 +1,190 @@
+"""
+Unread message counter hub.
+
+In-process pub/sub for unread message counts. The message DB service
+publishes every insert and read transition here, and the SSE endpoints
+subscribe per user, so connected clients receive new counts without
+polling the database.
+
+Counts are seeded from the database the first time a user is seen and then
+maintained incrementally. Each cached count is resynced after
+`resync_interval` seconds to pick up writes made by other processes.
+
+Keys:
+    "admin"            - shared admin inbox (unread messages sent by members)
+    "member:<user_id>" - unread messages addressed to a member
+"""
+import asyncio
+import time
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Set
+
+from ..config import settings
+
+ADMIN_KEY = "admin"
+
+
+def member_key(user_id: str) -> str:
+    return f"member:{user_id}"
+
+
+class UnreadCountHub:
+    """Incrementally maintained unread counters with per-user subscriptions."""
+
+    def __init__(self, resync_interval: float = 300.0):
+        """
+        Initialize unread count hub.
+
+        Args:
+            resync_interval: Seconds after which a cached count is reloaded from the database
+        """
+        self.resync_interval = resync_interval
+
+        self._counts: Dict[str, int] = {}
+        self._synced_at: Dict[str, float] = {}
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._seed_locks: Dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def key_for(user_id: str, is_admin: bool = False) -> str:
+        return ADMIN_KEY if is_admin else member_key(str(user_id))
+
+    # =========================================================================
+    # Reads
+    # =========================================================================
+
+    async def get_count(self, user_id: str, is_admin: bool = False) -> int:
+        """Get the unread count, loading it from the database if missing or stale."""
+        key = self.key_for(user_id, is_admin)
+        if self._is_fresh(key):
+            return self._counts[key]
+        return await self._resync(key, str(user_id), is_admin)
+
+    async def stream(
+        self,
+        user_id: str,
+        is_admin: bool = False,
+        heartbeat: float = 20.0,
+    ) -> AsyncIterator[Optional[int]]:
+        """
+        Yield the current unread count, then every change to it.
+
+        Yields None every `heartbeat` seconds without changes so callers can
+        send keep-alive frames. The subscription ends when the consumer stops
+        iterating (e.g. the client disconnects).
+        """
+        key = self.key_for(user_id, is_admin)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers[key].add(queue)
+        try:
+            last_sent = await self.get_count(user_id, is_admin)
+            yield last_sent
+            while True:
+                try:
+                    count = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    if not self._is_fresh(key):
+                        # Resync publishes to the queue if the count changed
+                        await self._resync(key, str(user_id), is_admin)
+                    yield None
+                    continue
+                if count != last_sent:
+                    last_sent = count
+                    yield count
+        finally:
+            self._subscribers[key].discard(queue)
+            if not self._subscribers[key]:
+                del self._subscribers[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "cached_counts": len(self._counts),
+            "subscribed_keys": len(self._subscribers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+        }
+
+    # =========================================================================
+    # Writes (called by the message DB service)
+    # =========================================================================
+
+    def on_messages_created(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """Apply newly inserted messages."""
+        self._apply(messages, delta=1)
+
+    def on_messages_read(self, messages: Iterable[Dict[str, Any]]) -> None:
+        """Apply messages that transitioned from unread to read."""
+        self._apply(messages, delta=-1)
+
+    def invalidate(self, user_id: Optional[str] = None, is_admin: bool = False) -> None:
+        """
+        Drop a cached count whose exact change is unknown.
+
+        Subscribed keys are reloaded in the background; others are reloaded
+        on next access.
+        """
+        key = self.key_for(user_id, is_admin)
+        self._synced_at.pop(key, None)
+        if key in self._subscribers:
+            self._schedule_resync(key, str(user_id), is_admin)
+        else:
+            self._counts.pop(key, None)
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _apply(self, messages: Iterable[Dict[str, Any]], delta: int) -> None:
+        deltas: Dict[str, int] = defaultdict(int)
+        for message in messages:
+            if delta > 0 and message.get("is_read"):
+                continue
+            recipient_id = message.get("recipient_id")
+            if recipient_id:
+                deltas[member_key(str(recipient_id))] += delta
+            if message.get("sender_type") == "member":
+                deltas[ADMIN_KEY] += delta
+
+        for key, change in deltas.items():
+            # Counts that were never seeded are loaded on first access instead
+            if key in self._counts:
+                self._set(key, max(0, self._counts[key] + change), synced=False)
+
+    def _is_fresh(self, key: str) -> bool:
+        synced_at = self._synced_at.get(key)
+        return (
+            key in self._counts
+            and synced_at is not None
+            and time.monotonic() - synced_at < self.resync_interval
+        )
+
+    async def _resync(self, key: str, user_id: str, is_admin: bool) -> int:
+        """Reload a count from the database (single-flight per key)."""
+        lock = self._seed_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if self._is_fresh(key):
+                return self._counts[key]
+            from .message_service import message_db_service
+            count = await message_db_service.get_unread_count(user_id, is_admin)
+            self._set(key, count, synced=True)
+        return count
+
+    def _schedule_resync(self, key: str, user_id: str, is_admin: bool) -> None:
+        try:
+            asyncio.get_running_loop().create_task(self._resync(key, user_id, is_admin))
+        except RuntimeError:
+            # No running loop - reload on next access
+            self._counts.pop(key, None)
+
+    def _set(self, key: str, count: int, synced: bool) -> None:
+        self._counts[key] = count
+        if synced:
+            self._synced_at[key] = time.monotonic()
+        for queue in self._subscribers.get(key, ()):
+            # Subscribers only need the latest value
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(count)
+
+
+# Global unread count hub instance
+unread_count_hub = UnreadCountHub(resync_interval=settings.MESSAGE_UNREAD_RESYNC_SECONDS)
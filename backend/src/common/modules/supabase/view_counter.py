@@ -0,0 +1,180 @@
+"""
+Write-behind view counter.
+
+Page views only bump an in-memory counter. A background task periodically
+flushes the aggregated increments with one `increment_view_counts` RPC per
+table (`view_count = view_count + n` in the database), so a hot notice costs
+one UPDATE per flush interval instead of one read and one write per view,
+and concurrent views are never lost.
+
+Reads add the pending (not yet flushed) deltas so a user sees their own view:
+
+    view_counter.increment("notices", notice_id)
+    notice["view_count"] = view_counter.merge_one("notices", notice)
+"""
+import asyncio
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..config import settings
+from ..logger import get_logger
+from .client import get_supabase_service_client
+
+logger = get_logger(__name__)
+
+# Tables with a view_count column supported by the increment_view_counts RPC
+VIEW_COUNT_TABLES = ("notices", "projects")
+
+
+class ViewCountAccumulator:
+    """Aggregates view increments in memory and flushes them periodically."""
+
+    def __init__(self, flush_interval: float = 5.0, max_pending: int = 1000):
+        """
+        Initialize view counter.
+
+        Args:
+            flush_interval: Seconds between flushes
+            max_pending: Number of pending records that triggers an early flush
+        """
+        self.flush_interval = flush_interval
+        self.max_pending = max(1, max_pending)
+
+        self._pending: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._flusher_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+
+        self._stats = {
+            "total_views": 0,
+            "total_flushes": 0,
+            "total_rows_flushed": 0,
+            "total_flush_errors": 0,
+        }
+
+    @property
+    def client(self):
+        return get_supabase_service_client()
+
+    # =========================================================================
+    # Public API
+    # =========================================================================
+
+    def increment(self, table: str, record_id: str, count: int = 1) -> None:
+        """Record `count` views of a record; written to the database on the next flush."""
+        if table not in VIEW_COUNT_TABLES:
+            raise ValueError(f"Unsupported view count table: {table}")
+        pending = self._pending[table]
+        record_id = str(record_id)
+        pending[record_id] = pending.get(record_id, 0) + count
+        self._stats["total_views"] += count
+
+        self._ensure_started()
+        if self.pending_count() >= self.max_pending:
+            self._wakeup.set()
+
+    def pending_delta(self, table: str, record_id: str) -> int:
+        """Views recorded for a record but not yet flushed."""
+        return self._pending.get(table, {}).get(str(record_id), 0)
+
+    def merge_one(self, table: str, row: Dict[str, Any]) -> int:
+        """Return the row's view_count including pending views."""
+        return (row.get("view_count") or 0) + self.pending_delta(table, row.get("id"))
+
+    def merge(self, table: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Add pending views to the view_count of each row (in place)."""
+        pending = self._pending.get(table)
+        if not pending:
+            return
+        for row in rows:
+            delta = pending.get(str(row.get("id")))
+            if delta:
+                row["view_count"] = (row.get("view_count") or 0) + delta
+
+    def pending_count(self) -> int:
+        return sum(len(pending) for pending in self._pending.values())
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "pending_records": self.pending_count(),
+            "flusher_running": bool(self._flusher_task and not self._flusher_task.done()),
+        }
+
+    async def flush(self) -> int:
+        """Write all pending increments now. Returns the number of records updated."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            batches, self._pending = self._pending, defaultdict(dict)
+            flushed = 0
+            for table, deltas in batches.items():
+                if not deltas:
+                    continue
+                try:
+                    await asyncio.to_thread(self._apply, table, deltas)
+                    flushed += len(deltas)
+                except Exception as e:
+                    # Keep the increments for the next flush
+                    self._stats["total_flush_errors"] += 1
+                    pending = self._pending[table]
+                    for record_id, count in deltas.items():
+                        pending[record_id] = pending.get(record_id, 0) + count
+                    logger.error(
+                        f"View count flush failed for {table}: {str(e)}",
+                        exc_info=True,
+                        extra={"module_name": __name__, "records": len(deltas)},
+                    )
+            if flushed:
+                self._stats["total_flushes"] += 1
+                self._stats["total_rows_flushed"] += flushed
+            return flushed
+
+    async def close(self) -> None:
+        """Stop the flusher and write remaining increments."""
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+        await self.flush()
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _ensure_started(self) -> None:
+        """Start the flusher on first use (lazy initialization)."""
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._flusher_task is None or self._flusher_task.done():
+            self._flusher_task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def _apply(self, table: str, deltas: Dict[str, int]) -> None:
+        record_ids: List[str] = list(deltas)
+        self.client.rpc(
+            "increment_view_counts",
+            {
+                "p_table": table,
+                "p_ids": record_ids,
+                "p_deltas": [deltas[record_id] for record_id in record_ids],
+            },
+        ).execute()
+
+
+# Global view counter instance
+view_counter = ViewCountAccumulator(
+    flush_interval=settings.VIEW_COUNT_FLUSH_INTERVAL,
+    max_pending=settings.VIEW_COUNT_MAX_PENDING,
+)
@@ -30,10 +30,86 @@ async def lifespan(app: FastAPI):
     
     await handle_startup_logging()
     
+    # Compile email templates, then start draining emails left in the outbox by a previous run
+    from .common.modules.email import email_service
+    from .common.modules.email.outbox import email_outbox
+    email_service.precompile_templates()
+    email_outbox.start()
+    
+    # Create upcoming log partitions and drop expired ones periodically
+    from .common.modules.logger.retention import log_retention
+    log_retention.start()
+    
+    # Refresh health checks in the background; health endpoints serve the latest snapshot
+    from .common.modules.health import HealthService
+    HealthService.start_prober()
+    
     yield
     
     # Shutdown: gracefully close log writers
     logger.info("Shutting down application")
+    try:
+        # Stop background export workers
+        from .common.modules.export import export_job_manager
+        await export_job_manager.close(timeout=10.0)
+        logger.info("Export job manager closed")
+    except Exception as e:
+        logger.warning(f"Error closing export job manager: {e}")
+    
+    try:
+        # Finish running broadcast deliveries, then stop the email dispatcher
+        from .modules.messages.broadcast import broadcast_fanout
+        from .common.modules.email.smtp_pool import smtp_pool
+        await broadcast_fanout.close(timeout=10.0)
+        await email_outbox.close(timeout=10.0)
+        await smtp_pool.close()
+        logger.info("Broadcast fan-out, email outbox and SMTP pool closed")
+    except Exception as e:
+        logger.warning(f"Error closing email outbox: {e}")
+    
+    try:
+        # Finish bulk verifications, then close the shared Nice D&B HTTP client
+        from .common.modules.integrations.nice_dnb import bulk_verifier, nice_dnb_client
+        await bulk_verifier.close(timeout=10.0)
+        await nice_dnb_client.close()
+        logger.info("Nice D&B bulk verifier and client closed")
+    except Exception as e:
+        logger.warning(f"Error closing Nice D&B client: {e}")
+    
+    try:
+        # Write pending view count increments
+        from .common.modules.supabase.view_counter import view_counter
+        await view_counter.close()
+        logger.info("View counter flushed")
+    except Exception as e:
+        logger.warning(f"Error flushing view counter: {e}")
+    
+    try:
+        await HealthService.stop_prober()
+    except Exception as e:
+        logger.warning(f"Error stopping health prober: {e}")
+    
+    try:
+        await log_retention.close()
+    except Exception as e:
+        logger.warning(f"Error stopping log retention job: {e}")
+    
+    try:
+        # Write the current exception aggregation window
+        from .common.modules.exception import exception_aggregator
+        await exception_aggregator.close()
+        logger.info("Exception aggregator flushed")
+    except Exception as e:
+        logger.warning(f"Error flushing exception aggregator: {e}")
+    
+    try:
+        # Write remaining per-minute log rollups
+        from .common.modules.logger.rollup import log_rollups
+        await log_rollups.close()
+        logger.info("Log rollups flushed")
+    except Exception as e:
+        logger.warning(f"Error flushing log rollups: {e}")
+    
     try:
         # Close database log writer (flush remaining logs)
         await db_log_writer.close(timeout=10.0)
@@ -100,6 +176,7 @@ from .common.modules.audit.router import router as audit_router
 from .common.modules.exception._07_router import router as exception_router
 from .common.modules.logger import get_logging_router
 from .common.modules.health import router as health_router
+from .common.modules.export.router import router as export_router
 
 app.include_router(auth_router)
 app.include_router(member_router)
@@ -115,6 +192,11 @@ app.include_router(audit_router)
 app.include_router(exception_router)
 app.include_router(get_logging_router())
 app.include_router(health_router)
+app.include_router(export_router)
+
+if settings.METRICS_ENABLED:
+    from .common.modules.metrics import router as metrics_router
+    app.include_router(metrics_router)
 
 
 # Health check endpoints
@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 
 from ...common.modules.exception import NotFoundError, ValidationError
 from ...common.modules.supabase.service import supabase_service
+from ...common.modules.supabase.view_counter import view_counter
 from .schemas import (
     NoticeCreate,
     NoticeUpdate,
@@ -80,10 +81,10 @@ class ContentService:
                 .range((page - 1) * page_size, page * page_size - 1)
             
             result = query.execute()
-            return result.data or [], total
+            notices, total = result.data or [], total
         else:
             # Simple pagination - use helper method
-            return await supabase_service.list_with_pagination(
+            notices, total = await supabase_service.list_with_pagination(
                 table='notices',
                 page=page,
                 page_size=page_size,
@@ -92,6 +93,9 @@ class ContentService:
                 exclude_deleted=True
             )
 
+        view_counter.merge('notices', notices)
+        return notices, total
+
     async def get_notice_latest5(self) -> List[Dict[str, Any]]:
         """
         Get latest 5 notices for homepage.
@@ -106,7 +110,9 @@ class ContentService:
             .limit(5)\
             .execute()
         
-        return result.data or []
+        notices = result.data or []
+        view_counter.merge('notices', notices)
+        return notices
 
     async def get_notice_by_id(self, notice_id: UUID) -> Dict[str, Any]:
         """
@@ -126,14 +132,11 @@ class ContentService:
         if not notice:
             raise NotFoundError(resource_type="Notice")
         
-        # Increment view count - use direct client for atomic operation
-        supabase_service.client.table('notices')\
-            .update({'view_count': (notice.get('view_count', 0) + 1)})\
-            .eq('id', str(notice_id))\
-            .execute()
+        # Increment view count - write-behind, flushed atomically in batches
+        view_counter.increment('notices', str(notice_id))
         
-        # Return updated notice
-        notice['view_count'] = notice.get('view_count', 0) + 1
+        # Return notice including views not yet flushed
+        notice['view_count'] = view_counter.merge_one('notices', notice)
         return notice
 
     async def create_notice(self, data: NoticeCreate) -> Dict[str, Any]:
@@ -232,7 +235,7 @@ class ContentService:
             Tuple of (projects list, total count)
         """
         # Get projects from projects table with status filter
-        return await supabase_service.list_with_pagination(
+        projects, total = await supabase_service.list_with_pagination(
             table='projects',
             page=page,
             page_size=page_size,
@@ -241,6 +244,8 @@ class ContentService:
             exclude_deleted=True,
             filters={'status': 'active'}
         )
+        view_counter.merge('projects', projects)
+        return projects, total
 
     async def get_project_latest1(self) -> Optional[Dict[str, Any]]:
         """
@@ -281,6 +286,7 @@ class ContentService:
         print(f"[DEBUG] Content Service - Project detail: {project}")
         print(f"[DEBUG] Content Service - Attachments: {project.get('attachments')}")
         
+        project['view_count'] = view_counter.merge_one('projects', project)
         return project
 
     # ============================================================================
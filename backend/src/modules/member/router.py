@@ -3,20 +3,29 @@ Member router.
 
 API endpoints for member management.
 """
-from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi import APIRouter, Depends, File, Form, Query, Response, UploadFile, status
 from typing import Optional
 from datetime import datetime
 from uuid import UUID
 
 from fastapi import Request
+from fastapi.responses import JSONResponse
 
 from ...common.modules.audit import audit_log
 from ...common.modules.exception import (
     ExternalServiceError,
+    ValidationError,
     CMessageTemplate,
 )
 
-from ...common.modules.integrations.nice_dnb import nice_dnb_client
+from ...common.modules.export import ExportPayload, export_job_manager
+from ...common.modules.integrations.nice_dnb import (
+    MAX_CSV_BYTES,
+    MAX_CSV_ROWS,
+    bulk_verifier,
+    nice_dnb_client,
+    parse_business_numbers,
+)
 from .schemas import (
     MemberProfileResponse,
     MemberProfileUpdate,
@@ -26,6 +35,7 @@ from .schemas import (
     MemberListResponsePaginated,
     CompanyVerifyRequest,
     CompanyVerifyResponse,
+    NiceDnBBulkVerifyRequest,
 )
 from .service import MemberService
 from ..user.dependencies import get_current_active_user, get_current_admin_user
@@ -396,16 +406,18 @@ async def search_nice_dnb(
         max_length=20,
         example="123-45-67890"
     ),
+    refresh: bool = Query(False, description="Bypass the lookup cache and query the API"),
     current_user: dict = Depends(get_current_admin_user),
 ):
     """
     Search company information from Nice D&B API (admin only).
     
-    This endpoint queries the Nice D&B API and stores the result in the database
-    for future reference and audit purposes.
+    Results are served from the lookup cache when fresh; API results are
+    stored in the database for future reference and audit purposes.
     
     Args:
         business_number: Business registration number (사업자등록번호)
+        refresh: Force a new API query instead of using cached data
         current_user: Current admin user (from dependency)
     
     Returns:
@@ -415,7 +427,7 @@ async def search_nice_dnb(
         HTTPException: If API is not configured or request fails
     """
     # Check if API is configured
-    if not nice_dnb_client._is_configured():
+    if not nice_dnb_client.is_configured():
         raise ExternalServiceError(
             message=CMessageTemplate.EXTERNAL_SERVICE_NOT_CONFIGURED.format(
                 service_name="Nice D&B API"
@@ -426,8 +438,12 @@ async def search_nice_dnb(
     # Clean business number (remove hyphens)
     clean_business_number = business_number.replace("-", "").strip()
     
-    # Call Nice D&B API
-    response = await nice_dnb_client.search_company(clean_business_number)
+    # Call Nice D&B API (cached; new results are stored by the client)
+    response = await nice_dnb_client.search_company(
+        clean_business_number,
+        queried_by=current_user.get("id"),
+        refresh=refresh,
+    )
     
     if not response:
         # API request failed - return graceful error instead of 502
@@ -484,28 +500,197 @@ async def search_nice_dnb(
         ],
     }
     
-    # Store the result in database (don't fail request if storage fails)
-    try:
-        await member_service.save_nice_dnb_data(
-            business_number=clean_business_number,
-            response=response,
-            queried_by=current_user.get("id"),
+    return response_data
+
+
+# Column headers for member exports, by language
+MEMBER_EXPORT_COLUMNS = {
+    "ko": {
+        "id": "ID",
+        "business_number": "사업자번호",
+        "company_name": "기업명",
+        "email": "이메일",
+        "status": "상태",
+        "approval_status": "승인상태",
+        "industry": "업종",
+        "revenue": "매출액",
+        "employee_count": "직원수",
+        "founding_date": "설립일",
+        "region": "지역",
+        "address": "주소",
+        "website": "웹사이트",
+        "logo_url": "로고 URL",
+        "created_at": "가입일",
+        "updated_at": "수정일",
+    },
+    "zh": {
+        "id": "ID",
+        "business_number": "营业执照号",
+        "company_name": "企业名称",
+        "email": "邮箱",
+        "status": "状态",
+        "approval_status": "审批状态",
+        "industry": "行业",
+        "revenue": "营业收入",
+        "employee_count": "员工数",
+        "founding_date": "成立日期",
+        "region": "地区",
+        "address": "地址",
+        "website": "网站",
+        "logo_url": "标志 URL",
+        "created_at": "注册时间",
+        "updated_at": "更新时间",
+    },
+}
+
+
+def _ensure_nice_dnb_configured() -> None:
+    if not nice_dnb_client.is_configured():
+        raise ExternalServiceError(
+            message=CMessageTemplate.EXTERNAL_SERVICE_NOT_CONFIGURED.format(
+                service_name="Nice D&B API"
+            ),
+            service_name="Nice D&B",
         )
-    except Exception as e:
-        # Log error but don't fail the request
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.error(
-            f"Failed to save Nice D&B data to database: {str(e)}",
-            extra={
-                "business_number": clean_business_number,
-                "error_type": type(e).__name__,
-            },
-            exc_info=True,
+
+
+@router.post(
+    "/api/admin/members/nice-dnb/bulk",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Bulk Verify Companies (Admin)",
+    tags=["Admin", "Nice D&B"],
+)
+@audit_log(action="verify", resource_type="nice_dnb")
+async def bulk_verify_nice_dnb(
+    data: NiceDnBBulkVerifyRequest,
+    request: Request,
+    current_user: dict = Depends(get_current_admin_user),
+):
+    """
+    Start a bulk verification job (admin only).
+
+    Verifies the given business numbers, or every member's business number
+    when `all_members` is set. Returns the job record immediately; poll
+    `/api/admin/members/nice-dnb/bulk/{job_id}` for progress and results.
+    """
+    _ensure_nice_dnb_configured()
+
+    business_numbers = list(data.business_numbers)
+    if data.all_members:
+        business_numbers += await member_service.get_member_business_numbers(data.approval_status)
+
+    job = bulk_verifier.submit(
+        business_numbers,
+        requested_by=current_user.get("id"),
+        refresh=data.refresh,
+    )
+    return job.to_dict()
+
+
+@router.post(
+    "/api/admin/members/nice-dnb/bulk/csv",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Bulk Verify Companies from CSV (Admin)",
+    tags=["Admin", "Nice D&B"],
+)
+@audit_log(action="verify", resource_type="nice_dnb")
+async def bulk_verify_nice_dnb_csv(
+    request: Request,
+    file: UploadFile = File(..., description="CSV file containing business numbers"),
+    refresh: bool = Form(False),
+    current_user: dict = Depends(get_current_admin_user),
+):
+    """
+    Start a bulk verification job from an uploaded CSV file (admin only).
+
+    Every cell that looks like a business number is used, so the file may
+    contain headers and other columns. Files over MAX_CSV_BYTES or
+    MAX_CSV_ROWS are rejected before parsing.
+    """
+    _ensure_nice_dnb_configured()
+
+    # Read at most one byte past the limit so oversized uploads are never held in memory
+    content = await file.read(MAX_CSV_BYTES + 1)
+    if len(content) > MAX_CSV_BYTES:
+        raise ValidationError(
+            CMessageTemplate.VALIDATION_FILE_SIZE.format(
+                actual_size=f"{(file.size or len(content)) / 1024 / 1024:.2f}",
+                max_size=f"{MAX_CSV_BYTES / 1024 / 1024:.0f}",
+            )
         )
-        # Continue to return API response even if storage fails
-    
-    return response_data
+    business_numbers = parse_business_numbers(
+        content.decode("utf-8-sig", errors="replace"),
+        max_rows=MAX_CSV_ROWS,
+    )
+    job = bulk_verifier.submit(
+        business_numbers,
+        requested_by=current_user.get("id"),
+        refresh=refresh,
+    )
+    return job.to_dict()
+
+
+@router.get(
+    "/api/admin/members/nice-dnb/bulk/{job_id}",
+    summary="Get Bulk Verification Job (Admin)",
+    tags=["Admin", "Nice D&B"],
+)
+async def get_bulk_verify_nice_dnb(
+    job_id: str,
+    include_results: bool = Query(True, description="Include per-number results"),
+    current_user: dict = Depends(get_current_admin_user),
+):
+    """Get bulk verification progress and results (admin only)."""
+    return bulk_verifier.get(job_id).to_dict(include_results=include_results)
+
+
+async def build_members_export(params: dict) -> ExportPayload:
+    """
+    Build member export rows with internationalized column names.
+
+    Args:
+        params: MemberListQuery fields plus `language` ('ko' or 'zh')
+    """
+    params = dict(params)
+    language = params.pop("language", None) or "ko"
+    query = MemberListQuery(**params)
+
+    # Get export data
+    export_data = await member_service.export_members_data(query)
+
+    # Get headers based on language (default to Korean)
+    lang = language if language in MEMBER_EXPORT_COLUMNS else "ko"
+    header_labels = MEMBER_EXPORT_COLUMNS[lang]
+
+    # Reorganize data with internationalized column names
+    if export_data:
+        # Get the keys from the first data row
+        data_keys = list(export_data[0].keys())
+        # Create header list in the same order as data keys
+        header_list = [header_labels.get(key, key) for key in data_keys]
+
+        # Reorganize data: map field keys to header labels
+        reorganized_data = []
+        for row in export_data:
+            reorganized_row = {}
+            for key in data_keys:
+                header_label = header_labels.get(key, key)
+                reorganized_row[header_label] = row.get(key, "")
+            reorganized_data.append(reorganized_row)
+    else:
+        header_list = None
+        reorganized_data = []
+
+    return ExportPayload(
+        data=reorganized_data,
+        sheet_name="Members",
+        filename_prefix="members_export",
+        headers=header_list,
+        title=f"Members Export - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+    )
+
+
+export_job_manager.register("members", build_members_export)
 
 
 @router.get("/api/admin/members/export")
@@ -519,12 +704,15 @@ async def export_members(
     approval_status: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
     language: Optional[str] = Query("ko", description="Language for column headers: 'ko' or 'zh'"),
+    background: bool = Query(False, description="Run as a background export job and return its progress record"),
     current_user: dict = Depends(get_current_admin_user),
 ):
     """
     Export members data to Excel or CSV (admin only).
     
     Supports the same filtering options as the list endpoint.
+    With `background=true` the export is queued and a job record is returned
+    (poll `/api/admin/exports/{job_id}` for the download URL).
     """
     from ...common.modules.export import ExportService
     
@@ -537,80 +725,23 @@ async def export_members(
         approval_status=approval_status,
         status=status,
     )
-    
-    # Get export data
-    export_data = await member_service.export_members_data(query)
-    
-    # Define column headers based on language
-    column_mapping = {
-        "ko": {
-            "id": "ID",
-            "business_number": "사업자번호",
-            "company_name": "기업명",
-            "email": "이메일",
-            "status": "상태",
-            "approval_status": "승인상태",
-            "industry": "업종",
-            "revenue": "매출액",
-            "employee_count": "직원수",
-            "founding_date": "설립일",
-            "region": "지역",
-            "address": "주소",
-            "website": "웹사이트",
-            "logo_url": "로고 URL",
-            "created_at": "가입일",
-            "updated_at": "수정일",
-        },
-        "zh": {
-            "id": "ID",
-            "business_number": "营业执照号",
-            "company_name": "企业名称",
-            "email": "邮箱",
-            "status": "状态",
-            "approval_status": "审批状态",
-            "industry": "行业",
-            "revenue": "营业收入",
-            "employee_count": "员工数",
-            "founding_date": "成立日期",
-            "region": "地区",
-            "address": "地址",
-            "website": "网站",
-            "logo_url": "标志 URL",
-            "created_at": "注册时间",
-            "updated_at": "更新时间",
-        },
-    }
-    
-    # Get headers based on language (default to Korean)
-    lang = language if language in column_mapping else "ko"
-    header_labels = column_mapping[lang]
-    
-    # Reorganize data with internationalized column names
-    if export_data:
-        # Get the keys from the first data row
-        data_keys = list(export_data[0].keys())
-        # Create header list in the same order as data keys
-        header_list = [header_labels.get(key, key) for key in data_keys]
-        
-        # Reorganize data: map field keys to header labels
-        reorganized_data = []
-        for row in export_data:
-            reorganized_row = {}
-            for key in data_keys:
-                header_label = header_labels.get(key, key)
-                reorganized_row[header_label] = row.get(key, "")
-            reorganized_data.append(reorganized_row)
-    else:
-        header_list = list(header_labels.values())
-        reorganized_data = []
+    params = {**query.model_dump(mode="json"), "language": language}
+
+    if background:
+        job = await export_job_manager.submit(
+            "members", params, format, requested_by=current_user.get("id")
+        )
+        return JSONResponse(status_code=202, content=job.to_dict())
+
+    payload = await build_members_export(params)
     
     # Generate export file
     if format == "excel":
         excel_bytes = ExportService.export_to_excel(
-            data=reorganized_data,
-            sheet_name="Members",
-            headers=header_list if reorganized_data else None,
-            title=f"Members Export - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            data=payload.data,
+            sheet_name=payload.sheet_name,
+            headers=payload.headers,
+            title=payload.title,
         )
         return Response(
             content=excel_bytes,
@@ -621,8 +752,8 @@ async def export_members(
         )
     else:  # CSV
         csv_content = ExportService.export_to_csv(
-            data=reorganized_data,
-            headers=header_list if reorganized_data else None,
+            data=payload.data,
+            headers=payload.headers,
         )
         return Response(
             content=csv_content,
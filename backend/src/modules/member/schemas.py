@@ -257,6 +257,15 @@ class CompanyVerifyRequest(BaseModel):
     company_name: Optional[str] = Field(None, max_length=255, description="Company name to verify (optional)")
 
 
+class NiceDnBBulkVerifyRequest(BaseModel):
+    """Bulk company verification request schema."""
+
+    business_numbers: list[str] = Field(default_factory=list, description="Business registration numbers to verify")
+    all_members: bool = Field(False, description="Verify the business numbers of all members")
+    approval_status: Optional[str] = Field(None, description="With all_members, only include this approval status")
+    refresh: bool = Field(False, description="Query the API even when a fresh stored result exists")
+
+
 class CompanyVerifyResponse(BaseModel):
     """Company verification response schema."""
 
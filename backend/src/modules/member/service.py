@@ -10,6 +10,7 @@ from datetime import datetime, date
 from ...common.modules.db.models import Member  # Member table now includes profile fields
 from ...common.modules.exception import NotFoundError, ValidationError, ConflictError, CMessageTemplate
 from ...common.modules.supabase.service import supabase_service
+from ...common.modules.integrations.nice_dnb import nice_dnb_cache
 from ...common.modules.integrations.nice_dnb.schemas import NiceDnBResponse
 from .schemas import MemberProfileUpdate, MemberListQuery, MemberProfileResponse
 
@@ -344,16 +345,13 @@ class MemberService:
             }
         )
 
-        # Send approval notification email in background (non-blocking)
+        # Queue approval notification email (delivered by the email outbox)
         from ...common.modules.email import email_service
-        from ...common.modules.email.background import send_email_background
-        send_email_background(
-            email_service.send_approval_notification_email(
-                to_email=updated_member['email'],
-                company_name=updated_member['company_name'],
-                approval_type="회원가입",
-                status="approved",
-            )
+        await email_service.send_approval_notification_email(
+            to_email=updated_member['email'],
+            company_name=updated_member['company_name'],
+            approval_type="회원가입",
+            status="approved",
         )
 
         return updated_member
@@ -389,17 +387,14 @@ class MemberService:
             }
         )
 
-        # Send rejection notification email in background (non-blocking)
+        # Queue rejection notification email (delivered by the email outbox)
         from ...common.modules.email import email_service
-        from ...common.modules.email.background import send_email_background
-        send_email_background(
-            email_service.send_approval_notification_email(
-                to_email=updated_member['email'],
-                company_name=updated_member['company_name'],
-                approval_type="회원가입",
-                status="rejected",
-                comments=reason,
-            )
+        await email_service.send_approval_notification_email(
+            to_email=updated_member['email'],
+            company_name=updated_member['company_name'],
+            approval_type="회원가입",
+            status="rejected",
+            comments=reason,
         )
 
         return updated_member
@@ -475,6 +470,36 @@ class MemberService:
 
         return export_data
 
+    async def get_member_business_numbers(
+        self, approval_status: Optional[str] = None
+    ) -> list[str]:
+        """
+        Get the business numbers of all members (for bulk re-verification).
+
+        Args:
+            approval_status: Only include members with this approval status (optional)
+
+        Returns:
+            List of business numbers
+        """
+        page_size = 1000
+        numbers = []
+        offset = 0
+        while True:
+            query = supabase_service.client.table("members")\
+                .select("business_number")\
+                .is_("deleted_at", "null")
+            if approval_status:
+                query = query.eq("approval_status", approval_status)
+            result = query.order("business_number")\
+                .range(offset, offset + page_size - 1)\
+                .execute()
+            rows = result.data or []
+            numbers.extend(row["business_number"] for row in rows if row.get("business_number"))
+            if len(rows) < page_size:
+                return numbers
+            offset += page_size
+
     async def save_nice_dnb_data(
         self,
         business_number: str,
@@ -482,7 +507,7 @@ class MemberService:
         queried_by: Optional[str] = None,
     ) -> None:
         """
-        Save Nice D&B API response to database.
+        Save Nice D&B API response to database (upsert on biz_no).
         
         Args:
             business_number: Business registration number (cleaned, without hyphens)
@@ -492,85 +517,8 @@ class MemberService:
         Raises:
             Exception: If database operation fails
         """
-        # Format established_date to YYYYMMDD if available
-        estb_date_str = None
-        if response.data.established_date:
-            estb_date_str = response.data.established_date.strftime("%Y%m%d")
-        
-        # Get latest financial data (most recent year) for single record storage
-        latest_financial = None
-        if response.financials:
-            latest_financial = max(response.financials, key=lambda f: f.year)
-        
-        # Prepare raw JSON for full response storage
-        raw_json_data = {
-            "data": {
-                "businessNumber": response.data.business_number,
-                "companyName": response.data.company_name,
-                "representative": response.data.representative,
-                "address": response.data.address,
-                "industry": response.data.industry,
-                "establishedDate": (
-                    response.data.established_date.isoformat()
-                    if response.data.established_date
-                    else None
-                ),
-                "creditGrade": response.data.credit_grade,
-            },
-            "financials": [
-                {
-                    "year": f.year,
-                    "revenue": f.revenue,
-                    "profit": f.profit,
-                    "employees": f.employees,
-                }
-                for f in response.financials
-            ],
-            "queried_at": datetime.now().isoformat(),
-            "queried_by": queried_by,
-        }
-        
-        # Prepare data for database
-        db_data = {
-            "biz_no": business_number,
-            "cmp_nm": response.data.company_name,
-            "ceo_nm": response.data.representative,
-            "ind_nm": response.data.industry,
-            "estb_date": estb_date_str,
-            "cri_grd": response.data.credit_grade,
-            "bzcnd_nm": response.data.main_business,
-            "raw_json": raw_json_data,
-        }
-        
-        # Address handling (split if needed)
-        if response.data.address:
-            addr_parts = response.data.address.split(" ", 1)
-            db_data["addr1"] = addr_parts[0] if len(addr_parts) > 0 else response.data.address
-            db_data["addr2"] = addr_parts[1] if len(addr_parts) > 1 else None
-        
-        # Financial data from latest year
-        if latest_financial:
-            db_data["sales_amt"] = float(latest_financial.revenue)
-            db_data["emp_cnt"] = latest_financial.employees
-        
-        # Check if record exists - use direct client for complex query
-        existing = supabase_service.client.table("nice_dnb_company_info")\
-            .select("biz_no")\
-            .eq("biz_no", business_number)\
-            .limit(1)\
-            .execute()
-        
-        if existing.data:
-            # Update existing record - use direct client
-            supabase_service.client.table("nice_dnb_company_info")\
-                .update(db_data)\
-                .eq("biz_no", business_number)\
-                .execute()
-        else:
-            # Insert new record - use direct client
-            supabase_service.client.table("nice_dnb_company_info")\
-                .insert(db_data)\
-                .execute()
+        # Upsert the row and refresh the in-memory lookup cache
+        await nice_dnb_cache.store(business_number, response, queried_by=queried_by)
 
 # Service instance
 member_service = MemberService()
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Broadcast fan-out.
+
+Delivers a broadcast to its recipients outside the request cycle. Message
+rows are inserted in chunks with bounded concurrency; as each chunk lands,
+the matching notification emails are queued with
+EmailService.send_email_to_many on the email outbox, which sends them at a
+controlled rate. Progress is tracked per broadcast ID.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from ...common.modules.background import JobRegistry
+from ...common.modules.config import settings
+from ...common.modules.email import email_service
+from ...common.modules.logger import get_logger
+from ...common.modules.supabase.message_service import message_db_service
+
+logger = get_logger(__name__)
+
+
+@dataclass(slots=True)
+class BroadcastEmail:
+    """Notification email sent to every broadcast recipient with an address."""
+
+    subject: str
+    template_name: str
+    template_data: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class BroadcastJob:
+    """Progress record for a single broadcast fan-out."""
+
+    broadcast_id: str
+    sender_id: str
+    subject: str
+    recipient_count: int
+    status: str = "queued"  # queued, running, completed, failed
+    inserted_count: int = 0
+    emails_queued: int = 0
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def progress(self) -> int:
+        if not self.recipient_count:
+            return 100
+        return int(self.inserted_count * 100 / self.recipient_count)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "broadcast_id": self.broadcast_id,
+            "sender_id": self.sender_id,
+            "subject": self.subject,
+            "status": self.status,
+            "progress": self.progress,
+            "recipient_count": self.recipient_count,
+            "inserted_count": self.inserted_count,
+            "emails_queued": self.emails_queued,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class BroadcastFanout:
+    """Runs broadcast deliveries as background tasks and tracks their progress."""
+
+    def __init__(self, chunk_size: int = 500, concurrency: int = 4, max_jobs: int = 100):
+        """
+        Initialize broadcast fan-out.
+
+        Args:
+            chunk_size: Messages per insert request
+            concurrency: Insert requests in flight per broadcast
+            max_jobs: Number of broadcast records kept in memory
+        """
+        self.chunk_size = max(1, chunk_size)
+        self.concurrency = max(1, concurrency)
+
+        self._jobs: JobRegistry[BroadcastJob] = JobRegistry("Broadcast", max_jobs=max_jobs)
+
+    def start(
+        self,
+        job: BroadcastJob,
+        messages: List[Dict[str, Any]],
+        email: BroadcastEmail,
+        recipient_emails: Dict[str, str],
+    ) -> BroadcastJob:
+        """
+        Start delivering a broadcast in the background.
+
+        Args:
+            job: Progress record (its recipient_count should match messages)
+            messages: Message rows to insert, each with a pre-generated id
+            email: Notification email sent alongside the messages
+            recipient_emails: Email address per recipient ID (recipients
+                without an address are simply omitted)
+        """
+        self._jobs.add(job.broadcast_id, job)
+        self._jobs.spawn(self._run(job, messages, email, recipient_emails))
+        return job
+
+    def get(self, broadcast_id: str) -> BroadcastJob:
+        return self._jobs.get(broadcast_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._jobs.running,
+            "jobs_in_memory": len(self._jobs),
+        }
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Wait up to `timeout` seconds for running broadcasts, then cancel them."""
+        cancelled = await self._jobs.close(timeout)
+        if cancelled:
+            logger.warning(
+                f"Cancelled {cancelled} unfinished broadcast deliveries",
+                extra={"module_name": __name__},
+            )
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    async def _run(
+        self,
+        job: BroadcastJob,
+        messages: List[Dict[str, Any]],
+        email: BroadcastEmail,
+        recipient_emails: Dict[str, str],
+    ) -> None:
+        job.status = "running"
+
+        async def on_chunk(chunk: List[Dict[str, Any]]) -> None:
+            job.inserted_count += len(chunk)
+            to_emails = [
+                recipient_emails[message["recipient_id"]]
+                for message in chunk
+                if message["recipient_id"] in recipient_emails
+            ]
+            if to_emails:
+                job.emails_queued += await email_service.send_email_to_many(
+                    to_emails=to_emails,
+                    subject=email.subject,
+                    template_name=email.template_name,
+                    template_data=email.template_data,
+                )
+
+        try:
+            await message_db_service.insert_messages_chunked(
+                messages,
+                chunk_size=self.chunk_size,
+                concurrency=self.concurrency,
+                on_chunk=on_chunk,
+            )
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Broadcast delivery was cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(
+                f"Broadcast delivery failed: {job.broadcast_id}: {str(e)}",
+                exc_info=True,
+                extra={"module_name": __name__, "broadcast_id": job.broadcast_id},
+            )
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+
+        if job.status == "completed":
+            logger.info(
+                f"Broadcast delivered: {job.broadcast_id} ({job.inserted_count} messages)",
+                extra={
+                    "module_name": __name__,
+                    "broadcast_id": job.broadcast_id,
+                    "recipient_count": job.recipient_count,
+                    "emails_queued": job.emails_queued,
+                    "duration_ms": int((job.finished_at - job.created_at).total_seconds() * 1000),
+                },
+            )
+
+
+# Global broadcast fan-out instance
+broadcast_fanout = BroadcastFanout(
+    chunk_size=settings.BROADCAST_CHUNK_SIZE,
+    concurrency=settings.BROADCAST_CONCURRENCY,
+)
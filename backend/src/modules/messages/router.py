@@ -9,6 +9,7 @@ from uuid import UUID
 from math import ceil
 
 from fastapi import Request
+from fastapi.responses import StreamingResponse
 
 from ...common.modules.db.models import Member
 from ...common.modules.audit import audit_log
@@ -29,12 +30,20 @@ from .schemas import (
     ThreadListResponse,
     BroadcastCreate,
     BroadcastResponse,
+    BroadcastStatusResponse,
     MessageAnalyticsResponse,
 )
 
 router = APIRouter()
 service = MessageService()
 
+# Headers for server-sent event streams (disable proxy buffering)
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
 
 # Admin Endpoints
 
@@ -93,6 +102,27 @@ async def get_unread_count(
     return UnreadCountResponse(unread_count=result.get('unread_count', 0))
 
 
+@router.get(
+    "/api/admin/messages/unread-count/stream",
+    tags=["messages", "admin"],
+    summary="Stream unread messages count (admin)",
+)
+async def stream_unread_count(
+    current_user = Depends(get_current_admin_user),
+):
+    """
+    Server-sent event stream of the admin unread messages count.
+
+    Emits an `unread-count` event with the current count on connect and
+    again whenever it changes.
+    """
+    return StreamingResponse(
+        service.stream_unread_count(current_user["id"], is_admin=True),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 @router.get(
     "/api/admin/messages/analytics",
     response_model=MessageAnalyticsResponse,
@@ -268,6 +298,27 @@ async def get_member_unread_count(
     return UnreadCountResponse(unread_count=result.get('unread_count', 0))
 
 
+@router.get(
+    "/api/member/messages/unread-count/stream",
+    tags=["messages", "member"],
+    summary="Stream unread messages count (member)",
+)
+async def stream_member_unread_count(
+    current_user: Member = Depends(get_current_member_user),
+):
+    """
+    Server-sent event stream of the member unread messages count.
+
+    Emits an `unread-count` event with the current count on connect and
+    again whenever it changes.
+    """
+    return StreamingResponse(
+        service.stream_unread_count(current_user.id, is_admin=False),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
 # Thread Endpoints (must be before /{message_id} to avoid route conflicts)
 
 @router.get(
@@ -503,5 +554,20 @@ async def create_broadcast(
     return BroadcastResponse(**broadcast)
 
 
+@router.get(
+    "/api/admin/messages/broadcast/{broadcast_id}/status",
+    response_model=BroadcastStatusResponse,
+    tags=["messages", "broadcast", "admin"],
+    summary="Get broadcast delivery status (admin)",
+)
+async def get_broadcast_status(
+    broadcast_id: str,
+    current_user = Depends(get_current_admin_user),
+):
+    """Get delivery progress of a broadcast started by POST /api/admin/messages/broadcast."""
+    broadcast = await service.get_broadcast_status(broadcast_id)
+    return BroadcastStatusResponse(**broadcast)
+
+
 # Analytics endpoint moved above to fix route ordering issue
 
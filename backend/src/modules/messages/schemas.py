@@ -203,6 +203,8 @@ class BroadcastResponse(BaseModel):
     sent_at: Optional[datetime] = None
     created_at: Optional[datetime] = None
     messages: Optional[List[dict]] = None
+    status: Optional[str] = None  # Delivery status: queued, running, completed, failed
+    progress: int = 0  # Delivery progress (0-100)
     
     # 格式化后的显示字段
     sent_at_display: Optional[str] = None
@@ -216,6 +218,22 @@ class BroadcastResponse(BaseModel):
         self.created_at_display = format_kst_display(self.created_at)
 
 
+class BroadcastStatusResponse(BaseModel):
+    """Broadcast delivery progress schema."""
+    
+    broadcast_id: str
+    sender_id: Optional[str] = None
+    subject: Optional[str] = None
+    status: str
+    progress: int = 0
+    recipient_count: int = 0
+    inserted_count: int = 0
+    emails_queued: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
 # Analytics schemas
 
 class MessageAnalyticsResponse(BaseModel):
@@ -1,11 +1,15 @@
-from typing import List, Tuple, Optional
+import json
+from typing import AsyncIterator, List, Tuple, Optional
 from uuid import UUID, uuid4
 from datetime import datetime, timezone, timedelta
 
+from ...common.modules.config import settings
 from ...common.modules.exception import NotFoundError, ValidationError, CMessageTemplate
 from ...common.modules.supabase.message_service import message_db_service
+from ...common.modules.supabase.unread_hub import unread_count_hub
 from ...common.modules.supabase.service import supabase_service
 from ...common.modules.email.service import EmailService
+from .broadcast import BroadcastEmail, BroadcastJob, broadcast_fanout
 from .schemas import (
     MessageCreate, MessageUpdate, ThreadCreate, ThreadMessageCreate,
     ThreadUpdate, BroadcastCreate
@@ -184,13 +188,25 @@ class MessageService:
 
     async def get_unread_count_unified(self, user_id: UUID, is_admin: bool = False) -> dict:
         """获取用户未读消息数量"""
-        count = await self.db.get_unread_count(str(user_id), is_admin)
+        count = await unread_count_hub.get_count(str(user_id), is_admin)
         return {
             "unread_count": count,
             "direct_count": count,
             "thread_count": 0,
         }
 
+    async def stream_unread_count(self, user_id: UUID, is_admin: bool = False) -> AsyncIterator[str]:
+        """以 SSE 帧推送未读数量（首帧为当前值，之后仅在变化时推送，空闲时发送 keep-alive）"""
+        async for count in unread_count_hub.stream(
+            str(user_id),
+            is_admin,
+            heartbeat=settings.MESSAGE_SSE_HEARTBEAT_SECONDS,
+        ):
+            if count is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: unread-count\ndata: {json.dumps({'unread_count': count})}\n\n"
+
     async def create_direct_message(
         self,
         sender_id: Optional[UUID],
@@ -234,23 +250,22 @@ class MessageService:
         threads, total_count = await self.db.get_threads_paginated(
             page=page,
             page_size=page_size,
-            status=status
+            status=status,
+            unread_for=self.SENDER_ADMIN,
+            has_unread=has_unread,
         )
 
         if not threads:
             return threads, total_count
 
-        thread_ids = [t['id'] for t in threads]
-        thread_stats = await self.db.get_thread_stats_batch(thread_ids, for_admin=True)
-
         member_ids = list(set(t.get('sender_id') for t in threads if t.get('sender_id')))
         member_names = await self.db.get_member_names_batch(member_ids)
 
         for thread in threads:
-            stats = thread_stats.get(thread['id'], {'message_count': 0, 'unread_count': 0})
-            thread['message_count'] = stats['message_count']
-            thread['admin_unread_count'] = stats['unread_count']
-            thread['unread_count'] = stats['unread_count']
+            # message_count / admin_unread_count 由触发器维护在 thread 根消息行上
+            thread['message_count'] = thread.get('message_count') or 0
+            thread['admin_unread_count'] = thread.get('admin_unread_count') or 0
+            thread['unread_count'] = thread['admin_unread_count']
             thread['member_name'] = member_names.get(thread.get('sender_id'))
             thread['member_id'] = thread.get('sender_id')
             thread['created_by'] = thread.get('sender_id')
@@ -278,14 +293,11 @@ class MessageService:
         if not threads:
             return threads, total_count
 
-        thread_ids = [t['id'] for t in threads]
-        thread_stats = await self.db.get_thread_stats_batch(thread_ids, for_admin=False)
         member_name = await self.db.get_member_name(str(member_id))
 
         for thread in threads:
-            stats = thread_stats.get(thread['id'], {'message_count': 0, 'unread_count': 0})
-            thread['message_count'] = stats['message_count']
-            thread['unread_count'] = stats['unread_count']
+            thread['message_count'] = thread.get('message_count') or 0
+            thread['unread_count'] = thread.get('member_unread_count') or 0
             thread['member_name'] = member_name
             thread['member_id'] = str(member_id)
             thread['created_by'] = str(member_id)
@@ -424,24 +436,33 @@ class MessageService:
         return updated if updated else thread
 
     async def create_broadcast(self, data: BroadcastCreate, sender_id: UUID) -> dict:
-        """创建并发送广播消息"""
+        """
+        创建广播消息并在后台投递
+        
+        立即返回广播 ID；消息分块插入及通知邮件入队由 broadcast_fanout 在后台完成，
+        进度可通过 get_broadcast_status 查询。
+        """
         is_admin = await self._is_admin(str(sender_id))
         if not is_admin:
             raise ValidationError(CMessageTemplate.MESSAGE_BROADCAST_ADMIN_ONLY)
 
         if data.send_to_all:
-            recipient_ids = await self.db.get_active_member_ids()
+            contacts = await self.db.get_member_contacts()
+            recipient_ids = [c['id'] for c in contacts]
         else:
-            recipient_ids = [str(rid) for rid in (data.recipient_ids or [])]
+            recipient_ids = list(dict.fromkeys(str(rid) for rid in (data.recipient_ids or [])))
+            contacts = await self.db.get_member_contacts(recipient_ids)
 
         if not recipient_ids:
             raise ValidationError(CMessageTemplate.MESSAGE_NO_RECIPIENTS)
 
-        messages_to_insert = []
         broadcast_id = str(uuid4())
+        now = datetime.now(timezone.utc).isoformat()
+        category = getattr(data, 'category', "announcement")
+        is_important = getattr(data, 'is_important', False)
 
-        for recipient_id in recipient_ids:
-            messages_to_insert.append({
+        messages_to_insert = [
+            {
                 "id": str(uuid4()),
                 "message_type": self.TYPE_BROADCAST,
                 "thread_id": broadcast_id,
@@ -450,24 +471,60 @@ class MessageService:
                 "recipient_id": recipient_id,
                 "subject": data.subject,
                 "content": data.content,
-                "category": getattr(data, 'category', "announcement"),
-                "is_important": getattr(data, 'is_important', False),
+                "category": category,
+                "is_important": is_important,
                 "is_broadcast": True,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-            })
-
-        result = await self.db.insert_messages_batch(messages_to_insert)
-        if not result:
-            raise ValidationError(
-                CMessageTemplate.VALIDATION_OPERATION_FAILED.format(operation="create broadcast")
-            )
+                "created_at": now,
+            }
+            for recipient_id in recipient_ids
+        ]
+
+        sender_name = await self._get_admin_name(str(sender_id))
+        email_subject = f"{'[중요] ' if is_important else ''}{data.subject}"
+        messages_link = f"{settings.FRONTEND_URL.rstrip('/')}/member/support/inquiry-history"
+        email = BroadcastEmail(
+            subject=email_subject,
+            template_name="broadcast_message",
+            template_data={
+                "sender_name": sender_name,
+                "subject": data.subject,
+                "is_important": is_important,
+                "messages_link": messages_link,
+            },
+        )
+        recipient_emails = {contact['id']: contact['email'] for contact in contacts if contact.get('email')}
+
+        job = broadcast_fanout.start(
+            BroadcastJob(
+                broadcast_id=broadcast_id,
+                sender_id=str(sender_id),
+                subject=data.subject,
+                recipient_count=len(recipient_ids),
+            ),
+            messages_to_insert,
+            email,
+            recipient_emails,
+        )
 
         return {
             "broadcast_id": broadcast_id,
+            "sender_id": str(sender_id),
+            "sender_name": sender_name,
+            "subject": data.subject,
+            "content": data.content,
+            "category": category,
+            "is_important": is_important,
+            "send_to_all": data.send_to_all,
             "recipient_count": len(recipient_ids),
-            "messages": result
+            "created_at": now,
+            "status": job.status,
+            "progress": job.progress,
         }
 
+    async def get_broadcast_status(self, broadcast_id: str) -> dict:
+        """获取广播投递进度"""
+        return broadcast_fanout.get(broadcast_id).to_dict()
+
     async def get_analytics(self, time_range: str = "7d") -> dict:
         """获取消息分析数据"""
         now = datetime.now(timezone.utc)
@@ -6,9 +6,11 @@ from math import ceil
 from datetime import datetime
 
 from fastapi import Request
+from fastapi.responses import JSONResponse
 
 from ...common.modules.db.models import Member, Admin
 from ...common.modules.audit import audit_log
+from ...common.modules.export import ExportPayload, export_job_manager
 from ..user.dependencies import get_current_active_user_compat as get_current_active_user, get_current_admin_user
 from .service import PerformanceService
 from .schemas import (
@@ -168,6 +170,20 @@ async def list_all_performance_records(
     )
 
 
+async def build_performance_export(params: dict) -> ExportPayload:
+    """Build performance export rows from PerformanceListQuery fields."""
+    query = PerformanceListQuery(**params)
+    return ExportPayload(
+        data=service.iter_performance_export_data(query),
+        sheet_name="Performance",
+        filename_prefix="performance_export",
+        title=f"Performance Data Export - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+    )
+
+
+export_job_manager.register("performance", build_performance_export)
+
+
 @router.get(
     "/api/admin/performance/export",
     tags=["admin-performance"],
@@ -179,10 +195,20 @@ async def export_performance_data(
     request: Request,
     current_admin: Annotated[Admin, Depends(get_current_admin_user)],
     export_format: str = Query("excel", alias="format", regex="^(excel|csv)$", description="Export format: excel or csv"),
+    background: bool = Query(False, description="Run as a background export job and return its progress record"),
 ):
     """导出业绩数据"""
     from ...common.modules.export import ExportService
     
+    if background:
+        job = await export_job_manager.submit(
+            "performance",
+            query.model_dump(mode="json"),
+            export_format,
+            requested_by=current_admin.get("id"),
+        )
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.to_dict())
+
     export_data = await service.export_performance_data(query)
     
     if export_format == "excel":
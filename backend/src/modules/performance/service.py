@@ -1,7 +1,7 @@
 """
 Performance service.
 """
-from typing import Optional
+from typing import AsyncIterator, Optional
 from uuid import UUID
 import uuid
 from datetime import datetime
@@ -268,17 +268,14 @@ class PerformanceService:
         updated_record = await supabase_service.get_by_id('performance_records', str(performance_id))
 
         from ...common.modules.email import email_service
-        from ...common.modules.email.background import send_email_background
         member = await supabase_service.get_by_id('members', str(record["member_id"]))
         if member:
-            send_email_background(
-                email_service.send_approval_notification_email(
-                    to_email=member["email"],
-                    company_name=member["company_name"],
-                    approval_type="성과 데이터",
-                    status="approved",
-                    comments=comments,
-                )
+            await email_service.send_approval_notification_email(
+                to_email=member["email"],
+                company_name=member["company_name"],
+                approval_type="성과 데이터",
+                status="approved",
+                comments=comments,
             )
             await self._send_performance_notification(
                 member_id=record["member_id"],
@@ -316,19 +313,13 @@ class PerformanceService:
         updated_record = await supabase_service.get_by_id('performance_records', str(performance_id))
 
         from ...common.modules.email import email_service
-        from ...common.modules.email.background import send_email_background
         member = await supabase_service.get_by_id('members', str(record["member_id"]))
         if member and comments:
-            from ...common.modules.config.settings import settings
-            revision_url = f"{settings.FRONTEND_URL}/member/performance/{performance_id}"
-            send_email_background(
-                email_service.send_revision_request_email(
-                    to_email=member["email"],
-                    company_name=member["company_name"],
-                    request_type="성과 데이터",
-                    comments=comments,
-                    revision_url=revision_url,
-                )
+            await email_service.send_revision_request_email(
+                to_email=member["email"],
+                company_name=member["company_name"],
+                record_title="성과 데이터",
+                comments=comments,
             )
             await self._send_performance_notification(
                 member_id=record["member_id"],
@@ -379,27 +370,35 @@ class PerformanceService:
         self, query: PerformanceListQuery
     ) -> list[dict]:
         """导出业绩数据（管理员）"""
-        records = await supabase_service.export_performance_records(
+        export_data = []
+        async for chunk in self.iter_performance_export_data(query):
+            export_data.extend(chunk)
+        return export_data
+
+    async def iter_performance_export_data(
+        self, query: PerformanceListQuery
+    ) -> AsyncIterator[list[dict]]:
+        """按块生成业绩导出数据（后台导出任务逐块写入文件）"""
+        chunks = supabase_service.iter_performance_records_export(
             member_id=str(query.member_id) if query.member_id else None,
             year=query.year,
             quarter=query.quarter,
             status=query.status,
             type=query.type,
         )
-
-        export_data = []
-        for record in records:
-            export_data.append({
-                "id": str(record["id"]),
-                "member_id": str(record["member_id"]),
-                "year": record["year"],
-                "quarter": record["quarter"],
-                "type": record["type"],
-                "status": record["status"],
-                "data_json": json.dumps(record["data_json"], ensure_ascii=False) if record.get("data_json") else "",
-                "submitted_at": record.get("submitted_at"),
-                "created_at": record.get("created_at"),
-                "updated_at": record.get("updated_at"),
-            })
-
-        return export_data
+        async for records in chunks:
+            yield [
+                {
+                    "id": str(record["id"]),
+                    "member_id": str(record["member_id"]),
+                    "year": record["year"],
+                    "quarter": record["quarter"],
+                    "type": record["type"],
+                    "status": record["status"],
+                    "data_json": json.dumps(record["data_json"], ensure_ascii=False) if record.get("data_json") else "",
+                    "submitted_at": record.get("submitted_at"),
+                    "created_at": record.get("created_at"),
+                    "updated_at": record.get("updated_at"),
+                }
+                for record in records
+            ]
@@ -10,9 +10,11 @@ from math import ceil
 from datetime import datetime
 
 from fastapi import Request
+from fastapi.responses import JSONResponse
 
 from ...common.modules.db.models import Member
 from ...common.modules.audit import audit_log
+from ...common.modules.export import ExportPayload, export_job_manager
 from ..user.dependencies import get_current_active_user_compat as get_current_active_user, get_current_admin_user, get_current_user_optional
 from .service import ProjectService
 from .schemas import (
@@ -21,6 +23,7 @@ from .schemas import (
     ProjectResponse,
     ProjectListItem,
     ProjectListQuery,
+    ProjectStatus,
     ProjectListResponsePaginated,
     ProjectApplicationCreate,
     ProjectApplicationResponse,
@@ -47,15 +50,16 @@ service = ProjectService()
 async def list_projects(
     page: Annotated[int, Query(ge=1)] = 1,
     page_size: Annotated[int, Query(ge=1, le=1000)] = 20,
-    status: Optional[str] = Query(None, description="Filter by status"),
+    status: Optional[ProjectStatus] = Query(None, description="Filter by status"),
+    search: Optional[str] = Query(None, description="Search in title and description"),
     request: Request = None,
 ):
     """
     List all projects with pagination (public access).
-    Data formatting is handled by schemas.
+    Filtering and paging happen in the database; data formatting is handled by schemas.
     """
-    # Use service method that supports pagination
-    projects, total = await service.list_projects_paginated(page, page_size, status)
+    query = ProjectListQuery(page=page, page_size=page_size, status=status, search=search)
+    projects, total = await service.list_projects(query)
 
     # Use schema to format data
     return ProjectListResponsePaginated(
@@ -248,12 +252,26 @@ async def list_projects_admin(
     return ProjectListResponsePaginated(
         items=[ProjectListItem.from_db_dict(p, include_admin_fields=True) for p in projects],
         total=total,
-        page=1,
-        page_size=total if total > 0 else 1,
-        total_pages=1,
+        page=query.page,
+        page_size=query.page_size,
+        total_pages=ceil(total / query.page_size) if total > 0 else 0,
+    )
+
+
+async def build_projects_export(params: dict) -> ExportPayload:
+    """Build project export rows from ProjectListQuery fields."""
+    query = ProjectListQuery(**params)
+    return ExportPayload(
+        data=service.iter_projects_export_data(query),
+        sheet_name="Projects",
+        filename_prefix="projects_export",
+        title=f"Projects Export - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
     )
 
 
+export_job_manager.register("projects", build_projects_export)
+
+
 @router.get(
     "/api/admin/projects/export",
     tags=["admin-projects"],
@@ -265,12 +283,22 @@ async def export_projects(
     request: Request,
     current_admin: Annotated[Member, Depends(get_current_admin_user)],
     format: str = Query("excel", regex="^(excel|csv)$", description="Export format: excel or csv"),
+    background: bool = Query(False, description="Run as a background export job and return its progress record"),
 ):
     """
     Export projects data to Excel or CSV (admin only).
     """
     from ...common.modules.export import ExportService
     
+    if background:
+        job = await export_job_manager.submit(
+            "projects",
+            query.model_dump(mode="json"),
+            format,
+            requested_by=current_admin.get("id"),
+        )
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.to_dict())
+
     export_data = await service.export_projects_data(query)
     
     if format == "excel":
@@ -449,6 +477,27 @@ async def update_application_status(
     return ProjectApplicationResponse.model_validate(application)
 
 
+async def build_applications_export(params: dict) -> ExportPayload:
+    """
+    Build application export rows.
+
+    Args:
+        params: ApplicationListQuery fields plus optional `project_id`
+    """
+    params = dict(params)
+    project_id = params.pop("project_id", None)
+    query = ApplicationListQuery(**params)
+    return ExportPayload(
+        data=service.iter_applications_export_data(UUID(project_id) if project_id else None, query),
+        sheet_name="Applications",
+        filename_prefix="applications_export",
+        title=f"Project Applications Export - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+    )
+
+
+export_job_manager.register("applications", build_applications_export)
+
+
 @router.get(
     "/api/admin/applications/export",
     tags=["admin-projects"],
@@ -461,12 +510,23 @@ async def export_applications(
     current_admin: Annotated[Member, Depends(get_current_admin_user)],
     format: str = Query("excel", regex="^(excel|csv)$", description="Export format: excel or csv"),
     project_id: Optional[UUID] = Query(None, description="Filter by project ID"),
+    background: bool = Query(False, description="Run as a background export job and return its progress record"),
 ):
     """
     Export project applications data to Excel or CSV (admin only).
     """
     from ...common.modules.export import ExportService
     
+    if background:
+        params = {
+            **query.model_dump(mode="json"),
+            "project_id": str(project_id) if project_id else None,
+        }
+        job = await export_job_manager.submit(
+            "applications", params, format, requested_by=current_admin.get("id")
+        )
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.to_dict())
+
     export_data = await service.export_applications_data(project_id, query)
     
     if format == "excel":
@@ -4,11 +4,12 @@ Project service.
 Business logic for project and application management operations.
 """
 from uuid import UUID, uuid4
-from typing import Optional
+from typing import AsyncIterator, Optional
 from datetime import datetime
 
 from ...common.modules.db.models import Project, ProjectApplication  # 保留用于类型提示和文档
 from ...common.modules.supabase.service import supabase_service
+from ...common.modules.supabase.view_counter import view_counter
 from ...common.modules.exception import NotFoundError, ValidationError, ErrorCode, CMessageTemplate
 from .schemas import (
     ProjectCreate,
@@ -35,38 +36,19 @@ class ProjectService:
             query: Query parameters
 
         Returns:
-            Tuple of (projects list, total count)
+            Tuple of (projects list for the page, total count)
         """
         projects, total = await supabase_service.list_projects_with_filters(
+            page=query.page,
+            page_size=query.page_size,
+            status=query.status.value if query.status else None,
+            search=query.search,
             sort_by="created_at",
             sort_order="desc",
         )
+        view_counter.merge('projects', projects)
         return projects, total
     
-    async def list_projects_paginated(
-        self, page: int = 1, page_size: int = 20, status: Optional[str] = None
-    ) -> tuple[list[dict], int]:
-        """
-        List projects with pagination (public access).
-
-        Args:
-            page: Page number (1-indexed)
-            page_size: Items per page
-            status: Optional status filter
-
-        Returns:
-            Tuple of (projects list, total count)
-        """
-        return await supabase_service.list_with_pagination(
-            table='projects',
-            page=page,
-            page_size=page_size,
-            order_by='created_at',
-            order_desc=True,
-            exclude_deleted=True,
-            filters={'status': status} if status else None
-        )
-    
     async def get_latest_project(self) -> Optional[dict]:
         """
         Get latest project for homepage.
@@ -94,12 +76,17 @@ class ProjectService:
             query: Query parameters
 
         Returns:
-            Tuple of (projects list, total count)
+            Tuple of (projects list for the page, total count)
         """
         projects, total = await supabase_service.list_projects_with_filters(
+            page=query.page,
+            page_size=query.page_size,
+            status=query.status.value if query.status else None,
+            search=query.search,
             sort_by="created_at",
             sort_order="desc",
         )
+        view_counter.merge('projects', projects)
         return projects, total
 
     async def get_project_by_id(
@@ -124,16 +111,11 @@ class ProjectService:
         if not project:
             raise NotFoundError(resource_type="Project")
 
-        # Increment view count if requested
+        # Increment view count if requested (write-behind, flushed in batches)
         if increment_view:
-            current_count = project.get('view_count', 0)
-            await supabase_service.update_record(
-                'projects',
-                str(project_id),
-                {'view_count': current_count + 1}
-            )
-            project['view_count'] = current_count + 1
+            view_counter.increment('projects', str(project_id))
         
+        project['view_count'] = view_counter.merge_one('projects', project)
         return project
 
     async def apply_to_project(
@@ -505,39 +487,43 @@ class ProjectService:
         Returns:
             List of project records as dictionaries
         """
-        projects = await supabase_service.export_projects(
+        export_data = []
+        async for chunk in self.iter_projects_export_data(query):
+            export_data.extend(chunk)
+        return export_data
+
+    async def iter_projects_export_data(
+        self, query: ProjectListQuery
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Yield project export rows one fetched chunk at a time.
+
+        Used by background export jobs, which write each chunk as it arrives.
+        """
+        chunks = supabase_service.iter_projects_export(
             status=query.status.value if query.status else None,
             search=query.search,
         )
-
-        # Get application counts for each project - use direct client for complex query
-        export_data = []
-        for project in projects:
-            # Get application count for this project
-            app_count_result = supabase_service.client.table('project_applications')\
-                .select('*', count='exact')\
-                .eq('project_id', str(project["id"]))\
-                .is_('deleted_at', 'null')\
-                .execute()
-            app_count = app_count_result.count or 0
-
-            export_data.append({
-                "id": str(project["id"]),
-                "title": project["title"],
-                "description": project["description"],
-                "target_company_name": project["target_company_name"],
-                "target_business_number": project["target_business_number"],
-                "start_date": project.get("start_date"),
-                "end_date": project.get("end_date"),
-                "image_url": project.get("image_url"),
-                "status": project["status"],
-                "attachments": project.get("attachments", []),
-                "applications_count": app_count,
-                "created_at": project.get("created_at"),
-                "updated_at": project.get("updated_at"),
-            })
-
-        return export_data
+        async for projects in chunks:
+            # applications_count is maintained on the project row
+            yield [
+                {
+                    "id": str(project["id"]),
+                    "title": project["title"],
+                    "description": project["description"],
+                    "target_company_name": project["target_company_name"],
+                    "target_business_number": project["target_business_number"],
+                    "start_date": project.get("start_date"),
+                    "end_date": project.get("end_date"),
+                    "image_url": project.get("image_url"),
+                    "status": project["status"],
+                    "attachments": project.get("attachments", []),
+                    "applications_count": project.get("applications_count") or 0,
+                    "created_at": project.get("created_at"),
+                    "updated_at": project.get("updated_at"),
+                }
+                for project in projects
+            ]
 
     async def export_applications_data(
         self, project_id: Optional[UUID], query: ApplicationListQuery
@@ -552,32 +538,39 @@ class ProjectService:
         Returns:
             List of application records as dictionaries
         """
-        applications = await supabase_service.export_project_applications(
+        export_data = []
+        async for chunk in self.iter_applications_export_data(project_id, query):
+            export_data.extend(chunk)
+        return export_data
+
+    async def iter_applications_export_data(
+        self, project_id: Optional[UUID], query: ApplicationListQuery
+    ) -> AsyncIterator[list[dict]]:
+        """Yield application export rows one fetched chunk at a time."""
+        chunks = supabase_service.iter_project_applications_export(
             project_id=str(project_id) if project_id else None,
             status=query.status.value if query.status else None,
         )
-
-        # Convert to dict format for export
-        export_data = []
-        for application in applications:
-            # Get project and member info - use helper methods
-            project = await supabase_service.get_by_id('projects', str(application["project_id"]))
-            member = await supabase_service.get_by_id('members', str(application["member_id"]))
-
-            export_data.append({
-                "id": str(application["id"]),
-                "project_id": str(application["project_id"]),
-                "project_title": project["title"] if project else None,
-                "member_id": str(application["member_id"]),
-                "company_name": member["company_name"] if member else None,
-                "business_number": member["business_number"] if member else None,
-                "status": application["status"],
-                "application_reason": application.get("application_reason"),
-                "submitted_at": application.get("submitted_at"),
-                "reviewed_at": application.get("reviewed_at"),
-            })
-
-        return export_data
+        async for applications in chunks:
+            # Project and member info are embedded in each row (single joined query)
+            rows = []
+            for application in applications:
+                project = application.get("projects")
+                member = application.get("members")
+
+                rows.append({
+                    "id": str(application["id"]),
+                    "project_id": str(application["project_id"]),
+                    "project_title": project["title"] if project else None,
+                    "member_id": str(application["member_id"]),
+                    "company_name": member["company_name"] if member else None,
+                    "business_number": member["business_number"] if member else None,
+                    "status": application["status"],
+                    "application_reason": application.get("application_reason"),
+                    "submitted_at": application.get("submitted_at"),
+                    "reviewed_at": application.get("reviewed_at"),
+                })
+            yield rows
 
 # Service instance
 service = ProjectService()
\ No newline at end of file
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, Query, Response
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import JSONResponse
 from typing import List, Optional
 from .schemas import StatisticsQuery, StatisticsResponse, SortField, SortOrder, Gender
 from .service import service as statistics_service
 from ..user.dependencies import get_current_admin_user
-from ...common.modules.export.exporter import ExportService
+from ...common.modules.export import ExportService, ExportPayload, export_job_manager
 from datetime import datetime
 
 router = APIRouter(prefix="/api/admin/statistics", tags=["管理员统计接口"])
@@ -74,6 +75,30 @@ async def get_statistics_report(
         page_size=page_size
     )
 
+STATISTICS_EXPORT_HEADERS = [
+    "business_reg_no", "enterprise_name", "industry_type", 
+    "startup_stage", "policy_tags", "total_investment",
+    "patent_count", "annual_revenue", "export_amount"
+]
+
+
+async def build_statistics_export(params: dict) -> ExportPayload:
+    """构建企业统计导出数据（StatisticsQuery 字段）"""
+    query = StatisticsQuery(**params)
+    data = await statistics_service.get_export_data(query)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return ExportPayload(
+        data=data,
+        sheet_name="Enterprise Statistics",
+        filename_prefix="gangwon_stats",
+        headers=STATISTICS_EXPORT_HEADERS,
+        title=f"Gangwon Business Portal Statistics Report ({timestamp})",
+    )
+
+
+export_job_manager.register("statistics", build_statistics_export)
+
+
 @router.get("/export")
 async def export_statistics(
     year: Optional[int] = Query(None),
@@ -98,6 +123,7 @@ async def export_statistics(
 
 
     sort_order: SortOrder = Query(SortOrder.ASC),
+    background: bool = Query(False, description="Run as a background export job and return its progress record"),
     current_admin: dict = Depends(get_current_admin_user)
 ):
     """导出企业统计 Excel"""
@@ -126,19 +152,22 @@ async def export_statistics(
         sort_order=sort_order
     )
     
+    if background:
+        job = await export_job_manager.submit(
+            "statistics",
+            query.model_dump(mode="json"),
+            "excel",
+            requested_by=current_admin.get("id"),
+        )
+        return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.to_dict())
+
     data = await statistics_service.get_export_data(query)
     
-    headers = [
-        "business_reg_no", "enterprise_name", "industry_type", 
-        "startup_stage", "policy_tags", "total_investment",
-        "patent_count", "annual_revenue", "export_amount"
-    ]
-    
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     excel_content = ExportService.export_to_excel(
         data=data,
         sheet_name="Enterprise Statistics",
-        headers=headers,
+        headers=STATISTICS_EXPORT_HEADERS,
         title=f"Gangwon Business Portal Statistics Report ({timestamp})"
     )
     
@@ -116,15 +116,12 @@ async def password_reset_request(
         data.business_number, data.email
     )
 
-    # Send password reset email in background (non-blocking)
+    # Queue password reset email (delivered by the email outbox)
     from ...common.modules.email import email_service
-    from ...common.modules.email.background import send_email_background
-    send_email_background(
-        email_service.send_password_reset_email(
-            to_email=data.email,
-            reset_token=reset_token,
-            business_number=data.business_number,
-        )
+    await email_service.send_password_reset_email(
+        to_email=data.email,
+        reset_token=reset_token,
+        business_number=data.business_number,
     )
 
     return {
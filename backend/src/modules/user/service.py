@@ -168,15 +168,12 @@ class AuthService:
         if not member:
             raise ValidationError(format_operation_failed("create member"))
 
-        # Send registration confirmation email in background (non-blocking)
+        # Queue registration confirmation email (delivered by the email outbox)
         from ...common.modules.email import email_service
-        from ...common.modules.email.background import send_email_background
-        send_email_background(
-            email_service.send_registration_confirmation_email(
-                to_email=member["email"],
-                company_name=member["company_name"],
-                business_number=member["business_number"],
-            )
+        await email_service.send_registration_confirmation_email(
+            to_email=member["email"],
+            company_name=member["company_name"],
+            business_number=member["business_number"],
         )
 
         return member
@@ -0,0 +1,28 @@
+"""Shared fakes and fixtures for the unit tests."""
+import threading
+
+import pytest
+
+from src.common.modules.export import jobs as jobs_module
+
+
+class FakeStorage:
+    """Stands in for storage_service: keeps uploads in memory and records signing threads."""
+
+    def __init__(self):
+        self.uploads = {}
+        self.sign_threads = []
+
+    async def upload_bytes(self, content, bucket, path, content_type):
+        self.uploads[path] = content
+
+    def create_signed_url(self, bucket, path, expires_in=3600):
+        self.sign_threads.append(threading.current_thread())
+        return f"https://signed/{bucket}/{path}?n={len(self.sign_threads)}"
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = FakeStorage()
+    monkeypatch.setattr(jobs_module, "storage_service", fake)
+    return fake
@@ -0,0 +1,91 @@
+"""Tests for the shared job registry and rate limiter."""
+import asyncio
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from src.common.modules.background import JobRegistry, RateLimiter
+from src.common.modules.exception import NotFoundError
+
+
+@dataclass
+class FakeJob:
+    id: str
+    is_finished: bool = False
+
+
+def test_get_unknown_job_raises_not_found():
+    registry = JobRegistry("Demo job")
+
+    with pytest.raises(NotFoundError):
+        registry.get("missing")
+
+
+def test_eviction_drops_oldest_finished_records_only():
+    registry = JobRegistry("Demo job", max_jobs=2)
+    running = registry.add("running", FakeJob("running"))
+    registry.add("done-1", FakeJob("done-1", is_finished=True))
+    registry.add("done-2", FakeJob("done-2", is_finished=True))
+    registry.add("done-3", FakeJob("done-3", is_finished=True))
+
+    assert registry.get("running") is running
+    assert [job.id for job in registry.newest_first()] == ["done-3", "running"]
+
+
+def test_running_records_are_kept_beyond_capacity():
+    registry = JobRegistry("Demo job", max_jobs=1)
+    for i in range(3):
+        registry.add(str(i), FakeJob(str(i)))
+
+    assert len(registry) == 3
+
+
+async def test_spawn_tracks_tasks_until_done():
+    registry = JobRegistry("Demo job")
+    release = asyncio.Event()
+
+    registry.spawn(release.wait())
+    assert registry.running == 1
+
+    release.set()
+    assert await registry.close(timeout=1.0) == 0
+    assert registry.running == 0
+
+
+async def test_close_cancels_tasks_after_timeout():
+    registry = JobRegistry("Demo job")
+    cancelled = []
+
+    async def stuck():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    registry.spawn(stuck())
+    await asyncio.sleep(0)
+
+    assert await registry.close(timeout=0.01) == 1
+    assert cancelled == [True]
+
+
+async def test_rate_limiter_spaces_acquisitions():
+    limiter = RateLimiter(rate_per_second=50.0)
+
+    started = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+
+    # First slot is immediate, the other four are 20ms apart
+    assert time.monotonic() - started >= 0.075
+
+
+async def test_rate_limiter_unlimited_never_waits():
+    limiter = RateLimiter(rate_per_second=0)
+
+    started = time.monotonic()
+    for _ in range(100):
+        await limiter.acquire()
+
+    assert time.monotonic() - started < 0.05
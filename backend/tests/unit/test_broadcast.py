@@ -0,0 +1,104 @@
+"""Tests for broadcast fan-out notification emails."""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.common.modules.supabase import message_service as message_service_module
+from src.common.modules.supabase.message_service import message_db_service
+from src.modules.messages import broadcast as broadcast_module
+from src.modules.messages.broadcast import BroadcastEmail, BroadcastFanout, BroadcastJob
+
+
+class FakeMessageDB:
+    async def insert_messages_chunked(self, messages, chunk_size, concurrency, on_chunk):
+        for i in range(0, len(messages), chunk_size):
+            await on_chunk(messages[i:i + chunk_size])
+        return len(messages)
+
+
+class FakeEmailService:
+    def __init__(self):
+        self.calls = []
+
+    async def send_email_to_many(self, *, to_emails, subject, template_name, template_data):
+        self.calls.append((list(to_emails), subject, template_name, template_data))
+        return len(to_emails)
+
+
+@pytest.fixture
+def email_service(monkeypatch):
+    fake = FakeEmailService()
+    monkeypatch.setattr(broadcast_module, "message_db_service", FakeMessageDB())
+    monkeypatch.setattr(broadcast_module, "email_service", fake)
+    return fake
+
+
+async def test_notifications_are_queued_per_chunk_via_send_email_to_many(email_service):
+    fanout = BroadcastFanout(chunk_size=2)
+    messages = [{"id": str(i), "recipient_id": f"r{i}"} for i in range(5)]
+    recipient_emails = {"r0": "a@x.kr", "r1": "b@x.kr", "r3": "d@x.kr", "r4": "e@x.kr"}
+    email = BroadcastEmail(subject="공지", template_name="broadcast_message", template_data={"subject": "공지"})
+
+    job = fanout.start(
+        BroadcastJob(broadcast_id="b1", sender_id="s1", subject="공지", recipient_count=5),
+        messages,
+        email,
+        recipient_emails,
+    )
+    await fanout.close(timeout=1.0)
+
+    assert job.status == "completed"
+    assert job.inserted_count == 5
+    assert job.emails_queued == 4
+    assert [call[0] for call in email_service.calls] == [["a@x.kr", "b@x.kr"], ["d@x.kr"], ["e@x.kr"]]
+    assert all(call[2] == "broadcast_message" for call in email_service.calls)
+    assert fanout.get("b1") is job
+
+
+@pytest.fixture
+def chunk_inserts(monkeypatch):
+    """Records inserted chunks; `fail` maps a chunk's first id to how many more attempts of it fail."""
+    state = SimpleNamespace(inserted=[], attempts=[], fail={})
+
+    def insert(chunk):
+        first = chunk[0]["id"]
+        state.attempts.append(first)
+        if state.fail.get(first):
+            state.fail[first] -= 1
+            raise ConnectionError(f"chunk {first} failed")
+        time.sleep(0.01)
+        state.inserted.append(first)
+
+    monkeypatch.setattr(message_db_service, "_insert_messages_minimal", insert)
+    monkeypatch.setattr(message_service_module.unread_count_hub, "on_messages_created", lambda chunk: None)
+    return state
+
+
+async def test_failed_chunks_are_retried(chunk_inserts):
+    messages = [{"id": str(i)} for i in range(6)]
+    chunk_inserts.fail["2"] = 2
+
+    inserted = await message_db_service.insert_messages_chunked(messages, chunk_size=2, retry_delay=0)
+
+    assert inserted == 6
+    assert sorted(chunk_inserts.inserted) == ["0", "2", "4"]
+    assert chunk_inserts.attempts.count("2") == 3
+
+
+async def test_a_failing_chunk_cancels_the_remaining_chunks(chunk_inserts):
+    messages = [{"id": str(i)} for i in range(10)]
+    chunk_inserts.fail["0"] = 99
+    delivered = []
+
+    async def on_chunk(chunk):
+        delivered.append(chunk[0]["id"])
+
+    with pytest.raises(ConnectionError):
+        await message_db_service.insert_messages_chunked(
+            messages, chunk_size=1, concurrency=1, on_chunk=on_chunk, attempts=2, retry_delay=0
+        )
+
+    # Chunks waiting for the semaphore never start
+    assert chunk_inserts.inserted == []
+    assert delivered == []
@@ -0,0 +1,239 @@
+"""Tests for the email outbox dispatcher."""
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from src.common.modules.email import service as service_module
+from src.common.modules.email.outbox import PURGE_BATCH_SIZE, EmailOutbox, OutboxEmail
+from src.common.modules.email.service import EmailService
+
+
+class FakeQuery:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.update_data = None
+        self.filters = []
+
+    def update(self, data):
+        self.update_data = data
+        return self
+
+    def in_(self, column, values):
+        self.filters.append((column, list(values)))
+        return self
+
+    def eq(self, column, value):
+        self.filters.append((column, value))
+        return self
+
+    def execute(self):
+        self.client.updates.append((self.update_data, self.filters))
+        return SimpleNamespace(data=[])
+
+
+class FakeRpc:
+    def __init__(self, client, name, params):
+        self.client = client
+        self.name = name
+        self.params = params
+
+    def execute(self):
+        self.client.rpc_calls.append((self.name, self.params))
+        results = self.client.rpc_results[self.name]
+        return SimpleNamespace(data=results.pop(0) if results else None)
+
+
+class FakeClient:
+    def __init__(self, **rpc_results):
+        self.updates = []
+        self.rpc_calls = []
+        self.rpc_results = {"claim_email_outbox": [], "purge_email_outbox": [], **rpc_results}
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, name, params)
+
+
+class FakeEmailService:
+    def __init__(self, results):
+        self.results = results
+        self.delivered = []
+
+    async def deliver_many(self, emails, before_send=None):
+        for email in emails:
+            if before_send is not None:
+                await before_send()
+            self.delivered.append(email.to_email)
+        return [self.results.get(email.to_email, True) for email in emails]
+
+
+def outbox_row(row_id, to_email, attempts=1):
+    return {
+        "id": row_id,
+        "to_email": to_email,
+        "subject": "비밀번호 재설정 안내",
+        "template_name": "password_reset.html",
+        "context": {"reset_url": "https://portal/reset-password?token=secret"},
+        "plain_text": "https://portal/reset-password?token=secret",
+        "attempts": attempts,
+        "created_at": "2026-02-23T00:00:00+00:00",
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    fake = FakeClient()
+    monkeypatch.setattr(EmailOutbox, "client", property(lambda self: fake))
+    return fake
+
+
+@pytest.fixture
+def email_service(monkeypatch):
+    fake = FakeEmailService({"bad@x.kr": False})
+    monkeypatch.setattr(service_module, "email_service", fake)
+    return fake
+
+
+async def test_sent_rows_drop_their_content(client, email_service):
+    outbox = EmailOutbox(rate_per_second=0)
+
+    await outbox._deliver_batch([outbox_row("1", "ok@x.kr"), outbox_row("2", "bad@x.kr")])
+
+    sent_update, sent_filters = client.updates[0]
+    assert sent_update["status"] == "sent"
+    assert sent_update["context"] == {} and sent_update["plain_text"] is None
+    assert sent_filters == [("id", ["1"])]
+
+    retry_update, _ = client.updates[1]
+    assert retry_update["status"] == "pending"
+    assert "context" not in retry_update
+
+
+async def test_dead_rows_drop_their_content(client, email_service):
+    outbox = EmailOutbox(rate_per_second=0, max_attempts=2)
+
+    await outbox._deliver_batch([outbox_row("1", "bad@x.kr", attempts=2)])
+
+    dead_update, _ = client.updates[0]
+    assert dead_update["status"] == "dead"
+    assert dead_update["context"] == {} and dead_update["plain_text"] is None
+    assert outbox.get_stats()["total_dead"] == 1
+
+
+async def test_rate_limit_is_applied_per_message(client, email_service):
+    outbox = EmailOutbox(rate_per_second=1000)
+    acquired = []
+
+    async def acquire():
+        acquired.append(True)
+
+    outbox.rate_limiter.acquire = acquire
+    await outbox._deliver_batch([outbox_row(str(i), f"u{i}@x.kr") for i in range(3)])
+
+    assert len(acquired) == 3
+
+
+async def test_dispatcher_claims_delivers_and_purges(client, email_service):
+    client.rpc_results["claim_email_outbox"] = [[outbox_row("1", "ok@x.kr"), outbox_row("2", "ok2@x.kr")]]
+    client.rpc_results["purge_email_outbox"] = [0]
+    outbox = EmailOutbox(rate_per_second=0, batch_size=10, lease_seconds=120, poll_interval=0.01)
+
+    outbox.start()
+    for _ in range(100):
+        if any(name == "purge_email_outbox" for name, _ in client.rpc_calls):
+            break
+        await asyncio.sleep(0.01)
+    await outbox.close(timeout=1.0)
+
+    assert client.rpc_calls[0] == ("claim_email_outbox", {"p_limit": 10, "p_lease_seconds": 120})
+    assert sorted(email_service.delivered) == ["ok2@x.kr", "ok@x.kr"]
+    assert outbox.get_stats()["total_sent"] == 2
+
+
+async def test_purge_runs_in_batches_until_drained(client):
+    client.rpc_results["purge_email_outbox"] = [PURGE_BATCH_SIZE, PURGE_BATCH_SIZE, 3]
+    outbox = EmailOutbox(sent_retention_days=7, dead_retention_days=0)
+
+    assert await outbox.purge() == 2 * PURGE_BATCH_SIZE + 3
+
+    params = client.rpc_calls[0][1]
+    assert params["p_limit"] == PURGE_BATCH_SIZE
+    # dead_retention_days=0 keeps dead rows forever
+    assert params["p_dead_before"].startswith("1970-01-01")
+    assert len(client.rpc_calls) == 3
+
+
+async def test_purge_disabled_when_both_retentions_are_zero(client):
+    outbox = EmailOutbox(sent_retention_days=0, dead_retention_days=0)
+
+    assert await outbox.purge() == 0
+    assert client.rpc_calls == []
+
+
+class FakeSMTP:
+    def __init__(self):
+        self.sent = []
+
+    async def sendmail(self, sender, recipients, message):
+        self.sent.append(recipients[0])
+
+
+class FakePool:
+    def __init__(self):
+        self.smtp = FakeSMTP()
+
+    @asynccontextmanager
+    async def connection(self):
+        yield self.smtp
+
+
+async def test_deliver_awaits_before_send_for_every_message():
+    pool = FakePool()
+    service = EmailService(pool=pool)
+    calls = []
+
+    async def before_send():
+        calls.append(len(pool.smtp.sent))
+
+    results = await service._deliver([("a@x.kr", b"a"), ("b@x.kr", b"b")], before_send=before_send)
+
+    assert results == [True, True]
+    assert calls == [0, 1]
+
+
+def revision_email(to_email, company_name, comments="서류를 보완해 주세요"):
+    return OutboxEmail(
+        to_email=to_email,
+        subject="보완 요청",
+        template_name="revision_request.html",
+        context={"title": "보완 요청", "company_name": company_name, "record_title": "2026 지원사업", "comments": comments},
+    )
+
+
+async def test_personalized_batch_renders_the_template_once(monkeypatch):
+    service = EmailService(pool=FakePool())
+    template = service._get_template("revision_request.html")
+    render_async = template.render_async
+    renders = []
+    monkeypatch.setattr(template, "render_async", lambda **context: renders.append(context) or render_async(**context))
+    emails = [revision_email(f"u{i}@x.kr", f"<회사 {i}>") for i in range(3)]
+
+    html_bodies = await service._render_personalized(emails)
+
+    assert len(renders) == 1
+    for email, html in zip(emails, html_bodies):
+        assert html == await render_async(**email.context)
+        assert "&lt;회사" in html
+
+
+async def test_empty_personal_values_fall_back_to_per_email_renders():
+    service = EmailService(pool=FakePool())
+    emails = [revision_email("a@x.kr", "A", comments=""), revision_email("b@x.kr", "B")]
+
+    # The empty comment would flip the template's {% if comments %} test
+    assert await service._render_personalized(emails) == [None, None]
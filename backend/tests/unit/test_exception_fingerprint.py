@@ -0,0 +1,132 @@
+"""Tests for exception fingerprints and the per-window exception aggregator."""
+import asyncio
+
+import pytest
+
+from src.common.modules.exception._03_impls import impl_aggregator
+from src.common.modules.exception._03_impls.impl_aggregator import ExceptionAggregator
+from src.common.modules.exception._08_utils.helper_fingerprint import (
+    compute_fingerprint,
+    extract_top_frames,
+    normalize_message,
+)
+from src.common.modules.logger.schemas import ErrorLogCreate
+
+PYTHON_TRACE = """Traceback (most recent call last):
+  File "/app/src/modules/user/router.py", line 12, in get_user
+    return await service.get_user(user_id)
+  File "/app/src/modules/user/service.py", line 42, in get_user
+    raise NotFoundError(f"User {user_id} not found")
+"""
+
+
+@pytest.fixture
+def written(monkeypatch):
+    logs = []
+
+    async def error(schema, count_in_rollups=True):
+        logs.append(dict(schema.error_details))
+
+    monkeypatch.setattr(impl_aggregator.logging_service, "error", error)
+    monkeypatch.setattr(impl_aggregator.log_rollups, "record_schema", lambda log_type, schema: None)
+    return logs
+
+
+def make_schema(message="User 42 not found", trace_id="trace-1"):
+    return ErrorLogCreate(error_type="NotFoundError", error_message=message, trace_id=trace_id)
+
+
+def add(aggregator, schema):
+    fingerprint, template, frames = compute_fingerprint("backend", schema.error_type, schema.error_message, PYTHON_TRACE)
+    return aggregator.add(schema, fingerprint, template, frames)
+
+
+def test_message_template_replaces_variable_parts():
+    assert normalize_message(
+        "User 1b9d6bcd-bbfd-4b2d-9b5d-ab8dfbbd4bed (a@b.com) failed 3 times at 'x' https://host/p?q=1"
+    ) == "User <uuid> (<email>) failed <n> times at '<str>' <url>"
+
+
+def test_frames_are_innermost_first_without_line_numbers_or_bundle_hashes():
+    assert extract_top_frames(PYTHON_TRACE) == ["user/service.py:get_user", "user/router.py:get_user"]
+    js_stack = "TypeError: x is undefined\n    at fetchData (https://host/assets/index-3f9a1c.js:10:5)"
+    assert extract_top_frames(js_stack) == ["assets/index.js:fetchData"]
+
+
+def test_fingerprint_is_stable_across_occurrences_and_differs_by_type():
+    first, template, frames = compute_fingerprint("backend", "NotFoundError", "User 42 not found", PYTHON_TRACE)
+    second, _, _ = compute_fingerprint("backend", "NotFoundError", "User 7 not found", PYTHON_TRACE.replace("42", "57"))
+    other_type, _, _ = compute_fingerprint("backend", "ValueError", "User 42 not found", PYTHON_TRACE)
+    other_source, _, _ = compute_fingerprint("frontend", "NotFoundError", "User 42 not found", PYTHON_TRACE)
+
+    assert first == second
+    assert len({first, other_type, other_source}) == 3
+    assert template == "User <n> not found"
+    assert frames[0] == "user/service.py:get_user"
+
+
+def test_window_writes_one_log_per_fingerprint(written):
+    aggregator = ExceptionAggregator(max_sample_trace_ids=2)
+    merged = []
+    aggregator._apply = merged.extend
+
+    async def scenario():
+        for i in range(5):
+            await add(aggregator, make_schema(f"User {i} not found", trace_id=f"trace-{i % 3}"))
+        assert written == []
+        await aggregator.close()
+
+    asyncio.run(scenario())
+
+    assert len(written) == 1
+    assert written[0]["occurrences"] == 5
+    assert written[0]["sample_trace_ids"] == ["trace-0", "trace-1"]
+    assert [row["count"] for row in merged] == [5]
+    assert merged[0]["fingerprint"] == written[0]["fingerprint"]
+    assert aggregator.get_stats()["total_occurrences"] == 5
+
+
+def test_fingerprints_beyond_the_limit_are_written_unaggregated(written):
+    aggregator = ExceptionAggregator(max_fingerprints=1)
+    aggregator._apply = lambda rows: None
+
+    async def scenario():
+        await add(aggregator, make_schema())
+        await add(aggregator, ErrorLogCreate(error_type="ValueError", error_message="bad"))
+        assert len(written) == 1 and "occurrences" not in written[0]
+        await aggregator.close()
+
+    asyncio.run(scenario())
+
+    assert len(written) == 2
+    assert aggregator.get_stats()["total_unaggregated"] == 1
+
+
+def test_disabled_aggregator_writes_every_occurrence(written):
+    aggregator = ExceptionAggregator(enabled=False)
+
+    async def scenario():
+        await add(aggregator, make_schema())
+        await add(aggregator, make_schema())
+
+    asyncio.run(scenario())
+
+    assert len(written) == 2
+    assert aggregator.get_stats()["pending_fingerprints"] == 0
+
+
+def test_failed_fingerprint_merge_keeps_the_error_logs(written):
+    aggregator = ExceptionAggregator()
+
+    def fail(rows):
+        raise ConnectionError("connection refused")
+
+    aggregator._apply = fail
+
+    async def scenario():
+        await add(aggregator, make_schema())
+        return await aggregator.flush()
+
+    assert asyncio.run(scenario()) == 1
+    assert len(written) == 1
+    assert aggregator.get_stats()["total_store_errors"] == 1
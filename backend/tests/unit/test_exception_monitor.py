@@ -0,0 +1,128 @@
+"""Tests for the ring-buffer exception monitor and its sliding alert window."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from src.common.modules.exception._01_contracts.d_exception_record import DExceptionRecord
+from src.common.modules.exception._03_impls import impl_monitor
+from src.common.modules.exception._03_impls.impl_monitor import ExceptionMonitor
+
+START_MINUTE = int(datetime(2026, 10, 18, 9, 0, tzinfo=timezone.utc).timestamp()) // 60
+
+
+def make_record(minute, level="ERROR", exception_type="ValueError"):
+    return DExceptionRecord(
+        id=uuid4(),
+        source="backend",
+        level=level,
+        layer="Service",
+        message="boom",
+        exception_type=exception_type,
+        created_at=datetime.fromtimestamp(minute * 60, timezone.utc),
+    )
+
+
+def make_monitor(window_minutes=10, error_threshold=3, critical_threshold=2):
+    monitor = ExceptionMonitor()
+    monitor.now = START_MINUTE
+    monitor._current_minute = lambda: monitor.now
+    monitor.set_thresholds(
+        critical_threshold=critical_threshold,
+        error_threshold=error_threshold,
+        window_minutes=window_minutes,
+    )
+    return monitor
+
+
+def test_stats_are_grouped_by_utc_hour_and_type():
+    monitor = ExceptionMonitor()
+    now = datetime.now(timezone.utc)
+    for level, exception_type in (("ERROR", "ValueError"), ("ERROR", "ValueError"), ("CRITICAL", "KeyError")):
+        record = make_record(0, level, exception_type)
+        record.created_at = now
+        monitor.update_stats(record)
+    record = make_record(0)
+    record.created_at = now - timedelta(hours=1)
+    monitor.update_stats(record)
+
+    stats = monitor.get_stats(hours=2)
+
+    assert (stats.total_count, stats.error_count, stats.critical_count) == (4, 3, 1)
+    assert stats.by_type == {"ValueError": 3, "KeyError": 1}
+    assert stats.by_hour == {
+        now.strftime("%Y-%m-%d-%H"): 3,
+        (now - timedelta(hours=1)).strftime("%Y-%m-%d-%H"): 1,
+    }
+    assert stats.top_errors[0] == {"type": "ValueError", "count": 3}
+    assert monitor.get_stats(hours=1000).total_count == 4
+
+
+def test_reused_slot_is_reset_and_records_older_than_the_ring_are_ignored():
+    monitor = make_monitor()
+    monitor.update_stats(make_record(START_MINUTE))
+
+    # The same slot one full ring later
+    later = START_MINUTE + monitor.BUCKET_COUNT
+    monitor.now = later
+    monitor.update_stats(make_record(later, exception_type="KeyError"))
+    monitor.update_stats(make_record(START_MINUTE))
+
+    slot = later % monitor.BUCKET_COUNT
+    assert monitor._bucket_minutes[slot] == later
+    assert monitor._bucket_totals[slot] == 1
+    assert monitor._bucket_types[slot] == {"KeyError": 1}
+
+
+def test_sliding_window_subtracts_minutes_that_leave_it():
+    monitor = make_monitor(window_minutes=10)
+    monitor.update_stats(make_record(START_MINUTE))
+    monitor.now += 5
+    monitor.update_stats(make_record(monitor.now))
+    monitor.update_stats(make_record(monitor.now, level="CRITICAL"))
+    assert (monitor._window_errors, monitor._window_criticals) == (2, 1)
+
+    monitor.now = START_MINUTE + 10
+    monitor._advance_window(monitor.now)
+    assert (monitor._window_errors, monitor._window_criticals) == (1, 1)
+
+    monitor.now = START_MINUTE + 30
+    monitor._advance_window(monitor.now)
+    assert (monitor._window_errors, monitor._window_criticals) == (0, 0)
+
+
+def test_changing_the_window_recounts_it():
+    monitor = make_monitor(window_minutes=10)
+    monitor.update_stats(make_record(START_MINUTE))
+    monitor.now += 20
+    monitor.update_stats(make_record(monitor.now))
+    assert monitor._window_errors == 1
+
+    monitor.set_thresholds(window_minutes=60)
+
+    assert monitor._window_errors == 2
+
+
+def test_threshold_alert_fires_once_per_window(monkeypatch):
+    alerts = []
+
+    async def app(schema):
+        alerts.append(schema.message)
+
+    monkeypatch.setattr(impl_monitor.logging_service, "app", app)
+    monitor = make_monitor(window_minutes=10, error_threshold=3)
+
+    async def record(count):
+        for _ in range(count):
+            item = make_record(monitor.now)
+            monitor.update_stats(item)
+            await monitor.check_alerts(item)
+
+    asyncio.run(record(2))
+    assert alerts == []
+    asyncio.run(record(5))
+    assert len(alerts) == 1
+    assert "last 10 minutes: 3" in alerts[0]
+
+    monitor.now += 10
+    asyncio.run(record(3))
+    assert len(alerts) == 2
@@ -0,0 +1,41 @@
+"""Tests for the write-only Excel export."""
+import io
+from datetime import datetime
+
+from openpyxl import load_workbook
+
+from src.common.modules.export.exporter import ExportService, EXCEL_MAX_COLUMN_WIDTH
+
+
+def _load(content: bytes):
+    return load_workbook(io.BytesIO(content)).active
+
+
+def test_write_only_export_matches_regular_workbook_values():
+    data = [
+        {"name": "Alpha", "created_at": datetime(2026, 1, 2, 3, 4, 5), "tags": ["a", "b"], "note": None},
+        {"name": "Beta", "created_at": datetime(2026, 2, 3, 4, 5, 6), "tags": [], "note": "x"},
+    ]
+    streamed = _load(ExportService.export_to_excel(data, sheet_name="S", title="Report"))
+    regular = _load(ExportService.export_to_excel(data, sheet_name="S", title="Report", write_only=False))
+
+    assert [list(r) for r in streamed.iter_rows(values_only=True)] == [
+        list(r) for r in regular.iter_rows(values_only=True)
+    ]
+    rows = list(streamed.iter_rows(values_only=True))
+    assert rows[0][0] == "Report"
+    assert rows[1] == ("name", "created_at", "tags", "note")
+    assert rows[2] == ("Alpha", "2026-01-02 03:04:05", "['a', 'b']", None)
+    assert "A1:D1" in {str(r) for r in streamed.merged_cells.ranges}
+
+
+def test_column_widths_are_measured_and_capped():
+    data = [{"short": "x", "long": "y" * 200}]
+    ws = _load(ExportService.export_to_excel(data))
+    assert ws.column_dimensions["A"].width == len("short") + 2
+    assert ws.column_dimensions["B"].width == EXCEL_MAX_COLUMN_WIDTH
+
+
+def test_empty_data_produces_valid_workbook():
+    ws = _load(ExportService.export_to_excel([]))
+    assert ws.max_row == 1 and ws["A1"].value is None
@@ -0,0 +1,60 @@
+"""Tests for background export jobs."""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.common.modules.exception import NotFoundError, ValidationError
+from src.common.modules.export.jobs import ExportJobManager, ExportJobStatus, ExportPayload
+
+
+@pytest.fixture
+def manager():
+    manager = ExportJobManager(workers=1, bucket="private-files", url_expires_in=60)
+
+    async def producer(params):
+        return ExportPayload(data=[{"a": i} for i in range(params["rows"])], sheet_name="S", filename_prefix="demo")
+
+    manager.register("demo", producer)
+    return manager
+
+
+async def test_run_uploads_and_signs(manager, storage):
+    job = await manager.run("demo", {"rows": 3}, "csv")
+
+    assert job.status == ExportJobStatus.COMPLETED
+    assert job.row_count == 3
+    assert storage.uploads[job.file_path].decode("utf-8").splitlines()[0].lstrip("﻿") == "a"
+    assert job.download_url.endswith("?n=1")
+
+
+async def test_get_resigns_expired_url_off_the_event_loop(manager, storage):
+    job = await manager.run("demo", {"rows": 1}, "excel")
+    job.url_expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+    refreshed = await manager.get(job.id)
+
+    assert refreshed.download_url.endswith("?n=2")
+    assert refreshed.url_expires_at > datetime.now(timezone.utc)
+    assert storage.sign_threads[-1] is not threading.main_thread()
+
+
+async def test_get_does_not_resign_valid_url(manager, storage):
+    job = await manager.run("demo", {"rows": 1}, "excel")
+    await manager.get(job.id)
+    assert len(storage.sign_threads) == 1
+
+
+async def test_unknown_job_and_kind_are_rejected(manager, storage):
+    with pytest.raises(NotFoundError):
+        await manager.get("missing")
+    with pytest.raises(ValidationError):
+        await manager.submit("nope", {})
+
+
+async def test_submitted_job_runs_in_background_worker(manager, storage):
+    job = await manager.submit("demo", {"rows": 2}, "csv")
+    assert job.status == ExportJobStatus.QUEUED
+    await manager._queue.join()
+    assert job.status == ExportJobStatus.COMPLETED
+    await manager.close()
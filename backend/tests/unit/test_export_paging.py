@@ -0,0 +1,120 @@
+"""Tests for chunked export reads and streaming export writes."""
+import io
+import threading
+
+import pytest
+from openpyxl import load_workbook
+
+from src.common.modules.export.exporter import CsvStreamWriter, ExportService
+from src.common.modules.export.jobs import ExportJobManager, ExportJobStatus, ExportPayload
+from src.common.modules.supabase.service import SupabaseService
+
+
+class FakeQuery:
+    """Mimics the postgrest builder: range() adds params to the same builder."""
+
+    def __init__(self, rows, calls):
+        self.rows = rows
+        self.calls = calls
+        self.params = []
+
+    def range(self, start, end):
+        self.params += [("offset", start), ("limit", end - start + 1)]
+        return self
+
+    def execute(self):
+        self.calls.append((list(self.params), threading.current_thread()))
+        offsets = [value for key, value in self.params if key == "offset"]
+        limits = [value for key, value in self.params if key == "limit"]
+        assert len(offsets) == 1, "range() applied twice to one builder"
+        data = self.rows[offsets[0]:offsets[0] + limits[0]]
+        return type("Result", (), {"data": data})()
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+async def test_iter_export_chunks_builds_a_fresh_query_per_chunk():
+    rows = [{"id": i} for i in range(5)]
+    calls = []
+    service = SupabaseService.__new__(SupabaseService)
+
+    chunks = await collect(service.iter_export_chunks(lambda: FakeQuery(rows, calls), chunk_size=2))
+
+    assert chunks == [rows[0:2], rows[2:4], rows[4:5]]
+    assert [params for params, _ in calls] == [
+        [("offset", 0), ("limit", 2)],
+        [("offset", 2), ("limit", 2)],
+        [("offset", 4), ("limit", 2)],
+    ]
+    assert all(thread is not threading.main_thread() for _, thread in calls)
+
+
+async def test_iter_export_chunks_stops_after_exact_multiple():
+    rows = [{"id": i} for i in range(4)]
+    calls = []
+    service = SupabaseService.__new__(SupabaseService)
+
+    chunks = await collect(service.iter_export_chunks(lambda: FakeQuery(rows, calls), chunk_size=2))
+
+    assert chunks == [rows[0:2], rows[2:4]]
+    # The empty third page ends the iteration
+    assert len(calls) == 3
+
+
+def test_csv_stream_writer_matches_in_memory_export():
+    data = [{"a": 1, "b": None}, {"a": 2, "b": "x"}, {"a": 3, "b": "y"}]
+    output = io.BytesIO()
+    writer = CsvStreamWriter(output)
+    writer.write_rows(data[:2])
+    writer.write_rows(data[2:])
+    writer.close()
+
+    assert output.getvalue().decode("utf-8") == ExportService.export_to_csv(data)
+    assert writer.row_count == 3
+
+
+@pytest.fixture
+def manager():
+    manager = ExportJobManager(workers=1)
+
+    async def chunked_producer(params):
+        async def chunks():
+            for start in range(0, params["rows"], 2):
+                yield [{"n": i, "label": f"row {i}"} for i in range(start, min(start + 2, params["rows"]))]
+
+        return ExportPayload(data=chunks(), sheet_name="S", filename_prefix="demo", title="Demo")
+
+    manager.register("chunked", chunked_producer)
+    return manager
+
+
+async def test_chunked_payload_is_streamed_to_excel(manager, storage):
+    job = await manager.run("chunked", {"rows": 5}, "excel")
+
+    assert job.status == ExportJobStatus.COMPLETED
+    assert job.row_count == 5
+    sheet = load_workbook(io.BytesIO(storage.uploads[job.file_path])).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0][0] == "Demo"
+    assert rows[1] == ("n", "label")
+    assert [row[0] for row in rows[2:]] == [0, 1, 2, 3, 4]
+
+
+async def test_chunked_payload_is_streamed_to_csv(manager, storage):
+    job = await manager.run("chunked", {"rows": 3}, "csv")
+
+    content = storage.uploads[job.file_path].decode("utf-8")
+    assert content == ExportService.export_to_csv([{"n": i, "label": f"row {i}"} for i in range(3)])
+    assert job.row_count == 3
+
+
+async def test_empty_chunked_payload_produces_empty_files(manager, storage):
+    excel_job = await manager.run("chunked", {"rows": 0}, "excel")
+    csv_job = await manager.run("chunked", {"rows": 0}, "csv")
+
+    assert excel_job.status == csv_job.status == ExportJobStatus.COMPLETED
+    assert excel_job.row_count == csv_job.row_count == 0
+    assert storage.uploads[csv_job.file_path] == b""
+    load_workbook(io.BytesIO(storage.uploads[excel_job.file_path]))
@@ -0,0 +1,70 @@
+"""Tests for the health module's admin check and prober reconfiguration."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.common.modules.health import adapter
+from src.common.modules.health.prober import HealthProber
+from src.common.modules.health.service import HealthService
+from src.modules.user import dependencies
+
+
+@pytest.fixture
+def token_user(monkeypatch):
+    user = {}
+
+    async def bearer(request):
+        return SimpleNamespace(credentials="token")
+
+    async def get_current_user_optional(credentials):
+        return dict(user) if user else None
+
+    monkeypatch.setattr(adapter, "_bearer", bearer)
+    monkeypatch.setattr(dependencies, "get_current_user_optional", get_current_user_optional)
+    return user
+
+
+@pytest.mark.parametrize(
+    ("user", "expected"),
+    [
+        ({"role": "admin", "is_active": "true"}, True),
+        ({"role": "admin", "is_active": "false"}, False),
+        ({"role": "admin"}, False),
+        ({"role": "member", "is_active": "true"}, False),
+        ({}, False),
+    ],
+)
+def test_only_active_admins_count_as_admin(token_user, user, expected):
+    token_user.update(user)
+
+    assert asyncio.run(adapter.is_admin_request(SimpleNamespace())) is expected
+
+
+def test_configure_stops_the_running_prober(monkeypatch):
+    monkeypatch.setattr(HealthService, "_prober", None)
+    monkeypatch.setattr(HealthService, "_config", None)
+    monkeypatch.setattr(HealthService, "_db_session_factory", None)
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def check():
+            started.set()
+            await asyncio.sleep(3600)
+
+        prober = HealthProber()
+        prober.register("slow", check, interval=60)
+        prober.start()
+        HealthService._prober = prober
+        await started.wait()
+        tasks = list(prober._tasks.values())
+
+        HealthService.configure()
+        await asyncio.sleep(0)
+
+        assert HealthService._prober is None
+        assert all(task.cancelled() for task in tasks)
+        assert prober.get_stats()["running"] is False
+
+    asyncio.run(scenario())
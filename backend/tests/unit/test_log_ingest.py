@@ -0,0 +1,126 @@
+"""Tests for frontend log ingestion: rate limiting and client keys."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from starlette.datastructures import Headers
+
+from src.common.modules.exception import RateLimitError
+from src.common.modules.logger import ingest as ingest_module
+from src.common.modules.logger import router as router_module
+from src.common.modules.logger.ingest import ClientRateLimiter, FrontendLogIngestor
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ingest_module.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def writers(monkeypatch):
+    written = []
+    monkeypatch.setattr(ingest_module.file_log_writer, "write_many", lambda log_type, rows: None)
+    monkeypatch.setattr(
+        ingest_module.db_log_writer, "enqueue_many", lambda log_type, rows: written.extend(rows)
+    )
+    monkeypatch.setattr(ingest_module.log_rollups, "record", lambda *args, **kwargs: None)
+    return written
+
+
+def entries(count):
+    return [{"timestamp": "2026-10-18 09:00:00.000", "level": "INFO", "message": f"entry {i}"} for i in range(count)]
+
+
+def test_bucket_grants_burst_then_refills_at_rate(clock):
+    limiter = ClientRateLimiter(rate_per_second=10, burst=20)
+
+    assert limiter.acquire("a", 15) == 15
+    assert limiter.acquire("a", 15) == 5
+    assert limiter.acquire("a", 1) == 0
+
+    clock.now += 0.5
+    assert limiter.acquire("a", 15) == 5
+    clock.now += 60
+    assert limiter.acquire("a", 100) == 20
+
+
+def test_buckets_are_per_key_and_least_recently_used_are_evicted(clock):
+    limiter = ClientRateLimiter(rate_per_second=1, burst=2, max_clients=2)
+
+    assert limiter.acquire("a", 2) == 2
+    assert limiter.acquire("b", 2) == 2
+    assert limiter.acquire("a", 1) == 0
+    limiter.acquire("c", 1)
+
+    assert list(limiter._buckets) == ["a", "c"]
+
+
+def test_zero_rate_is_unlimited():
+    limiter = ClientRateLimiter(rate_per_second=0, burst=1)
+
+    assert limiter.acquire("a", 10000) == 10000
+    assert limiter.retry_after() == 0
+
+
+def test_ingest_drops_entries_beyond_the_bucket_and_rejects_empty_buckets(clock, writers):
+    ingestor = FrontendLogIngestor(rate_per_second=1, burst=3)
+
+    result = ingestor.ingest(entries(5), client_key="10.0.0.1")
+    assert (result["processed"], result["dropped"]) == (3, 2)
+    assert len(writers) == 3
+
+    with pytest.raises(RateLimitError) as exc_info:
+        ingestor.ingest(entries(1), client_key="10.0.0.1")
+    assert exc_info.value.retry_after == 1
+    assert ingestor.get_stats()["total_rate_limited_requests"] == 1
+
+    # Another client has its own bucket
+    assert ingestor.ingest(entries(1), client_key="10.0.0.2")["processed"] == 1
+
+
+def make_request(host, forwarded_for=()):
+    headers = Headers(raw=[(b"x-forwarded-for", value.encode()) for value in forwarded_for])
+    return SimpleNamespace(client=SimpleNamespace(host=host) if host else None, headers=headers)
+
+
+def test_client_key_is_the_hop_appended_by_the_trusted_proxy():
+    ingestor = FrontendLogIngestor(trusted_proxies=1)
+
+    # Render appends the real client after whatever the client sent
+    assert ingestor.client_key(make_request("10.0.0.9", ["198.51.100.1, 203.0.113.7"])) == "203.0.113.7"
+    assert ingestor.client_key(make_request("10.0.0.9", ["198.51.100.1", "203.0.113.7"])) == "203.0.113.7"
+    assert ingestor.client_key(make_request("203.0.113.7")) == "203.0.113.7"
+    assert ingestor.client_key(make_request(None)) == "unknown"
+
+    two_proxies = FrontendLogIngestor(trusted_proxies=2)
+    assert two_proxies.client_key(make_request("10.0.0.9", ["1.1.1.1, 203.0.113.7, 10.0.0.8"])) == "203.0.113.7"
+    assert FrontendLogIngestor(trusted_proxies=0).client_key(
+        make_request("10.0.0.9", ["203.0.113.7"])
+    ) == "10.0.0.9"
+
+
+def test_endpoint_rate_limits_on_the_client_key(monkeypatch):
+    keys = []
+
+    async def read_entries(request):
+        return entries(1)
+
+    monkeypatch.setattr(router_module.frontend_log_ingestor, "read_entries", read_entries)
+    monkeypatch.setattr(router_module.frontend_log_ingestor, "trusted_proxies", 1)
+    monkeypatch.setattr(
+        router_module.frontend_log_ingestor, "ingest", lambda batch, client_key: keys.append(client_key)
+    )
+
+    asyncio.run(router_module.create_frontend_log(make_request("10.0.0.9", ["198.51.100.1, 203.0.113.7"])))
+
+    assert keys == ["203.0.113.7"]
@@ -0,0 +1,174 @@
+"""Tests for log partition maintenance, the retention manager and partitioned index builds.
+
+The migration tests run against Postgres: set TEST_DATABASE_URL to a
+disposable database (the log tables in it are dropped and recreated).
+"""
+import asyncio
+import importlib.util
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+from src.common.modules.logger import retention as retention_module
+from src.common.modules.logger.retention import LOG_TABLES, LogRetentionManager
+
+VERSIONS = Path(__file__).resolve().parents[2] / "alembic" / "versions"
+PARTITION_MIGRATION = "20260215090000_partition_log_tables.py"
+KEYSET_MIGRATION = "20260217090000_add_log_keyset_indexes.py"
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL", "")
+
+
+def test_run_once_passes_retention_per_table(monkeypatch):
+    monkeypatch.setattr(retention_module.settings, "LOG_RETENTION_DAYS", 90)
+    monkeypatch.setattr(retention_module.settings, "LOG_AUDIT_RETENTION_DAYS", 365)
+    monkeypatch.setattr(retention_module.settings, "LOG_ROLLUP_RETENTION_DAYS", 400)
+    calls = []
+    manager = LogRetentionManager(months_ahead=0)
+    manager._apply = lambda params: calls.append(params) or {
+        "created": ["app_logs_p202611"],
+        "dropped": [],
+        "moved_from_default": 3,
+    }
+
+    result = asyncio.run(manager.run_once())
+
+    assert result["created"] == ["app_logs_p202611"]
+    assert calls == [{
+        "p_retention_days": {
+            "app_logs": 90,
+            "error_logs": 90,
+            "performance_logs": 90,
+            "system_logs": 90,
+            "audit_logs": 365,
+        },
+        # At least one month ahead is always kept
+        "p_months_ahead": 1,
+        "p_rollup_retention_days": 400,
+    }]
+    assert set(calls[0]["p_retention_days"]) == set(LOG_TABLES.values())
+    stats = manager.get_stats()
+    assert (stats["total_runs"], stats["partitions_created"], stats["partitions_dropped"]) == (1, 1, 0)
+    assert stats["rows_moved_from_default"] == 3
+
+
+def test_retention_start_covers_partially_expired_partitions(monkeypatch):
+    monkeypatch.setattr(retention_module.settings, "LOG_RETENTION_DAYS", 0)
+    assert retention_module.retention_start("app") is None
+
+    monkeypatch.setattr(retention_module.settings, "LOG_AUDIT_RETENTION_DAYS", 30)
+    start = retention_module.retention_start("audit")
+    assert abs(datetime.now(timezone.utc) - timedelta(days=61) - start) < timedelta(seconds=5)
+
+
+def reset_log_tables(conn):
+    for table in LOG_TABLES.values():
+        conn.execute(sa.text(f"DROP TABLE IF EXISTS {table}, {table}_p_legacy CASCADE"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS maintain_log_partitions(jsonb, integer, integer)"))
+    conn.execute(sa.text("DROP FUNCTION IF EXISTS log_partition_upper_bound(regclass)"))
+
+
+@pytest.fixture
+def pg():
+    """Unpartitioned log tables as they were before the partition migration."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = sa.create_engine(TEST_DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://"))
+    with engine.begin() as conn:
+        reset_log_tables(conn)
+        for table in LOG_TABLES.values():
+            conn.execute(sa.text(
+                f"CREATE TABLE {table} ("
+                "id uuid PRIMARY KEY DEFAULT gen_random_uuid(), "
+                "created_at timestamptz NOT NULL DEFAULT now(), "
+                "trace_id varchar(100), message text)"
+            ))
+            conn.execute(sa.text(f"CREATE INDEX idx_{table}_created ON {table} (created_at)"))
+            conn.execute(sa.text(f"CREATE INDEX idx_{table}_trace_id ON {table} (trace_id)"))
+    yield engine
+    with engine.begin() as conn:
+        reset_log_tables(conn)
+    engine.dispose()
+
+
+def run_upgrade(engine, filename):
+    spec = importlib.util.spec_from_file_location(filename.removesuffix(".py"), VERSIONS / filename)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+    with engine.connect() as conn:
+        context = MigrationContext.configure(conn)
+        with context.begin_transaction():
+            migration.op = Operations(context)
+            migration.upgrade()
+
+
+def scalar(engine, sql, **params):
+    with engine.begin() as conn:
+        return conn.execute(sa.text(sql), params).scalar()
+
+
+def test_legacy_table_keeps_its_prebuilt_index_as_primary_key(pg):
+    with pg.begin() as conn:
+        conn.execute(sa.text(
+            "INSERT INTO app_logs (created_at) VALUES (now() - interval '40 days'), (now())"
+        ))
+        # Built ahead of time, as the migration's CONCURRENTLY phase does
+        conn.execute(sa.text("CREATE UNIQUE INDEX app_logs_p_legacy_id_created ON app_logs (id, created_at)"))
+    prebuilt = scalar(pg, "SELECT 'app_logs_p_legacy_id_created'::regclass::oid")
+
+    run_upgrade(pg, PARTITION_MIGRATION)
+
+    assert scalar(
+        pg, "SELECT conindid FROM pg_constraint WHERE conrelid = 'app_logs_p_legacy'::regclass AND contype = 'p'"
+    ) == prebuilt
+    assert scalar(
+        pg, "SELECT count(*) FROM pg_inherits WHERE inhparent = 'app_logs_pkey'::regclass AND inhrelid = :oid",
+        oid=prebuilt,
+    ) == 1
+    assert scalar(pg, "SELECT count(*) FROM app_logs") == 2
+
+
+def test_rows_past_the_last_partition_land_in_default_and_move_on_maintenance(pg):
+    run_upgrade(pg, PARTITION_MIGRATION)
+    late = "date_trunc('month', now()) + interval '8 months'"
+    with pg.begin() as conn:
+        conn.execute(sa.text(f"INSERT INTO app_logs (created_at) VALUES ({late})"))
+    assert scalar(pg, "SELECT count(*) FROM app_logs_p_default") == 1
+
+    result = scalar(pg, "SELECT maintain_log_partitions(CAST(:days AS jsonb), 9)", days=json.dumps({"app_logs": 0}))
+
+    assert result["moved_from_default"] == 1
+    assert scalar(pg, "SELECT count(*) FROM app_logs_p_default") == 0
+    partition = scalar(pg, f"SELECT 'app_logs_p' || to_char({late}, 'YYYYMM')")
+    assert scalar(pg, f"SELECT count(*) FROM {partition}") == 1
+    assert scalar(pg, "SELECT count(*) FROM app_logs") == 1
+
+
+def test_partitions_and_maintenance_are_closed_to_api_roles(pg):
+    run_upgrade(pg, PARTITION_MIGRATION)
+
+    assert scalar(pg, "SELECT prosecdef FROM pg_proc WHERE proname = 'maintain_log_partitions'") is True
+    assert scalar(
+        pg, "SELECT has_function_privilege('public', 'maintain_log_partitions(jsonb, integer, integer)', 'EXECUTE')"
+    ) is False
+    assert scalar(
+        pg,
+        "SELECT bool_and(c.relrowsecurity) FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'app_logs'::regclass AND c.relname <> 'app_logs_p_legacy'",
+    ) is True
+
+
+def test_keyset_indexes_are_attached_on_every_partition(pg):
+    run_upgrade(pg, PARTITION_MIGRATION)
+    run_upgrade(pg, KEYSET_MIGRATION)
+
+    for table in LOG_TABLES.values():
+        # A partitioned index is only valid once every partition has its index attached
+        assert scalar(pg, f"SELECT indisvalid FROM pg_index WHERE indexrelid = 'idx_{table}_created_id'::regclass")
+        assert scalar(pg, f"SELECT to_regclass('idx_{table}_created')") is None
@@ -0,0 +1,160 @@
+"""Tests for the per-minute log rollup aggregator."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from src.common.modules.logger import service as service_module
+from src.common.modules.logger.rollup import (
+    LatencyHistogram,
+    LogRollupAggregator,
+    RollupKey,
+    RollupSeries,
+)
+from src.common.modules.logger.schemas import AppLogCreate
+from src.common.modules.logger.service import LoggingService
+
+
+class FakeRollupTable:
+    """Mimics merge_log_rollups: additive per series, skipping flush ids already merged."""
+
+    def __init__(self):
+        self.rows = {}
+        self.flush_ids = []
+        self.calls = []
+        self.fail_before_commit = 0
+        self.fail_after_commit = 0
+
+    def apply(self, flush_id, rows):
+        self.calls.append(flush_id)
+        if self.fail_before_commit:
+            self.fail_before_commit -= 1
+            raise ConnectionError("connection refused")
+        if flush_id not in self.flush_ids:
+            self.flush_ids.append(flush_id)
+            for row in rows:
+                key = (row["bucket_start"], row["log_type"], row["layer"], row["level"], row["route"])
+                self.rows[key] = self.rows.get(key, 0) + row["count"]
+        if self.fail_after_commit:
+            self.fail_after_commit -= 1
+            raise TimeoutError("read timed out")
+
+    def total(self):
+        return sum(self.rows.values())
+
+
+def make_aggregator(table, **kwargs):
+    aggregator = LogRollupAggregator(**kwargs)
+    aggregator._apply = table.apply
+    return aggregator
+
+
+def past_minute(minutes_ago=5):
+    return datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=minutes_ago)
+
+
+def test_retry_after_ambiguous_failure_does_not_double_count():
+    table = FakeRollupTable()
+    aggregator = make_aggregator(table)
+    for _ in range(3):
+        aggregator.record("app", level="info", layer="api", route="/api/notices", at=past_minute())
+
+    table.fail_after_commit = 1
+    assert asyncio.run(aggregator.flush()) == 0
+    assert aggregator.get_stats()["unsent_batches"] == 1
+
+    assert asyncio.run(aggregator.flush()) == 1
+    assert table.calls[0] == table.calls[1]
+    assert table.total() == 3
+    assert aggregator.get_stats()["unsent_batches"] == 0
+
+
+def test_failed_batch_is_retried_unchanged_before_new_minutes():
+    table = FakeRollupTable()
+    aggregator = make_aggregator(table)
+    aggregator.record("app", level="info", at=past_minute(5))
+
+    table.fail_before_commit = 1
+    asyncio.run(aggregator.flush())
+    # New entries for the same minute go into a new batch, not into the failed one
+    aggregator.record("app", level="info", at=past_minute(5))
+    aggregator.record("error", level="error", at=past_minute(4))
+    asyncio.run(aggregator.flush())
+
+    first_id, retried_id, second_id = table.calls
+    assert retried_id == first_id
+    assert second_id != first_id
+    assert table.total() == 3
+
+
+def test_pending_series_includes_unsent_batches():
+    table = FakeRollupTable()
+    aggregator = make_aggregator(table)
+    minute = past_minute()
+    aggregator.record("performance", duration_ms=120, at=minute)
+
+    table.fail_before_commit = 1
+    asyncio.run(aggregator.flush())
+
+    pending = list(aggregator.pending_series(minute, minute + timedelta(minutes=1)))
+    assert [(bucket_start, key.log_type, series.count) for bucket_start, key, series in pending] == [
+        (minute, "performance", 1)
+    ]
+
+
+def test_unsent_batches_are_dropped_first_when_over_limit():
+    table = FakeRollupTable()
+    aggregator = make_aggregator(table, max_pending_minutes=2)
+    aggregator.record("app", at=past_minute(10))
+
+    table.fail_before_commit = 1
+    asyncio.run(aggregator.flush())
+    aggregator.record("app", at=past_minute(3))
+    aggregator.record("app", at=past_minute(2))
+
+    stats = aggregator.get_stats()
+    assert stats["unsent_batches"] == 0
+    assert stats["dropped_minutes"] == 1
+    assert stats["pending_minutes"] == 2
+
+
+def test_series_merge_combines_counts_and_histograms():
+    first = RollupSeries()
+    for duration in (10, 20, 900):
+        first.record(duration)
+    second = RollupSeries()
+    second.record(5)
+    second.record(None)
+
+    first.merge(second)
+
+    assert first.count == 5
+    assert first.slow_count == 1
+    assert first.histogram.count == 4
+    assert first.histogram.total == 935
+    assert (first.histogram.min, first.histogram.max) == (5, 900)
+
+
+def test_histogram_round_trips_through_a_rollup_row():
+    histogram = LatencyHistogram()
+    for value in range(1, 1001):
+        histogram.record(value)
+
+    row = RollupSeries(count=1000, histogram=histogram).to_row(past_minute(), RollupKey("performance", "", "", ""))
+    restored = LatencyHistogram.from_row(row)
+
+    assert restored.counts == histogram.counts
+    assert abs(restored.percentile(50) - 500) <= 500 * 0.03
+    assert abs(restored.percentile(99) - 990) <= 990 * 0.03
+
+
+
+def test_app_logs_below_the_database_level_are_not_counted(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(service_module.file_log_writer, "write_app_log_from_schema", lambda schema: None)
+    monkeypatch.setattr(service_module.db_log_writer, "enqueue_app_log_from_schema", lambda schema: None)
+    monkeypatch.setattr(service_module.db_log_writer, "min_log_level", "INFO")
+    monkeypatch.setattr(service_module.log_rollups, "record_schema", lambda log_type, schema: recorded.append(schema.level))
+
+    for level in ("DEBUG", "INFO", "ERROR"):
+        asyncio.run(LoggingService().app(AppLogCreate(source="backend", level=level, message="m")))
+
+    assert recorded == ["INFO", "ERROR"]
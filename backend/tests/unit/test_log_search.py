@@ -0,0 +1,63 @@
+"""Tests for log message search and by-message deletes."""
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from src.common.modules.db.models import AppLog, ErrorLog
+from src.common.modules.logger import service as service_module
+from src.common.modules.logger.schemas import LogListQuery
+from src.common.modules.logger.service import LoggingService
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class FakeSession:
+    """Records executed statements; each delete removes up to `rowcounts.pop(0)` rows."""
+
+    def __init__(self, *rowcounts):
+        self.rowcounts = list(rowcounts)
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.statements.append(compile_sql(statement))
+        return SimpleNamespace(rowcount=self.rowcounts.pop(0))
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_delete_by_message_is_a_plain_substring_match(monkeypatch):
+    monkeypatch.setattr(service_module.settings, "LOG_DELETE_BATCH_SIZE", 2)
+    db = FakeSession(2, 1)
+
+    deleted = asyncio.run(LoggingService().delete_logs_by_message(db, "error", "user.id=42 not found"))
+
+    assert deleted == 3
+    assert db.commits == 2
+    for sql in db.statements:
+        assert "ILIKE '%%user.id=42 not found%%'" in sql
+        assert "tsquery" not in sql
+        assert "to_tsvector" not in sql
+
+
+def test_search_uses_the_indexed_expression():
+    service = LoggingService()
+    for model, log_type in ((AppLog, "app"), (ErrorLog, "error")):
+        conditions = service._build_conditions(model, LogListQuery(q="timeout"), log_type)
+        sql = compile_sql(conditions[-1])
+        assert sql.startswith(f"{model.search_document} @@ websearch_to_tsquery('simple'::regconfig, 'timeout')")
+        index = next(index for index in model.__table__.indexes if index.name.endswith("_search"))
+        assert model.search_document in str(index.expressions[0])
+
+
+def test_tables_without_search_index_fall_back_to_ilike():
+    service = LoggingService()
+    model = service._get_model_for_type("system")
+
+    conditions = service._build_conditions(model, LogListQuery(q="timeout"), "system")
+
+    assert "ILIKE" in compile_sql(conditions[-1])
@@ -0,0 +1,99 @@
+"""Tests for the metrics registry and the /metrics endpoint."""
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+import pytest
+
+from src.common.modules.exception import AuthenticationError, NotFoundError
+from src.common.modules.metrics.registry import GaugeFamily, MetricsRegistry
+
+# The package re-exports the APIRouter as `router`, shadowing the submodule
+router_module = importlib.import_module("src.common.modules.metrics.router")
+
+
+def test_counter_renders_help_type_and_escaped_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs run.", ["queue"])
+    counter.inc("b")
+    counter.inc("a", amount=2.5)
+    counter.inc('x"y\n')
+
+    assert registry.render().splitlines() == [
+        "# HELP jobs_total Jobs run.",
+        "# TYPE jobs_total counter",
+        'jobs_total{queue="a"} 2.5',
+        'jobs_total{queue="b"} 1',
+        'jobs_total{queue="x\\"y\\n"} 1',
+    ]
+
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ["route"], buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/x")
+
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{route="/x",le="0.1"} 2',
+        'latency_seconds_bucket{route="/x",le="1"} 3',
+        'latency_seconds_bucket{route="/x",le="+Inf"} 4',
+        'latency_seconds_sum{route="/x"} 3.65',
+        'latency_seconds_count{route="/x"} 4',
+    ]
+
+
+def test_label_count_and_redefinitions_are_validated():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ["method", "route"])
+
+    with pytest.raises(ValueError):
+        histogram.observe(0.1, "GET")
+    assert registry.histogram("latency_seconds", "Latency.", ["method", "route"]) is histogram
+    with pytest.raises(ValueError):
+        registry.counter("latency_seconds", "Latency.", ["method", "route"])
+    with pytest.raises(ValueError):
+        registry.histogram("latency_seconds", "Latency.", ["method"])
+
+
+def test_failing_collector_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+
+    def broken():
+        raise RuntimeError("queue gone")
+
+    registry.register_collector(broken)
+    registry.register_collector(lambda: [GaugeFamily("queue_size", "Queue size.", ("queue",)).add(("log",), 3)])
+
+    assert registry.render().splitlines() == [
+        "# HELP queue_size Queue size.",
+        "# TYPE queue_size gauge",
+        'queue_size{queue="log"} 3',
+    ]
+
+
+def scrape(authorization=None):
+    headers = {"authorization": authorization} if authorization else {}
+    return asyncio.run(router_module.get_metrics(SimpleNamespace(headers=headers)))
+
+
+def test_endpoint_is_hidden_without_a_token_outside_debug(monkeypatch):
+    monkeypatch.setattr(router_module.settings, "METRICS_TOKEN", "")
+    monkeypatch.setattr(router_module.settings, "DEBUG", False)
+    with pytest.raises(NotFoundError):
+        scrape()
+
+    monkeypatch.setattr(router_module.settings, "DEBUG", True)
+    assert scrape().status_code == 200
+
+
+def test_endpoint_requires_the_bearer_token_when_set(monkeypatch):
+    monkeypatch.setattr(router_module.settings, "METRICS_TOKEN", "s3cret")
+    monkeypatch.setattr(router_module.settings, "DEBUG", True)
+
+    for authorization in (None, "Bearer wrong", "s3cret"):
+        with pytest.raises(AuthenticationError):
+            scrape(authorization)
+    response = scrape("Bearer s3cret")
+    assert response.status_code == 200
+    assert b"http_request_duration_seconds" in response.body
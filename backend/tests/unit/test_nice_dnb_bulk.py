@@ -0,0 +1,93 @@
+"""Tests for Nice D&B bulk verification."""
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from src.common.modules.exception import ValidationError
+from src.common.modules.integrations.nice_dnb import bulk as bulk_module
+from src.common.modules.integrations.nice_dnb import service as service_module
+from src.common.modules.integrations.nice_dnb.bulk import NiceDnBBulkVerifier, parse_business_numbers
+from src.common.modules.integrations.nice_dnb.cache import CachedLookup
+from src.common.modules.integrations.nice_dnb.schemas import NiceDnBCompanyData, NiceDnBResponse
+
+
+def company(business_number):
+    return NiceDnBResponse(data=NiceDnBCompanyData(business_number=business_number, company_name=f"Co {business_number}"))
+
+
+class FakeCache:
+    def __init__(self, cached):
+        self.cached = cached
+        self.stored = {}
+
+    async def get_many(self, business_numbers):
+        return {bn: self.cached[bn] for bn in business_numbers if bn in self.cached}
+
+    def is_fresh(self, entry):
+        return True
+
+    async def store_many(self, responses, queried_by=None):
+        self.stored.update(responses)
+
+
+class FakeClient:
+    def __init__(self):
+        self.fetched = []
+
+    async def fetch_company_raw(self, business_number):
+        self.fetched.append(business_number)
+        return company(business_number) if business_number != "3333333333" else None
+
+
+def test_parse_business_numbers_ignores_headers_and_extra_columns():
+    text = "business_number,name\n123-45-67890,Acme\n\n2222222222,Other\nnot-a-number,x\n"
+
+    assert parse_business_numbers(text) == ["1234567890", "2222222222"]
+
+
+def test_parse_business_numbers_rejects_too_many_rows():
+    text = "\n".join(f"{i:010d}" for i in range(11))
+
+    assert len(parse_business_numbers(text, max_rows=11)) == 11
+    with pytest.raises(ValidationError):
+        parse_business_numbers(text, max_rows=10)
+
+
+async def test_run_skips_fresh_numbers_and_fetches_the_rest(monkeypatch):
+    cache = FakeCache({"1111111111": CachedLookup(company("1111111111"), datetime.now(timezone.utc))})
+    client = FakeClient()
+    monkeypatch.setattr(bulk_module, "nice_dnb_cache", cache)
+    monkeypatch.setattr(service_module, "nice_dnb_client", client)
+    verifier = NiceDnBBulkVerifier(concurrency=2, rate_per_second=0)
+
+    job = await verifier.run(["111-11-11111", "2222222222", "3333333333", "bogus-1"])
+
+    assert job.status == "completed"
+    assert sorted(client.fetched) == ["2222222222", "3333333333"]
+    assert job.counts() == {"verified": 1, "cached": 1, "failed": 1, "invalid": 1}
+    assert list(cache.stored) == ["2222222222"]
+    assert verifier.get(job.id) is job
+
+
+async def test_a_failing_worker_cancels_the_others(monkeypatch):
+    class FailingClient(FakeClient):
+        async def fetch_company_raw(self, business_number):
+            self.fetched.append(business_number)
+            if business_number == "1111111111":
+                await asyncio.sleep(0)
+                raise ConnectionError("quota exceeded")
+            await asyncio.sleep(3600)
+
+    client = FailingClient()
+    monkeypatch.setattr(bulk_module, "nice_dnb_cache", FakeCache({}))
+    monkeypatch.setattr(service_module, "nice_dnb_client", client)
+    verifier = NiceDnBBulkVerifier(concurrency=2, rate_per_second=0)
+
+    job = await asyncio.wait_for(
+        verifier.run(["1111111111", "2222222222", "3333333333", "4444444444"]), timeout=5
+    )
+
+    assert job.status == "failed"
+    assert job.error == "quota exceeded"
+    assert sorted(client.fetched) == ["1111111111", "2222222222"]
@@ -0,0 +1,62 @@
+"""Tests for Nice D&B token refresh."""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.common.modules.integrations.nice_dnb.service import NiceDnBClient
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = NiceDnBClient()
+    client.api_key = "key"
+    client.api_secret_key = "secret"
+    tokens = iter(f"token-{i}" for i in range(1, 100))
+
+    async def request_access_token():
+        client._stats["token_requests"] += 1
+        client._access_token = next(tokens)
+        client._token_expires_at = datetime.now() + timedelta(hours=1)
+        client._token_used = False
+        return client._access_token
+
+    monkeypatch.setattr(client, "_request_access_token", request_access_token)
+    monkeypatch.setattr(client, "_schedule_refresh", lambda: None)
+    return client
+
+
+async def no_sleep(delay):
+    return None
+
+
+async def test_refresh_loop_stops_when_token_unused(client, monkeypatch):
+    assert await client._get_access_token() == "token-1"
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+    # Used once after the fetch: the first wake-up refreshes, the second finds
+    # no call since that refresh and stops
+    await client._refresh_loop()
+
+    assert client._stats["token_requests"] == 2
+    assert client._stats["token_refreshes"] == 1
+    assert client._stats["token_refreshes_skipped"] == 1
+
+
+async def test_refresh_loop_skips_token_never_used_after_refresh(client, monkeypatch):
+    await client._get_access_token()
+    client._token_used = False
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+
+    await client._refresh_loop()
+
+    assert client._stats["token_requests"] == 1
+    assert client._stats["token_refreshes"] == 0
+
+
+async def test_cached_token_marks_usage(client):
+    await client._get_access_token()
+    client._token_used = False
+
+    assert await client._get_access_token() == "token-1"
+    assert client._token_used is True
@@ -3,7 +3,7 @@
  * 事业公告列表
  */
 
-import { useState, useEffect, useCallback, useMemo } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import { useTranslation } from 'react-i18next';
 import { useNavigate, useLocation } from 'react-router-dom';
 import { Card, Table, Button, Badge, Pagination, SearchInput, Alert, Modal } from '@shared/components';
@@ -16,20 +16,20 @@ export default function ProjectList() {
   const navigate = useNavigate();
   const location = useLocation();
   const [loading, setLoading] = useState(false);
-  const [allProjects, setAllProjects] = useState([]);
-  const [filteredProjects, setFilteredProjects] = useState([]);
+  const [projects, setProjects] = useState([]);
   const [message, setMessage] = useState(null);
   const [messageVariant, setMessageVariant] = useState('success');
   const [showDeleteModal, setShowDeleteModal] = useState(false);
   const [deletingProjectId, setDeletingProjectId] = useState(null);
 
   const [currentPage, setCurrentPage] = useState(1);
-  const [pageSize, setPageSize] = useState(20);
+  const [pageSize] = useState(20);
   const [totalCount, setTotalCount] = useState(0);
+  const [search, setSearch] = useState('');
 
-  // 使用 useCallback 包装 setFilteredProjects 避免无限循环
-  const handleFilterChange = useCallback((filtered) => {
-    setFilteredProjects(filtered);
+  // 搜索词变化（已防抖）时回到第一页
+  const handleSearchChange = useCallback((value) => {
+    setSearch(value);
     setCurrentPage(1);
   }, []);
 
@@ -45,80 +45,31 @@ export default function ProjectList() {
     }
   }, [location.state]);
 
-  // 一次性加载所有项目数据
-  const loadAllProjects = useCallback(async () => {
+  // 服务端分页和搜索
+  const loadProjects = useCallback(async () => {
     setLoading(true);
     try {
       const params = {
-        page: 1,
-        pageSize: 1000
+        page: currentPage,
+        pageSize: pageSize,
+        search: search || undefined
       };
-      const response = await apiService.get(`${API_PREFIX}/admin/projects`, { params });
+      const response = await apiService.get(`${API_PREFIX}/admin/projects`, params);
       
-      if (response && response.items) {
-        setAllProjects(response.items);
-        setFilteredProjects(response.items);
-      } else {
-        setAllProjects([]);
-        setFilteredProjects([]);
-      }
+      setProjects(response?.items || []);
+      setTotalCount(response?.total || 0);
     } catch (error) {
       console.error('Failed to load projects:', error);
-      setAllProjects([]);
+      setProjects([]);
+      setTotalCount(0);
     } finally {
       setLoading(false);
     }
-  }, []);
-
-  useEffect(() => {
-    loadAllProjects();
-  }, [loadAllProjects]);
-
-  // 定义搜索列 - 与表格列保持一致
-  const searchColumns = useMemo(() => [
-    {
-      key: 'title',
-      label: t('admin.projects.table.title'),
-      render: (value) => value || ''
-    },
-    {
-      key: 'startDate',
-      label: t('admin.projects.table.startDate'),
-      render: (value) => value || ''
-    },
-    {
-      key: 'endDate',
-      label: t('admin.projects.table.endDate'),
-      render: (value) => value || ''
-    },
-    {
-      key: 'status',
-      label: t('admin.projects.table.status'),
-      render: (value) => t(`admin.projects.status.${value}`, value)
-    },
-    {
-      key: 'viewCount',
-      label: t('admin.projects.table.viewCount', '조회수'),
-      render: (value) => value?.toString() || '0'
-    },
-    {
-      key: 'applicationsCount',
-      label: t('admin.projects.table.applicationsCount', '신청인원'),
-      render: (value) => value?.toString() || '0'
-    }
-  ], [t]);
-
-  // 分页后的数据
-  const projects = useMemo(() => {
-    const start = (currentPage - 1) * pageSize;
-    const end = start + pageSize;
-    return filteredProjects.slice(start, end);
-  }, [filteredProjects, currentPage, pageSize]);
+  }, [currentPage, pageSize, search]);
 
-  // 更新总数
   useEffect(() => {
-    setTotalCount(filteredProjects.length);
-  }, [filteredProjects]);
+    loadProjects();
+  }, [loadProjects]);
 
   const handleCreate = () => {
     navigate('/admin/projects/new');
@@ -142,7 +93,7 @@ export default function ProjectList() {
       await apiService.delete(`${API_PREFIX}/admin/projects/${deletingProjectId}`);
       setShowDeleteModal(false);
       setDeletingProjectId(null);
-      loadAllProjects();
+      loadProjects();
       setMessage(t('admin.projects.deleteSuccess', '삭제되었습니다'));
       setMessageVariant('success');
       setTimeout(() => setMessage(null), 3000);
@@ -283,10 +234,8 @@ export default function ProjectList() {
         
         <div className="flex flex-wrap items-center justify-between gap-4 mb-4">
           <SearchInput
-            data={allProjects}
-            columns={searchColumns}
-            onFilter={handleFilterChange}
-            placeholder={t('admin.projects.searchPlaceholder', '공고명, 목표기업, 사업자등록번호 등 검색')}
+            onChange={handleSearchChange}
+            placeholder={t('admin.projects.searchPlaceholder', '공고명, 내용 검색')}
             className="flex-1 min-w-[200px] max-w-md"
           />
           <div className="flex items-center space-x-2 md:ml-4 w-full md:w-auto">
@@ -318,7 +267,7 @@ export default function ProjectList() {
           <div className="p-12 text-center text-gray-500">
             <p className="text-lg mb-2">{t('admin.projects.noProjects', '공고 데이터가 없습니다')}</p>
             <p className="text-sm text-gray-400">
-              {totalCount === 0 
+              {!search 
                 ? t('admin.projects.noProjectsHint', '첫 번째 공고를 생성하거나 페이지를 새로고침하세요')
                 : t('admin.projects.noMatchingProjects', '현재 필터 조건에 맞는 공고가 없습니다')}
             </p>